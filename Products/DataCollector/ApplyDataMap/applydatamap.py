@@ -254,7 +254,8 @@ def _validate_datamap(
         log.debug("_validate_datamap: got valid IncrementalDataMap")
     elif isinstance(datamap, ObjectMap):
         log.debug("_validate_datamap: got valid ObjectMap")
-        datamap = IncrementalDataMap(device, datamap)
+        # IncrementalDataMap rewrites legacy directives on the ObjectMap.
+        datamap = IncrementalDataMap(device, _clone_datamap(datamap))
     else:
         log.debug("_validate_datamap: build object_map")
         datamap = ObjectMap(datamap, compname=compname, modname=modname)
@@ -264,7 +265,11 @@ def _validate_datamap(
 
 
 def _clone_datamap(datamap):
-    """Return a copy of the given datamap."""
+    """Return a copy of the given datamap.
+
+    The attribute values are shared with the original datamap, which
+    is left unchanged by changes to the copy's attributes.
+    """
     if isinstance(datamap, RelationshipMap):
         clone = RelationshipMap(
             relname=datamap.relname,
@@ -275,8 +280,12 @@ def _clone_datamap(datamap):
         clone.maps = [_clone_datamap(submap) for submap in datamap]
         return clone
 
+    clone = copy.copy(datamap)
+    if isinstance(datamap, ObjectMap):
+        # Setting an attribute on the copy updates its _attrs list.
+        clone.__dict__["_attrs"] = list(datamap._attrs)
     # It's an IncrementalDataMap, ObjectMap, etc.
-    return copy.copy(datamap)
+    return clone
 
 
 def _get_relmap_target(device, relmap):
@@ -0,0 +1,256 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import
+
+import hashlib
+import logging
+import time
+
+from collections import defaultdict
+
+from Acquisition import aq_base
+from BTrees.OOBTree import OOBTree
+
+from Products.DataCollector.plugins.DataMaps import (
+    MultiArgs,
+    ObjectMap,
+    RelationshipMap,
+)
+from Products.ZenUtils.Utils import NotFound
+
+from .applydatamap import _get_relationship_ids, _get_relmap_target
+from .datamaputils import directive_map
+
+log = logging.getLogger("zen.ApplyDataMap.fingerprint")
+
+# Seconds during which a fingerprint is trusted.  Afterwards, the datamap
+# is applied again even if it's unchanged.
+DEFAULT_TTL = 24 * 60 * 60
+
+# Seconds between the time a collection is recorded on a device and the
+# commit of that transaction during which a modified device is considered
+# unchanged since the collection.
+_COLLECTION_WINDOW = 60
+
+# Name of the device attribute holding the fingerprints.
+_ATTRIBUTE = "_datamapFingerprints"
+
+_DIRECTIVES = tuple(directive_map) + ("_directive",)
+
+
+def fingerprint(datamap):
+    """Return a digest of the content of the datamap."""
+    digest = hashlib.sha1()
+    _feed(digest, datamap)
+    return digest.digest()
+
+
+def _feed(digest, value):
+    if isinstance(value, RelationshipMap):
+        digest.update("R(")
+        for name in ("relname", "compname", "parentId", "plugin_name"):
+            _feed(digest, getattr(value, name, None))
+        for objmap in value:
+            _feed(digest, objmap)
+        digest.update(")")
+    elif isinstance(value, ObjectMap):
+        digest.update("O(")
+        for name in ObjectMap._blockattrs:
+            _feed(digest, getattr(value, name, None))
+        _feed(digest, dict(value.iteritems()))
+        digest.update(")")
+    elif isinstance(value, MultiArgs):
+        digest.update("M(")
+        _feed(digest, value.args)
+        digest.update(")")
+    elif isinstance(value, dict):
+        digest.update("D(")
+        for key, item in sorted(value.iteritems()):
+            _feed(digest, key)
+            _feed(digest, item)
+        digest.update(")")
+    elif isinstance(value, (list, tuple)):
+        digest.update("L(" if isinstance(value, list) else "T(")
+        for item in value:
+            _feed(digest, item)
+        digest.update(")")
+    elif isinstance(value, (set, frozenset)):
+        digest.update("S(")
+        for item in sorted(fingerprint(item) for item in value):
+            digest.update(item)
+        digest.update(")")
+    else:
+        # Objects without a stable repr get a different fingerprint every
+        # time, so their datamaps are always applied.
+        text = repr(value)
+        digest.update(
+            "%s:%d:%s" % (type(value).__name__, len(text), text)
+        )
+
+
+def _has_directive(objmap):
+    return any(
+        getattr(objmap, name, None) is not None for name in _DIRECTIVES
+    )
+
+
+def _object_ids(relmap):
+    """
+    Return the IDs of the objects of the relmap, renamed as
+    _process_relationshipmap renames duplicate IDs.
+    """
+    seenids = defaultdict(int)
+    ids = set()
+    for objmap in relmap:
+        objid = getattr(objmap, "id", None)
+        if objid is None:
+            return None
+        seenids[objid] += 1
+        if seenids[objid] > 1:
+            objid = "%s_%s" % (objid, seenids[objid])
+        ids.add(objid)
+    return ids
+
+
+class DatamapFingerprints(object):
+    """
+    The fingerprints of the datamaps last applied to a device, stored on the
+    device by the transaction that applies the datamaps, and indexed by
+    plugin and the datamap's target.
+
+    A datamap whose fingerprint matches the fingerprint of the last datamap
+    applied to the same target doesn't need to be applied again, provided
+    the target and its components haven't been replaced, added, removed or
+    modified since.
+    """
+
+    def __init__(self, device, ttl=DEFAULT_TTL):
+        self._device = device
+        self._ttl = ttl
+
+    def identify(self, datamap):
+        """
+        Return the (key, fingerprint) of the datamap, or None if the
+        datamap must always be applied.
+        """
+        if isinstance(datamap, RelationshipMap):
+            if any(
+                not isinstance(objmap, ObjectMap) or _has_directive(objmap)
+                for objmap in datamap
+            ):
+                return None
+            key = (
+                "relationship",
+                datamap.plugin_name,
+                datamap.parentId or datamap.compname,
+                datamap.relname,
+            )
+        elif isinstance(datamap, ObjectMap):
+            if _has_directive(datamap):
+                return None
+            key = (
+                "object",
+                datamap.plugin_name,
+                datamap.compname,
+                datamap.modname,
+            )
+        else:
+            return None
+        return "|".join(part or "" for part in key), fingerprint(datamap)
+
+    def isCurrent(self, datamap, ident):
+        """
+        Return True if the datamap identified by `ident` was the last
+        datamap applied to its target.
+        """
+        key, value = ident
+        entries = getattr(aq_base(self._device), _ATTRIBUTE, None)
+        entry = entries.get(key) if entries is not None else None
+        if entry is None or entry[0] != value:
+            return False
+        _, applied, oid = entry
+        if time.time() - applied > self._ttl:
+            return False
+        try:
+            target, objects = self._target(datamap)
+            if target is None or target._p_oid != oid:
+                return False
+            if isinstance(datamap, RelationshipMap):
+                expected = _object_ids(datamap)
+                actual = _get_relationship_ids(target, datamap.relname)
+                if expected is None or expected != actual:
+                    return False
+            # Changes made since the datamap was applied, by a user for
+            # instance, are undone by applying the datamap again.
+            return all(self._unchangedSince(obj, applied) for obj in objects)
+        except Exception:
+            log.debug("unable to check target of datamap", exc_info=True)
+            return False
+
+    def update(self, datamap, ident):
+        """Record the fingerprint of an applied datamap."""
+        key, value = ident
+        try:
+            target, _ = self._target(datamap)
+        except Exception:
+            log.debug("unable to find target of datamap", exc_info=True)
+            target = None
+        oid = getattr(target, "_p_oid", None)
+        entries = getattr(aq_base(self._device), _ATTRIBUTE, None)
+        if oid is None:
+            # The target is created by this transaction; the datamap is
+            # recorded the next time it's applied.
+            if entries is not None:
+                entries.pop(key, None)
+            return
+        if entries is None:
+            entries = OOBTree()
+            setattr(self._device, _ATTRIBUTE, entries)
+        entries[key] = (value, time.time(), oid)
+
+    def _unchangedSince(self, obj, applied):
+        """
+        Return True if obj wasn't modified since the time `applied`.
+        """
+        mtime = obj._p_mtime
+        if mtime is None:
+            return False
+        if mtime < applied:
+            return True
+        if aq_base(obj) is not aq_base(self._device):
+            return False
+        # zenmodeler records the time of each collection on the device,
+        # in the transaction applying the datamaps, so the device is
+        # always modified after the datamaps were applied.  That write
+        # alone doesn't change the device.
+        collected = getattr(aq_base(obj), "_snmpLastCollection", 0)
+        return (
+            applied <= collected <= mtime <= collected + _COLLECTION_WINDOW
+        )
+
+    def _target(self, datamap):
+        """
+        Return the target of the datamap and the objects it updates.
+        """
+        device = self._device
+        if isinstance(datamap, RelationshipMap):
+            parent = _get_relmap_target(device, datamap)
+            if parent is None or not hasattr(parent, datamap.relname):
+                return None, ()
+            relationship = getattr(parent, datamap.relname)
+            return parent, list(relationship.objectValuesAll())
+        if datamap.compname:
+            try:
+                target = device.getObjByPath(datamap.compname)
+            except (NotFound, KeyError, AttributeError):
+                return None, ()
+        else:
+            target = device
+        return target, (target,)
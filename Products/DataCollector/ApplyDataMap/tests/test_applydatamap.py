@@ -667,6 +667,16 @@ class Test__validate_datamap(BaseTestCase):
         t.assertIsInstance(ret, IncrementalDataMap)
         t.assertEqual(ret._base, sentinel.device)
 
+    def test_objectmap_is_not_modified(t):
+        datamap = ObjectMap({"id": sentinel.deviceid, "_add": True})
+
+        ret = _validate_datamap(
+            sentinel.device, datamap, None, "compname", "modname", "parentId"
+        )
+
+        t.assertTrue(datamap._add)
+        t.assertFalse(hasattr(datamap, "_directive"))
+
     def test_relname_means_relationshipmap(t):
         """Legacy API Asumption:
         given a ObjectMap, and including a relname
@@ -962,6 +972,19 @@ class Test__clone_datamap(BaseTestCase):
         t.assertEqual(original.plugin_name, clone.plugin_name)
         t.assertDictEqual(dict(original.items()), dict(clone.items()))
 
+    def test_ObjectMap_copy_on_write(t):
+        original = ObjectMap(data={"id": "a", "b": [1]})
+
+        clone = _clone_datamap(original)
+        clone.relname = "rel"
+        clone.id = "a_2"
+
+        t.assertIs(original.b, clone.b)
+        t.assertEqual(original.id, "a")
+        t.assertFalse(hasattr(original, "relname"))
+        t.assertNotIn("relname", dict(original.items()))
+        t.assertIn("relname", dict(clone.items()))
+
     def test_dict(t):
         original = {"a": 1}
         clone = _clone_datamap(original)
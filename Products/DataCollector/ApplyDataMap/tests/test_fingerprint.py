@@ -0,0 +1,177 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+import time
+
+from mock import Mock, patch
+
+from ..fingerprint import (
+    DatamapFingerprints,
+    MultiArgs,
+    ObjectMap,
+    RelationshipMap,
+    fingerprint,
+)
+from .utils import BaseTestCase
+
+PATH = {"src": "Products.DataCollector.ApplyDataMap.fingerprint"}
+
+
+def _relmap(*ids, **kw):
+    return RelationshipMap(
+        relname="interfaces",
+        compname="os",
+        modname="Products.ZenModel.IpInterface",
+        objmaps=[dict({"id": objid}, **kw) for objid in ids],
+        plugin_name="zenoss.snmp.InterfaceMap",
+    )
+
+
+class TestFingerprint(BaseTestCase):
+    def test_equal_maps(t):
+        t.assertEqual(
+            fingerprint(_relmap("eth0", "eth1", speed=1000)),
+            fingerprint(_relmap("eth0", "eth1", speed=1000)),
+        )
+
+    def test_different_values(t):
+        t.assertNotEqual(
+            fingerprint(_relmap("eth0", speed=1000)),
+            fingerprint(_relmap("eth0", speed=100)),
+        )
+        t.assertNotEqual(
+            fingerprint(_relmap("eth0", speed=1000)),
+            fingerprint(_relmap("eth0", speed="1000")),
+        )
+
+    def test_order_of_objects_matters(t):
+        t.assertNotEqual(
+            fingerprint(_relmap("eth0", "eth1")),
+            fingerprint(_relmap("eth1", "eth0")),
+        )
+
+    def test_containers(t):
+        om1 = ObjectMap(
+            {
+                "setIpAddresses": MultiArgs(["10.0.0.1/24"], "x"),
+                "tags": {"b", "a"},
+                "attrs": {"y": 2, "x": (1, [2])},
+            }
+        )
+        om2 = ObjectMap(
+            {
+                "attrs": {"x": (1, [2]), "y": 2},
+                "tags": {"a", "b"},
+                "setIpAddresses": MultiArgs(["10.0.0.1/24"], "x"),
+            }
+        )
+        t.assertEqual(fingerprint(om1), fingerprint(om2))
+        om2.attrs = {"x": [1, [2]], "y": 2}
+        t.assertNotEqual(fingerprint(om1), fingerprint(om2))
+
+
+class TestDatamapFingerprints(BaseTestCase):
+    def setUp(t):
+        super(TestDatamapFingerprints, t).setUp()
+        t.device = Mock(id="device", spec=["id", "getObjByPath"])
+        t.fingerprints = DatamapFingerprints(t.device)
+        patcher = patch(
+            "{src}._get_relmap_target".format(**PATH), autospec=True
+        )
+        t._get_relmap_target = patcher.start()
+        t.addCleanup(patcher.stop)
+        t.components = [
+            Mock(id="eth0", _p_mtime=1.0), Mock(id="eth1", _p_mtime=1.0),
+        ]
+        t.parent = t._get_relmap_target.return_value
+        t.parent._p_oid = "parent"
+        t.parent.interfaces.objectIdsAll.side_effect = lambda: [
+            c.id for c in t.components
+        ]
+        t.parent.interfaces.objectValuesAll.side_effect = lambda: list(
+            t.components
+        )
+
+    def _applied(t, datamap):
+        ident = t.fingerprints.identify(datamap)
+        t.fingerprints.update(datamap, ident)
+        return ident
+
+    def test_unchanged_relmap(t):
+        t._applied(_relmap("eth0", "eth1"))
+        datamap = _relmap("eth0", "eth1")
+        ident = t.fingerprints.identify(datamap)
+        t.assertTrue(t.fingerprints.isCurrent(datamap, ident))
+
+    def test_stored_on_device(t):
+        t._applied(_relmap("eth0", "eth1"))
+        datamap = _relmap("eth0", "eth1")
+        other = DatamapFingerprints(t.device)
+        t.assertTrue(
+            other.isCurrent(datamap, other.identify(datamap))
+        )
+
+    def test_changed_relmap(t):
+        t._applied(_relmap("eth0", "eth1"))
+        datamap = _relmap("eth0", "eth1", mtu=9000)
+        ident = t.fingerprints.identify(datamap)
+        t.assertFalse(t.fingerprints.isCurrent(datamap, ident))
+
+    def test_component_removed_since(t):
+        datamap = _relmap("eth0", "eth1")
+        ident = t._applied(datamap)
+        del t.components[1]
+        t.assertFalse(t.fingerprints.isCurrent(datamap, ident))
+
+    def test_component_modified_since(t):
+        datamap = _relmap("eth0", "eth1")
+        ident = t._applied(datamap)
+        t.components[1]._p_mtime = time.time() + 1
+        t.assertFalse(t.fingerprints.isCurrent(datamap, ident))
+
+    def test_target_replaced_since(t):
+        datamap = _relmap("eth0", "eth1")
+        ident = t._applied(datamap)
+        t.parent._p_oid = "other"
+        t.assertFalse(t.fingerprints.isCurrent(datamap, ident))
+
+    def test_new_target_is_not_recorded(t):
+        t.parent._p_oid = None
+        datamap = _relmap("eth0", "eth1")
+        ident = t._applied(datamap)
+        t.assertFalse(t.fingerprints.isCurrent(datamap, ident))
+
+    def test_other_device(t):
+        datamap = _relmap("eth0", "eth1")
+        t._applied(datamap)
+        other = DatamapFingerprints(Mock(id="other", spec=["id"]))
+        ident = other.identify(datamap)
+        t.assertFalse(other.isCurrent(datamap, ident))
+
+    def test_expired(t):
+        t.fingerprints = DatamapFingerprints(t.device, ttl=-1)
+        datamap = _relmap("eth0", "eth1")
+        ident = t._applied(datamap)
+        t.assertFalse(t.fingerprints.isCurrent(datamap, ident))
+
+    def test_directives_are_always_applied(t):
+        datamap = _relmap("eth0", "eth1")
+        datamap.maps[0]._remove = True
+        t.assertIsNone(t.fingerprints.identify(datamap))
+        objmap = ObjectMap({"_add": False, "id": "eth0"})
+        t.assertIsNone(t.fingerprints.identify(objmap))
+
+    def test_objectmap(t):
+        component = Mock(_p_oid="hw", _p_mtime=1.0)
+        t.device.getObjByPath.return_value = component
+        objmap = ObjectMap({"snmpContact": "admin"}, compname="hw")
+        ident = t._applied(objmap)
+        t.assertTrue(t.fingerprints.isCurrent(objmap, ident))
+        t.device.getObjByPath.side_effect = KeyError("hw")
+        t.assertFalse(t.fingerprints.isCurrent(objmap, ident))
@@ -0,0 +1,131 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from collections import deque
+from unittest import TestCase
+
+from mock import Mock, patch
+from twisted.internet import defer
+
+from Products.DataCollector.zenmodeler import ZenModeler
+from Products.ZenUtils.Driver import drive
+
+PATH = {"driver": "Products.ZenUtils.Driver"}
+
+
+def _proxy(name):
+    return Mock(id=name, skipModelMsg="")
+
+
+class FillCollectionSlotsTest(TestCase):
+    """Test the fillCollectionSlots method of ZenModeler."""
+
+    def setUp(t):
+        # Run the driver's steps immediately instead of in the reactor.
+        patcher = patch("{driver}.reactor".format(**PATH), autospec=True)
+        reactor = patcher.start()
+        t.addCleanup(patcher.stop)
+        reactor.callLater.side_effect = lambda delay, f, *a, **kw: f(*a, **kw)
+
+        t.modeler = ZenModeler.__new__(ZenModeler)
+        t.modeler.options = Mock(parallel=2, prefetch=1, checkStatus=False)
+        t.modeler.log = Mock()
+        t.modeler.clients = []
+        t.modeler.prefetched = deque()
+        t.modeler._prefetchGeneration = 0
+        t.modeler.pendingNewClients = False
+        t.modeler.devicegen = iter(["a", "b", "c", "d"])
+        t.modeler.processedDevicesCount = 0
+        t.modeler.iterationDeviceCount = 4
+        t.modeler.collectorLoopIteration = 1
+        t.modeler.didCollect = False
+        t.modeler.cyberark = None
+        t.modeler.checkStop = Mock()
+        t.modeler.collectDevice = Mock(side_effect=t.modeler.clients.append)
+        t.remote = Mock(spec=["callRemote"])
+        t.remote.callRemote.side_effect = (
+            lambda method, names, checkStatus: defer.succeed(
+                [_proxy(name) for name in names]
+            )
+        )
+        t.modeler.config = lambda: t.remote
+
+    def _fill(t):
+        return drive(t.modeler.fillCollectionSlots)
+
+    def _collected(t):
+        return [d.id for d in t.modeler.clients]
+
+    def test_fetches_free_slots_and_prefetch_in_one_batch(t):
+        t._fill()
+
+        t.remote.callRemote.assert_called_once_with(
+            "getDeviceConfig", ["a", "b", "c"], False
+        )
+        t.assertEqual(t._collected(), ["a", "b"])
+        t.assertEqual([d.id for d in t.modeler.prefetched], ["c"])
+
+    def test_free_slot_is_filled_from_prefetched_configs(t):
+        t._fill()
+        t.modeler.clients.pop(0)
+
+        t._fill()
+
+        t.assertEqual(t.remote.callRemote.call_count, 1)
+        t.assertEqual(t._collected(), ["b", "c"])
+        t.assertEqual(len(t.modeler.prefetched), 0)
+
+    def test_prefetched_configs_are_refilled(t):
+        t._fill()
+        t.modeler.clients[:] = []
+
+        t._fill()
+
+        t.remote.callRemote.assert_called_with(
+            "getDeviceConfig", ["d"], False
+        )
+        t.assertEqual(t._collected(), ["c", "d"])
+        t.assertIsNone(t.modeler.devicegen)
+
+    def test_hub_error_requeues_device_names(t):
+        t.remote.callRemote.side_effect = (
+            lambda method, names, checkStatus: defer.fail(
+                RuntimeError("hub down")
+            )
+        )
+        failures = []
+
+        t._fill().addErrback(failures.append)
+
+        t.assertEqual(len(failures), 1)
+        t.assertEqual(t._collected(), [])
+        t.assertFalse(t.modeler.pendingNewClients)
+        t.assertEqual(list(t.modeler.devicegen), ["a", "b", "c", "d"])
+
+    def test_configs_fetched_before_reload_are_discarded(t):
+        pending = defer.Deferred()
+        calls = []
+
+        def callRemote(method, names, checkStatus):
+            calls.append(names)
+            if len(calls) == 1:
+                return pending
+            return defer.succeed([_proxy(name) for name in names])
+
+        t.remote.callRemote.side_effect = callRemote
+        t._fill()
+
+        # The device list is reloaded while the configs are fetched.
+        t.modeler.devicegen = iter(["x"])
+        t.modeler._clearPrefetched()
+        pending.callback([_proxy(name) for name in calls[0]])
+
+        t.assertEqual(calls, [["a", "b", "c"], ["x"]])
+        t.assertEqual(t._collected(), ["x"])
+        t.assertEqual(len(t.modeler.prefetched), 0)
@@ -31,7 +31,8 @@ import sys
 import time
 import traceback
 
-from itertools import chain
+from collections import deque
+from itertools import chain, islice
 from random import randint
 
 import DateTime
@@ -66,6 +67,7 @@ from Products.DataCollector import DeviceProxy, Plugins
 
 defaultPortScanTimeout = 5
 defaultParallel = 1
+defaultPrefetch = 10
 defaultProtocol = "ssh"
 defaultPort = 22
 
@@ -115,6 +117,10 @@ class ZenModeler(PBDaemon):
         self.clients = []
         self.finished = []
         self.devicegen = None
+        # Device configs fetched from zenhub, waiting for a free slot.
+        self.prefetched = deque()
+        # Incremented each time the prefetched configs are discarded.
+        self._prefetchGeneration = 0
         self.configFilter = None
         self.configLoaded = False
 
@@ -965,7 +971,7 @@ class ZenModeler(PBDaemon):
         @param unused: unused (unused)
         @type unused: string
         """
-        if self.pendingNewClients or self.clients:
+        if self.pendingNewClients or self.clients or self.prefetched:
             return
         if self._devicegen_has_items:
             return
@@ -1005,26 +1011,50 @@ class ZenModeler(PBDaemon):
 
     def fillCollectionSlots(self, driver):
         """
-        An iterator which either returns a device to collect or
+        An iterator which fills the free collection slots with devices and
         calls checkStop()
+
+        Device configs are fetched from zenhub in batches large enough to
+        fill the free slots plus the read-ahead window (--prefetch).
+
         @param driver: driver object
         @type driver: driver object
         """
         count = len(self.clients)
-        while (
-            count < self.options.parallel
-            and self._devicegen_has_items
-            and not self.pendingNewClients
-        ):
+        if not self.pendingNewClients:
             self.pendingNewClients = True
             try:
-                device = self.devicegen.next()
-                yield self.config().callRemote(
-                    "getDeviceConfig", [device], self.options.checkStatus
-                )
-                # just collect one device, and let the timer add more
-                devices = driver.next()
-                if devices:
+                while len(self.clients) < self.options.parallel:
+                    if not self.prefetched:
+                        names = self._nextDeviceNames(
+                            self.options.parallel
+                            - len(self.clients)
+                            + self.options.prefetch
+                        )
+                        if not names:
+                            break
+                        generation = self._prefetchGeneration
+                        yield self.config().callRemote(
+                            "getDeviceConfig", names, self.options.checkStatus
+                        )
+                        try:
+                            devices = driver.next()
+                        except Exception:
+                            if generation == self._prefetchGeneration:
+                                self._requeueDeviceNames(names)
+                            raise
+                        if generation != self._prefetchGeneration:
+                            # The device list was reloaded meanwhile and
+                            # it includes these devices again.
+                            self.log.debug(
+                                "Discarded %d device configs fetched for "
+                                "the previous collector loop",
+                                len(devices),
+                            )
+                            continue
+                        self._addPrefetched(names, devices)
+                        continue
+                    d = self.prefetched.popleft()
                     self.processedDevicesCount = self.processedDevicesCount + 1
                     self.log.info(
                         "Filled collection slots for %d of %d devices "
@@ -1034,23 +1064,16 @@ class ZenModeler(PBDaemon):
                         self.collectorLoopIteration,
                     )  # TODO should this message be logged at debug level?
                     self.didCollect = True
-                    d = devices[0]
                     if d.skipModelMsg:
                         self.log.info(d.skipModelMsg)
-                    else:
-                        if self.cyberark:
-                            yield self.cyberark.update_config(d.id, d)
-                            driver.next()
-                            self.log.info("config updated")
-                        self.collectDevice(d)
-                else:
-                    self.log.info("Device %s not returned is it down?", device)
-            except StopIteration:
-                self.log.info("no more devices")
-                self.devicegen = None
+                        continue
+                    if self.cyberark:
+                        yield self.cyberark.update_config(d.id, d)
+                        driver.next()
+                        self.log.info("config updated")
+                    self.collectDevice(d)
             finally:
                 self.pendingNewClients = False
-            break
         update = len(self.clients)
         if update != count and update != 1:
             self.log.info("Running %d clients", update)
@@ -1058,6 +1081,48 @@ class ZenModeler(PBDaemon):
             self.log.debug("Running %d clients", update)
         self.checkStop()
 
+    def _nextDeviceNames(self, count):
+        """
+        Return the names of, at most, the next `count` devices to collect.
+        """
+        if self.devicegen is None:
+            return []
+        names = list(islice(self.devicegen, count))
+        if len(names) < count:
+            self.log.info("no more devices")
+            self.devicegen = None
+        return names
+
+    def _requeueDeviceNames(self, names):
+        """
+        Put back the names of devices whose configs couldn't be fetched,
+        ahead of the devices still to collect.
+        """
+        self.devicegen = chain(names, self.devicegen or ())
+
+    def _clearPrefetched(self):
+        """
+        Discard the prefetched device configs, including the configs of
+        a fetch that is still in progress.
+        """
+        self.prefetched.clear()
+        self._prefetchGeneration += 1
+
+    def _addPrefetched(self, names, devices):
+        """
+        Queue the device configs returned by zenhub for collection.
+        """
+        returned = {d.id for d in devices}
+        for name in names:
+            if name not in returned:
+                self.log.info("Device %s not returned is it down?", name)
+        self.prefetched.extend(devices)
+        self.log.debug(
+            "Fetched %d device configs, %d waiting for a collection slot",
+            len(devices),
+            len(self.prefetched),
+        )
+
     def timeMatches(self):
         """
         Check whether the current time matches a cron-like
@@ -1127,6 +1192,14 @@ class ZenModeler(PBDaemon):
             default=defaultParallel,
             help="Number of devices to collect from in parallel",
         )
+        self.parser.add_option(
+            "--prefetch",
+            dest="prefetch",
+            type="int",
+            default=defaultPrefetch,
+            help="Number of device configs to fetch from zenhub ahead of "
+            "the free collection slots",
+        )
         self.parser.add_option(
             "--cycletime",
             dest="cycletime",
@@ -1376,6 +1449,7 @@ class ZenModeler(PBDaemon):
         self.log.debug("getDeviceList returned %s devices", len(deviceList))
         self.log.debug("getDeviceList returned %s devices", deviceList)
         self.devicegen = iter(deviceList)
+        self._clearPrefetched()
         self.iterationDeviceCount = len(deviceList)
         self.processedDevicesCount = 0
         self.log.info(
@@ -10,12 +10,14 @@
 from __future__ import absolute_import
 
 from .device import DeviceConfigStore, DeviceConfigStoreFactory
+from .local import LocalDeviceConfigCache
 from .oidmap import OidMapStore, OidMapStoreFactory
 
 
 __all__ = (
     "DeviceConfigStore",
     "DeviceConfigStoreFactory",
+    "LocalDeviceConfigCache",
     "OidMapStore",
     "OidMapStoreFactory",
 )
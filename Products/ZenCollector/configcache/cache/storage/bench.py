@@ -0,0 +1,139 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""
+Compare the configcache codecs using the configs stored in Redis.
+
+    python -m Products.ZenCollector.configcache.cache.storage.bench \\
+        [--limit N] [--repeat N]
+
+For each codec, reports the average time to encode and decode a record
+and the average number of bytes a record occupies in Redis.
+"""
+
+from __future__ import absolute_import, print_function, division
+
+import argparse
+import itertools
+import timeit
+
+from Products.ZenUtils.RedisUtils import getRedisClient, getRedisUrl
+
+from .codec import (
+    JellyMarshalCodec,
+    LegacyDeviceConfigCodec,
+    LegacyOidMapCodec,
+    MarshalCodec,
+)
+from .device import DeviceConfigStore
+from .oidmap import OidMapStore
+
+_device_codecs = (
+    ("legacy (json)", LegacyDeviceConfigCodec()),
+    ("v1 (jelly+marshal)", JellyMarshalCodec()),
+)
+
+_oidmap_codecs = (
+    ("legacy (json)", LegacyOidMapCodec()),
+    ("v1 (jelly+marshal)", JellyMarshalCodec()),
+    ("v2 (marshal)", MarshalCodec()),
+)
+
+_header = "{:<20} {:>8} {:>14} {:>14} {:>12}".format(
+    "codec", "records", "encode (ms)", "decode (ms)", "bytes"
+)
+_row = "{:<20} {:>8} {:>14.3f} {:>14.3f} {:>12.0f}"
+
+
+def measure(codec, objects, repeat):
+    """
+    Return the average encode time, decode time, and encoded size of
+    the given objects.  Times are in seconds.
+
+    @rtype: Tuple[float, float, float]
+    """
+    encoded = [codec.encode(obj) for obj in objects]
+    encode_time = min(
+        timeit.repeat(
+            lambda: [codec.encode(obj) for obj in objects],
+            repeat=repeat,
+            number=1,
+        )
+    )
+    decode_time = min(
+        timeit.repeat(
+            lambda: [codec.decode(data) for data in encoded],
+            repeat=repeat,
+            number=1,
+        )
+    )
+    count = len(objects)
+    return (
+        encode_time / count,
+        decode_time / count,
+        sum(len(data) for data in encoded) / count,
+    )
+
+
+def report(title, codecs, objects, repeat):
+    print(title)
+    print(_header)
+    for name, codec in codecs:
+        encode, decode, size = measure(codec, objects, repeat)
+        print(
+            _row.format(
+                name, len(objects), encode * 1000, decode * 1000, size
+            )
+        )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the configcache codecs using stored configs"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=500,
+        help="Maximum number of device configs to use",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of times each measurement is repeated",
+    )
+    args = parser.parse_args()
+
+    client = getRedisClient(url=getRedisUrl())
+
+    devices = DeviceConfigStore(client)
+    configs = [
+        record.config
+        for record in (
+            devices.get(key)
+            for key in itertools.islice(devices.search(), args.limit)
+        )
+        if record is not None
+    ]
+    if configs:
+        report("Device configs", _device_codecs, configs, args.repeat)
+    else:
+        print("No device configs found")
+
+    record = OidMapStore(client).get()
+    if record is not None:
+        report("OID map", _oidmap_codecs, [record.oidmap], args.repeat)
+    else:
+        print("No oidmap found")
+
+
+if __name__ == "__main__":
+    main()
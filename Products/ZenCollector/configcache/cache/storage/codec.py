@@ -0,0 +1,173 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+# Record format
+# =============
+# <version><payload>
+#
+# <version> is one byte identifying the codec that encoded the payload.
+# Records written before codecs were versioned have no version byte;
+# they start with a zlib header ("x") or, if uncompressed, with the "["
+# of a JSON list.  Version values are chosen so they never collide
+# with those bytes.
+#
+# Version 1 -- zlib compressed marshal data of the jellied object.
+# Version 2 -- zlib compressed marshal data of the object itself;
+#              only for objects built from builtin types, e.g. the oidmap.
+
+from __future__ import absolute_import, print_function, division
+
+import ast
+import json
+import marshal
+import zlib
+
+import six
+
+from twisted.spread.jelly import jelly, unjelly
+
+# marshal format version 2 is the newest format supported by Python 2.7.
+_marshal_version = 2
+
+
+class JellyMarshalCodec(object):
+    """Encodes jellied objects using the marshal format."""
+
+    version = b"\x01"
+
+    def encode(self, obj):
+        return self.version + zlib.compress(
+            marshal.dumps(jelly(obj), _marshal_version)
+        )
+
+    def decode(self, data):
+        return unjelly(marshal.loads(zlib.decompress(data[1:])))
+
+
+class MarshalCodec(object):
+    """Encodes objects made of builtin types using the marshal format."""
+
+    version = b"\x02"
+
+    def encode(self, obj):
+        return self.version + zlib.compress(
+            marshal.dumps(obj, _marshal_version)
+        )
+
+    def decode(self, data):
+        return marshal.loads(zlib.decompress(data[1:]))
+
+
+class LegacyDeviceConfigCodec(object):
+    """The unversioned JSON format used for device configs."""
+
+    version = None
+
+    def encode(self, obj):
+        return zlib.compress(json.dumps(jelly(obj)))
+
+    def decode(self, data):
+        # Python2's `unicode` built-in won't accept a unicode string when
+        # the `encoding` parameter is given.  Twisted's `unjelly` function
+        # assumes that a Unicode value is an utf-8-encoded non-unicode
+        # string.  However, by default, all strings from a JSON loader are
+        # Unicode strings, so Twisted's `unjelly` function fails on the
+        # unicode value.
+        #
+        # The fix is add a hook to ensure that all strings are converted
+        # into binary (non-unicode) strings.  However, Twisted's jelly
+        # format is s-expressions, which are basically nested lists, and
+        # there's no JSON hook for lists.  So, wrap the data into a
+        # JSON-object (a dict) and use a function to customize the decoding.
+        try:
+            data = zlib.decompress(data)
+        except zlib.error:
+            pass
+        data = '{{"config":{}}}'.format(data)
+        return unjelly(json.loads(data, object_hook=_decode_config))
+
+
+class LegacyOidMapCodec(object):
+    """The unversioned JSON format used for the oidmap."""
+
+    version = None
+
+    def encode(self, obj):
+        return zlib.compress(json.dumps(jelly(obj)))
+
+    def decode(self, data):
+        return unjelly(ast.literal_eval(zlib.decompress(data)))
+
+
+def _decode_config(data):
+    return _decode_list(data.get("config"))
+
+
+def _decode_list(data):
+    return [_decode_item(item) for item in data]
+
+
+def _decode_item(item):
+    if isinstance(item, six.text_type):
+        return item.encode("utf-8")
+    elif isinstance(item, list):
+        return _decode_list(item)
+    else:
+        return item
+
+
+_versioned = {
+    codec.version: codec for codec in (JellyMarshalCodec(), MarshalCodec())
+}
+
+
+class VersionedCodec(object):
+    """
+    Encodes data with the given codec and decodes data encoded by any
+    codec, including the legacy unversioned format.
+    """
+
+    def __init__(self, codec, legacy):
+        self.__codec = codec
+        self.__legacy = legacy
+
+    @property
+    def codec(self):
+        return self.__codec
+
+    def encode(self, obj):
+        return self.__codec.encode(obj)
+
+    def decode(self, data):
+        codec = _versioned.get(data[:1], self.__legacy)
+        return codec.decode(data)
+
+
+def device_config_codec(codec=None):
+    """
+    Return the codec for device configs.
+
+    @param codec: The codec used to encode configs; defaults to
+        JellyMarshalCodec.
+    """
+    if codec is None:
+        codec = JellyMarshalCodec()
+    return VersionedCodec(codec, LegacyDeviceConfigCodec())
+
+
+def oidmap_codec(codec=None):
+    """
+    Return the codec for the oidmap.
+
+    @param codec: The codec used to encode the oidmap; defaults to
+        MarshalCodec.
+    """
+    if codec is None:
+        codec = MarshalCodec()
+    return VersionedCodec(codec, LegacyOidMapCodec())
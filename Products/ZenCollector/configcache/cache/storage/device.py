@@ -60,20 +60,16 @@
 from __future__ import absolute_import, print_function, division
 
 import inspect
-import json
 import logging
 import re
 import types
-import zlib
 
 from functools import partial
 from itertools import chain
 
 import attr
-import six
 
 from attr.validators import instance_of
-from twisted.spread.jelly import jelly, unjelly
 from zope.component.factory import Factory
 
 from Products.ZenUtils.RedisUtils import getRedisClient, getRedisUrl
@@ -86,6 +82,7 @@ from ..model import (
     KeyConverter,
 )
 from ..table import String, SortedSet
+from .codec import device_config_codec
 
 _app = "configcache"
 log = logging.getLogger("zen.configcache.storage")
@@ -120,9 +117,14 @@ class DeviceConfigStore(object):
         client = getRedisClient(url=getRedisUrl())
         return cls(client)
 
-    def __init__(self, client):
-        """Initialize a ConfigStore instance."""
+    def __init__(self, client, codec=None):
+        """
+        Initialize a ConfigStore instance.
+
+        @param codec: Encodes configs for storage; see the codec module.
+        """
         self.__client = client
+        self.__codec = device_config_codec(codec)
         self.__uids = _StringTable(
             _uid_template.format(app=_app), keytype=_UIDKey
         )
@@ -189,33 +191,40 @@ class DeviceConfigStore(object):
             raise TypeError("'{!r} is not a DeviceQuery".format(query))
         return self._query(**attr.asdict(query))
 
-    def add(self, record):
+    def add(self, *records):
         """
-        @type record: DeviceRecord
+        @type records: Sequence[DeviceRecord]
         """
-        self._add(record, self._delete_statuses)
+        self._add(records, self._delete_statuses)
 
-    def put_config(self, record):
+    def put_config(self, *records):
         """
-        Updates the config without changing its status.
+        Updates the config(s) without changing their status.
 
-        @type record: DeviceRecord
+        @type records: Sequence[DeviceRecord]
         """
-        self._add(record)
+        self._add(records)
 
-    def _add(self, record, statushandler=lambda *args: None):
-        svc, mon, dvc, uid, updated, config = _from_record(record)
+    def _add(self, records, statushandler=lambda *args: None):
+        if len(records) == 0:
+            return
+        rows = tuple(_from_record(record, self.__codec) for record in records)
         orphaned_keys = tuple(
             key
+            for svc, mon, dvc, _, _, _ in rows
             for key in self._query(service=svc, device=dvc)
             if key.monitor != mon
         )
-        watch_keys = self._get_watch_keys(orphaned_keys + (record.key,))
-        stored_uid = self.__uids.get(self.__client, _UIDKey(dvc))
+        watch_keys = self._get_watch_keys(
+            orphaned_keys + tuple(record.key for record in records)
+        )
+        stored_uids = dict(
+            self.get_uids(*{record.device for record in records})
+        )
 
         def _add_impl(pipe):
             pipe.multi()
-            # Remove configs for this device that exist with a different
+            # Remove configs for these devices that exist with a different
             # monitor.
             # Note: configs produced by different configuration services
             # may exist simultaneously.
@@ -223,11 +232,14 @@ class DeviceConfigStore(object):
                 self.__config.delete(pipe, key)
                 self.__age.delete(pipe, key, key.device)
                 self._delete_statuses(pipe, key)
-            if stored_uid != uid:
-                self.__uids.set(pipe, _UIDKey(record.key.device), uid)
-            self.__config.set(pipe, record.key, config)
-            self.__age.add(pipe, record.key, dvc, updated)
-            statushandler(pipe, record.key)
+            for record, (_, _, dvc, uid, updated, config) in zip(
+                records, rows
+            ):
+                if stored_uids.get(dvc) != uid:
+                    self.__uids.set(pipe, _UIDKey(dvc), uid)
+                self.__config.set(pipe, record.key, config)
+                self.__age.add(pipe, record.key, dvc, updated)
+                statushandler(pipe, record.key)
 
         self.__client.transaction(_add_impl, *watch_keys)
 
@@ -264,10 +276,15 @@ class DeviceConfigStore(object):
         """
         Return the timestamp of when the config was built.
 
+        None is returned if no config exists for the key.
+
         @type key: DeviceKey
-        @rtype: float
+        @rtype: float | None
         """
-        return _to_ts(self.__age.score(self.__client, key, key.device))
+        score = self.__age.score(self.__client, key, key.device)
+        if score is None:
+            return None
+        return _to_ts(score)
 
     def query_updated(self, query=None):
         """
@@ -300,7 +317,13 @@ class DeviceConfigStore(object):
             return default
         score = 0 if score < 0 else score
         return _to_record(
-            key.service, key.monitor, key.device, uid, score, conf
+            key.service,
+            key.monitor,
+            key.device,
+            uid,
+            score,
+            conf,
+            self.__codec,
         )
 
     def remove(self, *keys):
@@ -475,6 +498,34 @@ class DeviceConfigStore(object):
             return None
         return self._get_status_from_scores(scores, key)
 
+    def get_statuses(self, *keys):
+        """
+        Returns the current status of each of the configs identified by
+        `keys` using one round trip to Redis.
+
+        The return value is an iterator producing two element tuples:
+
+            (<key>, <status or None>)
+
+        @type keys: Sequence[DeviceKey]
+        @rtype: Iterator[Tuple[DeviceKey, ConfigStatus | None]]
+        """
+        if len(keys) == 0:
+            return iter(())
+        with self.__client.pipeline() as pipe:
+            for key in keys:
+                self._queue_scores(pipe, key)
+            results = pipe.execute()
+        return (
+            (
+                key,
+                self._get_status_from_scores(results[n : n + 5], key)
+                if any(results[n : n + 5])
+                else None,
+            )
+            for key, n in zip(keys, range(0, len(results), 5))
+        )
+
     def query_statuses(self, query=None):
         """
         Return all status objects matching the query.
@@ -629,15 +680,17 @@ class DeviceConfigStore(object):
             yield ConfigStatus.Current(key, age)
 
     def _get_scores(self, key):
-        service, monitor, device = attr.astuple(key)
         with self.__client.pipeline() as pipe:
-            self.__age.score(pipe, key, key.device)
-            self.__retired.score(pipe, key, key.device)
-            self.__expired.score(pipe, key, key.device)
-            self.__pending.score(pipe, key, key.device)
-            self.__building.score(pipe, key, key.device)
+            self._queue_scores(pipe, key)
             return pipe.execute()
 
+    def _queue_scores(self, pipe, key):
+        self.__age.score(pipe, key, key.device)
+        self.__retired.score(pipe, key, key.device)
+        self.__expired.score(pipe, key, key.device)
+        self.__pending.score(pipe, key, key.device)
+        self.__building.score(pipe, key, key.device)
+
 
 def _range(client, table, query, minv=None, maxv=None):
     pattern = table.to_rawkey(query)
@@ -649,47 +702,6 @@ def _range(client, table, query, minv=None, maxv=None):
     )
 
 
-def _deserialize(data):
-    # Python2's `unicode` built-in won't accept a unicode string when the
-    # `encoding` parameter is given.  Twisted's `unjelly` function assumes
-    # that a Unicode value is an utf-8-encoded non-unicode string.  However,
-    # by default, all strings from a JSON loader are Unicode strings, so
-    # Twisted's `unjelly` function fails on the unicode value.
-    #
-    # The fix is add a hook to ensure that all strings are converted into
-    # binary (non-unicode) strings.  However, Twisted's jelly format is
-    # s-expressions, which are basically nested lists, and there's no JSON
-    # hook for lists.  So, wrap the data into a JSON-object (a dict) and
-    # use a function to customize the decoding.
-    try:
-        data = zlib.decompress(data)
-    except zlib.error:
-        pass
-    data = '{{"config":{}}}'.format(data)
-    return unjelly(json.loads(data, object_hook=_decode_config))
-
-
-def _decode_config(data):
-    return _decode_list(data.get("config"))
-
-
-def _decode_list(data):
-    return [_decode_item(item) for item in data]
-
-
-def _decode_item(item):
-    if isinstance(item, six.text_type):
-        return item.encode("utf-8")
-    elif isinstance(item, list):
-        return _decode_list(item)
-    else:
-        return item
-
-
-def _serialize(config):
-    return zlib.compress(json.dumps(jelly(config)))
-
-
 def _to_score(ts):
     return ts * 1000.0
 
@@ -698,21 +710,21 @@ def _to_ts(score):
     return score / 1000.0
 
 
-def _to_record(svc, mon, dvc, uid, updated, config):
+def _to_record(svc, mon, dvc, uid, updated, config, codec):
     key = DeviceKey(svc, mon, dvc)
     updated = _to_ts(updated)
-    config = _deserialize(config)
+    config = codec.decode(config)
     return DeviceRecord(key, uid, updated, config)
 
 
-def _from_record(record):
+def _from_record(record, codec):
     return (
         record.service,
         record.monitor,
         record.device,
         record.uid,
         _to_score(record.updated),
-        _serialize(record.config),
+        codec.encode(record.config),
     )
 
 
@@ -0,0 +1,234 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import, print_function, division
+
+import logging
+import sys
+import types
+
+from collections import OrderedDict
+
+from metrology import Metrology
+from metrology.instruments import Gauge
+
+log = logging.getLogger("zen.configcache.storage.local")
+
+# Default limit of the number of configs kept in memory.
+DEFAULT_MAX_ENTRIES = 1000
+
+# Default limit, in bytes, of the estimated memory used by the configs
+# kept in memory.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Objects whose size isn't part of the configs referencing them.
+_SHARED_TYPES = (
+    type,
+    types.ClassType,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+)
+
+
+def estimate_size(obj):
+    """
+    Return an estimate of the number of bytes of memory used by obj and
+    the objects it references.
+
+    Containers and the attributes of instances are followed; objects
+    referenced several times are counted once.
+    """
+    seen = set()
+    pending = [obj]
+    size = 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item, 0)
+        if isinstance(item, dict):
+            pending.extend(item.iterkeys())
+            pending.extend(item.itervalues())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        else:
+            attributes = getattr(item, "__dict__", None)
+            if isinstance(attributes, dict):
+                pending.append(attributes)
+    return size
+
+
+class _Entry(object):
+    __slots__ = ("record", "updated", "size")
+
+    def __init__(self, record, updated, size):
+        self.record = record
+        self.updated = updated
+        self.size = size
+
+
+class LocalDeviceConfigCache(object):
+    """
+    An in-process LRU cache in front of a DeviceConfigStore.
+
+    Only the 'get' method reads from the cache; every other method is
+    passed through to the store.  A cached config is returned only if
+    the store's 'updated' timestamp for the config hasn't changed since
+    the config was cached, so configs that were rebuilt or removed are
+    never served from memory.  That check still reads from the store;
+    the cache saves fetching and decoding the config.
+
+    The cache is bounded by the number of configs it holds and by the
+    memory they use, as estimated by estimate_size when a config is
+    cached.
+    """
+
+    def __init__(
+        self,
+        store,
+        maxentries=DEFAULT_MAX_ENTRIES,
+        maxbytes=DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize a LocalDeviceConfigCache instance.
+
+        @param store: The store to read configs from.
+        @type store: DeviceConfigStore
+        @param maxentries: Maximum number of cached configs.
+        @type maxentries: int
+        @param maxbytes: Maximum estimated memory used by the cached
+            configs.
+        @type maxbytes: int
+        """
+        self.__store = store
+        self.__maxentries = maxentries
+        self.__maxbytes = maxbytes
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def store(self):
+        return self.__store
+
+    @property
+    def ratio(self):
+        """Return the ratio of gets served from the cache."""
+        total = self.hits + self.misses
+        return (self.hits / total) if total else 0.0
+
+    @property
+    def entries(self):
+        """Return the number of cached configs."""
+        return len(self.__entries)
+
+    @property
+    def nbytes(self):
+        """Return the estimated memory used by the cached configs."""
+        return self.__bytes
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__store
+
+    def __iter__(self):
+        return iter(self.__store)
+
+    def __getattr__(self, name):
+        return getattr(self.__store, name)
+
+    def get(self, key, default=None):
+        """
+        @type key: DeviceKey
+        @rtype: DeviceRecord
+        """
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            updated = self.__store.get_updated(key)
+            if updated is not None and entry.updated == updated:
+                # Re-insert the entry to make it the most recently used.
+                self.__entries[key] = entry
+                self.hits += 1
+                return entry.record
+            self.__bytes -= entry.size
+            if updated is None:
+                self.misses += 1
+                return default
+        self.misses += 1
+        # The record's timestamp is read together with the config, so a
+        # config rebuilt meanwhile fails validation on its next use.
+        record = self.__store.get(key)
+        if record is None:
+            return default
+        size = estimate_size(record.config)
+        if size <= self.__maxbytes:
+            self.__entries[key] = _Entry(record, record.updated, size)
+            self.__bytes += size
+            self.__evict()
+        return record
+
+    def invalidate(self, *keys):
+        """Remove the given keys from the cache."""
+        for key in keys:
+            entry = self.__entries.pop(key, None)
+            if entry is not None:
+                self.__bytes -= entry.size
+
+    def clear(self):
+        self.__entries.clear()
+        self.__bytes = 0
+
+    def __evict(self):
+        while (
+            len(self.__entries) > self.__maxentries
+            or self.__bytes > self.__maxbytes
+        ):
+            key, entry = self.__entries.popitem(last=False)
+            self.__bytes -= entry.size
+            self.evictions += 1
+            log.debug(
+                "evicted config  service=%s collector=%s device=%s",
+                key.service,
+                key.monitor,
+                key.device,
+            )
+
+
+class LocalCacheGauge(Gauge):
+    """Samples an attribute of a LocalDeviceConfigCache."""
+
+    def __init__(self, cache, name):
+        self.__cache = cache
+        self.__name = name
+
+    @property
+    def value(self):
+        return getattr(self.__cache, self.__name)
+
+
+def register_metrics(cache, prefix="configcache.localcache"):
+    """Publish the cache's statistics as Metrology gauges."""
+    for attribute, metric in (
+        ("hits", "hits"),
+        ("misses", "misses"),
+        ("evictions", "evictions"),
+        ("ratio", "hitRatio"),
+        ("entries", "entries"),
+        ("nbytes", "bytes"),
+    ):
+        Metrology.gauge(
+            "{}.{}".format(prefix, metric), LocalCacheGauge(cache, attribute)
+        )
@@ -10,6 +10,15 @@
 # Key structure
 # =============
 # configcache:oidmap:config <config>
+# configcache:oidmap:version <version>
+# configcache:oidmap:changes {
+#     <version>: <changes>,
+#     ...
+# }
+# configcache:oidmap:checksums {
+#     <version>: <checksum>,
+#     ...
+# }
 # configcache:oidmap:state {
 #     "checksum": ...,
 #     "created": ...,
@@ -18,6 +27,12 @@
 # }
 #
 # * config - the oid map.
+# * version - incremented whenever the oid map changes.
+# * changes - the OIDs added and removed by each of the most recent
+#   versions, i.e. the changes from <version> - 1 to <version>.
+# * checksums - the checksums of the oid maps of the most recent versions;
+#   changes are applied only to the oid map having the checksum of its
+#   version.
 # * hash - the hash of the current oid map
 # * created - timestamp of when the oid map was created
 # * status - identifies the oid map's status (expired, pending, building)
@@ -30,18 +45,15 @@
 
 from __future__ import absolute_import, print_function, division
 
-import ast
-import json
 import logging
-import zlib
 
-from twisted.spread.jelly import jelly, unjelly
 from zope.component.factory import Factory
 
 from Products.ZenUtils.RedisUtils import getRedisClient, getRedisUrl
 
 from ..model import CacheKey, ConfigStatus, OidMapRecord
 from ..table import Hash, String
+from .codec import oidmap_codec
 
 _app = "configcache"
 log = logging.getLogger("zen.configcache.storage.oidmap")
@@ -61,8 +73,17 @@ class OidMapStoreFactory(Factory):
 
 
 _template_oidmap = "{app}:oidmap:config"
+_template_version = "{app}:oidmap:version"
+_template_changes = "{app}:oidmap:changes"
+_template_checksums = "{app}:oidmap:checksums"
 _template_state = "{app}:oidmap:state"
 
+# The number of versions for which changes are kept.
+_default_max_versions = 20
+
+# Changes involving more OIDs than this are not returned by get_changes.
+_default_max_changes = 10000
+
 _status_map = {
     cls.__name__: cls
     for cls in (
@@ -91,11 +112,33 @@ class OidMapStore(object):
         client = getRedisClient(url=getRedisUrl())
         return cls(client)
 
-    def __init__(self, client):
-        """Initialize a OidMapStore instance."""
+    def __init__(
+        self,
+        client,
+        codec=None,
+        max_versions=_default_max_versions,
+        max_changes=_default_max_changes,
+    ):
+        """
+        Initialize a OidMapStore instance.
+
+        @param codec: Encodes the oidmap for storage; see the codec module.
+        @param max_versions: The number of versions for which the changes
+            to the oidmap are kept.
+        @param max_changes: The largest number of added and removed OIDs
+            returned by get_changes.
+        """
         self.__client = client
+        self.__codec = oidmap_codec(codec)
+        self.__max_versions = max_versions
+        self.__max_changes = max_changes
         self.__oidmap_key = _template_oidmap.format(app=_app)
         self.__oids = String()
+        self.__version_key = _template_version.format(app=_app)
+        self.__changes_key = _template_changes.format(app=_app)
+        self.__changes = Hash()
+        self.__checksums_key = _template_checksums.format(app=_app)
+        self.__checksums = Hash()
         self.__state_key = _template_state.format(app=_app)
         self.__state = Hash()
 
@@ -103,11 +146,95 @@ class OidMapStore(object):
         return self.__client.exists(self.__oidmap_key)
 
     def remove(self):
+        # The version is kept so that versions keep increasing if the
+        # oidmap is added again.
         with self.__client.pipeline() as pipe:
             self.__oids.delete(pipe, self.__oidmap_key)
+            self.__changes.delete(pipe, self.__changes_key)
+            self.__checksums.delete(pipe, self.__checksums_key)
             self.__state.delete(pipe, self.__state_key)
             pipe.execute()
 
+    def get_version(self):
+        """
+        Returns the version of the oidmap or None if there's no oidmap.
+
+        An oidmap stored before versioning was introduced has version 0.
+
+        @rtype: int | None
+        """
+        exists, version, _ = self._get_version_state()
+        return version if exists else None
+
+    def get_changes(self, version, checksum):
+        """
+        Returns the changes needed to update the oidmap having the given
+        version and checksum to the current version.
+
+        The return value is a tuple of four elements:
+
+            (<version>, <checksum>, {<oid>: <name>, ...}, [<oid>, ...])
+
+        The first two elements are the version and checksum of the current
+        oidmap.  The third element contains the added or renamed OIDs and
+        the fourth element contains the removed OIDs.
+
+        None is returned if the changes are no longer available, if
+        `checksum` isn't the checksum of the oidmap having the given
+        version, or if more OIDs changed than the store's max_changes
+        limit.  In that case, the whole oidmap should be retrieved using
+        the get method.
+
+        @type version: int
+        @type checksum: str
+        @rtype: Tuple[int, str, Dict[str, str], List[str]] | None
+        """
+        exists, current, stored_checksum = self._get_version_state()
+        if not exists or version > current:
+            return None
+        if version == current:
+            if checksum != stored_checksum:
+                return None
+            return (current, stored_checksum, {}, [])
+        versions = range(version + 1, current + 1)
+        if len(versions) > self.__max_versions:
+            return None
+        # The same version number may identify different oidmaps, e.g.
+        # when the oidmap was removed and built again.
+        version_checksum = self.__checksums.getfield(
+            self.__client, self.__checksums_key, version
+        )
+        if version_checksum is None or version_checksum != checksum:
+            return None
+        changes = self.__changes.getfields(
+            self.__client, self.__changes_key, *versions
+        )
+        added = {}
+        removed = set()
+        for data in changes:
+            if data is None:
+                return None
+            additions, removals = self.__codec.decode(data)
+            for oid in removals:
+                added.pop(oid, None)
+                removed.add(oid)
+            for oid, name in additions.iteritems():
+                added[oid] = name
+                removed.discard(oid)
+            if len(added) + len(removed) > self.__max_changes:
+                return None
+        return (current, stored_checksum, added, sorted(removed))
+
+    def _get_version_state(self):
+        # The pipeline is a transaction, so the version and checksum
+        # are for the same oidmap.
+        with self.__client.pipeline() as pipe:
+            pipe.exists(self.__oidmap_key)
+            self.__oids.get(pipe, self.__version_key)
+            self.__state.getfield(pipe, self.__state_key, _FieldNames.checksum)
+            exists, version, checksum = pipe.execute()
+        return bool(exists), int(version or 0), checksum
+
     def get_checksum(self):
         return self.__state.getfield(
             self.__client, self.__state_key, _FieldNames.checksum
@@ -148,6 +275,7 @@ class OidMapStore(object):
             state.get(_FieldNames.created),
             state.get(_FieldNames.checksum),
             oids,
+            self.__codec,
         )
 
     def add(self, record):
@@ -167,10 +295,24 @@ class OidMapStore(object):
         self._add(record)
 
     def _add(self, record, statushandler=lambda *args, **kw: None):
-        created, checksum, oidmap = _from_record(record)
-        watch_keys = (self.__oidmap_key, self.__state_key)
+        created, checksum, oidmap = _from_record(record, self.__codec)
+        watch_keys = (
+            self.__oidmap_key,
+            self.__version_key,
+            self.__changes_key,
+            self.__checksums_key,
+            self.__state_key,
+        )
 
         def _add_impl(pipe):
+            # In WATCH mode, these commands are executed immediately.
+            stored_checksum = self.__state.getfield(
+                pipe, self.__state_key, _FieldNames.checksum
+            )
+            changed = stored_checksum is None or stored_checksum != checksum
+            if changed:
+                changes = self._get_changes_from(pipe, record.oidmap)
+                version = int(self.__oids.get(pipe, self.__version_key) or 0)
             pipe.multi()
             self.__oids.set(pipe, self.__oidmap_key, oidmap)
             self.__state.set(
@@ -178,10 +320,47 @@ class OidMapStore(object):
                 self.__state_key,
                 {_FieldNames.checksum: checksum, _FieldNames.created: created},
             )
+            if changed:
+                self._add_version(pipe, version + 1, checksum, changes)
             statushandler(pipe)
 
         self.__client.transaction(_add_impl, *watch_keys)
 
+    def _get_changes_from(self, pipe, oidmap):
+        # Returns the encoded changes from the stored oidmap to `oidmap`,
+        # or None if there's no stored oidmap.
+        stored = self.__oids.get(pipe, self.__oidmap_key)
+        if stored is None:
+            return None
+        stored = self.__codec.decode(stored)
+        added = {
+            oid: name
+            for oid, name in oidmap.iteritems()
+            if stored.get(oid) != name
+        }
+        removed = [oid for oid in stored if oid not in oidmap]
+        return self.__codec.encode((added, removed))
+
+    def _add_version(self, pipe, version, checksum, changes):
+        self.__oids.set(pipe, self.__version_key, version)
+        if changes is None:
+            # Without the changes to this version, older versions
+            # can't be updated.
+            self.__changes.delete(pipe, self.__changes_key)
+            self.__checksums.delete(pipe, self.__checksums_key)
+        else:
+            self.__changes.set(pipe, self.__changes_key, {version: changes})
+        self.__checksums.set(pipe, self.__checksums_key, {version: checksum})
+        expired = version - self.__max_versions
+        if expired > 0:
+            self.__changes.deletefields(pipe, self.__changes_key, expired)
+        # The checksum of the oldest version having all its changes
+        # to the current version is kept.
+        if expired > 1:
+            self.__checksums.deletefields(
+                pipe, self.__checksums_key, expired - 1
+            )
+
     def _delete_status(self, client):
         self.__state.deletefields(
             client, self.__state_key, _FieldNames.status, _FieldNames.effective
@@ -228,23 +407,15 @@ class OidMapStore(object):
         self.__client.transaction(_impl, *watch_keys)
 
 
-def _deserialize(data):
-    return unjelly(ast.literal_eval(zlib.decompress(data)))
-
-
-def _serialize(oidmap):
-    return zlib.compress(json.dumps(jelly(oidmap)))
-
-
-def _to_record(created, checksum, oidmap):
+def _to_record(created, checksum, oidmap, codec):
     created = float(created)
-    oidmap = _deserialize(oidmap)
+    oidmap = codec.decode(oidmap)
     return OidMapRecord(created, checksum, oidmap)
 
 
-def _from_record(record):
+def _from_record(record, codec):
     return (
         record.created,
         record.checksum,
-        _serialize(record.oidmap),
+        codec.encode(record.oidmap),
     )
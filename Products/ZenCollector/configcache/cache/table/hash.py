@@ -51,6 +51,15 @@ class Hash(object):
         """
         return client.hget(key, field)
 
+    def getfields(self, client, key, *fields):
+        """
+        Returns the values of the `fields` stored in the key, in the same
+        order as `fields`.  None is returned for a field that isn't found.
+
+        @rtype: List[str | None]
+        """
+        return client.hmget(key, fields)
+
     def set(self, client, key, mapping):
         """
         Use `mapping` to set or replace fields found in the key.
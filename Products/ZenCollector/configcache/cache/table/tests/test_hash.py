@@ -79,6 +79,14 @@ class TestHashTable(TestCase):
         t.assertEqual(mapping["f1"], f1)
         t.assertEqual(str(mapping["f2"]), f2)
 
+    def test_getfields(t):
+        mapping = {"f1": "cookie", "f2": 2343.2}
+        t.table.set(t.layer.redis, t.key, mapping)
+
+        fields = t.table.getfields(t.layer.redis, t.key, "f2", "f3", "f1")
+
+        t.assertEqual([str(mapping["f2"]), None, mapping["f1"]], fields)
+
     def test_delete_data(t):
         mapping = {"f1": "cookie", "f2": 2343.2}
         t.table.set(t.layer.redis, t.key, mapping)
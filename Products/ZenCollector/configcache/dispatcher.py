@@ -9,25 +9,36 @@
 
 from __future__ import absolute_import
 
-from .tasks import build_device_config, build_oidmap
+from collections import defaultdict
+
+from .tasks import build_device_config, build_device_configs, build_oidmap
+
+# The time limit of a batch is at most this many times the largest build
+# timeout of its devices.
+BATCH_TIMEOUT_FACTOR = 2
 
 
 class DeviceConfigTaskDispatcher(object):
     """Encapsulates the act of dispatching the build_device_config task."""
 
-    def __init__(self, configClasses):
+    def __init__(self, configClasses, batchsize=1):
         """
         Initialize a DeviceConfigTaskDispatcher instance.
 
         The `configClasses` parameter should be the classes used to create
         the device configurations.
 
+        The `batchsize` parameter is the maximum number of devices
+        `dispatch_many` submits to one build_device_configs task.
+
         @type configClasses: Sequence[Class]
+        @type batchsize: int
         """
         self._classnames = {
             cls.__module__: ".".join((cls.__module__, cls.__name__))
             for cls in configClasses
         }
+        self._batchsize = max(1, batchsize)
 
     @property
     def service_names(self):
@@ -66,6 +77,58 @@ class DeviceConfigTaskDispatcher(object):
             time_limit=hard_limit,
         )
 
+    def dispatch_many(self, builds):
+        """
+        Submit tasks to build the configurations of many devices.
+
+        Builds for the same service and monitor are grouped into
+        build_device_configs tasks of up to `batchsize` devices.  The time
+        limits of such a task are the sum of its devices' timeouts, but no
+        more than BATCH_TIMEOUT_FACTOR times the largest of them, so that
+        a hung build doesn't hold a worker for the whole batch's time.
+        The devices not built before the limit remain pending and are
+        submitted again when their pending timeout expires.
+
+        @param builds: (servicename, monitorid, deviceid, timeout, submitted)
+        @type builds: Iterable[Tuple[str, str, str, float, float]]
+        """
+        groups = defaultdict(list)
+        for servicename, monitorid, deviceid, timeout, submitted in builds:
+            name = self._classnames.get(servicename)
+            if name is None:
+                raise ValueError("service name '%s' not found" % servicename)
+            groups[(name, monitorid)].append((deviceid, timeout, submitted))
+
+        for (name, monitorid), devices in groups.iteritems():
+            for n in range(0, len(devices), self._batchsize):
+                batch = devices[n : n + self._batchsize]
+                if len(batch) == 1:
+                    deviceid, timeout, submitted = batch[0]
+                    soft_limit, hard_limit = _get_limits(timeout)
+                    build_device_config.apply_async(
+                        args=(monitorid, deviceid, name),
+                        kwargs={"submitted": submitted},
+                        soft_time_limit=soft_limit,
+                        time_limit=hard_limit,
+                    )
+                    continue
+                timeouts = [timeout for _, timeout, _ in batch]
+                soft_limit, hard_limit = _get_limits(
+                    min(sum(timeouts), max(timeouts) * BATCH_TIMEOUT_FACTOR)
+                )
+                build_device_configs.apply_async(
+                    args=(
+                        monitorid,
+                        name,
+                        [
+                            (deviceid, submitted)
+                            for deviceid, _, submitted in batch
+                        ],
+                    ),
+                    soft_time_limit=soft_limit,
+                    time_limit=hard_limit,
+                )
+
 
 class OidMapTaskDispatcher(object):
     """Encapsulates the act of dispatching the build_oidmap_config task."""
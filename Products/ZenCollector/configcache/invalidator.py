@@ -12,6 +12,7 @@ from __future__ import print_function, absolute_import
 import logging
 import time
 
+from contextlib import contextmanager
 from multiprocessing import Process
 
 from metrology.instruments import Gauge, HistogramExponentiallyDecaying
@@ -222,32 +223,48 @@ def _synchronize_deviceconfig_cache(log, dmd, dispatcher):
     store = createObject(
         "deviceconfigcache-store", getRedisClient(url=getRedisUrl())
     )
-    tool = IModelCatalogTool(dmd)
-    catalog_results = tool.cursor_search(
-        types=("Products.ZenModel.Device.Device",),
-        limit=constants.DEFAULT_SEARCH_LIMIT,
-        fields=_deviceconfig_solr_fields,
-    ).results
-    devices = {
-        (brain.id, brain.collector): brain.uid
-        for brain in catalog_results
-        if brain.collector is not None
-    }
-    _removeDeleted(log, store, devices)
-    _addNewOrChangedDevices(log, store, dispatcher, dmd, devices)
-
-
-def _removeDeleted(log, store, devices):
+    with _phase(log, "catalog search"):
+        tool = IModelCatalogTool(dmd)
+        catalog_results = tool.cursor_search(
+            types=("Products.ZenModel.Device.Device",),
+            limit=constants.DEFAULT_SEARCH_LIMIT,
+            fields=_deviceconfig_solr_fields,
+        ).results
+        devices = {
+            (brain.id, brain.collector): brain.uid
+            for brain in catalog_results
+            if brain.collector is not None
+        }
+    with _phase(log, "store scan"):
+        keys = tuple(store.search())
+    with _phase(log, "remove deleted"):
+        _removeDeleted(log, store, devices, keys)
+    with _phase(log, "add new or changed"):
+        _addNewOrChangedDevices(log, store, dispatcher, dmd, devices, keys)
+
+
+@contextmanager
+def _phase(log, name):
+    started = time.time()
+    yield
+    log.info(
+        "finished synchronization phase  phase=%s elapsed=%.3fs",
+        name,
+        time.time() - started,
+    )
+
+
+def _removeDeleted(log, store, devices, keys):
     """
     Remove deleted devices from the cache.
 
     @param devices: devices that currently exist
     @type devices: Mapping[Sequence[str, str], str]
+    @param keys: keys of the configs in the store
+    @type keys: Sequence[DeviceKey]
     """
     devices_not_found = tuple(
-        key
-        for key in store.search()
-        if (key.device, key.monitor) not in devices
+        key for key in keys if (key.device, key.monitor) not in devices
     )
     if devices_not_found:
         RemoveConfigsHandler(log, store)(devices_not_found)
@@ -255,14 +272,29 @@ def _removeDeleted(log, store, devices):
         log.info("no dangling configurations found")
 
 
-def _addNewOrChangedDevices(log, store, dispatcher, dmd, devices):
-    # Add new devices to the config and metadata store.
-    # Also look for device that have changed their device class.
-    # Query the catalog for all devices
+def _addNewOrChangedDevices(log, store, dispatcher, dmd, devices, keys):
+    """
+    Submit build jobs for devices that have no configs or that have
+    changed their device class.
+
+    Only those devices are loaded from ZODB.
+
+    @param devices: devices that currently exist
+    @type devices: Mapping[Sequence[str, str], str]
+    @param keys: keys of the configs in the store
+    @type keys: Sequence[DeviceKey]
+    """
+    with _phase(log, "diff"):
+        new, changed = _findNewOrChangedDevices(store, devices, keys)
+    log.info(
+        "found devices needing configurations  new=%d changed=%d",
+        len(new),
+        len(changed),
+    )
     new_devices = 0
     changed_devices = 0
     handle = NewDeviceHandler(log, store, dispatcher)
-    for (deviceId, monitorId), uid in devices.iteritems():
+    for (deviceId, monitorId), uid, stored_uid in new + changed:
         try:
             device = dmd.unrestrictedTraverse(uid)
         except Exception as ex:
@@ -274,25 +306,50 @@ def _addNewOrChangedDevices(log, store, dispatcher, dmd, devices):
             )
             continue
         timeout = DeviceProperties(device).build_timeout
-        keys_with_configs = tuple(
-            store.search(DeviceQuery(monitor=monitorId, device=deviceId))
-        )
-        uid = device.getPrimaryId()
-        if not keys_with_configs:
+        if stored_uid is _no_config:
             handle(deviceId, monitorId, timeout)
             new_devices += 1
-        else:
-            current_uid = store.get_uid(deviceId)
-            # A device with a changed device class will have a different uid.
-            if current_uid != uid:
-                handle(deviceId, monitorId, timeout, False)
-                changed_devices += 1
+        # A device with a changed device class will have a different uid.
+        elif stored_uid != device.getPrimaryId():
+            handle(deviceId, monitorId, timeout, False)
+            changed_devices += 1
     if new_devices == 0:
         log.info("no missing configurations found")
     if changed_devices == 0:
         log.info("no devices with a different device class found")
 
 
+_no_config = object()
+
+
+def _findNewOrChangedDevices(store, devices, keys):
+    """
+    Returns the devices having no configs and the devices whose uid
+    differs from the uid in the store.
+
+    Each device is returned as ((device-id, monitor-id), uid, stored-uid)
+    where stored-uid is _no_config for devices having no configs.
+
+    @rtype: Tuple[List[Tuple], List[Tuple]]
+    """
+    configured = {(key.device, key.monitor) for key in keys}
+    stored_uids = dict(
+        store.get_uids(
+            *{deviceId for deviceId, _ in configured.intersection(devices)}
+        )
+    )
+    new = []
+    changed = []
+    for device, uid in devices.iteritems():
+        if device not in configured:
+            new.append((device, uid, _no_config))
+        else:
+            stored_uid = stored_uids.get(device[0])
+            if stored_uid != uid:
+                changed.append((device, uid, stored_uid))
+    return new, changed
+
+
 class _InvalidationProcessor(object):
     def __init__(self, log, stores, dispatchers):
         self.log = log
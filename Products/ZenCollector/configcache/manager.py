@@ -33,6 +33,7 @@ from .propertymap import DevicePropertyMap
 from .utils import getDeviceConfigServices, OidMapProperties
 
 _default_interval = 30.0  # seconds
+_default_batch_size = 25
 
 
 class Manager(object):
@@ -59,6 +60,13 @@ class Manager(object):
             type=float,
             help="Config checking interval (in seconds)",
         )
+        subp_run.add_argument(
+            "--build-batch-size",
+            default=_default_batch_size,
+            type=int,
+            help="Maximum number of devices whose configs are rebuilt "
+            "by one job; 1 submits one job per device and service",
+        )
         subp_run.set_defaults(
             factory=Application.from_args,
             parser=subp_run,
@@ -82,7 +90,10 @@ class Manager(object):
             "Dispatchers",
             (object,),
             {
-                "device": DeviceConfigTaskDispatcher(configClasses),
+                "device": DeviceConfigTaskDispatcher(
+                    configClasses,
+                    batchsize=config["build-batch-size"],
+                ),
                 "oidmap": OidMapTaskDispatcher(),
             },
         )()
@@ -296,19 +307,31 @@ class Manager(object):
         buildlimitmap = DevicePropertyMap.make_build_timeout_map(
             self.ctx.dmd.Devices
         )
-        count = 0
-        for status in statuses:
-            uid = self.stores.device.get_uid(status.key.device)
-            timeout = buildlimitmap.get(uid)
-            now = time()
-            self.stores.device.set_pending((status.key, now))
-            self.dispatchers.device.dispatch(
+        now = time()
+        uids = dict(
+            self.stores.device.get_uids(
+                *{status.key.device for status in statuses}
+            )
+        )
+        timeouts = [
+            buildlimitmap.get(uids.get(status.key.device))
+            for status in statuses
+        ]
+        self.stores.device.set_pending(
+            *((status.key, now) for status in statuses)
+        )
+        self.dispatchers.device.dispatch_many(
+            (
                 status.key.service,
                 status.key.monitor,
                 status.key.device,
                 timeout,
                 now,
             )
+            for status, timeout in zip(statuses, timeouts)
+        )
+        count = 0
+        for status, timeout in zip(statuses, timeouts):
             if isinstance(status, ConfigStatus.Expired):
                 self.log.info(
                     "submitted job to rebuild expired config  "
@@ -7,7 +7,7 @@
 #
 ##############################################################################
 
-from .deviceconfig import build_device_config
+from .deviceconfig import build_device_config, build_device_configs
 from .oidmap import build_oidmap
 
-__all__ = ("build_device_config", "build_oidmap")
+__all__ = ("build_device_config", "build_device_configs", "build_oidmap")
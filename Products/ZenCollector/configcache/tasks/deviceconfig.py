@@ -12,6 +12,7 @@ from __future__ import absolute_import
 from datetime import datetime
 from time import time
 
+from celery.exceptions import SoftTimeLimitExceeded
 from zope.component import createObject
 from zope.dottedname.resolve import resolve
 
@@ -24,6 +25,9 @@ from ..cache import DeviceKey, DeviceRecord, ConfigStatus
 from ..constants import Constants
 from ..utils import DeviceProperties
 
+# Number of configs built by build_device_configs that are saved together.
+SAVE_BATCH_SIZE = 5
+
 
 @app.task(
     bind=True,
@@ -56,8 +60,39 @@ def build_device_config(
     )
 
 
-# NOTE: the buildDeviceConfig function exists so that it can be tested
-# without having to handle Celery details in the unit tests.
+@app.task(
+    bind=True,
+    base=requires(DMD),
+    name="configcache.build_device_configs",
+    summary="Create Device Configurations Task",
+    description_template=(
+        "Create device configurations from {1} for collector {0}."
+    ),
+    ignore_result=True,
+    dmd_read_only=True,
+)
+def build_device_configs(self, monitorname, configclassname, builds):
+    """
+    Create configurations for many devices of the same monitor/collector.
+
+    @param monitorname: The name of the monitor/collector the devices
+        are members of.
+    @type monitorname: str
+    @param configclassname: The fully qualified name of the class that
+        will create the device configurations.
+    @type configclassname: str
+    @param builds: The ID of each device and the timestamp of when its
+        build was submitted.
+    @type builds: Sequence[(str, float)]
+    """
+    buildDeviceConfigs(
+        self.dmd, self.log, monitorname, configclassname, builds
+    )
+
+
+# NOTE: the buildDeviceConfig and buildDeviceConfigs functions exist so
+# that they can be tested without having to handle Celery details in the
+# unit tests.
 
 
 def buildDeviceConfig(
@@ -71,10 +106,114 @@ def buildDeviceConfig(
     # record when this build starts
     started = time()
 
-    # Check whether this is an old job, i.e. job pending timeout.
-    # If it is an old job, skip it, manager already sent another one.
     status = store.get_status(key)
-    device = dmd.Devices.findDeviceByIdExact(deviceid)
+    device = _accept_job(dmd, log, store, key, status, submitted, started)
+    if device is None:
+        return
+
+    # Change the configuration's status to 'building' to indicate that
+    # a config is now building.
+    store.set_building((key, time()))
+    log.info(
+        "building device configuration  device=%s collector=%s service=%s",
+        deviceid,
+        monitorname,
+        svcname,
+    )
+
+    service = svcconfigclass(dmd, monitorname)
+    if not _has_required_api(service, key, submitted, store, log):
+        return
+
+    result = service.remote_getDeviceConfigs((deviceid,))
+    config = result[0] if result else None
+
+    # get a new store; the prior store's connection may have gone stale.
+    store = _getStore()
+    _save_configs(store, log, ((key, device, status, config, started),))
+
+
+def buildDeviceConfigs(dmd, log, monitorname, configclassname, builds):
+    """
+    Build the configs of many devices using one config service instance.
+
+    Each device goes through the same checks and status changes as
+    a config built by buildDeviceConfig.  The status of each device is
+    read just before its build begins.  The built configs are saved
+    together every SAVE_BATCH_SIZE devices, so a job killed by its time
+    limit loses only the configs built since the last save.
+    """
+    svcconfigclass = resolve(configclassname)
+    svcname = configclassname.rsplit(".", 1)[0]
+    store = _getStore()
+    service = None
+    built = []
+    try:
+        for deviceid, submitted in builds:
+            key = DeviceKey(svcname, monitorname, deviceid)
+
+            # record when this build starts
+            started = time()
+
+            status = store.get_status(key)
+            device = _accept_job(
+                dmd, log, store, key, status, submitted, started
+            )
+            if device is None:
+                continue
+
+            if service is None:
+                service = svcconfigclass(dmd, monitorname)
+            if not _has_required_api(service, key, submitted, store, log):
+                continue
+
+            # The status changes to 'building' only when the build of this
+            # device's config actually begins.
+            store.set_building((key, time()))
+            log.info(
+                "building device configuration  "
+                "device=%s collector=%s service=%s",
+                deviceid,
+                monitorname,
+                svcname,
+            )
+            try:
+                result = service.remote_getDeviceConfigs((deviceid,))
+            except SoftTimeLimitExceeded:
+                raise
+            except Exception:
+                # Leave the status as 'building' so that the manager handles
+                # this config as it would a failed single device job.
+                log.exception(
+                    "failed to build device configuration  "
+                    "device=%s collector=%s service=%s",
+                    deviceid,
+                    monitorname,
+                    svcname,
+                )
+                continue
+            config = result[0] if result else None
+            built.append((key, device, status, config, started))
+
+            if len(built) >= SAVE_BATCH_SIZE:
+                # get a new store; the prior store's connection may have
+                # gone stale.
+                store = _getStore()
+                saved, built = built, []
+                _save_configs(store, log, saved)
+    finally:
+        # Save the configs already built, even if the job's soft time
+        # limit was exceeded.
+        if built:
+            _save_configs(_getStore(), log, built)
+
+
+def _accept_job(dmd, log, store, key, status, submitted, started):
+    """
+    Returns the device if its config should be built by this job.
+    Otherwise, None is returned.
+    """
+    device = dmd.Devices.findDeviceByIdExact(key.device)
     if device is None:
         log.warn(
             "cannot build config because device was not found  "
@@ -87,11 +226,13 @@ def buildDeviceConfig(
         # Speculatively delete the config because this device may have been
         # re-identified under a new ID so the config keyed by the old ID
         # should be removed.
-        _delete_config(key, store, log)
-        return
+        _delete_configs((key,), store, log)
+        return None
 
+    # Check whether this is an old job, i.e. job pending timeout.
+    # If it is an old job, skip it, manager already sent another one.
     if _job_is_old(status, submitted, started, device, log):
-        return
+        return None
 
     # If the status is Expired, another job is coming, so skip this job.
     if isinstance(status, ConfigStatus.Expired):
@@ -103,7 +244,7 @@ def buildDeviceConfig(
             key.service,
             submitted,
         )
-        return
+        return None
 
     # If the status is Pending, verify whether it's for this job, and if not,
     # skip this job.
@@ -119,84 +260,105 @@ def buildDeviceConfig(
                 key.service,
                 submitted,
             )
-            return
+            return None
 
-    # Change the configuration's status to 'building' to indicate that
-    # a config is now building.
-    store.set_building((key, time()))
-    log.info(
-        "building device configuration  device=%s collector=%s service=%s",
-        deviceid,
-        monitorname,
-        svcname,
+    return device
+
+
+def _has_required_api(service, key, submitted, store, log):
+    if getattr(service, "remote_getDeviceConfigs", None) is not None:
+        return True
+    log.warn(
+        "config service does not have required API  "
+        "device=%s collector=%s service=%s submitted=%f",
+        key.device,
+        key.monitor,
+        key.service,
+        submitted,
     )
+    # Services without a remote_getDeviceConfigs method can't create
+    # device configs, so delete the config that may exist.
+    _delete_configs((key,), store, log)
+    return False
 
-    service = svcconfigclass(dmd, monitorname)
-    method = getattr(service, "remote_getDeviceConfigs", None)
-    if method is None:
-        log.warn(
-            "config service does not have required API  "
-            "device=%s collector=%s service=%s submitted=%f",
-            key.device,
-            key.monitor,
-            key.service,
-            submitted,
-        )
-        # Services without a remote_getDeviceConfigs method can't create
-        # device configs, so delete the config that may exist.
-        _delete_config(key, store, log)
-        return
 
-    result = service.remote_getDeviceConfigs((deviceid,))
-    config = result[0] if result else None
+def _save_configs(store, log, built):
+    """
+    Save the built configs using one Redis transaction per kind of update.
 
-    # get a new store; the prior store's connection may have gone stale.
-    store = _getStore()
-    if config is None:
+    @param built: The key, device, status (before the build started),
+        config (None if no config was built), and start time of each
+        build.
+    @type built: Sequence[(DeviceKey, Device, ConfigStatus, DeviceProxy,
+        float)]
+    """
+    nokeys = tuple(key for key, _, _, config, _ in built if config is None)
+    for key in nokeys:
         log.info(
             "no configuration built  device=%s collector=%s service=%s",
             key.device,
             key.monitor,
             key.service,
         )
-        _delete_config(key, store, log)
-    else:
-        uid = device.getPrimaryId()
-        record = DeviceRecord.make(
-            svcname, monitorname, deviceid, uid, time(), config
-        )
+    _delete_configs(nokeys, store, log)
+
+    built = tuple(item for item in built if item[3] is not None)
+    if not built:
+        return
 
-        # Get the current status of the configuration.
-        recent_status = store.get_status(key)
+    # Get the current status of the configurations.
+    recent_statuses = dict(
+        store.get_statuses(*(key for key, _, _, _, _ in built))
+    )
 
+    added, saved = [], []
+    for key, device, status, config, started in built:
+        record = DeviceRecord.make(
+            key.service,
+            key.monitor,
+            key.device,
+            device.getPrimaryId(),
+            time(),
+            config,
+        )
         # Test whether the status should be updated
         update_status = _should_update_status(
-            recent_status, started, deviceid, monitorname, svcname, log
+            recent_statuses.get(key),
+            started,
+            key.device,
+            key.monitor,
+            key.service,
+            log,
         )
-
-        if not update_status:
+        if update_status:
+            added.append((record, status))
+        else:
             # recent_status is not ConfigStatus.Building, so another job
             # will be submitted or has already been submitted.
-            store.put_config(record)
-            log.info(
-                "saved config without changing status  "
-                "updated=%s device=%s collector=%s service=%s",
-                datetime.fromtimestamp(record.updated).isoformat(),
-                deviceid,
-                monitorname,
-                svcname,
-            )
-        else:
-            verb = "replaced" if status is not None else "added"
-            store.add(record)
-            log.info(
-                "%s config  updated=%s device=%s collector=%s service=%s",
-                verb,
-                datetime.fromtimestamp(record.updated).isoformat(),
-                deviceid,
-                monitorname,
-                svcname,
-            )
+            saved.append(record)
+
+    store.put_config(*saved)
+    for record in saved:
+        log.info(
+            "saved config without changing status  "
+            "updated=%s device=%s collector=%s service=%s",
+            datetime.fromtimestamp(record.updated).isoformat(),
+            record.device,
+            record.monitor,
+            record.service,
+        )
+
+    store.add(*(record for record, _ in added))
+    for record, status in added:
+        verb = "replaced" if status is not None else "added"
+        log.info(
+            "%s config  updated=%s device=%s collector=%s service=%s",
+            verb,
+            datetime.fromtimestamp(record.updated).isoformat(),
+            record.device,
+            record.monitor,
+            record.service,
+        )
 
 
 def _should_update_status(
@@ -260,9 +422,13 @@ def _should_update_status(
     return True
 
 
-def _delete_config(key, store, log):
-    if key in store:
-        store.remove(key)
+def _delete_configs(keys, store, log):
+    if len(keys) == 0:
+        return
+    present = tuple(key for key in keys if key in store)
+    if present:
+        store.remove(*present)
+    for key in present:
         log.info(
             "removed previously built configuration  "
             "device=%s collector=%s service=%s",
@@ -270,8 +436,8 @@ def _delete_config(key, store, log):
             key.monitor,
             key.service,
         )
-    # Ensure all statuses for this key are deleted.
-    store.clear_status(key)
+    # Ensure all statuses for these keys are deleted.
+    store.clear_status(*keys)
 
 
 def _job_is_old(status, submitted, now, device, log):
@@ -120,12 +120,19 @@ def buildOidMap(dmd, log, submitted):
         # will be submitted or has already been submitted.
         store.put_config(record)
         log.info(
-            "saved oidmap without changing status  created=%s", created_ts
+            "saved oidmap without changing status  created=%s version=%s",
+            created_ts,
+            store.get_version(),
         )
     else:
         verb = "replaced" if status is not None else "added"
         store.add(record)
-        log.info("%s oidmap  created=%s", verb, created_ts)
+        log.info(
+            "%s oidmap  created=%s version=%s",
+            verb,
+            created_ts,
+            store.get_version(),
+        )
 
 
 def _should_update_status(recent_status, started, log):
@@ -13,12 +13,14 @@ import mock
 
 from unittest import TestCase
 
+from celery.exceptions import SoftTimeLimitExceeded
+
 from Products.Jobber.tests.utils import RedisLayer
 from Products.ZenCollector.services.config import DeviceProxy
 
-from ..cache import DeviceKey, DeviceRecord
+from ..cache import ConfigStatus, DeviceKey, DeviceRecord
 from ..cache.storage import DeviceConfigStore
-from ..tasks.deviceconfig import buildDeviceConfig
+from ..tasks.deviceconfig import buildDeviceConfig, buildDeviceConfigs
 
 PATH = {
     "zenjobs": "Products.Jobber.zenjobs",
@@ -130,3 +132,156 @@ class TestBuildDeviceConfig(TestCase):
 
         status = t.store.get_status(key)
         t.assertIsNone(status)
+
+
+class TestBuildDeviceConfigs(TestCase):
+    layer = RedisLayer
+
+    def setUp(t):
+        t.store = DeviceConfigStore(t.layer.redis)
+
+    def tearDown(t):
+        del t.store
+
+    @mock.patch("{task}.time".format(**PATH), autospec=True)
+    @mock.patch("{task}.createObject".format(**PATH), autospec=True)
+    @mock.patch("{task}.resolve".format(**PATH), autospec=True)
+    def test_batch(t, _resolve, _createObject, _time):
+        monitor = "localhost"
+        clsname = "Products.ZenHub.services.PingService.PingService"
+        svcname = clsname.rsplit(".", 1)[0]
+        submitted = 123456.34
+        svcclass = mock.Mock()
+        svc = mock.MagicMock()
+        dmd = mock.Mock()
+        log = mock.Mock()
+        dvc = mock.Mock()
+        built = DeviceKey(svcname, monitor, "built")
+        missing = DeviceKey(svcname, monitor, "missing")
+        stale = DeviceKey(svcname, monitor, "stale")
+
+        _createObject.return_value = t.store
+        _resolve.return_value = svcclass
+        svcclass.return_value = svc
+        proxy = DeviceProxy()
+        svc.remote_getDeviceConfigs.return_value = [proxy]
+        dmd.Devices.findDeviceByIdExact.side_effect = lambda name: (
+            None if name == "missing" else dvc
+        )
+        dvc.getPrimaryId.return_value = "/zport/dmd/Devices/built"
+        dvc.getZ.return_value = 1000
+        _time.return_value = submitted + 10
+
+        t.store.set_pending(
+            (built, submitted), (missing, submitted), (stale, submitted + 5)
+        )
+
+        buildDeviceConfigs(
+            dmd,
+            log,
+            monitor,
+            clsname,
+            (
+                ("built", submitted),
+                ("missing", submitted),
+                ("stale", submitted),
+            ),
+        )
+
+        # The service is created once and only builds the accepted config.
+        svcclass.assert_called_once_with(dmd, monitor)
+        svc.remote_getDeviceConfigs.assert_called_once_with(("built",))
+        t.assertIsInstance(t.store.get_status(built), ConfigStatus.Current)
+        t.assertIsNone(t.store.get_status(missing))
+        t.assertIsInstance(t.store.get_status(stale), ConfigStatus.Pending)
+
+    def _setup_batch(t, _resolve, _createObject, _time, build):
+        t.monitor = "localhost"
+        t.clsname = "Products.ZenHub.services.PingService.PingService"
+        t.svcname = t.clsname.rsplit(".", 1)[0]
+        t.submitted = 123456.34
+        svcclass = mock.Mock()
+        svc = mock.MagicMock()
+        t.dmd = mock.Mock()
+        t.log = mock.Mock()
+        dvc = mock.Mock()
+
+        _createObject.return_value = t.store
+        _resolve.return_value = svcclass
+        svcclass.return_value = svc
+        svc.remote_getDeviceConfigs.side_effect = build
+        t.dmd.Devices.findDeviceByIdExact.return_value = dvc
+        dvc.getPrimaryId.return_value = "/zport/dmd/Devices/dvc"
+        dvc.getZ.return_value = 1000
+        _time.return_value = t.submitted + 10
+
+    def _keys(t, *names):
+        return tuple(DeviceKey(t.svcname, t.monitor, name) for name in names)
+
+    @mock.patch("{task}.SAVE_BATCH_SIZE".format(**PATH), new=2)
+    @mock.patch("{task}.time".format(**PATH), autospec=True)
+    @mock.patch("{task}.createObject".format(**PATH), autospec=True)
+    @mock.patch("{task}.resolve".format(**PATH), autospec=True)
+    def test_configs_saved_in_batches(t, _resolve, _createObject, _time):
+        built = []
+
+        def build(deviceids):
+            if deviceids == ("dev3",):
+                # The configs of the first two devices are already saved.
+                t.assertIn(dev1, t.store)
+                t.assertIn(dev2, t.store)
+                t.assertNotIn(dev3, t.store)
+                # A newer job is submitted for the fourth device.
+                t.store.set_pending((dev4, t.submitted + 5))
+            built.append(deviceids)
+            return [DeviceProxy()]
+
+        t._setup_batch(_resolve, _createObject, _time, build)
+        dev1, dev2, dev3, dev4 = t._keys("dev1", "dev2", "dev3", "dev4")
+        t.store.set_pending(
+            *((key, t.submitted) for key in (dev1, dev2, dev3, dev4))
+        )
+
+        buildDeviceConfigs(
+            t.dmd,
+            t.log,
+            t.monitor,
+            t.clsname,
+            tuple(
+                (key.device, t.submitted) for key in (dev1, dev2, dev3, dev4)
+            ),
+        )
+
+        t.assertEqual(built, [("dev1",), ("dev2",), ("dev3",)])
+        for key in (dev1, dev2, dev3):
+            t.assertIsInstance(t.store.get_status(key), ConfigStatus.Current)
+        t.assertIsInstance(t.store.get_status(dev4), ConfigStatus.Pending)
+
+    @mock.patch("{task}.time".format(**PATH), autospec=True)
+    @mock.patch("{task}.createObject".format(**PATH), autospec=True)
+    @mock.patch("{task}.resolve".format(**PATH), autospec=True)
+    def test_soft_time_limit(t, _resolve, _createObject, _time):
+        def build(deviceids):
+            if deviceids == ("dev2",):
+                raise SoftTimeLimitExceeded()
+            return [DeviceProxy()]
+
+        t._setup_batch(_resolve, _createObject, _time, build)
+        dev1, dev2, dev3 = t._keys("dev1", "dev2", "dev3")
+        t.store.set_pending(
+            *((key, t.submitted) for key in (dev1, dev2, dev3))
+        )
+
+        with t.assertRaises(SoftTimeLimitExceeded):
+            buildDeviceConfigs(
+                t.dmd,
+                t.log,
+                t.monitor,
+                t.clsname,
+                tuple((key.device, t.submitted) for key in (dev1, dev2, dev3)),
+            )
+
+        # The config built before the time limit is saved.
+        t.assertIsInstance(t.store.get_status(dev1), ConfigStatus.Current)
+        t.assertIsInstance(t.store.get_status(dev2), ConfigStatus.Building)
+        t.assertIsInstance(t.store.get_status(dev3), ConfigStatus.Pending)
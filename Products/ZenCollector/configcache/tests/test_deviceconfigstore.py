@@ -196,6 +196,19 @@ class ConfigStoreAddTest(_BaseTest):
         t.assertIsInstance(result, DeviceRecord)
         t.assertEqual(t.record2, result)
 
+    def test_add_many(t):
+        t.store.set_pending((t.record1.key, 1234000.0))
+        t.store.add(t.record1, t.record2)
+
+        result = tuple(t.store.search())
+        t.assertEqual(2, len(result))
+        t.assertEqual(t.record1, t.store.get(t.record1.key))
+        t.assertEqual(t.record2, t.store.get(t.record2.key))
+        t.assertEqual(t.values[0].uid, t.store.get_uid(t.values[0].device))
+        t.assertIsInstance(
+            t.store.get_status(t.record1.key), ConfigStatus.Current
+        )
+
 
 class ConfigStoreSearchTest(_BaseTest):
     """Test the `search` method of DeviceConfigStore."""
@@ -277,6 +290,21 @@ class ConfigStoreGetStatusTest(_BaseTest):
         t.assertIsInstance(status, ConfigStatus.Current)
         t.assertEqual(t.values[1].updated, status.updated)
 
+    def test_get_statuses(t):
+        t.store.add(t.record1)
+        t.store.set_pending((t.record2.key, 1234600.0))
+        unknown = DeviceKey("a", "b", "c3")
+
+        result = dict(
+            t.store.get_statuses(t.record1.key, t.record2.key, unknown)
+        )
+
+        t.assertEqual(3, len(result))
+        t.assertIsInstance(result[t.record1.key], ConfigStatus.Current)
+        t.assertIsInstance(result[t.record2.key], ConfigStatus.Pending)
+        t.assertEqual(1234600.0, result[t.record2.key].submitted)
+        t.assertIsNone(result[unknown])
+
 
 class ConfigStoreGetOlderTest(_BaseTest):
     """Test the `get_older` method of DeviceConfigStore."""
@@ -13,7 +13,11 @@ from unittest import TestCase
 
 from mock import call, patch
 
-from ..dispatcher import DeviceConfigTaskDispatcher, build_device_config
+from ..dispatcher import (
+    DeviceConfigTaskDispatcher,
+    build_device_config,
+    build_device_configs,
+)
 
 
 PATH = {"src": "Products.ZenCollector.configcache.dispatcher"}
@@ -87,3 +91,96 @@ class DeviceConfigTaskDispatcherTest(TestCase):
 
         with t.assertRaises(ValueError):
             t.bctd.dispatch("unknown", monitor, device, timeout, submitted)
+
+
+class DeviceConfigTaskDispatcherBatchTest(TestCase):
+    """Test the dispatch_many method of DeviceConfigTaskDispatcher."""
+
+    def setUp(t):
+        t.class_a = type(
+            "a", (object,), {"__module__": "some.path.one", "__name__": "a"}
+        )
+        t.class_a_name = ".".join((t.class_a.__module__, t.class_a.__name__))
+        t.class_b = type(
+            "b", (object,), {"__module__": "some.path.two", "__name__": "b"}
+        )
+        t.class_b_name = ".".join((t.class_b.__module__, t.class_b.__name__))
+
+        t.bctd = DeviceConfigTaskDispatcher(
+            (t.class_a, t.class_b), batchsize=2
+        )
+
+    @patch.object(build_device_configs, "apply_async")
+    @patch.object(build_device_config, "apply_async")
+    def test_dispatch_many(t, _single, _batch):
+        svc_a = t.class_a.__module__
+        svc_b = t.class_b.__module__
+        t.bctd.dispatch_many(
+            (
+                (svc_a, "local", "dev1", 10.0, 100.0),
+                (svc_a, "local", "dev2", 20.0, 101.0),
+                (svc_a, "local", "dev3", 10.0, 102.0),
+                (svc_b, "local", "dev1", 10.0, 103.0),
+            )
+        )
+
+        _batch.assert_called_once_with(
+            args=(
+                "local",
+                t.class_a_name,
+                [("dev1", 100.0), ("dev2", 101.0)],
+            ),
+            soft_time_limit=30.0,
+            time_limit=33.0,
+        )
+        _single.assert_has_calls(
+            (
+                call(
+                    args=("local", "dev3", t.class_a_name),
+                    kwargs={"submitted": 102.0},
+                    soft_time_limit=10.0,
+                    time_limit=11.0,
+                ),
+                call(
+                    args=("local", "dev1", t.class_b_name),
+                    kwargs={"submitted": 103.0},
+                    soft_time_limit=10.0,
+                    time_limit=11.0,
+                ),
+            ),
+            any_order=True,
+        )
+
+    @patch.object(build_device_configs, "apply_async")
+    @patch.object(build_device_config, "apply_async")
+    def test_dispatch_many_limits_batch_time(t, _single, _batch):
+        bctd = DeviceConfigTaskDispatcher((t.class_a,), batchsize=5)
+        svc_a = t.class_a.__module__
+        bctd.dispatch_many(
+            tuple(
+                (svc_a, "local", "dev%d" % n, 10.0, 100.0) for n in range(5)
+            )
+        )
+
+        _single.assert_not_called()
+        _, kwargs = _batch.call_args
+        t.assertEqual(kwargs["soft_time_limit"], 20.0)
+        t.assertEqual(kwargs["time_limit"], 22.0)
+
+    @patch.object(build_device_configs, "apply_async")
+    @patch.object(build_device_config, "apply_async")
+    def test_dispatch_many_unbatched(t, _single, _batch):
+        bctd = DeviceConfigTaskDispatcher((t.class_a,))
+        svc_a = t.class_a.__module__
+        bctd.dispatch_many(
+            (
+                (svc_a, "local", "dev1", 10.0, 100.0),
+                (svc_a, "local", "dev2", 10.0, 100.0),
+            )
+        )
+        _batch.assert_not_called()
+        t.assertEqual(_single.call_count, 2)
+
+    def test_dispatch_many_unknown_service(t):
+        with t.assertRaises(ValueError):
+            t.bctd.dispatch_many((("unknown", "local", "dev1", 1.0, 1.0),))
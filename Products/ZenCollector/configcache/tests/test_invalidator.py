@@ -0,0 +1,97 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import, print_function
+
+import mock
+
+from unittest import TestCase
+
+from ..cache import DeviceKey
+from ..invalidator import _addNewOrChangedDevices, _removeDeleted
+
+PATH = {"src": "Products.ZenCollector.configcache.invalidator"}
+
+
+class SynchronizeDeviceConfigCacheTest(TestCase):
+    def setUp(t):
+        t.log = mock.Mock()
+        t.store = mock.Mock(spec=["get_uids"])
+        t.store.get_uids.side_effect = lambda *ids: (
+            (dvc, t.stored_uids.get(dvc)) for dvc in ids
+        )
+        t.dispatcher = mock.Mock()
+        t.dmd = mock.Mock()
+        t.dmd.unrestrictedTraverse.side_effect = t._traverse
+        t.devices = {
+            ("same", "localhost"): "/zport/dmd/Devices/same",
+            ("moved", "localhost"): "/zport/dmd/Devices/Server/moved",
+            ("added", "localhost"): "/zport/dmd/Devices/added",
+        }
+        t.stored_uids = {
+            "same": "/zport/dmd/Devices/same",
+            "moved": "/zport/dmd/Devices/moved",
+            "deleted": "/zport/dmd/Devices/deleted",
+        }
+        t.keys = (
+            DeviceKey("PingService", "localhost", "same"),
+            DeviceKey("PingService", "localhost", "moved"),
+            DeviceKey("PingService", "localhost", "deleted"),
+        )
+
+    def _traverse(t, uid):
+        device = mock.Mock()
+        device.getPrimaryId.return_value = uid
+        return device
+
+    @mock.patch("{src}.DeviceProperties".format(**PATH), autospec=True)
+    @mock.patch("{src}.NewDeviceHandler".format(**PATH), autospec=True)
+    def test_only_new_or_changed_devices_are_loaded(
+        t, _handler, _properties
+    ):
+        handle = _handler.return_value
+        _properties.return_value.build_timeout = 600
+
+        _addNewOrChangedDevices(
+            t.log, t.store, t.dispatcher, t.dmd, t.devices, t.keys
+        )
+
+        t.store.get_uids.assert_called_once_with(*{"same", "moved"})
+        t.assertEqual(
+            sorted(
+                args[0]
+                for args, _ in t.dmd.unrestrictedTraverse.call_args_list
+            ),
+            ["/zport/dmd/Devices/Server/moved", "/zport/dmd/Devices/added"],
+        )
+        handle.assert_has_calls(
+            [
+                mock.call("added", "localhost", 600),
+                mock.call("moved", "localhost", 600, False),
+            ],
+            any_order=True,
+        )
+        t.assertEqual(handle.call_count, 2)
+
+    @mock.patch("{src}.NewDeviceHandler".format(**PATH), autospec=True)
+    def test_nothing_to_do(t, _handler):
+        devices = {("same", "localhost"): "/zport/dmd/Devices/same"}
+
+        _addNewOrChangedDevices(
+            t.log, t.store, t.dispatcher, t.dmd, devices, t.keys[:1]
+        )
+
+        t.dmd.unrestrictedTraverse.assert_not_called()
+        _handler.return_value.assert_not_called()
+
+    @mock.patch("{src}.RemoveConfigsHandler".format(**PATH), autospec=True)
+    def test_remove_deleted(t, _handler):
+        _removeDeleted(t.log, t.store, t.devices, t.keys)
+
+        _handler.return_value.assert_called_once_with((t.keys[2],))
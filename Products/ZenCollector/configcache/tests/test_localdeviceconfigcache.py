@@ -0,0 +1,170 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import, print_function
+
+from unittest import TestCase
+
+from mock import Mock
+
+import sys
+
+from ..cache import DeviceKey
+from ..cache.storage.local import LocalDeviceConfigCache, estimate_size
+
+
+def _key(device):
+    return DeviceKey("PerfConfig", "localhost", device)
+
+
+class LocalDeviceConfigCacheTest(TestCase):
+    """Test the LocalDeviceConfigCache class."""
+
+    def setUp(t):
+        t.updated = {}
+        t.configs = {}
+        t.store = Mock(spec=["get_updated", "get", "search"])
+        t.store.get_updated.side_effect = lambda key: t.updated.get(key)
+        t.store.get.side_effect = lambda key: (
+            Mock(
+                name="record-%s-%s" % (key.device, t.updated[key]),
+                updated=t.updated[key],
+                config=t.configs.get(key, ""),
+            )
+            if key in t.updated
+            else None
+        )
+        t.cache = LocalDeviceConfigCache(t.store, maxentries=2)
+
+    def test_miss_then_hit(t):
+        key = _key("a")
+        t.updated[key] = 100.0
+
+        record = t.cache.get(key)
+        t.assertEqual(record.updated, 100.0)
+        t.assertIs(t.cache.get(key), record)
+
+        t.assertEqual(t.store.get.call_count, 1)
+        # A miss reads the config only.
+        t.assertEqual(t.store.get_updated.call_count, 1)
+        t.assertEqual((t.cache.hits, t.cache.misses), (1, 1))
+        t.assertEqual(t.cache.ratio, 0.5)
+        t.assertEqual(len(t.cache), 1)
+
+    def test_rebuilt_config_is_refetched(t):
+        key = _key("a")
+        t.updated[key] = 100.0
+        t.cache.get(key)
+        t.updated[key] = 200.0
+
+        t.assertEqual(t.cache.get(key).updated, 200.0)
+        t.assertEqual(t.store.get.call_count, 2)
+        t.assertEqual(len(t.cache), 1)
+
+    def test_removed_config(t):
+        key = _key("a")
+        t.updated[key] = 100.0
+        t.cache.get(key)
+        del t.updated[key]
+
+        t.assertIsNone(t.cache.get(key))
+        t.assertEqual(t.cache.get(key, "default"), "default")
+        t.assertEqual(len(t.cache), 0)
+        t.assertEqual(t.store.get.call_count, 2)
+
+    def test_least_recently_used_is_evicted(t):
+        keys = [_key(name) for name in "abc"]
+        for key in keys:
+            t.updated[key] = 100.0
+        t.cache.get(keys[0])
+        t.cache.get(keys[1])
+        t.cache.get(keys[0])
+        t.cache.get(keys[2])
+
+        t.assertEqual(t.cache.evictions, 1)
+        t.assertEqual(len(t.cache), 2)
+        t.assertEqual(t.cache.entries, 2)
+
+        t.cache.get(keys[0])
+        t.assertEqual(t.cache.hits, 2)
+
+    def test_bounded_by_size(t):
+        keys = [_key(name) for name in "abc"]
+        for key in keys:
+            t.updated[key] = 100.0
+            t.configs[key] = "x" * 1000
+        size = sys.getsizeof(t.configs[keys[0]])
+        t.cache = LocalDeviceConfigCache(
+            t.store, maxentries=10, maxbytes=size * 2
+        )
+        for key in keys:
+            t.cache.get(key)
+
+        t.assertEqual(t.cache.evictions, 1)
+        t.assertEqual(len(t.cache), 2)
+        t.assertEqual(t.cache.nbytes, size * 2)
+
+    def test_config_larger_than_limit_is_not_cached(t):
+        key = _key("a")
+        t.updated[key] = 100.0
+        t.configs[key] = "x" * 1000
+        t.cache = LocalDeviceConfigCache(t.store, maxentries=10, maxbytes=10)
+
+        t.assertEqual(t.cache.get(key).updated, 100.0)
+        t.assertEqual(len(t.cache), 0)
+        t.assertEqual(t.cache.nbytes, 0)
+
+    def test_invalidate(t):
+        key = _key("a")
+        t.updated[key] = 100.0
+        t.configs[key] = "x" * 1000
+        t.cache.get(key)
+        t.assertEqual(t.cache.nbytes, sys.getsizeof(t.configs[key]))
+        t.cache.invalidate(key)
+
+        t.assertEqual(len(t.cache), 0)
+        t.assertEqual(t.cache.nbytes, 0)
+
+    def test_other_methods_use_store(t):
+        t.cache.search("query")
+        t.store.search.assert_called_once_with("query")
+
+
+class _Config(object):
+    pass
+
+
+class EstimateSizeTest(TestCase):
+    """Test the estimate_size function."""
+
+    def test_follows_containers_and_attributes(t):
+        text = "x" * 100
+        values = [text, 1]
+        config = _Config()
+        config.values = values
+
+        t.assertEqual(
+            estimate_size(config),
+            sys.getsizeof(config)
+            + sys.getsizeof(config.__dict__)
+            + sys.getsizeof("values")
+            + sys.getsizeof(values)
+            + sys.getsizeof(text)
+            + sys.getsizeof(1),
+        )
+
+    def test_shared_objects_counted_once(t):
+        text = "x" * 100
+        t.assertEqual(
+            estimate_size([text, text]),
+            sys.getsizeof([text, text]) + sys.getsizeof(text),
+        )
+
+    def test_classes_are_not_counted(t):
+        t.assertEqual(estimate_size([_Config]), sys.getsizeof([_Config]))
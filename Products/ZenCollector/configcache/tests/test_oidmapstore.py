@@ -159,3 +159,88 @@ class OidMapStoreTest(TestCase):
         t.assertIsNone(t.store.get_checksum())
         t.assertIsNone(t.store.get_created())
         t.assertFalse(t.store)
+
+
+class OidMapStoreVersionTest(TestCase):
+
+    layer = RedisLayer
+
+    def setUp(t):
+        t.store = OidMapStore(t.layer.redis, max_versions=3, max_changes=4)
+
+    def tearDown(t):
+        del t.store
+
+    def _add(t, oidmap):
+        checksum = md5(  # noqa: S324
+            json.dumps(oidmap, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        t.store.add(OidMapRecord(time.time(), checksum, oidmap))
+        return checksum
+
+    def test_no_version(t):
+        t.assertIsNone(t.store.get_version())
+        t.assertIsNone(t.store.get_changes(0, None))
+
+    def test_first_version(t):
+        checksum = t._add({"1.1": "a"})
+        t.assertEqual(t.store.get_version(), 1)
+        t.assertEqual(
+            t.store.get_changes(1, checksum), (1, checksum, {}, [])
+        )
+        # There are no changes from an empty map.
+        t.assertIsNone(t.store.get_changes(0, None))
+
+    def test_unchanged_map_keeps_version(t):
+        t._add({"1.1": "a"})
+        t._add({"1.1": "a"})
+        t.assertEqual(t.store.get_version(), 1)
+
+    def test_changes(t):
+        first = t._add({"1.1": "a", "1.2": "b", "1.3": "c"})
+        second = t._add({"1.1": "a", "1.2": "renamed", "1.4": "d"})
+        checksum = t._add({"1.1": "a", "1.2": "renamed", "1.3": "c"})
+
+        t.assertEqual(t.store.get_version(), 3)
+        t.assertEqual(
+            t.store.get_changes(2, second),
+            (3, checksum, {"1.3": "c"}, ["1.4"]),
+        )
+        t.assertEqual(
+            t.store.get_changes(1, first),
+            (3, checksum, {"1.2": "renamed", "1.3": "c"}, ["1.4"]),
+        )
+
+    def test_changes_need_the_checksum_of_the_version(t):
+        first = t._add({"1.1": "a"})
+        second = t._add({"1.1": "b"})
+
+        t.assertIsNone(t.store.get_changes(1, second))
+        t.assertIsNone(t.store.get_changes(1, "other"))
+        t.assertIsNone(t.store.get_changes(2, first))
+
+    def test_changes_are_bounded(t):
+        checksums = [t._add({"1.1": "a"})]
+        for n in range(2, 6):
+            checksums.append(t._add({"1.1": "a", "1.{}".format(n): "x"}))
+        t.assertEqual(t.store.get_version(), 5)
+        # Too many versions
+        t.assertIsNone(t.store.get_changes(1, checksums[0]))
+        t.assertIsNotNone(t.store.get_changes(2, checksums[1]))
+
+        t._add({"2.{}".format(n): "y" for n in range(5)})
+        # Too many changed OIDs
+        t.assertIsNone(t.store.get_changes(5, checksums[4]))
+
+    def test_version_increases_after_remove(t):
+        t._add({"1.1": "a"})
+        second = t._add({"1.1": "b"})
+        t.store.remove()
+        t.assertIsNone(t.store.get_version())
+
+        checksum = t._add({"1.1": "c"})
+        t.assertEqual(t.store.get_version(), 3)
+        t.assertIsNone(t.store.get_changes(2, second))
+        t.assertEqual(
+            t.store.get_changes(3, checksum), (3, checksum, {}, [])
+        )
@@ -0,0 +1,93 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import, print_function
+
+import zlib
+
+from unittest import TestCase
+
+from Products.ZenCollector.services.config import DeviceProxy
+
+from ..cache.storage.codec import (
+    JellyMarshalCodec,
+    LegacyDeviceConfigCodec,
+    LegacyOidMapCodec,
+    MarshalCodec,
+    device_config_codec,
+    oidmap_codec,
+)
+
+
+def _make_config():
+    config = DeviceProxy()
+    config.id = "qadevice"
+    config._config_id = "qadevice"
+    config.manageIp = "10.0.0.1"
+    config.name = u"q\xe4device"
+    config.thresholds = [{"a": 1.5, "b": None, "c": True}]
+    config.datapoints = ("sysUpTime", 100L)
+    return config
+
+
+class DeviceConfigCodecTest(TestCase):
+    """Test the device config codecs."""
+
+    def setUp(t):
+        t.codec = device_config_codec()
+        t.config = _make_config()
+
+    def _assertConfigEqual(t, expected, actual):
+        t.assertIsInstance(actual, DeviceProxy)
+        t.assertDictEqual(expected.__dict__, actual.__dict__)
+
+    def test_version_byte(t):
+        data = t.codec.encode(t.config)
+        t.assertEqual(JellyMarshalCodec.version, data[:1])
+
+    def test_roundtrip(t):
+        data = t.codec.encode(t.config)
+        t._assertConfigEqual(t.config, t.codec.decode(data))
+
+    def test_decode_legacy(t):
+        data = LegacyDeviceConfigCodec().encode(t.config)
+        t._assertConfigEqual(t.config, t.codec.decode(data))
+
+    def test_decode_legacy_uncompressed(t):
+        data = LegacyDeviceConfigCodec().encode(t.config)
+        data = zlib.decompress(data)
+        t._assertConfigEqual(t.config, t.codec.decode(data))
+
+    def test_encode_with_legacy_codec(t):
+        codec = device_config_codec(LegacyDeviceConfigCodec())
+        data = codec.encode(t.config)
+        t._assertConfigEqual(t.config, t.codec.decode(data))
+
+
+class OidMapCodecTest(TestCase):
+    """Test the oidmap codecs."""
+
+    def setUp(t):
+        t.codec = oidmap_codec()
+        t.oidmap = {"1.3.6.1.2.1.1": "system", "1.3.6.1.2.1.2": "interfaces"}
+
+    def test_version_byte(t):
+        data = t.codec.encode(t.oidmap)
+        t.assertEqual(MarshalCodec.version, data[:1])
+
+    def test_roundtrip(t):
+        t.assertDictEqual(t.oidmap, t.codec.decode(t.codec.encode(t.oidmap)))
+
+    def test_decode_legacy(t):
+        data = LegacyOidMapCodec().encode(t.oidmap)
+        t.assertDictEqual(t.oidmap, t.codec.decode(data))
+
+    def test_decode_other_version(t):
+        data = JellyMarshalCodec().encode(t.oidmap)
+        t.assertDictEqual(t.oidmap, t.codec.decode(data))
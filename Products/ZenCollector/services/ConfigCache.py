@@ -12,12 +12,66 @@ import logging
 from zope.component import createObject
 
 from Products.ZenCollector.configcache.cache import DeviceKey, DeviceQuery
+from Products.ZenCollector.configcache.cache.storage.local import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    LocalDeviceConfigCache,
+    register_metrics,
+)
 from Products.ZenHub.errors import translateError
-from Products.ZenHub.HubService import HubService
+from Products.ZenHub.HubService import HubService, idempotent
+from Products.ZenUtils.GlobalConfig import getGlobalConfiguration
 from Products.ZenUtils.RedisUtils import getRedisClient, getRedisUrl
 
 from .optionsfilter import getOptionsFilter
 
+log = logging.getLogger("zen.configcache.service")
+
+# Name of the global.conf option setting the maximum number of device
+# configs kept in zenhub's memory.  Zero disables the cache.
+_CFG_LOCAL_CACHE_SIZE = "configcache-local-cache-entries"
+
+# Name of the global.conf option setting the maximum estimated memory, in
+# megabytes, used by the device configs kept in zenhub's memory.
+_CFG_LOCAL_CACHE_MB = "configcache-local-cache-mb"
+
+# The device config cache shared by all ConfigCache service instances
+# in the process.
+_local_cache = None
+
+
+def _getDeviceConfigStore(client):
+    global _local_cache
+    if _local_cache is None:
+        store = createObject("deviceconfigcache-store", client)
+        config = getGlobalConfiguration()
+        maxentries = _getIntOption(
+            config, _CFG_LOCAL_CACHE_SIZE, DEFAULT_MAX_ENTRIES
+        )
+        maxbytes = _getIntOption(
+            config, _CFG_LOCAL_CACHE_MB, DEFAULT_MAX_BYTES // (1024 * 1024)
+        ) * (1024 * 1024)
+        if maxentries <= 0 or maxbytes <= 0:
+            return store
+        _local_cache = LocalDeviceConfigCache(
+            store, maxentries=maxentries, maxbytes=maxbytes
+        )
+        register_metrics(_local_cache)
+        log.info(
+            "local device config cache enabled  maxentries=%s maxbytes=%s",
+            maxentries,
+            maxbytes,
+        )
+    return _local_cache
+
+
+def _getIntOption(config, name, default):
+    try:
+        return int(config.get(name, default))
+    except ValueError:
+        log.warning("invalid value for %s; using default", name)
+        return default
+
 
 class ConfigCache(HubService):
     """ZenHub service for retrieving device configs from Redis."""
@@ -39,11 +93,12 @@ class ConfigCache(HubService):
             "Stores",
             (object,),
             {
-                "device": createObject("deviceconfigcache-store", client),
+                "device": _getDeviceConfigStore(client),
                 "oidmap": createObject("oidmapcache-store", client),
             },
         )()
 
+    @idempotent
     @translateError
     def remote_getDeviceNames(self, servicename, options):
         """
@@ -58,6 +113,7 @@ class ConfigCache(HubService):
             for key in self._filter(self._keys(servicename), options)
         )
 
+    @idempotent
     @translateError
     def remote_getDeviceConfigs(
         self, servicename, when, deviceids, options=None
@@ -132,6 +188,7 @@ class ConfigCache(HubService):
             "removed": list(removed),
         }
 
+    @idempotent
     @translateError
     def remote_getDeviceConfig(self, servicename, deviceid, options=None):
         """
@@ -163,11 +220,13 @@ class ConfigCache(HubService):
         filtered = tuple(self._filter([key], predicate))
         if len(filtered) == 0:
             return None
-        if key not in self._stores.device:
+        record = self._stores.device.get(key)
+        if record is None:
             return None
-        return self._stores.device.get(key).config
+        return record.config
 
-    def remote_getOidMap(self, checksum):
+    @idempotent(shared=True)
+    def remote_getOidMap(self, checksum, version=None):
         """
         Returns the current OID map if its checksum doesn't match `checksum`.
         The checksum of the current OID map is returned as well.
@@ -178,14 +237,45 @@ class ConfigCache(HubService):
         If the stored checksum and the `checksum` parameter are the same or
         if there is no oidmap data, the return value is `(None, None)`.
 
-        @rtype: Tuple[str, Dict] | None
+        If `version` is given, it is the version of the caller's OID map
+        and the return value is a four element tuple:
+
+            (<checksum>, <version>, <oidmap>, <changes>)
+
+        When `checksum` is the checksum of the OID map having the given
+        version, only the changes to the caller's OID map are returned;
+        <oidmap> is None and <changes> is a tuple containing a dict of the
+        added OIDs and a list of the removed OIDs.  Otherwise, the whole
+        OID map is returned and <changes> is None.
+        If no update is needed, the return value is
+        `(None, None, None, None)`.
+
+        @rtype: Tuple[str, Dict] | Tuple[str, int, Dict, Tuple] | None
         """
-        self.log.debug("[ConfigCache] getOidMap(%r)", checksum)
-        stored_checksum = self._stores.oidmap.get_checksum()
-        if stored_checksum == checksum:
-            return (None, None)
-        record = self._stores.oidmap.get()
-        return (record.checksum, record.oidmap)
+        self.log.debug("[ConfigCache] getOidMap(%r, %r)", checksum, version)
+        store = self._stores.oidmap
+        if version is None:
+            stored_checksum = store.get_checksum()
+            if stored_checksum == checksum:
+                return (None, None)
+            record = store.get()
+            return (record.checksum, record.oidmap)
+        # Changes can be applied only if the caller has an OID map.
+        if checksum is not None:
+            changes = store.get_changes(version, checksum)
+            if changes is not None:
+                current, stored_checksum, added, removed = changes
+                if stored_checksum == checksum:
+                    return (None, None, None, None)
+                return (stored_checksum, current, None, (added, removed))
+        # Avoid decoding the whole OID map if the caller's is current.
+        if store.get_checksum() == checksum:
+            return (None, None, None, None)
+        current = store.get_version()
+        record = store.get()
+        if current is None or record is None or record.checksum == checksum:
+            return (None, None, None, None)
+        return (record.checksum, current, record.oidmap, None)
 
     def _keys(self, servicename):
         """
@@ -16,7 +16,7 @@ from twisted.spread import pb
 from ZODB.transact import transact
 
 from Products.ZenHub.errors import translateError
-from Products.ZenHub.HubService import HubService
+from Products.ZenHub.HubService import HubService, idempotent
 from Products.ZenHub.services.ThresholdMixin import ThresholdMixin
 from Products.ZenModel.Device import Device
 from Products.ZenUtils.guid.interfaces import IGlobalIdentifier
@@ -104,6 +104,7 @@ class CollectorConfigService(HubService, UpdateCollectorMixin, ThresholdMixin):
             pass
         return items
 
+    @idempotent
     @translateError
     def remote_getDeviceNames(self, options=None):
         return [
@@ -111,6 +112,7 @@ class CollectorConfigService(HubService, UpdateCollectorMixin, ThresholdMixin):
             for device in self._selectDevices(self.conf.devices(), options)
         ]
 
+    @idempotent
     @translateError
     def remote_getDeviceConfigs(self, deviceNames=None, options=None):
         if deviceNames:
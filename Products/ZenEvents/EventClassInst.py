@@ -45,6 +45,7 @@ from Products import Zuul
 from Products.Zuul.interfaces import IInfo
 from Products.ZenUtils.Utils import zenPath
 from Products.ZenUtils.daemonconfig import IDaemonConfig
+from Products.ZenEvents.codecache import getCompiledCodeCache
 
 from zenoss.protocols.jsonformat import to_dict
 
@@ -165,7 +166,11 @@ class EventClassPropertyMixin(object):
         badLineNo = None
         badLineText = ''
         try:
-            if len(tb) == 2:
+            if isinstance(sys.exc_info()[1], SyntaxError):
+                # Compiletime error raised by the compiled code cache
+                badLineNo = sys.exc_info()[1].lineno
+                exceptionText = "compile error on line %d" % badLineNo
+            elif len(tb) == 2:
                 # Compiletime error: with exceptionText in the form:
                 # '  File "<string>", line 4'
                 # We must extract the line number from the exceptionText
@@ -314,12 +319,14 @@ Transform:
             'log':log, 'component':component,
             'getFacade':Zuul.getFacade, 'IInfo':IInfo,
         }
+        codecache = getCompiledCodeCache()
         for eventclass in transpath:
             if not eventclass.transform: continue
             startTime = time.time()
             errorCallback = partial(self.sendTransformException, eventclass, evt)
             with transformsavepoint(errorCallback):
-                exec(eventclass.transform, variables_and_funcs)
+                code = codecache.transform(eventclass)
+                exec(code, variables_and_funcs)
             endTime = time.time()
 
             if endTime - startTime > MAX_TRANSFORM_TIME:
@@ -495,7 +502,7 @@ class EventClassInst(EventClassPropertyMixin, ZenModelRM, EventView,
         Apply the event dict regex to extract additional values from the event.
         """
         if self.regex:
-            m = re.search(self.regex, evt.message)
+            m = getCompiledCodeCache().regex(self).search(evt.message)
             if m: evt.updateFromDict(m.groupdict())
         return evt
 
@@ -535,14 +542,15 @@ class EventClassInst(EventClassPropertyMixin, ZenModelRM, EventView,
         if self.rule:
             try:
                 log.debug("eval rule:%s", self.rule)
-                value = eval(self.rule, {'evt':evt, 'dev':device, 'device': device})
+                code = getCompiledCodeCache().rule(self)
+                value = eval(code, {'evt':evt, 'dev':device, 'device': device})
             except Exception as e:
                 logging.warn("EventClassInst: %s rule failure: %s",
                             self.getDmdKey(), e)
         else:
             try:
                 log.debug("regex='%s' message='%s'", self.regex, evt.message)
-                value = re.search(self.regex, evt.message, re.I)
+                value = getCompiledCodeCache().regex(self, re.I).search(evt.message)
             except sre_constants.error: pass
         return value
 
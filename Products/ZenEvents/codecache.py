@@ -0,0 +1,144 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""Per-process cache of compiled event class transforms, rules and regexes.
+
+Event class transforms, mapping rules and mapping regexes are stored as
+source strings on the persistent objects.  Compiling them for every event
+is expensive, so the compiled objects are cached here keyed by the path of
+the owning object.  Each entry remembers the hash and text of the source it
+was compiled from; when the source is edited the entry no longer matches
+and is recompiled on the next lookup.
+"""
+
+import logging
+import re
+import threading
+
+log = logging.getLogger("zen.Events.codecache")
+
+TRANSFORM = "transform"
+RULE = "rule"
+REGEX = "regex"
+
+
+class CompiledCodeCache(object):
+    """
+    Cache of compiled code objects and regular expressions.
+
+    Entries are keyed by (kind, path, flags) and validated against the
+    source text so that edited transforms, rules and regexes are never
+    served stale.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def transform(self, obj):
+        """Return the compiled transform code of obj."""
+        return self._get(
+            (TRANSFORM, _pathOf(obj), 0),
+            obj.transform,
+            lambda src: compile(src, "<string>", "exec"),
+        )
+
+    def rule(self, obj):
+        """Return the compiled rule expression of obj."""
+        return self._get(
+            (RULE, _pathOf(obj), 0),
+            obj.rule,
+            lambda src: compile(src, "<string>", "eval"),
+        )
+
+    def regex(self, obj, flags=0):
+        """Return the compiled regex of obj for the given flags."""
+        return self._get(
+            (REGEX, _pathOf(obj), flags),
+            obj.regex,
+            lambda src: re.compile(src, flags),
+        )
+
+    def warm(self, objects):
+        """
+        Precompile the transforms, rules and regexes of the given event
+        classes and mappings.  Sources that fail to compile are skipped;
+        they are reported when an event first uses them.
+        """
+        for obj in objects:
+            for kind, args in (
+                (TRANSFORM, ()), (RULE, ()), (REGEX, (0,)), (REGEX, (re.I,))
+            ):
+                if not getattr(obj, kind, None):
+                    continue
+                try:
+                    getattr(self, kind)(obj, *args)
+                except Exception as ex:
+                    log.debug("Unable to precompile %s of %s: %s",
+                              kind, _pathOf(obj), ex)
+
+    def invalidate(self, path):
+        """Drop all entries compiled for the object at path."""
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == path]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def ratio(self):
+        """Fraction of lookups that were served from the cache."""
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _get(self, key, source, compiler):
+        sourceHash = hash(source)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entryHash, entrySource, compiled = entry
+            if entryHash == sourceHash and entrySource == source:
+                self.hits += 1
+                return compiled
+        self.misses += 1
+        # Compile errors propagate to the caller; nothing is cached for
+        # them so the error is reported again on the next lookup.
+        compiled = compiler(source)
+        with self._lock:
+            self._entries[key] = (sourceHash, source, compiled)
+        log.debug("Compiled %s for %s", key[0], key[1])
+        return compiled
+
+
+def _pathOf(obj):
+    return obj.getPrimaryId()
+
+
+_cache = CompiledCodeCache()
+
+
+def getCompiledCodeCache():
+    """Return the process wide CompiledCodeCache."""
+    return _cache
@@ -23,6 +23,8 @@ from Products.AdvancedQuery import Eq, Or
 from zope.component import getUtility, getUtilitiesFor
 from Acquisition import aq_chain
 from Products.ZenEvents import ZenEventClasses
+from Products.ZenEvents.mappingindex import EventClassMappingIndex
+from contextlib import contextmanager
 from itertools import ifilterfalse
 
 from zenoss.protocols.jsonformat import to_dict
@@ -71,8 +73,10 @@ class Manager(object):
         COMPONENT: DeviceComponent,
     }
 
-    def __init__(self, dmd):
+    def __init__(self, dmd, useMappingIndex=False):
         self.dmd = dmd
+        self._useMappingIndex = useMappingIndex
+        self._batchCache = None
         self._initCatalogs()
 
     def _initCatalogs(self):
@@ -86,8 +90,45 @@ class Manager(object):
             DEVICE: self._devices,
         }
 
+        if self._useMappingIndex:
+            self._mappingIndex = EventClassMappingIndex(self._events)
+        else:
+            self._mappingIndex = None
+
     def reset(self):
         self._initCatalogs()
+        if self._batchCache is not None:
+            self._batchCache = {}
+
+    @contextmanager
+    def batch(self):
+        """
+        Share device, element and organizer lookups between the events
+        processed within the context.  The caller must not sync the
+        database within the context, so the model cannot change.
+        """
+        self._batchCache = {}
+        try:
+            yield
+        finally:
+            self._batchCache = None
+
+    def _batchLookup(self, key, func, *args):
+        cache = self._batchCache
+        if cache is None:
+            return func(*args)
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = func(*args)
+            return value
+
+    def invalidateMappings(self, oids):
+        """
+        Notify the event class mapping index of invalidated oids.
+        """
+        if self._mappingIndex is not None:
+            self._mappingIndex.invalidate(oids)
 
     def getEventClassOrganizer(self, eventClassName):
         try:
@@ -100,15 +141,19 @@ class Manager(object):
         """
         Find a Device's EventClass
         """
+        find = self._mappingIndex.find if self._mappingIndex else None
         return self._events.lookup(eventContext.eventProxy,
-                                   eventContext.deviceObject)
+                                   eventContext.deviceObject,
+                                   find=find)
 
     def getElementByUuid(self, uuid):
         """
         Get a Device/Component by UUID
         """
         if uuid:
-            return self._guidManager.getObject(uuid)
+            return self._batchLookup(
+                ("element", uuid), self._guidManager.getObject, uuid
+            )
 
     def uuidFromBrain(self, brain):
         """
@@ -212,7 +257,6 @@ class Manager(object):
 
         return device_brains, devices
 
-    @FunctionCache("findDeviceUuid", cache_miss_marker=-1, default_timeout=300)
     def findDeviceUuid(self, identifier, ipAddress):
         """
         This will return the device's
@@ -221,6 +265,11 @@ class Manager(object):
         @type  ipaddress: string
         @param ipaddress: The known ipaddress of the device
         """
+        return self._batchLookup(("device", identifier, ipAddress),
+                                 self._findDeviceUuid, identifier, ipAddress)
+
+    @FunctionCache("findDeviceUuid", cache_miss_marker=-1, default_timeout=300)
+    def _findDeviceUuid(self, identifier, ipAddress):
         device_brains, devices = self._findDevices(identifier, ipAddress, limit=1)
         if device_brains:
             return self.uuidFromBrain(device_brains[0])
@@ -237,6 +286,12 @@ class Manager(object):
         """
         Looks up all the UUIDs in the tree path of an Organizer
         """
+        if self._batchCache is None:
+            return self._getUuidsOfPath(node)
+        return self._batchLookup(("path", node.getPrimaryId()),
+                                 self._getUuidsOfPath, node)
+
+    def _getUuidsOfPath(self, node):
         uuids = set()
         acquisition_chain = []
         for n in aq_chain(node.primaryAq()):
@@ -0,0 +1,110 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""In-memory index of event class mappings keyed by eventClassKey.
+
+The index replaces the per-event catalog query made by EventClass.find.
+It is built from the event class catalog and rebuilt lazily once an
+invalidated oid touches one of the indexed mappings or the catalog itself
+(mappings added, removed or moved change the catalog's length counter).
+"""
+
+import logging
+
+from time import time
+
+log = logging.getLogger("zen.Events.mappingindex")
+
+DEFAULT_MAPPING = "defaultmapping"
+
+
+class EventClassMappingIndex(object):
+    """
+    Sequence sorted mappings per eventClassKey.
+
+    The find method has the same contract as EventClass.find.
+    """
+
+    def __init__(self, events):
+        self._events = events
+        self._index = None
+        self._oids = frozenset()
+        self.builds = 0
+
+    def find(self, evClassKey):
+        """
+        Return the mappings for evClassKey in sequence number order,
+        followed by the default mappings.
+
+        @parameter evClassKey: event class key
+        @type evClassKey: string
+        @return: list of event class mappings that match evClassKey, sorted
+        @rtype: list of EventClassInst
+        """
+        if self._index is None:
+            self.build()
+        insts = list(self._index.get(evClassKey, ()))
+        if evClassKey != DEFAULT_MAPPING:
+            insts.extend(self._index.get(DEFAULT_MAPPING, ()))
+        return insts
+
+    def build(self):
+        """Load every mapping from the event class catalog."""
+        start = time()
+        cat = self._events._getCatalog()
+        index = {}
+        oids = set()
+        for key in cat.uniqueValuesFor("eventClassKey"):
+            insts = []
+            for brain in cat({"eventClassKey": key}):
+                inst = self._events.getObjByPath(brain.getPrimaryId)
+                insts.append(inst)
+                oids.add(inst._p_oid)
+            insts.sort(key=lambda x: x.sequence)
+            index[key] = tuple(insts)
+        oids.update(_catalogOids(cat))
+        oids.discard(None)
+        self._index = index
+        self._oids = frozenset(oids)
+        self.builds += 1
+        log.info(
+            "Indexed %d event class mappings for %d keys in %.2f seconds",
+            sum(len(v) for v in index.itervalues()),
+            len(index),
+            time() - start,
+        )
+
+    def invalidate(self, oids):
+        """
+        Drop the index if any of the given oids belongs to an indexed
+        mapping or to the catalog.  An oids value of None means that
+        every object must be considered invalid.  The index is rebuilt
+        on next use.
+        """
+        if self._index is None:
+            return
+        if oids is None or not self._oids.isdisjoint(oids):
+            log.debug("Event class mappings changed; rebuilding index")
+            self.clear()
+
+    def clear(self):
+        self._index = None
+        self._oids = frozenset()
+
+
+def _catalogOids(cat):
+    """
+    Return the oids of the persistent objects that change whenever a
+    mapping is indexed or unindexed.
+    """
+    catalog = getattr(cat, "_catalog", None)
+    for obj in (cat, catalog, getattr(catalog, "_length", None)):
+        oid = getattr(obj, "_p_oid", None)
+        if oid is not None:
+            yield oid
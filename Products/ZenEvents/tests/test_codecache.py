@@ -0,0 +1,89 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+import re
+
+from unittest import TestCase
+from mock import Mock
+
+from Products.ZenEvents.codecache import CompiledCodeCache
+
+
+def _makeObj(path, transform="", rule="", regex=""):
+    obj = Mock(transform=transform, rule=rule, regex=regex)
+    obj.getPrimaryId.return_value = path
+    return obj
+
+
+class CompiledCodeCacheTest(TestCase):
+    def setUp(self):
+        self.cache = CompiledCodeCache()
+
+    def test_transform_is_compiled_once(self):
+        obj = _makeObj("/zport/dmd/Events/App", transform="evt.x = 1")
+        first = self.cache.transform(obj)
+        second = self.cache.transform(obj)
+        self.assertIs(first, second)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 1)
+
+        evt = Mock()
+        exec(first, {"evt": evt})
+        self.assertEqual(evt.x, 1)
+
+    def test_edited_source_is_recompiled(self):
+        obj = _makeObj("/zport/dmd/Events/App", transform="evt.x = 1")
+        first = self.cache.transform(obj)
+        obj.transform = "evt.x = 2"
+        second = self.cache.transform(obj)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_rule(self):
+        obj = _makeObj("/zport/dmd/Events/App/instances/a", rule="evt.y > 2")
+        code = self.cache.rule(obj)
+        self.assertTrue(eval(code, {"evt": Mock(y=3)}))
+        self.assertFalse(eval(code, {"evt": Mock(y=1)}))
+
+    def test_regex_flags_are_cached_separately(self):
+        obj = _makeObj("/zport/dmd/Events/App/instances/a", regex="^abc")
+        insensitive = self.cache.regex(obj, re.I)
+        sensitive = self.cache.regex(obj)
+        self.assertIsNot(insensitive, sensitive)
+        self.assertTrue(insensitive.search("ABC"))
+        self.assertFalse(sensitive.search("ABC"))
+        self.assertIs(self.cache.regex(obj, re.I), insensitive)
+
+    def test_compile_error_is_not_cached(self):
+        obj = _makeObj("/zport/dmd/Events/App", transform="if")
+        with self.assertRaises(SyntaxError):
+            self.cache.transform(obj)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_warm_skips_bad_sources(self):
+        good = _makeObj("/a", transform="x = 1", regex="abc")
+        bad = _makeObj("/b", transform="if", regex="(")
+        self.cache.warm([good, bad])
+        self.assertEqual(len(self.cache), 3)
+
+    def test_invalidate(self):
+        obj = _makeObj("/a", transform="x = 1", rule="True")
+        self.cache.warm([obj])
+        self.cache.invalidate("/a")
+        self.assertEqual(len(self.cache), 0)
+
+    def test_clear(self):
+        obj = _makeObj("/a", transform="x = 1")
+        self.cache.transform(obj)
+        self.cache.transform(obj)
+        self.cache.clear()
+        self.assertEqual(
+            self.cache.stats(), {"size": 0, "hits": 0, "misses": 0}
+        )
@@ -0,0 +1,91 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from unittest import TestCase
+from mock import Mock
+
+from Products.ZenEvents.mappingindex import EventClassMappingIndex
+
+
+class EventClassMappingIndexTest(TestCase):
+    def setUp(self):
+        self.mappings = {}
+        self.keys = {}
+        for n, (key, seq) in enumerate(
+            (("a", 2), ("a", 0), ("b", 0), ("defaultmapping", 1),
+             ("defaultmapping", 0))
+        ):
+            path = "/zport/dmd/Events/instances/%s_%d" % (key, n)
+            inst = Mock(eventClassKey=key, sequence=seq, _p_oid="oid%d" % n)
+            self.mappings[path] = inst
+            self.keys.setdefault(key, []).append(path)
+
+        catalog = Mock()
+        catalog.uniqueValuesFor.return_value = list(self.keys)
+        catalog.side_effect = lambda q: [
+            Mock(getPrimaryId=p) for p in self.keys.get(q["eventClassKey"], [])
+        ]
+        catalog._p_oid = "catalog"
+        catalog._catalog._p_oid = "_catalog"
+        catalog._catalog._length._p_oid = "_length"
+
+        self.events = Mock()
+        self.events._getCatalog.return_value = catalog
+        self.events.getObjByPath.side_effect = self.mappings.get
+        self.index = EventClassMappingIndex(self.events)
+
+    def _sequences(self, insts):
+        return [(i.eventClassKey, i.sequence) for i in insts]
+
+    def test_find_sorts_and_appends_defaults(self):
+        self.assertEqual(
+            self._sequences(self.index.find("a")),
+            [("a", 0), ("a", 2), ("defaultmapping", 0), ("defaultmapping", 1)],
+        )
+
+    def test_find_defaultmapping(self):
+        self.assertEqual(
+            self._sequences(self.index.find("defaultmapping")),
+            [("defaultmapping", 0), ("defaultmapping", 1)],
+        )
+
+    def test_find_unknown_key(self):
+        self.assertEqual(
+            self._sequences(self.index.find("zzz")),
+            [("defaultmapping", 0), ("defaultmapping", 1)],
+        )
+
+    def test_index_is_built_once(self):
+        self.index.find("a")
+        self.index.find("b")
+        self.assertEqual(self.index.builds, 1)
+
+    def test_unrelated_invalidation_keeps_index(self):
+        self.index.find("a")
+        self.index.invalidate({"device": 1})
+        self.index.find("a")
+        self.assertEqual(self.index.builds, 1)
+
+    def test_mapping_invalidation_rebuilds_index(self):
+        self.index.find("a")
+        self.index.invalidate({"oid1": 1})
+        self.index.find("a")
+        self.assertEqual(self.index.builds, 2)
+
+    def test_catalog_invalidation_rebuilds_index(self):
+        self.index.find("a")
+        self.index.invalidate(["_length"])
+        self.index.find("a")
+        self.assertEqual(self.index.builds, 2)
+
+    def test_invalidate_everything(self):
+        self.index.find("a")
+        self.index.invalidate(None)
+        self.index.find("a")
+        self.assertEqual(self.index.builds, 2)
@@ -1,8 +1,11 @@
 from unittest import TestCase
 from mock import patch, call, Mock, MagicMock
+from twisted.internet import defer
 
 from Products.ZenEvents.zeneventd import (
+    BatchingTwistedQueueConsumerTask,
     CheckInputPipe,
+    DropEvent,
     Event,
     EventContext,
     EventPipelineProcessor,
@@ -110,6 +113,27 @@ class EventPipelineProcessorTest(TestCase):
         self.epp._synchronize_with_database()
         self.dmd._p_jar.sync.assert_called_once_with()
 
+    def test_processMessages(self):
+        self.epp._pipes = (CheckInputPipe(self.epp._manager),)
+        self.epp.nextSync = time() + 0.5
+        dropped = Event()
+        dropped.CopyFrom(self.message)
+        dropped.ClearField("summary")
+
+        results = self.epp.processMessages([self.message, dropped])
+
+        self.dmd._p_jar.sync.assert_called_once_with()
+        self.epp._manager.batch.assert_called_once_with()
+        self.assertEqual(len(results), 2)
+        self.assertIsInstance(results[0], ZepRawEvent)
+        self.assertIsInstance(results[1], DropEvent)
+        self.assertFalse(self.epp._inBatch)
+
+    def test_no_sync_within_batch(self):
+        self.epp._inBatch = True
+        self.epp._synchronize_with_database(force=True)
+        self.dmd._p_jar.sync.assert_not_called()
+
     def test_create_exception_event(self):
         error = Exception("test exception")
         event_context = self.epp.create_exception_event(self.message, error)
@@ -161,6 +185,104 @@ class TwistedQueueConsumerTaskTest(TestCase):
     pass
 
 
+class BatchingTwistedQueueConsumerTaskTest(TestCase):
+    def setUp(self):
+        self.patchers = [
+            patch("{zeneventd}.getUtility".format(**PATH), autospec=True),
+            patch("{zeneventd}.reactor".format(**PATH), autospec=True),
+            patch(
+                "{zeneventd}.hydrateQueueMessage".format(**PATH),
+                side_effect=lambda message, schema: message.hydrated,
+            ),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        from Products.ZenEvents.zeneventd import reactor
+
+        self.reactor = reactor
+        self.processor = Mock(spec=["processMessages"])
+        self.task = BatchingTwistedQueueConsumerTask(self.processor, 3, 0.5)
+        self.task.queueConsumer = Mock()
+        for method in ("publishMessage", "acknowledge", "reject"):
+            getattr(self.task.queueConsumer, method).side_effect = (
+                lambda *args, **kwargs: defer.succeed(None)
+            )
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def _message(self, name):
+        return Mock(name=name, hydrated=name)
+
+    def test_partial_batch_waits_for_linger(self):
+        self.task.processMessage(self._message("a"))
+        self.task.processMessage(self._message("b"))
+
+        self.processor.processMessages.assert_not_called()
+        self.reactor.callLater.assert_called_once_with(
+            0.5, self.task._lingerFlush
+        )
+
+    def test_linger_flush_processes_partial_batch(self):
+        self.processor.processMessages.return_value = [ZepRawEvent()]
+        self.task.processMessage(self._message("a"))
+
+        self.task._lingerFlush()
+
+        self.processor.processMessages.assert_called_once_with(["a"])
+        self.assertIsNone(self.task._lingerCall)
+
+    def test_full_batch_is_processed_in_order(self):
+        raw = [ZepRawEvent(), ZepRawEvent()]
+        for n, zep in enumerate(raw):
+            zep.event.event_class = "/Test/%d" % n
+        dropped = DropEvent("dropped", Event())
+        self.processor.processMessages.return_value = [raw[0], dropped, raw[1]]
+        messages = [self._message(name) for name in "abc"]
+
+        for message in messages:
+            self.task.processMessage(message)
+
+        self.processor.processMessages.assert_called_once_with(
+            ["a", "b", "c"]
+        )
+        consumer = self.task.queueConsumer
+        self.assertEqual(
+            [c[0][2] for c in consumer.publishMessage.call_args_list], raw
+        )
+        consumer.acknowledge.assert_has_calls(
+            [call(messages[0]), call(messages[1]), call(messages[2])]
+        )
+        consumer.reject.assert_not_called()
+
+    def test_failed_batch_is_rejected(self):
+        self.processor.processMessages.side_effect = RuntimeError("boom")
+        messages = [self._message(name) for name in "abc"]
+
+        results = [self.task.processMessage(message) for message in messages]
+
+        consumer = self.task.queueConsumer
+        consumer.reject.assert_has_calls(
+            [call(messages[0]), call(messages[1]), call(messages[2])]
+        )
+        consumer.acknowledge.assert_not_called()
+        consumer.publishMessage.assert_not_called()
+        failures = []
+        results[-1].addErrback(failures.append)
+        self.assertEqual(failures, [])
+        self.assertEqual(self.task._pending, [])
+
+    def test_failed_linger_flush_is_handled(self):
+        self.processor.processMessages.side_effect = RuntimeError("boom")
+        message = self._message("a")
+        self.task.processMessage(message)
+
+        self.task._lingerFlush()
+
+        self.task.queueConsumer.reject.assert_called_once_with(message)
+
+
 class EventDTwistedWorkerTest(TestCase):
     pass
 
@@ -0,0 +1,145 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from unittest import TestCase
+from mock import MagicMock, Mock, patch
+
+from twisted.internet import defer
+from zenoss.protocols.protobufs.zep_pb2 import Event, EventActor, ZepRawEvent
+
+from Products.ZenEvents.events2.processing import DropEvent
+from Products.ZenEvents.zeneventdPool import (
+    DROP,
+    PUBLISH,
+    REJECT,
+    EventDWorkerPool,
+    ShardingQueueConsumerTask,
+    _WorkerHandle,
+    _toResult,
+    shardForEvent,
+)
+
+
+def _event(device, uuid="uuid"):
+    return Event(uuid=uuid, actor=EventActor(element_identifier=device))
+
+
+class ShardForEventTest(TestCase):
+    def test_same_device_same_worker(self):
+        shards = set(
+            shardForEvent(_event("device1", uuid=str(n)), 4) for n in range(20)
+        )
+        self.assertEqual(len(shards), 1)
+
+    def test_devices_are_spread(self):
+        shards = set(
+            shardForEvent(_event("device%d" % n), 4) for n in range(100)
+        )
+        self.assertEqual(shards, {0, 1, 2, 3})
+
+    def test_no_device_uses_uuid(self):
+        shards = set(
+            shardForEvent(_event("", uuid=str(n)), 4) for n in range(100)
+        )
+        self.assertTrue(len(shards) > 1)
+
+
+class ToResultTest(TestCase):
+    def test_publish(self):
+        zep = ZepRawEvent()
+        zep.event.uuid = "abc"
+        status, payload = _toResult(zep)
+        self.assertEqual(status, PUBLISH)
+        self.assertEqual(payload, zep.SerializeToString())
+
+    def test_drop(self):
+        self.assertEqual(_toResult(DropEvent("drop")), (DROP, None))
+
+    def test_reject(self):
+        self.assertEqual(_toResult(Exception("boom")), (REJECT, None))
+
+
+class EventDWorkerPoolTest(TestCase):
+    def setUp(self):
+        self.pool = EventDWorkerPool(Mock(), 2, 2)
+        self.pool._task = Mock()
+        depth = MagicMock()
+        depth.value = 0
+        self.handle = _WorkerHandle(1, Mock(), Mock(), depth)
+        self.pool._handles = {1: self.handle}
+
+    def _queued(self):
+        return [
+            args[0][0] for args, _ in self.handle.queue.put.call_args_list
+        ]
+
+    def test_dispatch_tracks_inflight_and_depth(self):
+        message = Mock()
+
+        self.pool.dispatch(1, 7, message, "payload")
+
+        self.assertEqual(self.handle.inflight, {7: message})
+        self.assertEqual(self.handle.depth.value, 1)
+        args = self.handle.queue.put.call_args[0][0]
+        self.assertEqual((args[0], args[2]), (7, "payload"))
+
+    def test_full_worker_queue_holds_back_events(self):
+        for token in range(3):
+            self.pool.dispatch(1, token, Mock(), "payload")
+
+        self.assertEqual(self._queued(), [0, 1])
+        self.assertEqual(len(self.handle.inflight), 3)
+
+        # The worker processed an event.
+        self.handle.depth.value -= 1
+        self.pool._completed(1, 0, PUBLISH, "")
+
+        self.assertEqual(self._queued(), [0, 1, 2])
+        self.assertEqual(self.handle.depth.value, 2)
+
+    def test_completed_ignores_unknown_tokens(self):
+        self.pool._completed(1, 3, PUBLISH, "")
+        self.pool._task.completed.assert_not_called()
+
+
+class ShardingQueueConsumerTaskTest(TestCase):
+    def setUp(self):
+        self.getUtility_patcher = patch(
+            "Products.ZenEvents.zeneventd.getUtility", autospec=True
+        )
+        self.getUtility_patcher.start()
+        self.task = ShardingQueueConsumerTask(Mock(workers=2))
+        self.task.queueConsumer = Mock()
+        for method in ("publishMessage", "acknowledge", "reject"):
+            getattr(self.task.queueConsumer, method).side_effect = (
+                lambda *args, **kwargs: defer.succeed(None)
+            )
+
+    def tearDown(self):
+        self.getUtility_patcher.stop()
+
+    def test_completed_publish(self):
+        zep = ZepRawEvent()
+        zep.event.event_class = "/App"
+        message = Mock()
+        self.task.completed(message, PUBLISH, zep.SerializeToString())
+        consumer = self.task.queueConsumer
+        self.assertEqual(consumer.publishMessage.call_args[0][2], zep)
+        consumer.acknowledge.assert_called_once_with(message)
+
+    def test_completed_drop(self):
+        message = Mock()
+        self.task.completed(message, DROP, None)
+        self.task.queueConsumer.publishMessage.assert_not_called()
+        self.task.queueConsumer.acknowledge.assert_called_once_with(message)
+
+    def test_completed_reject(self):
+        message = Mock()
+        self.task.completed(message, REJECT, None)
+        self.task.queueConsumer.reject.assert_called_once_with(message)
@@ -16,6 +16,8 @@ from zope.component import getUtility, provideUtility
 from zope.component.event import objectEventNotify
 from zope.interface import implementer, implements
 from metrology import Metrology
+from metrology.instruments import Gauge
+from metrology.registry import registry
 
 from zenoss.protocols import hydrateQueueMessage
 from zenoss.protocols.interfaces import IAMQPConnectionInfo, IQueueSchema
@@ -31,6 +33,7 @@ from Products.ZenCollector.utils.maintenance import (
     QueueHeartbeatSender,
     maintenanceBuildOptions,
 )
+from Products.ZenEvents.codecache import getCompiledCodeCache
 from Products.ZenEvents.daemonlifecycle import (
     BuildOptionsEvent,
     DaemonCreatedEvent,
@@ -93,10 +96,17 @@ class EventPipelineProcessor(object):
 
     SYNC_EVERY_EVENT = False
     PROCESS_EVENT_TIMEOUT = 0
+    USE_MAPPING_INDEX = True
 
     def __init__(self, dmd):
         self.dmd = dmd
-        self._manager = Manager(self.dmd)
+        self._poll_invalidations = None
+        if self.USE_MAPPING_INDEX:
+            self._poll_invalidations = _getInvalidationPoller(dmd)
+        self._manager = Manager(
+            self.dmd,
+            useMappingIndex=self._poll_invalidations is not None,
+        )
         self._pipes = (
             EventPluginPipe(
                 self._manager, IPreEventPlugin, "PreEventPluginPipe"
@@ -127,6 +137,8 @@ class EventPipelineProcessor(object):
             timer_name = pipe.name
             self._pipe_timers[timer_name] = Metrology.timer(timer_name)
 
+        _registerCodeCacheMetrics(getCompiledCodeCache())
+
         self.reporter = MetricReporter(prefix="zenoss.zeneventd.")
         self.reporter.start()
 
@@ -136,6 +148,41 @@ class EventPipelineProcessor(object):
             self.nextSync = time()
             self.syncInterval = 0.5
 
+        # True while processing a batch of messages
+        self._inBatch = False
+
+    def processMessages(self, messages):
+        """
+        Process a batch of queue messages.  The database is synced once
+        for the whole batch and device, element and organizer lookups are
+        shared between the events of the batch.  Messages are processed
+        in order, one at a time, exactly as processMessage does.
+
+        Returns a list holding, for each message in the same order, either
+        the ZepRawEvent to publish or the exception raised while
+        processing the message (e.g. DropEvent).
+        """
+        self._synchronize_with_database(force=True)
+        results = []
+        self._inBatch = True
+        try:
+            with self._manager.batch():
+                for message in messages:
+                    try:
+                        results.append(self.processMessage(message))
+                    except Exception as e:
+                        results.append(e)
+        finally:
+            self._inBatch = False
+        return results
+
+    def warmCodeCache(self):
+        """
+        Precompile the transforms, rules and regexes of every event class
+        and mapping so event processing only runs compiled code.
+        """
+        warmCodeCache(self.dmd)
+
     def processMessage(self, message, retry=True):
         """
         Handles a queue message, can call "acknowledge" on the Queue Consumer
@@ -206,13 +253,18 @@ class EventPipelineProcessor(object):
             )
         return eventContext.zepRawEvent
 
-    def _synchronize_with_database(self):
+    def _synchronize_with_database(self, force=False):
         """sync() db if it has been longer than
         self.syncInterval seconds since the last time,
         and no _synchronize has not been called for self.syncInterval seconds
         KNOWN ISSUE: ZEN-29884
+
+        Within a batch the database is not synced; the batch syncs once
+        before processing its first message.
         """
-        if self.SYNC_EVERY_EVENT:
+        if self._inBatch:
+            return
+        if self.SYNC_EVERY_EVENT or force:
             doSync = True
         else:
             current_time = time()
@@ -220,6 +272,10 @@ class EventPipelineProcessor(object):
             self.nextSync = current_time + self.syncInterval
 
         if doSync:
+            # Poll before syncing so that every polled change is visible
+            # once the connection has synced.
+            if self._poll_invalidations is not None:
+                self._manager.invalidateMappings(self._poll_invalidations())
             self.dmd._p_jar.sync()
 
     def create_exception_event(self, message, exception):
@@ -248,6 +304,60 @@ class EventPipelineProcessor(object):
         return event_context
 
 
+def warmCodeCache(dmd):
+    """
+    Precompile the transforms, rules and regexes of every event class and
+    mapping into the process wide compiled code cache.
+    """
+    start = time()
+    events = dmd.Events
+    codecache = getCompiledCodeCache()
+    codecache.warm([events] + events.getSubEventClasses())
+    codecache.warm(events.getInstances())
+    log.info(
+        "Compiled %d transforms, rules and regexes in %.2f seconds",
+        len(codecache),
+        time() - start,
+    )
+
+
+def _getInvalidationPoller(dmd):
+    """
+    Return the storage's poll_invalidations method, or None if the storage
+    does not report invalidated oids.
+    """
+    try:
+        storage = dmd._p_jar.db().storage
+    except Exception:
+        storage = None
+    poll = getattr(storage, "poll_invalidations", None)
+    if poll is None:
+        log.info(
+            "Storage does not report invalidations; "
+            "event class mapping index is disabled"
+        )
+    return poll
+
+
+class CodeCacheGauge(Gauge):
+    """Samples a statistic of the compiled code cache."""
+
+    def __init__(self, cache, stat):
+        self.__cache = cache
+        self.__stat = stat
+
+    @property
+    def value(self):
+        return self.__cache.stats()[self.__stat]
+
+
+def _registerCodeCacheMetrics(cache):
+    for stat in ("hits", "misses", "size"):
+        name = "transformCache.%s" % stat
+        if not registry.metrics.get(name):
+            Metrology.gauge(name, CodeCacheGauge(cache, stat))
+
+
 class BaseQueueConsumerTask(object):
 
     implements(IQueueConsumerTask)
@@ -306,15 +416,129 @@ class TwistedQueueConsumerTask(BaseQueueConsumerTask):
                 yield self.queueConsumer.reject(message)
 
 
+class BatchingTwistedQueueConsumerTask(TwistedQueueConsumerTask):
+    """
+    Collects messages from the queue and processes them in batches of up
+    to batchSize messages.  A partial batch is processed once its first
+    message has waited for batchLinger seconds.
+    """
+
+    def __init__(self, processor, batchSize, batchLinger):
+        TwistedQueueConsumerTask.__init__(self, processor)
+        self.batchSize = batchSize
+        self.batchLinger = batchLinger
+        self._pending = []
+        self._lingerCall = None
+        self._batch_timer = Metrology.timer("processBatch")
+        self._batch_size_histogram = Metrology.histogram("batchSize")
+
+    def processMessage(self, message):
+        try:
+            hydrated = hydrateQueueMessage(message, self._queueSchema)
+        except Exception as e:
+            log.error("Failed to hydrate raw event: %s", e)
+            return self.queueConsumer.acknowledge(message)
+        self._pending.append((message, hydrated))
+        if len(self._pending) >= self.batchSize:
+            return self.flush()
+        if self._lingerCall is None:
+            self._lingerCall = reactor.callLater(
+                self.batchLinger, self._lingerFlush
+            )
+        return defer.succeed(None)
+
+    def _lingerFlush(self):
+        # Nothing waits for this flush, so its failures are logged here.
+        self._lingerCall = None
+        self.flush().addErrback(
+            lambda failure: log.error(
+                "Failed to flush batch: %s", failure.getTraceback()
+            )
+        )
+
+    def flush(self):
+        """Process the pending messages as one batch."""
+        if self._lingerCall is not None:
+            if self._lingerCall.active():
+                self._lingerCall.cancel()
+            self._lingerCall = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return defer.succeed(None)
+        self._batch_size_histogram.update(len(pending))
+        messages = [message for message, _ in pending]
+        try:
+            with self._batch_timer:
+                results = self.processor.processMessages(
+                    [hydrated for _, hydrated in pending]
+                )
+        except Exception:
+            log.exception("Failed to process batch of %d events", len(pending))
+            return defer.DeferredList(
+                [self.queueConsumer.reject(message) for message in messages],
+                consumeErrors=True,
+            )
+        return self._publishAndAcknowledge(messages, results)
+
+    @defer.inlineCallbacks
+    def _publishAndAcknowledge(self, messages, results):
+        # Publish every processed event first, preserving the batch order,
+        # then acknowledge or reject the messages as a group.
+        outcomes = []
+        for message, result in zip(messages, results):
+            if isinstance(result, ZepRawEvent):
+                if log.isEnabledFor(logging.DEBUG):
+                    # assume to_dict() is expensive.
+                    log.debug("Publishing event: %s", to_dict(result))
+                outcomes.append(
+                    self.queueConsumer.publishMessage(
+                        EXCHANGE_ZEP_ZEN_EVENTS,
+                        self._routing_key(result),
+                        result,
+                        declareExchange=False,
+                    )
+                )
+            else:
+                outcomes.append(defer.fail(result))
+        outcomes = yield defer.DeferredList(outcomes, consumeErrors=True)
+
+        replies = []
+        for message, (success, value) in zip(messages, outcomes):
+            if success:
+                replies.append(self.queueConsumer.acknowledge(message))
+                continue
+            error = value.value
+            if isinstance(error, DropEvent):
+                if log.isEnabledFor(logging.DEBUG):
+                    # assume to_dict() is expensive.
+                    log.debug("%s - %s", error.message, to_dict(error.event))
+                replies.append(self.queueConsumer.acknowledge(message))
+            else:
+                if isinstance(error, ProcessingException):
+                    log.error("%s - %s", error.message, to_dict(error.event))
+                log.error("Failed to process event: %s", value.getTraceback())
+                replies.append(self.queueConsumer.reject(message))
+        yield defer.DeferredList(replies, consumeErrors=True)
+
+
 class EventDTwistedWorker(object):
-    def __init__(self, dmd):
+    def __init__(self, dmd, batchSize=1, batchLinger=0.1):
         super(EventDTwistedWorker, self).__init__()
         self._amqpConnectionInfo = getUtility(IAMQPConnectionInfo)
         self._queueSchema = getUtility(IQueueSchema)
-        self._consumer_task = TwistedQueueConsumerTask(
-            EventPipelineProcessor(dmd)
-        )
+        processor = EventPipelineProcessor(dmd)
+        processor.warmCodeCache()
+        if batchSize > 1:
+            self._consumer_task = BatchingTwistedQueueConsumerTask(
+                processor, batchSize, batchLinger
+            )
+        else:
+            self._consumer_task = TwistedQueueConsumerTask(processor)
         self._consumer = QueueConsumer(self._consumer_task, dmd)
+        if batchSize > 1:
+            # The broker must deliver a whole batch before any message of
+            # it is acknowledged.
+            self._consumer.setPrefetch(batchSize)
 
     def run(self):
         reactor.callWhenRunning(self._start)
@@ -346,6 +570,9 @@ class ZenEventD(ZCmdBase):
         EventPipelineProcessor.PROCESS_EVENT_TIMEOUT = (
             self.options.process_event_timeout
         )
+        EventPipelineProcessor.USE_MAPPING_INDEX = (
+            not self.options.disable_mapping_index
+        )
         self._heartbeatSender = QueueHeartbeatSender(
             "localhost", "zeneventd", self.options.heartbeatTimeout
         )
@@ -397,6 +624,16 @@ class ZenEventD(ZCmdBase):
                 "set to 0 to disable"
             ),
         )
+        self.parser.add_option(
+            "--disable-mapping-index",
+            dest="disable_mapping_index",
+            action="store_true",
+            default=False,
+            help=(
+                "Query the event class catalog for every event instead of"
+                " using the in-memory index of event class mappings."
+            ),
+        )
         self.parser.add_option(
             "--messagesperworker",
             dest="messagesPerWorker",
@@ -410,6 +647,52 @@ class ZenEventD(ZCmdBase):
                 " out of order."
             ),
         )
+        self.parser.add_option(
+            "--forkworkers",
+            dest="forkWorkers",
+            action="store_true",
+            default=False,
+            help=(
+                "Fork the worker processes from a supervisor that has"
+                " already loaded zeneventd and compiled the event class"
+                " transforms. The supervisor consumes the raw event queue"
+                " and shards events between the workers by device, so"
+                " events of one device are processed in order."
+            ),
+        )
+        self.parser.add_option(
+            "--workerqueuesize",
+            dest="workerQueueSize",
+            default=50,
+            type="int",
+            help=(
+                "Maximum number of events queued for each forked worker."
+                " The supervisor prefetches the number of workers times"
+                " this many events from the raw event queue and holds"
+                " back the events of busy workers. Default is 50."
+            ),
+        )
+        self.parser.add_option(
+            "--batchsize",
+            dest="batchSize",
+            default=1,
+            type="int",
+            help=(
+                "Process events in batches of up to this many messages,"
+                " syncing the database and publishing once per batch."
+                " Default is 1, which processes one event at a time."
+            ),
+        )
+        self.parser.add_option(
+            "--batchlinger",
+            dest="batchLinger",
+            default=0.1,
+            type="float",
+            help=(
+                "Maximum number of seconds a partial batch waits for more"
+                " messages before it is processed. Default is 0.1."
+            ),
+        )
         self.parser.add_option(
             "--maxpickle",
             dest="maxpickle",
@@ -38,7 +38,12 @@ def onDaemonCreated(daemon, event):
     """
     register_eventlet()
     if daemon.options.daemon or daemon.options.cycle:
-        daemon._workers = ProcessWorkers(daemon.options.workers, exec_worker, "Event worker")
+        if daemon.options.forkWorkers:
+            from .zeneventdPool import EventDWorkerPool
+            daemon._workers = EventDWorkerPool(daemon, daemon.options.workers,
+                                               daemon.options.workerQueueSize)
+        else:
+            daemon._workers = ProcessWorkers(daemon.options.workers, exec_worker, "Event worker")
 
 @adapter(ZenEventD, DaemonStartRunEvent)
 def onDaemonStartRun(daemon, event):
@@ -49,6 +54,9 @@ def onDaemonStartRun(daemon, event):
     from .zeneventdWorkers import EventDEventletWorker
     # Free up unnecessary database resources in parent zeneventd process
     if daemon.options.daemon or daemon.options.cycle:
+        if daemon.options.forkWorkers:
+            # Compile the transforms once; the forked workers inherit them
+            daemon._workers.warm()
         daemon.closedb()
         daemon.closeAll()
         daemon._workers.startWorkers()
@@ -0,0 +1,358 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""Pool of forked zeneventd pipeline workers.
+
+The supervisor process loads zeneventd, compiles the event class
+transforms and then forks the workers, so each worker starts with the
+component registry and the compiled code cache already in memory.  The
+database connection is not shared; every worker opens its own.
+
+The supervisor consumes the raw event queue and hands each event to the
+worker selected by hashing the event's device.  Workers process their
+events in order and send the results back to the supervisor, which
+publishes them and acknowledges the queue messages.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import zlib
+
+from collections import deque
+from itertools import count
+from Queue import Empty
+from time import time
+
+from metrology import Metrology
+from metrology.instruments import Gauge
+from twisted.internet import defer, reactor, task
+from zenoss.protocols import hydrateQueueMessage
+from zenoss.protocols.protobufs.zep_pb2 import Event, ZepRawEvent
+
+from Products.ZenEvents.events2.processing import DropEvent
+from Products.ZenEvents.zeneventd import (
+    EXCHANGE_ZEP_ZEN_EVENTS,
+    QUEUE_RAW_ZEN_EVENTS,
+    BaseQueueConsumerTask,
+    EventPipelineProcessor,
+    warmCodeCache,
+)
+from Products.ZenMessaging.queuemessaging.QueueConsumer import QueueConsumer
+from Products.ZenUtils.ZCmdBase import ZCmdBase
+
+log = logging.getLogger("zen.eventd.pool")
+
+# Result statuses sent from the workers to the supervisor.
+PUBLISH = "publish"
+DROP = "drop"
+REJECT = "reject"
+
+WORKER_CHECK_INTERVAL = 5
+
+
+def shardForEvent(event, workers):
+    """
+    Return the index of the worker that processes the event.  Events of
+    the same device always map to the same worker.
+    """
+    actor = event.actor
+    key = actor.element_identifier or actor.element_uuid or event.uuid
+    if isinstance(key, unicode):
+        key = key.encode("utf-8")
+    return (zlib.crc32(key) & 0xFFFFFFFF) % workers
+
+
+class SharedValueGauge(Gauge):
+    """Samples a multiprocessing.Value shared with the supervisor."""
+
+    def __init__(self, value):
+        self.__value = value
+
+    @property
+    def value(self):
+        return self.__value.value
+
+
+class _WorkerHandle(object):
+    """The supervisor's view of one forked worker."""
+
+    def __init__(self, workerId, process, queue, depth):
+        self.workerId = workerId
+        self.process = process
+        self.queue = queue
+        self.depth = depth
+        # Queue messages sent to the worker, keyed by token.
+        self.inflight = {}
+        # (token, payload) of the events held back while the worker's
+        # queue is full.
+        self.backlog = deque()
+
+
+class EventDWorkerPool(object):
+    """
+    Supervises a pool of forked pipeline workers.
+
+    Implements the startWorkers, shutdown and sendSignal methods used by
+    the zeneventd lifecycle handlers for ProcessWorkers.
+    """
+
+    def __init__(self, daemon, workers, queueSize):
+        self._daemon = daemon
+        self.workers = max(1, workers)
+        self._queueSize = queueSize
+        self._handles = {}
+        self._results = None
+        self._task = None
+        self._consumer = None
+        self._monitor = None
+        self._shutdown = False
+
+    def warm(self):
+        """Fill the caches inherited by the forked workers."""
+        warmCodeCache(self._daemon.dmd)
+
+    def startWorkers(self):
+        """
+        Fork the workers and start consuming the raw event queue once the
+        reactor is running.  The daemon's database connection must be
+        closed before this is called.
+        """
+        self._results = multiprocessing.Queue()
+        for workerId in range(self.workers):
+            self._handles[workerId] = self._startWorker(workerId)
+        self._task = ShardingQueueConsumerTask(self)
+        self._consumer = QueueConsumer(self._task, None)
+        self._consumer.setPrefetch(self.workers * self._queueSize)
+        reactor.callWhenRunning(self._start)
+
+    def _start(self):
+        reader = threading.Thread(
+            target=self._readResults, name="zeneventd-pool-results"
+        )
+        reader.daemon = True
+        reader.start()
+        self._monitor = task.LoopingCall(self._checkWorkers)
+        self._monitor.start(WORKER_CHECK_INTERVAL, now=False)
+        self._consumer.run()
+
+    def _startWorker(self, workerId):
+        queue = multiprocessing.Queue()
+        depth = multiprocessing.Value("i", 0)
+        process = multiprocessing.Process(
+            target=runWorker,
+            name="zeneventd-worker-%d" % workerId,
+            args=(self._daemon, workerId, queue, self._results, depth),
+        )
+        process.daemon = True
+        process.start()
+        log.info("Started worker %d  pid=%s", workerId, process.pid)
+        return _WorkerHandle(workerId, process, queue, depth)
+
+    def dispatch(self, workerId, token, message, payload):
+        """
+        Queue an event for a worker.  The event is held back while the
+        worker already has queueSize events queued.
+        """
+        handle = self._handles[workerId]
+        handle.inflight[token] = message
+        handle.backlog.append((token, payload))
+        self._drain(handle)
+
+    def _drain(self, handle):
+        while handle.backlog and handle.depth.value < self._queueSize:
+            token, payload = handle.backlog.popleft()
+            with handle.depth.get_lock():
+                handle.depth.value += 1
+            handle.queue.put((token, time(), payload))
+
+    def _readResults(self):
+        # Runs in its own thread; results are handled in the reactor.
+        while True:
+            result = self._results.get()
+            if result is None:
+                break
+            reactor.callFromThread(self._completed, *result)
+
+    def _completed(self, workerId, token, status, payload):
+        handle = self._handles.get(workerId)
+        message = handle.inflight.pop(token, None) if handle else None
+        if message is None:
+            # The worker was restarted and its messages requeued.
+            return
+        self._drain(handle)
+        return self._task.completed(message, status, payload)
+
+    def _checkWorkers(self):
+        for workerId, handle in self._handles.items():
+            if self._shutdown:
+                continue
+            if handle.process.is_alive():
+                self._drain(handle)
+                continue
+            log.warning(
+                "Worker %d (pid %s) exited with code %s; restarting it",
+                workerId,
+                handle.process.pid,
+                handle.process.exitcode,
+            )
+            for message in handle.inflight.values():
+                self._consumer.reject(message, requeue=True)
+            self._handles[workerId] = self._startWorker(workerId)
+
+    def sendSignal(self, signum):
+        for handle in self._handles.values():
+            if handle.process.is_alive():
+                log.debug("Sending signal %s to %s", signum, handle.process.pid)
+                os.kill(handle.process.pid, signum)
+
+    def shutdown(self):
+        """
+        Stop consuming and ask the workers to exit once they have drained
+        their queues.  Unacknowledged messages are redelivered by the
+        broker.
+        """
+        self._shutdown = True
+        if self._monitor is not None and self._monitor.running:
+            self._monitor.stop()
+        if self._consumer is not None:
+            self._consumer.shutdown()
+        for handle in self._handles.values():
+            handle.queue.put(None)
+        for handle in self._handles.values():
+            handle.process.join(WORKER_CHECK_INTERVAL)
+            if handle.process.is_alive():
+                log.warning("Terminating worker %d", handle.workerId)
+                handle.process.terminate()
+        if self._results is not None:
+            self._results.put(None)
+        self._handles = {}
+
+
+class ShardingQueueConsumerTask(BaseQueueConsumerTask):
+    """
+    Consumes the raw event queue on behalf of an EventDWorkerPool and
+    publishes the events processed by the workers.
+    """
+
+    def __init__(self, pool):
+        BaseQueueConsumerTask.__init__(self, None)
+        self.queue = self._queueSchema.getQueue(QUEUE_RAW_ZEN_EVENTS)
+        self._pool = pool
+        self._tokens = count()
+
+    def processMessage(self, message):
+        try:
+            hydrated = hydrateQueueMessage(message, self._queueSchema)
+        except Exception as e:
+            log.error("Failed to hydrate raw event: %s", e)
+            return self.queueConsumer.acknowledge(message)
+        workerId = shardForEvent(hydrated, self._pool.workers)
+        self._pool.dispatch(
+            workerId,
+            next(self._tokens),
+            message,
+            hydrated.SerializeToString(),
+        )
+
+    @defer.inlineCallbacks
+    def completed(self, message, status, payload):
+        try:
+            if status == PUBLISH:
+                zepRawEvent = ZepRawEvent()
+                zepRawEvent.ParseFromString(payload)
+                yield self.queueConsumer.publishMessage(
+                    EXCHANGE_ZEP_ZEN_EVENTS,
+                    self._routing_key(zepRawEvent),
+                    zepRawEvent,
+                    declareExchange=False,
+                )
+                yield self.queueConsumer.acknowledge(message)
+            elif status == DROP:
+                yield self.queueConsumer.acknowledge(message)
+            else:
+                yield self.queueConsumer.reject(message)
+        except Exception as e:
+            log.exception(e)
+            yield self.queueConsumer.reject(message)
+
+
+def runWorker(daemon, workerId, queue, results, depth):
+    """
+    Entry point of a forked worker.  Opens a database connection and
+    processes the events queued by the supervisor until it receives None.
+    """
+    # The handlers inherited from the supervisor manage the pool itself.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(
+        signal.SIGUSR1,
+        lambda signum, frame: ZCmdBase.sighandler_USR1(daemon, signum, frame),
+    )
+
+    daemon.zodbConnect()
+    daemon.getDataRoot()
+    daemon.login()
+
+    processor = EventPipelineProcessor(daemon.dmd)
+    processor.reporter.add_tags({"workerId": str(workerId)})
+    Metrology.gauge("eventWorker.queueDepth", SharedValueGauge(depth))
+    latency = Metrology.timer("eventWorker.latency")
+    batchSize = max(1, getattr(daemon.options, "batchSize", 1))
+    log.info("Worker %d ready  pid=%s", workerId, os.getpid())
+
+    stopping = False
+    while not stopping:
+        items = [queue.get()]
+        while len(items) < batchSize:
+            try:
+                items.append(queue.get_nowait())
+            except Empty:
+                break
+        if None in items:
+            stopping = True
+            items = items[:items.index(None)]
+        if not items:
+            continue
+
+        events = []
+        for _, _, payload in items:
+            event = Event()
+            event.ParseFromString(payload)
+            events.append(event)
+        if len(events) > 1:
+            outcomes = processor.processMessages(events)
+        else:
+            outcomes = [_processOne(processor, events[0])]
+
+        for (token, dispatched, _), outcome in zip(items, outcomes):
+            # The depth is decremented first, so the supervisor can queue
+            # another event when it handles the result.
+            with depth.get_lock():
+                depth.value -= 1
+            results.put((workerId, token) + _toResult(outcome))
+            latency.update(time() - dispatched)
+    log.info("Worker %d stopped", workerId)
+
+
+def _processOne(processor, event):
+    try:
+        return processor.processMessage(event)
+    except Exception as e:
+        return e
+
+
+def _toResult(outcome):
+    if isinstance(outcome, ZepRawEvent):
+        return (PUBLISH, outcome.SerializeToString())
+    if isinstance(outcome, DropEvent):
+        return (DROP, None)
+    log.error("Failed to process event: %s", outcome)
+    return (REJECT, None)
@@ -16,6 +16,7 @@ import time
 from amqplib.client_0_8.exceptions import AMQPConnectionException
 from zope.component import getUtility
 from Products.ZenEvents.zeneventd import BaseQueueConsumerTask, EventPipelineProcessor
+from Products.ZenEvents.zeneventd import EventDTwistedWorker
 from Products.ZenEvents.zeneventd import QUEUE_RAW_ZEN_EVENTS
 from Products.ZenMessaging.queuemessaging.eventlet import BasePubSubMessageTask
 from Products.ZenUtils.ZCmdBase import ZCmdBase
@@ -65,7 +66,17 @@ class EventDEventletWorker(ZCmdBase):
         signal.signal(signal.SIGTERM, self._sigterm)
         mypid = str(os.getpid())
         log.info("in worker, current pid: %s", mypid)
-        task = EventletQueueConsumerTask(EventPipelineProcessor(self.dmd))
+        if self.options.batchSize > 1:
+            # Batches are collected with a linger timer, which needs the
+            # reactor based consumer.
+            log.info("processing events in batches of up to %s messages",
+                     self.options.batchSize)
+            EventDTwistedWorker(self.dmd, self.options.batchSize,
+                                self.options.batchLinger).run()
+            return
+        processor = EventPipelineProcessor(self.dmd)
+        processor.warmCodeCache()
+        task = EventletQueueConsumerTask(processor)
         self._listen(task)
 
     def shutdown(self):
@@ -83,6 +94,12 @@ class EventDEventletWorker(ZCmdBase):
                     help='Sets the number of messages each worker gets from the queue at any given time. Default is 1. '
                     'Change this only if event processing is deemed slow. Note that increasing the value increases the '
                     'probability that events will be processed out of order.')
+        self.parser.add_option('--batchsize', dest='batchSize', default=1, type="int",
+                    help='Process events in batches of up to this many messages, syncing the database and '
+                    'publishing once per batch. Default is 1, which processes one event at a time.')
+        self.parser.add_option('--batchlinger', dest='batchLinger', default=0.1, type="float",
+                    help='Maximum number of seconds a partial batch waits for more messages before it is '
+                    'processed. Default is 0.1.')
         self.parser.add_option('--maxpickle', dest='maxpickle', default=100, type="int",
                     help='Sets the number of pickle files in var/zeneventd/failed_transformed_events.')
         self.parser.add_option('--pickledir', dest='pickledir', default=zenPath('var/zeneventd/failed_transformed_events'),
@@ -0,0 +1,128 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""
+Measure OID to MIB name lookups using captured trap packets.
+
+    python -m Products.ZenEvents.zentrap.bench [--repeat N] PREFIX...
+
+PREFIX is the file prefix given to zentrap's --captureFilePrefix option.
+The varbind OIDs of the captured packets are resolved against the OID
+map stored in Redis, using both the OidTree index and the previous
+prefix-by-prefix dict lookup.
+"""
+
+from __future__ import absolute_import, print_function, division
+
+import argparse
+import timeit
+
+from Products.ZenCollector.configcache.cache.storage import OidMapStore
+from Products.ZenUtils.RedisUtils import getRedisClient, getRedisUrl
+
+from .oidmap import OidMap, OidTree
+from .replay import PacketReplay
+
+
+def dict_to_name(oidmap, oid, strip):
+    """The OID lookup used before OidTree, for comparison."""
+    oidlist = oid.split(".")
+    for i in range(len(oidlist), 0, -1):
+        name = oidmap.get(".".join(oidlist[:i]), None)
+        if name is None:
+            continue
+        oid_trail = oidlist[i:]
+        if len(oid_trail) > 0 and not strip:
+            return "%s.%s" % (name, ".".join(oid_trail))
+        return name
+    return oid
+
+
+def measure(lookup, oids, repeat):
+    """Return the average time, in seconds, of one varbind's lookups."""
+    # Each varbind is looked up twice by the varbind processors.
+    elapsed = min(
+        timeit.repeat(
+            lambda: [(lookup(oid, True), lookup(oid, False)) for oid in oids],
+            repeat=repeat,
+            number=1,
+        )
+    )
+    return elapsed / len(oids)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure OID lookups using captured trap packets"
+    )
+    parser.add_argument(
+        "prefixes",
+        nargs="+",
+        metavar="PREFIX",
+        help="File prefix of the captured packets",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of times each measurement is repeated",
+    )
+    args = parser.parse_args()
+
+    record = OidMapStore(getRedisClient(url=getRedisUrl())).get()
+    if record is None:
+        print("No oidmap found")
+        return
+    oidmap = record.oidmap
+
+    oids = [
+        ".".join(map(str, oid)).strip(".")
+        for packet in PacketReplay(args.prefixes)
+        for oid, _ in packet.variables
+    ]
+    if not oids:
+        print("No varbinds found")
+        return
+
+    start = timeit.default_timer()
+    tree = OidTree(oidmap)
+    build = timeit.default_timer() - start
+
+    resolver = OidMap(None)
+    resolver._oidmap = tree
+    lookups = (
+        ("dict", lambda oid, strip: dict_to_name(oidmap, oid, strip)),
+        (
+            "tree",
+            lambda oid, strip: resolver.to_name(
+                oid, exactMatch=False, strip=strip
+            ),
+        ),
+    )
+
+    mismatched = sum(
+        1
+        for oid in oids
+        for strip in (True, False)
+        if lookups[0][1](oid, strip) != lookups[1][1](oid, strip)
+    )
+
+    print("OID map entries:   {}".format(len(oidmap)))
+    print("Varbinds:          {}".format(len(oids)))
+    print("OidTree build (s): {:.3f}".format(build))
+    print("Mismatches:        {}".format(mismatched))
+    print()
+    print("{:<10} {:>16}".format("lookup", "per varbind (us)"))
+    for name, lookup in lookups:
+        elapsed = measure(lookup, oids, args.repeat)
+        print("{:<10} {:>16.2f}".format(name, elapsed * 1e6))
+
+
+if __name__ == "__main__":
+    main()
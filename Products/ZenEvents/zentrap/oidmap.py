@@ -16,6 +16,98 @@ from twisted.internet import defer
 log = logging.getLogger("zen.zentrap.oidmap")
 
 
+class OidTree(object):
+    """
+    Index of OID to MIB name mappings supporting longest prefix matches.
+
+    The OIDs are stored in a tree keyed by OID component so a prefix
+    match costs one dict lookup per OID component.
+    """
+
+    __slots__ = ("_names", "_root")
+
+    def __init__(self, oidmap=None):
+        """
+        Initialize an OidTree instance.
+
+        @param oidmap: Maps OID strings (e.g. '1.3.6.1') to MIB names.
+        @type oidmap: Dict[str, str]
+        """
+        self._names = {}
+        # Each node is a [name, children] list, where 'name' is None if
+        # no MIB name is mapped to the node's OID.
+        self._root = {}
+        if oidmap:
+            self.update(oidmap)
+
+    def __len__(self):
+        return len(self._names)
+
+    def update(self, added=None, removed=()):
+        """
+        Add, rename, and remove OIDs.
+
+        @param added: Maps OID strings to their new MIB names.
+        @type added: Dict[str, str]
+        @param removed: The OID strings to remove.
+        @type removed: Iterable[str]
+        """
+        for oid in removed:
+            self._remove(oid)
+        for oid, name in (added or {}).iteritems():
+            self._names[oid] = name
+            children = self._root
+            node = None
+            for part in oid.split("."):
+                node = children.get(part)
+                if node is None:
+                    node = children[part] = [None, {}]
+                children = node[1]
+            node[0] = name
+
+    def _remove(self, oid):
+        if self._names.pop(oid, None) is None:
+            return
+        path = []
+        children = self._root
+        for part in oid.split("."):
+            path.append((children, part))
+            children = children[part][1]
+        path[-1][0][path[-1][1]][0] = None
+        # Prune the nodes no longer leading to a MIB name.
+        for children, part in reversed(path):
+            name, grandchildren = children[part]
+            if name is not None or grandchildren:
+                break
+            del children[part]
+
+    def get(self, oid, default=None):
+        """Return the name mapped to exactly the given OID."""
+        return self._names.get(oid, default)
+
+    def match(self, parts):
+        """
+        Return the name mapped to the longest prefix of the OID and the
+        number of OID components in the prefix.
+
+        (None, 0) is returned if no prefix of the OID is mapped.
+
+        @param parts: The components of the OID.
+        @type parts: Sequence[str]
+        @rtype: Tuple[str | None, int]
+        """
+        found, depth = None, 0
+        children = self._root
+        for n, part in enumerate(parts, 1):
+            node = children.get(part)
+            if node is None:
+                break
+            name, children = node
+            if name is not None:
+                found, depth = name, n
+        return found, depth
+
+
 class OidMap(object):
     """
     Retrieves the OID map from ZenHub.
@@ -24,7 +116,8 @@ class OidMap(object):
     def __init__(self, app):
         self._app = app
         self._checksum = None
-        self._oidmap = {}
+        self._version = 0
+        self._oidmap = OidTree()
 
     def to_name(self, oid, exactMatch=True, strip=False):
         """
@@ -47,35 +140,42 @@ class OidMap(object):
             return self._oidmap.get(oid, oid)
 
         oidlist = oid.split(".")
-        for i in range(len(oidlist), 0, -1):
-            name = self._oidmap.get(".".join(oidlist[:i]), None)
-            if name is None:
-                continue
-
-            oid_trail = oidlist[i:]
-            if len(oid_trail) > 0 and not strip:
-                return "%s.%s" % (name, ".".join(oid_trail))
-            return name
-
-        return oid
+        name, depth = self._oidmap.match(oidlist)
+        if name is None:
+            return oid
+        if depth < len(oidlist) and not strip:
+            return "%s.%s" % (name, ".".join(oidlist[depth:]))
+        return name
 
     @defer.inlineCallbacks
     def task(self):
         log.debug("retrieving oid map")
         try:
             service = yield self._app.getRemoteConfigCacheProxy()
-            checksum, oidmap = yield service.callRemote(
-                "getOidMap", self._checksum
+            checksum, version, oidmap, changes = yield service.callRemote(
+                "getOidMap", self._checksum, version=self._version
             )
             if checksum is None:
                 if self._checksum is None:
                     log.info("waiting for the OID map to be built")
                 else:
                     log.debug("no update available for the current OID map")
+            elif changes is not None:
+                added, removed = changes
+                self._oidmap.update(added, removed)
+                self._checksum = checksum
+                self._version = version
+                log.info(
+                    "updated OID map  version=%s added=%s removed=%s",
+                    version,
+                    len(added),
+                    len(removed),
+                )
             else:
                 state = "initial" if self._checksum is None else "updated"
                 self._checksum = checksum
-                self._oidmap = oidmap
-                log.info("received %s OID map", state)
+                self._version = version
+                self._oidmap = OidTree(oidmap)
+                log.info("received %s OID map  version=%s", state, version)
         except Exception:
             log.exception("failed to retrieve oid map")
@@ -85,7 +85,7 @@ class PacketReplay(collections.Iterable):
     def _filenames(self):
         return sorted(
             name
-            for prefix in self._fileprefix
+            for prefix in self._fileprefixes
             for name in glob.glob(prefix + "*")
         )
 
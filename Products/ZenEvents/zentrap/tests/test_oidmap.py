@@ -4,7 +4,7 @@ from unittest import TestCase
 
 from mock import Mock
 
-from ..oidmap import OidMap
+from ..oidmap import OidMap, OidTree
 
 
 class TestOidMap(TestCase):
@@ -21,34 +21,34 @@ class TestOidMap(TestCase):
         t.assertEqual(t.oidmap.to_name(".1.2.3.4", strip=True), "1.2.3.4")
 
     def test_HasExactMatch(t):
-        t.oidmap._oidmap = {"1.2.3.4": "Zenoss.Test.exactMatch"}
+        t.oidmap._oidmap = OidTree({"1.2.3.4": "Zenoss.Test.exactMatch"})
         result = t.oidmap.to_name(".1.2.3.4")
         t.assertEqual(result, "Zenoss.Test.exactMatch")
         result = t.oidmap.to_name(".1.2.3.4", strip=True)
         t.assertEqual(result, "Zenoss.Test.exactMatch")
 
     def test_NoInexactMatch(t):
-        t.oidmap._oidmap = {"1.2.3.4": "Zenoss.Test.exactMatch"}
+        t.oidmap._oidmap = OidTree({"1.2.3.4": "Zenoss.Test.exactMatch"})
         result = t.oidmap.to_name(".1.5.3.4", exactMatch=False)
         t.assertEqual(result, "1.5.3.4")
 
     def test_HasInexactMatchNotStripped(t):
-        t.oidmap._oidmap = {
+        t.oidmap._oidmap = OidTree({
             "1.2": "Zenoss",
             "1.2.3": "Zenoss.Test",
             "1.2.3.2": "Zenoss.Test.inexactMatch"
-        }
+        })
         result = t.oidmap.to_name(".1.2.3.2.5", exactMatch=False)
         t.assertEqual(result, "Zenoss.Test.inexactMatch.5")
         result = t.oidmap.to_name(".1.2.3.2.5.6", exactMatch=False)
         t.assertEqual(result, "Zenoss.Test.inexactMatch.5.6")
 
     def test_HasInexactMatchStripped(t):
-        t.oidmap._oidmap = {
+        t.oidmap._oidmap = OidTree({
             "1.2": "Zenoss",
             "1.2.3": "Zenoss.Test",
             "1.2.3.2": "Zenoss.Test.inexactMatch"
-        }
+        })
         result = t.oidmap.to_name(".1.2.3.2.5", exactMatch=False, strip=True)
         t.assertEqual(result, "Zenoss.Test.inexactMatch")
         result = t.oidmap.to_name(".1.2.3.2.5.6", exactMatch=False, strip=True)
@@ -56,3 +56,51 @@ class TestOidMap(TestCase):
 
     def test_AcceptsTuple(t):
         t.assertEqual(t.oidmap.to_name((1, 2, 3, 4)), "1.2.3.4")
+
+    def test_InexactMatchSkipsUnmappedPrefix(t):
+        t.oidmap._oidmap = OidTree({
+            "1.2": "Zenoss",
+            "1.2.3.4.5": "Zenoss.Test.deep",
+        })
+        result = t.oidmap.to_name(".1.2.3.4.6", exactMatch=False)
+        t.assertEqual(result, "Zenoss.3.4.6")
+        result = t.oidmap.to_name("1.2.3.4.5.1", exactMatch=False)
+        t.assertEqual(result, "Zenoss.Test.deep.1")
+
+    def test_InexactMatchComparesWholeComponents(t):
+        t.oidmap._oidmap = OidTree({"1.2.3": "Zenoss.Test"})
+        result = t.oidmap.to_name("1.2.30.1", exactMatch=False)
+        t.assertEqual(result, "1.2.30.1")
+
+
+class TestOidTree(TestCase):
+    def test_empty(t):
+        tree = OidTree()
+        t.assertEqual(len(tree), 0)
+        t.assertEqual(tree.match(["1", "2"]), (None, 0))
+
+    def test_match(t):
+        tree = OidTree({"1.3.6": "a", "1.3.6.1.4": "b"})
+        t.assertEqual(tree.match("1.3.6.1.4.1".split(".")), ("b", 5))
+        t.assertEqual(tree.match("1.3.6.1".split(".")), ("a", 3))
+        t.assertEqual(tree.match("1.3".split(".")), (None, 0))
+
+    def test_get(t):
+        tree = OidTree({"1.3.6": "a"})
+        t.assertEqual(tree.get("1.3.6"), "a")
+        t.assertIsNone(tree.get("1.3"))
+
+    def test_update(t):
+        tree = OidTree({"1.3.6": "a", "1.3.6.1.4": "b", "1.3.7": "c"})
+        tree.update({"1.3.6": "renamed", "1.3.6.1.4.1": "d"}, ["1.3.7"])
+        t.assertEqual(len(tree), 3)
+        t.assertEqual(tree.get("1.3.6"), "renamed")
+        t.assertIsNone(tree.get("1.3.7"))
+        t.assertEqual(tree.match("1.3.6.1.4.1.2".split(".")), ("d", 6))
+        t.assertEqual(tree.match("1.3.7.1".split(".")), (None, 0))
+
+    def test_update_prunes_removed_branches(t):
+        tree = OidTree({"1.3.6": "a", "1.3.6.1.4": "b"})
+        tree.update(removed=["1.3.6.1.4", "1.3.6", "1.3.9"])
+        t.assertEqual(len(tree), 0)
+        t.assertEqual(tree._root, {})
@@ -127,3 +127,30 @@ class HubService(object, pb.Referenceable):
         event["manager"] = self.fqdn
         event.update(kw)
         self.zem.sendEvent(event)
+
+
+def idempotent(method=None, shared=False):
+    """
+    Mark a remote_* method of a HubService as idempotent.
+
+    ZenHub executes identical calls to an idempotent method only once
+    while such a call is in progress; every caller receives the result
+    of that one execution.  Calls are identical if they have the same
+    arguments and come from the same collector.  Set 'shared' to True
+    if the method's result does not depend on the collector.
+
+    Apply this decorator last, i.e. above any other decorators:
+
+        @idempotent(shared=True)
+        @translateError
+        def remote_getOidMap(self, checksum):
+            ...
+    """
+
+    def mark(func):
+        func.idempotent = "shared" if shared else "monitor"
+        return func
+
+    if method is not None:
+        return mark(method)
+    return mark
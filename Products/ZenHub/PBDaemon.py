@@ -216,7 +216,11 @@ class PBDaemon(ZenDaemon, pb.Referenceable):
                     publisher.defaultRedisPort,
                 )
                 port = publisher.defaultRedisPort
-            self.__publisher = publisher.RedisListPublisher(
+            if getattr(self.options, "pipelinedMetricPublisher", False):
+                factory = publisher.PipelinedRedisListPublisher
+            else:
+                factory = publisher.RedisListPublisher
+            self.__publisher = factory(
                 host,
                 port,
                 self.options.metricBufferSize,
@@ -436,10 +440,13 @@ class PBDaemon(ZenDaemon, pb.Referenceable):
             self.__eventclient.sendEvent(self.stopEvent)
             yield self.__eventclient.stop()
             self.log.debug("stopped event client")
+            self.__eventqueue.close()
         yield self.__zhclient.stop()
 
     def _setup_event_client(self):
-        self.__eventqueue = EventQueueManager(self.options, self.log)
+        self.__eventqueue = EventQueueManager(
+            self.options, self.log, name=self.name
+        )
         self.__eventclient = EventClient(
             self.options,
             self.__eventqueue,
@@ -639,6 +646,21 @@ class PBDaemon(ZenDaemon, pb.Referenceable):
             action="store_false",
             help="Disable event de-duplication",
         )
+        self.parser.add_option(
+            "--event-spool-dir",
+            dest="event_spool_dir",
+            default=None,
+            help="Directory where events are spooled, in a subdirectory "
+            "named after the daemon, when more than maxqueuelen events "
+            "are queued; events are discarded instead when not set",
+        )
+        self.parser.add_option(
+            "--event-spool-size",
+            dest="event_spool_size",
+            default=100000,
+            type="int",
+            help="Maximum number of events to spool",
+        )
 
         self.parser.add_option(
             "--redis-url",
@@ -671,6 +693,14 @@ class PBDaemon(ZenDaemon, pb.Referenceable):
             default=publisher.defaultMaxOutstandingMetrics,
             help="Max Number of metrics to allow in redis",
         )
+        self.parser.add_option(
+            "--pipelinedMetricPublisher",
+            dest="pipelinedMetricPublisher",
+            action="store_true",
+            default=False,
+            help="Encode metrics in batches and size the batches sent to "
+            "redis by their latency",
+        )
         self.parser.add_option(
             "--writeStatistics",
             dest="writeStatistics",
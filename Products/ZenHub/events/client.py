@@ -39,7 +39,10 @@ class EventClient(object):
         self.__flushinterval = options.eventflushseconds
         self.__flushchunksize = options.eventflushchunksize
         self.__maxqueuelength = options.maxqueuelen
-        self.__limit = options.maxqueuelen * options.queueHighWaterMark
+        capacity = options.maxqueuelen
+        if getattr(options, "event_spool_dir", None):
+            capacity += options.event_spool_size
+        self.__limit = capacity * options.queueHighWaterMark
 
         self.__task = task.LoopingCall(self._push)
         self.__taskd = None
@@ -10,6 +10,7 @@
 import time
 
 from collections import OrderedDict
+from itertools import chain
 
 from Products.ZenHub.interfaces import ICollectorEventFingerprintGenerator
 
@@ -33,6 +34,8 @@ class DeDupingEventQueue(BaseEventQueue):
         )
         if not self.__fingerprinters:
             self.__fingerprinters = [DefaultFingerprintGenerator()]
+        # Events put back by extendleft, ahead of the events in __queue.
+        self.__front = OrderedDict()
         self.__queue = OrderedDict()
 
     def append(self, event):
@@ -41,24 +44,33 @@ class DeDupingEventQueue(BaseEventQueue):
             event["rcvtime"] = time.time()
 
         fingerprint = self._fingerprint_event(event)
-        if fingerprint in self.__queue:
-            # Remove the currently queued item - we will insert again which
-            # will move to the end.
-            current_event = self.__queue.pop(fingerprint)
+        current_event = self.__pop(fingerprint)
+        if current_event is not None:
+            # The currently queued item was removed - we will insert again
+            # which will move to the end.
             event["count"] = current_event.get("count", 1) + 1
             event["firstTime"] = self._first_time(current_event, event)
             self.__queue[fingerprint] = event
             return
 
         discarded = None
-        if len(self.__queue) == self.maxlen:
+        if len(self) == self.maxlen:
             discarded = self.popleft()
 
         self.__queue[fingerprint] = event
         return discarded
 
+    def pop_duplicate(self, event):
+        """
+        Removes and returns the queued event having the same fingerprint
+        as the event, or returns None if there is no such event.
+        """
+        return self.__pop(self._fingerprint_event(event))
+
     def popleft(self):
         try:
+            if self.__front:
+                return self.__front.popitem(last=False)[1]
             return self.__queue.popitem(last=False)[1]
         except KeyError:
             # Re-raise KeyError as IndexError for common interface across
@@ -70,8 +82,8 @@ class DeDupingEventQueue(BaseEventQueue):
         events_to_add = []
         for event in events:
             fingerprint = self._fingerprint_event(event)
-            if fingerprint in self.__queue:
-                current_event = self.__queue[fingerprint]
+            current_event = self.__get(fingerprint)
+            if current_event is not None:
                 current_event["count"] = current_event.get("count", 1) + 1
                 current_event["firstTime"] = self._first_time(
                     current_event, event
@@ -81,27 +93,49 @@ class DeDupingEventQueue(BaseEventQueue):
 
         if not events_to_add:
             return events_to_add
-        available = self.maxlen - len(self.__queue)
+        available = self.maxlen - len(self)
         if not available:
             return events_to_add
         to_discard = 0
         if available < len(events_to_add):
             to_discard = len(events_to_add) - available
-        old_queue, self.__queue = self.__queue, OrderedDict()
+        # Only the events put back earlier are moved, so that putting back
+        # a batch of events doesn't cost more as the queue grows.
+        old_front, self.__front = self.__front, OrderedDict()
         for event in events_to_add[to_discard:]:
-            self.__queue[self._fingerprint_event(event)] = event
-        for fingerprint, event in old_queue.iteritems():
-            self.__queue[fingerprint] = event
+            self.__front[self._fingerprint_event(event)] = event
+        for fingerprint, event in old_front.iteritems():
+            self.__front[fingerprint] = event
         return events_to_add[:to_discard]
 
     def __contains__(self, event):
-        return self._fingerprint_event(event) in self.__queue
+        fingerprint = self._fingerprint_event(event)
+        return fingerprint in self.__front or fingerprint in self.__queue
 
     def __len__(self):
-        return len(self.__queue)
+        return len(self.__front) + len(self.__queue)
 
     def __iter__(self):
-        return self.__queue.itervalues()
+        return chain(self.__front.itervalues(), self.__queue.itervalues())
+
+    def iteritems(self):
+        """
+        Returns an iterator over the fingerprints and events in the queue
+        (oldest events are returned first).
+        """
+        return chain(self.__front.iteritems(), self.__queue.iteritems())
+
+    def __get(self, fingerprint):
+        event = self.__front.get(fingerprint)
+        if event is None:
+            event = self.__queue.get(fingerprint)
+        return event
+
+    def __pop(self, fingerprint):
+        event = self.__front.pop(fingerprint, None)
+        if event is None:
+            event = self.__queue.pop(fingerprint, None)
+        return event
 
     def _fingerprint_event(self, event):
         for fingerprinter in self.__fingerprinters:
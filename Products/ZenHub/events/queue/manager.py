@@ -7,6 +7,7 @@
 #
 ##############################################################################
 
+import os
 import time
 
 from collections import deque
@@ -29,6 +30,7 @@ from Products.ZenHub.interfaces import (
 from .misc import load_utilities
 from .deduping import DeDupingEventQueue
 from .deque import DequeEventQueue
+from .spooling import SpoolingEventQueue
 
 
 class EventQueueManager(object):
@@ -40,8 +42,13 @@ class EventQueueManager(object):
         "eventClass",
     )
 
-    def __init__(self, options, log):
+    def __init__(self, options, log, name=None):
+        """
+        @param name: The name of the daemon; its events are spooled in a
+            subdirectory of the spool directory having that name.
+        """
         self.options = options
+        self.name = name
         self.transformers = load_utilities(ICollectorEventTransformer)
         self.log = log
         self.discarded_events = 0
@@ -72,16 +79,46 @@ class EventQueueManager(object):
         )
 
     def _initQueues(self):
+        self.close()
         maxlen = self.options.maxqueuelen
         queue_type = (
             DeDupingEventQueue
             if self.options.deduplicate_events
             else DequeEventQueue
         )
-        self.event_queue = queue_type(maxlen)
-        self.perf_event_queue = queue_type(maxlen)
+        self.event_queue = self._createQueue(queue_type, maxlen, "events")
+        self.perf_event_queue = self._createQueue(
+            queue_type, maxlen, "perf_events"
+        )
         self.heartbeat_event_queue = deque(maxlen=1)
 
+    def _createQueue(self, queue_type, maxlen, name):
+        spool_dir = getattr(self.options, "event_spool_dir", None)
+        if not spool_dir:
+            return queue_type(maxlen)
+        if self.name:
+            spool_dir = os.path.join(spool_dir, self.name)
+        path = os.path.join(spool_dir, name)
+        try:
+            return SpoolingEventQueue(
+                maxlen, queue_type, path, self.options.event_spool_size
+            )
+        except (IOError, OSError) as ex:
+            self.log.error(
+                "unable to spool events, queueing them in memory only  "
+                "path=%s error=%s",
+                path,
+                ex,
+            )
+            return queue_type(maxlen)
+
+    def close(self):
+        """Writes the queued events to disk when they are spooled."""
+        for name in ("event_queue", "perf_event_queue"):
+            queue = getattr(self, name, None)
+            if isinstance(queue, SpoolingEventQueue):
+                queue.close()
+
     def _transformEvent(self, event):
         for transformer in self.transformers:
             result = transformer.transform(event)
@@ -176,13 +213,12 @@ class EventQueueManager(object):
 
     @defer.inlineCallbacks
     def sendEvents(self, event_sender_fn):
-        # Create new queues - we will flush the current queues and don't want
-        # to get in a loop sending events that are queued while we send this
-        # batch (the event sending is asynchronous).
-        prev_heartbeat_event_queue = self.heartbeat_event_queue
-        prev_perf_event_queue = self.perf_event_queue
-        prev_event_queue = self.event_queue
-        self._initQueues()
+        # Only send the events queued so far - we don't want to get in a
+        # loop sending events that are queued while we send this batch (the
+        # event sending is asynchronous).
+        heartbeats_left = len(self.heartbeat_event_queue)
+        perf_events_left = len(self.perf_event_queue)
+        events_left = len(self.event_queue)
 
         perf_events = []
         events = []
@@ -192,30 +228,39 @@ class EventQueueManager(object):
                 chunk_remaining = self.options.eventflushchunksize
                 heartbeat_events = []
                 num_heartbeat_events = min(
-                    chunk_remaining, len(prev_heartbeat_event_queue)
+                    chunk_remaining,
+                    heartbeats_left,
+                    len(self.heartbeat_event_queue),
                 )
                 for _ in six.moves.range(num_heartbeat_events):
                     heartbeat_events.append(
-                        prev_heartbeat_event_queue.popleft()
+                        self.heartbeat_event_queue.popleft()
                     )
                 chunk_remaining -= num_heartbeat_events
 
                 perf_events = []
                 num_perf_events = min(
-                    chunk_remaining, len(prev_perf_event_queue)
+                    chunk_remaining,
+                    perf_events_left,
+                    len(self.perf_event_queue),
                 )
                 for _ in six.moves.range(num_perf_events):
-                    perf_events.append(prev_perf_event_queue.popleft())
+                    perf_events.append(self.perf_event_queue.popleft())
                 chunk_remaining -= num_perf_events
 
                 events = []
-                num_events = min(chunk_remaining, len(prev_event_queue))
+                num_events = min(
+                    chunk_remaining, events_left, len(self.event_queue)
+                )
                 for _ in six.moves.range(num_events):
-                    events.append(prev_event_queue.popleft())
+                    events.append(self.event_queue.popleft())
                 return heartbeat_events, perf_events, events
 
             heartbeat_events, perf_events, events = chunk_events()
             while heartbeat_events or perf_events or events:
+                heartbeats_left -= len(heartbeat_events)
+                perf_events_left -= len(perf_events)
+                events_left -= len(events)
                 self.log.debug(
                     "sending %d events, %d perf events, %d heartbeats",
                     len(events),
@@ -234,8 +279,8 @@ class EventQueueManager(object):
 
             defer.returnValue(sent)
         except Exception:
-            # Restore performance events that failed to send
-            perf_events.extend(prev_perf_event_queue)
+            # Restore performance events that failed to send; the events
+            # that weren't sent yet are still queued.
             discarded_perf_events = self.perf_event_queue.extendleft(
                 perf_events
             )
@@ -243,7 +288,6 @@ class EventQueueManager(object):
             self._discardedEvents.mark(len(discarded_perf_events))
 
             # Restore events that failed to send
-            events.extend(prev_event_queue)
             discarded_events = self.event_queue.extendleft(events)
             self.discarded_events += len(discarded_events)
             self._discardedEvents.mark(len(discarded_events))
@@ -0,0 +1,508 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+import cPickle
+import errno
+import fcntl
+import io
+import logging
+import os
+import struct
+import time
+
+from collections import deque
+from itertools import chain
+
+from .base import BaseEventQueue
+from .deduping import DeDupingEventQueue
+
+log = logging.getLogger("zen.eventqueue.spool")
+
+_SUFFIX = ".events"
+_TMP_SUFFIX = ".tmp"
+_LOCK_NAME = "lock"
+
+# Size, in bytes, at which a new segment file is started.
+_SEGMENT_SIZE = 8 * 1024 * 1024
+
+_HEADER = struct.Struct("!I")
+
+# Record types
+_EVENT = "E"  # (_EVENT, seq, fingerprint, event)
+_DELETE = "D"  # (_DELETE, seq)
+_COUNT = "C"  # (_COUNT, seq, fingerprint, count, firstTime)
+# First record of a segment holding all the unread events of the segments
+# before it.
+_COMPACTED = "S"  # (_COMPACTED, 0)
+
+
+class EventSpool(object):
+    """
+    FIFO of events stored in append-only segment files.
+
+    An event superseded by a duplicate event is marked as deleted by a
+    record appended to the spool, and the de-duplication count of a
+    spooled event is updated the same way, so the files are never
+    rewritten.  A segment file is removed once all of its events have been
+    read.
+
+    The spool reads the files in the directory when it's opened, so the
+    events of a process that stopped are read by the next one.  Close
+    copies the unread events to a new segment replacing the others; the
+    events read by a process that didn't close the spool are read again.
+    """
+
+    def __init__(self, path, segment_size=_SEGMENT_SIZE):
+        self.path = path
+        self._segment_size = segment_size
+        self._lockfile = _lock(path)
+        # fingerprint -> [seq, count, firstTime] of the spooled events
+        self._index = {}
+        # seqs of the spooled events superseded by a later event
+        self._deleted = set()
+        self._seq = 0
+        self._count = 0
+        self._closed = False
+        for name in os.listdir(path):
+            if name.endswith(_TMP_SUFFIX):
+                _unlink(os.path.join(path, name))
+        self._segments = deque(
+            sorted(
+                int(name[: -len(_SUFFIX)])
+                for name in os.listdir(path)
+                if name.endswith(_SUFFIX)
+            )
+        )
+        # Remove the segments copied by an interrupted close.
+        for segno in reversed(self._segments):
+            if self._isCompacted(segno):
+                while self._segments[0] != segno:
+                    _unlink(self._segmentName(self._segments.popleft()))
+                break
+        replayed = set()
+        for segno in self._segments:
+            for record in self._records(segno):
+                self._replay(record, replayed)
+        # An event may be deleted without a duplicate superseding it.
+        for fingerprint, entry in self._index.items():
+            if entry[0] in self._deleted:
+                del self._index[fingerprint]
+        self._reader = None
+        self._writer = None
+        self._openWriter(self._segments[-1] + 1 if self._segments else 0)
+        if self._count:
+            log.info(
+                "found spooled events  path=%s events=%d",
+                path,
+                self._count,
+            )
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return (event for _, event in self._items())
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def get(self, fingerprint):
+        """
+        Returns the count and firstTime of the spooled event having the
+        fingerprint, as a dict, or None if there is no such event.
+        """
+        entry = self._index.get(fingerprint)
+        if entry is None:
+            return None
+        return {"count": entry[1], "firstTime": entry[2]}
+
+    def append(self, event, fingerprint=None):
+        """Appends the event, identified by the fingerprint, to the spool."""
+        self._checkOpen()
+        _dump(self._writer, self._add(event, fingerprint))
+        if self._writer.tell() >= self._segment_size:
+            self._openWriter(self._segments[-1] + 1)
+
+    def update(self, fingerprint, count, firstTime):
+        """Sets the count and firstTime of the spooled event."""
+        self._checkOpen()
+        entry = self._index[fingerprint]
+        record = (_COUNT, entry[0], fingerprint, count, firstTime)
+        _dump(self._writer, record)
+        entry[1:] = [count, firstTime]
+
+    def pop_duplicate(self, fingerprint):
+        """
+        Removes the spooled event having the fingerprint and returns its
+        count and firstTime, as a dict, or returns None if there is no
+        such event.
+        """
+        entry = self._index.pop(fingerprint, None)
+        if entry is None:
+            return None
+        self._checkOpen()
+        _dump(self._writer, (_DELETE, entry[0]))
+        self._deleted.add(entry[0])
+        self._count -= 1
+        return {"count": entry[1], "firstTime": entry[2]}
+
+    def popleft(self):
+        """
+        Removes and returns the oldest spooled event.
+
+        @raise IndexError: If the spool is empty.
+        """
+        while self._count:
+            record = self._next()
+            if record is None:
+                log.error(
+                    "spooled events are missing  path=%s events=%d",
+                    self.path,
+                    self._count,
+                )
+                self._clear()
+                break
+            event = self._live(record)
+            if event is None:
+                if record[0] == _EVENT:
+                    self._deleted.discard(record[1])
+                continue
+            entry = self._index.get(record[2])
+            if entry is not None and entry[0] == record[1]:
+                del self._index[record[2]]
+            self._count -= 1
+            if not self._count:
+                self._clear()
+            return event
+        raise IndexError()
+
+    def close(self, events=(), fingerprints=None):
+        """
+        Writes the events, identified by the fingerprints, followed by the
+        unread spooled events to a new segment file replacing the others,
+        and releases the spool's directory.
+        """
+        if self._closed:
+            return
+        self._writer.close()
+        segno = self._segments[-1] + 1
+        items = chain(
+            zip(fingerprints or [None] * len(events), events), self._items()
+        )
+        filename = self._segmentName(segno)
+        with io.open(filename + _TMP_SUFFIX, "wb") as f:
+            _dump(f, (_COMPACTED, 0))
+            for seq, (fingerprint, event) in enumerate(items, 1):
+                _dump(f, (_EVENT, seq, fingerprint, event))
+            os.fsync(f.fileno())
+        os.rename(filename + _TMP_SUFFIX, filename)
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        for old in self._segments:
+            _unlink(self._segmentName(old))
+        self._segments.clear()
+        self._index.clear()
+        self._deleted.clear()
+        self._count = 0
+        self._closed = True
+        self._lockfile.close()
+
+    def _checkOpen(self):
+        if self._closed:
+            raise ValueError("spool is closed  path=%s" % self.path)
+
+    def _items(self):
+        """Yields the fingerprint and event of the unread spooled events."""
+        segments = list(self._segments)
+        offsets = {}
+        if self._reader is not None:
+            offsets[segments[0]] = self._reader.tell()
+        for segno in segments:
+            for record in self._records(segno, offsets.get(segno)):
+                event = self._live(record)
+                if event is not None:
+                    yield record[2], event
+
+    def _add(self, event, fingerprint):
+        """Returns the record of a new spooled event."""
+        self._seq += 1
+        self._index_event(self._seq, fingerprint, event)
+        return (_EVENT, self._seq, fingerprint, event)
+
+    def _index_event(self, seq, fingerprint, event):
+        if fingerprint is not None:
+            self._index[fingerprint] = [
+                seq,
+                event.get("count", 1),
+                _first_time(event),
+            ]
+        self._count += 1
+
+    def _live(self, record):
+        """
+        Returns the event of the record, with its current count, or None if
+        the record isn't an event or the event was superseded.
+        """
+        if record[0] != _EVENT:
+            return None
+        _, seq, fingerprint, event = record
+        if seq in self._deleted:
+            return None
+        entry = self._index.get(fingerprint)
+        if (
+            entry is not None
+            and entry[0] == seq
+            and entry[1] != event.get("count", 1)
+        ):
+            event["count"] = entry[1]
+            event["firstTime"] = entry[2]
+        return event
+
+    def _replay(self, record, replayed):
+        kind, seq = record[:2]
+        self._seq = max(self._seq, seq)
+        if kind == _EVENT:
+            fingerprint, event = record[2:]
+            self._index_event(seq, fingerprint, event)
+            replayed.add(seq)
+        elif kind == _DELETE:
+            # The event may have been read before the spool was closed.
+            if seq in replayed:
+                self._deleted.add(seq)
+                self._count -= 1
+        elif kind == _COUNT:
+            fingerprint, count, firstTime = record[2:]
+            entry = self._index.get(fingerprint)
+            if entry is not None and entry[0] == seq:
+                entry[1:] = [count, firstTime]
+
+    def _next(self):
+        """Returns the next record to read, or None if there is none."""
+        while self._segments:
+            segno = self._segments[0]
+            if self._reader is None:
+                self._reader = io.open(self._segmentName(segno), "rb")
+            record = _read(self._reader)
+            if record is not None:
+                return record
+            if len(self._segments) == 1:
+                return None
+            # The segment was read; the writer is on a later segment.
+            self._reader.close()
+            self._reader = None
+            self._segments.popleft()
+            _unlink(self._segmentName(segno))
+        return None
+
+    def _clear(self):
+        """Removes the segment files once every event was read."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        self._writer.close()
+        for segno in self._segments:
+            _unlink(self._segmentName(segno))
+        segno = self._segments[-1] + 1
+        self._segments.clear()
+        self._index.clear()
+        self._deleted.clear()
+        self._count = 0
+        self._openWriter(segno)
+
+    def _records(self, segno, offset=None):
+        with io.open(self._segmentName(segno), "rb") as f:
+            if offset:
+                f.seek(offset)
+            while True:
+                record = _read(f)
+                if record is None:
+                    return
+                yield record
+
+    def _openWriter(self, segno):
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = io.open(self._segmentName(segno), "ab")
+        self._segments.append(segno)
+
+    def _segmentName(self, segno):
+        return os.path.join(self.path, "%d%s" % (segno, _SUFFIX))
+
+    def _isCompacted(self, segno):
+        with io.open(self._segmentName(segno), "rb") as f:
+            record = _read(f)
+        return record is not None and record[0] == _COMPACTED
+
+
+def _first_time(event):
+    return event.get("firstTime", event.get("rcvtime"))
+
+
+def _dump(f, record):
+    data = cPickle.dumps(record, cPickle.HIGHEST_PROTOCOL)
+    f.write(_HEADER.pack(len(data)) + data)
+    f.flush()
+
+
+def _read(f):
+    """Returns the next record of the file or None at its end."""
+    offset = f.tell()
+    header = f.read(_HEADER.size)
+    if len(header) == _HEADER.size:
+        (size,) = _HEADER.unpack(header)
+        data = f.read(size)
+        if len(data) == size:
+            return cPickle.loads(data)
+    if header:
+        # Partially written by a process that stopped.
+        f.seek(offset)
+    return None
+
+
+def _unlink(filename):
+    try:
+        os.unlink(filename)
+    except OSError as ex:
+        if ex.errno != errno.ENOENT:
+            raise
+
+
+def _lock(path):
+    """Returns the lock file claiming the directory for this process."""
+    try:
+        os.makedirs(path)
+    except OSError as ex:
+        if ex.errno != errno.EEXIST:
+            raise
+    lockfile = open(os.path.join(path, _LOCK_NAME), "a")
+    try:
+        fcntl.flock(lockfile, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except IOError:
+        lockfile.close()
+        raise
+    return lockfile
+
+
+class SpoolingEventQueue(BaseEventQueue):
+    """
+    Event queue implementation keeping up to maxlen events in memory, in a
+    queue of type queue_type, and up to spoollen more events in an
+    EventSpool. Once events are spooled, new events are spooled too until
+    the spool is empty, so events are removed in the order they were
+    queued. Duplicate events are counted across memory and the spool when
+    queue_type de-duplicates events.
+
+    Close the queue to write the events in memory to the spool.
+    """
+
+    def __init__(self, maxlen, queue_type, path, spoollen):
+        super(SpoolingEventQueue, self).__init__(maxlen)
+        self.spoollen = spoollen
+        self.__spool = EventSpool(path)
+        # Events put back by extendleft go to memory, so it must hold more
+        # than maxlen events; this queue discards events itself.
+        self.__memory = queue_type(maxlen + spoollen)
+        if isinstance(self.__memory, DeDupingEventQueue):
+            self.__fingerprint = self.__memory._fingerprint_event
+        else:
+            self.__fingerprint = None
+
+    def append(self, event):
+        # Make sure every processed event specifies the time it was queued.
+        if "rcvtime" not in event:
+            event["rcvtime"] = time.time()
+
+        if self.__spool.closed:
+            # Events queued while stopping are kept in memory only.
+            return self.__memory.append(event)
+
+        if not len(self.__spool) and (
+            len(self.__memory) < self.maxlen
+            or (self.__fingerprint is not None and event in self.__memory)
+        ):
+            return self.__memory.append(event)
+
+        fingerprint = current_event = None
+        if self.__fingerprint is not None:
+            fingerprint = self.__fingerprint(event)
+            current_event = self.__memory.pop_duplicate(event)
+            if current_event is None:
+                current_event = self.__spool.pop_duplicate(fingerprint)
+        if current_event is not None:
+            event["count"] = current_event.get("count", 1) + 1
+            event["firstTime"] = min(
+                _first_time(current_event), _first_time(event)
+            )
+
+        discarded = None
+        if current_event is None and len(self) >= self.capacity:
+            discarded = self.popleft()
+        self.__spool.append(event, fingerprint)
+        return discarded
+
+    def popleft(self):
+        if len(self.__memory):
+            return self.__memory.popleft()
+        return self.__spool.popleft()
+
+    def extendleft(self, events):
+        if not events:
+            return events
+        if self.__fingerprint is not None:
+            # De-duplicate with the spooled events; the in-memory queue
+            # de-duplicates with the events in memory.
+            events_to_add = []
+            for event in events:
+                fingerprint = self.__fingerprint(event)
+                current_event = self.__spool.get(fingerprint)
+                if current_event is None:
+                    events_to_add.append(event)
+                    continue
+                self.__spool.update(
+                    fingerprint,
+                    current_event["count"] + 1,
+                    min(_first_time(current_event), _first_time(event)),
+                )
+            events = events_to_add
+        available = self.capacity - len(self)
+        if available <= 0:
+            return events
+        to_discard = max(0, len(events) - available)
+        discarded = self.__memory.extendleft(events[to_discard:])
+        return events[:to_discard] + discarded
+
+    def close(self):
+        """Writes the events in memory to the spool and closes it."""
+        if self.__fingerprint is not None:
+            items = list(self.__memory.iteritems())
+            fingerprints = [fingerprint for fingerprint, _ in items]
+            events = [event for _, event in items]
+        else:
+            fingerprints, events = None, list(self.__memory)
+        self.__spool.close(events, fingerprints)
+
+    @property
+    def capacity(self):
+        """The number of events the queue holds before discarding events."""
+        return self.maxlen + self.spoollen
+
+    def __contains__(self, event):
+        if event in self.__memory:
+            return True
+        if self.__fingerprint is not None:
+            return self.__spool.get(self.__fingerprint(event)) is not None
+        return any(event == spooled for spooled in self.__spool)
+
+    def __len__(self):
+        return len(self.__memory) + len(self.__spool)
+
+    def __iter__(self):
+        return chain(self.__memory, self.__spool)
@@ -1,4 +1,7 @@
 import collections
+import os
+import shutil
+import tempfile
 
 from unittest import TestCase
 from mock import MagicMock, Mock, create_autospec, call
@@ -8,6 +11,7 @@ from mock import MagicMock, Mock, create_autospec, call
 from Products.ZenHub.PBDaemon import Clear, defer
 from ..deduping import DeDupingEventQueue
 from ..manager import EventQueueManager, TRANSFORM_DROP, TRANSFORM_STOP
+from ..spooling import SpoolingEventQueue
 
 PATH = {"src": "Products.ZenHub.PBDaemon"}
 
@@ -47,6 +51,38 @@ class EventQueueManagerTest(TestCase):
         t.assertIsInstance(eqm.heartbeat_event_queue, collections.deque)
         t.assertEqual(eqm.heartbeat_event_queue.maxlen, 1)
 
+    def test_initQueues_spooling(t):
+        path = tempfile.mkdtemp()
+        t.addCleanup(shutil.rmtree, path)
+        options = Mock(
+            name="options",
+            spec_set=[
+                "maxqueuelen",
+                "deduplicate_events",
+                "event_spool_dir",
+                "event_spool_size",
+            ],
+        )
+        options.maxqueuelen = 5
+        options.deduplicate_events = True
+        options.event_spool_dir = path
+        options.event_spool_size = 10
+        log = Mock(name="logger.log", spec_set=[])
+
+        eqm = EventQueueManager(options, log, name="zenping")
+        eqm._initQueues()
+
+        t.assertIsInstance(eqm.event_queue, SpoolingEventQueue)
+        t.assertEqual(eqm.event_queue.maxlen, 5)
+        t.assertEqual(eqm.event_queue.spoollen, 10)
+        t.assertIsInstance(eqm.perf_event_queue, SpoolingEventQueue)
+        t.assertEqual(os.listdir(path), ["zenping"])
+        t.assertEqual(
+            sorted(os.listdir(os.path.join(path, "zenping"))),
+            ["events", "perf_events"],
+        )
+        eqm.close()
+
     def test_transformEvent(t):
         """a transformer mutates and returns an event"""
 
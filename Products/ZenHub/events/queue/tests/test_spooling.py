@@ -0,0 +1,288 @@
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from ..deduping import DeDupingEventQueue
+from ..deque import DequeEventQueue
+from ..spooling import EventSpool, SpoolingEventQueue
+
+def _events(*names):
+    return [{"name": name, "rcvtime": 0} for name in names]
+
+
+class EventSpoolTest(TestCase):
+    def setUp(t):
+        t.path = tempfile.mkdtemp()
+        t.addCleanup(shutil.rmtree, t.path)
+
+    def test_popleft_in_order(t):
+        spool = EventSpool(t.path, segment_size=64)
+        events = _events("a", "b", "c", "d")
+        for event in events:
+            spool.append(event)
+
+        t.assertEqual(len(spool), 4)
+        t.assertEqual(list(spool), events)
+        t.assertEqual([spool.popleft() for _ in range(4)], events)
+        with t.assertRaises(IndexError):
+            spool.popleft()
+
+    def test_read_segments_are_removed(t):
+        spool = EventSpool(t.path, segment_size=64)
+        for event in _events("a", "b", "c", "d"):
+            spool.append(event)
+        segments = [n for n in os.listdir(t.path) if n.endswith(".events")]
+        t.assertGreater(len(segments), 1)
+
+        for _ in range(4):
+            spool.popleft()
+
+        segments = [n for n in os.listdir(t.path) if n.endswith(".events")]
+        t.assertEqual(len(segments), 1)
+
+    def test_reopen_after_close(t):
+        spool = EventSpool(t.path)
+        events = _events("a", "b", "c")
+        for event in events:
+            spool.append(event)
+        spool.popleft()
+        spool.close(_events("z"))
+
+        spool = EventSpool(t.path)
+
+        t.assertEqual(list(spool), _events("z") + events[1:])
+
+    def test_reopen_after_several_closes(t):
+        expected = []
+        for cycle in range(5):
+            spool = EventSpool(t.path, segment_size=64)
+            t.assertEqual(list(spool), expected)
+            if expected:
+                t.assertEqual(spool.popleft(), expected.pop(0))
+            events = _events(*("%d-%d" % (cycle, n) for n in range(3)))
+            for event in events:
+                spool.append(event)
+            front = _events("front-%d" % cycle)
+            spool.close(front)
+            expected = front + expected + events
+
+        spool = EventSpool(t.path)
+
+        t.assertEqual(len(spool), len(expected))
+        t.assertEqual([spool.popleft() for _ in expected], expected)
+        segments = [n for n in os.listdir(t.path) if n.endswith(".events")]
+        t.assertEqual(len(segments), 1)
+
+    def test_interrupted_close(t):
+        spool = EventSpool(t.path)
+        for event in _events("a", "b"):
+            spool.append(event)
+        spool.popleft()
+        copied = {}
+        for name in os.listdir(t.path):
+            if name.endswith(".events"):
+                with open(os.path.join(t.path, name), "rb") as f:
+                    copied[name] = f.read()
+        spool.close()
+        # The copied segments weren't removed.
+        for name, data in copied.items():
+            with open(os.path.join(t.path, name), "wb") as f:
+                f.write(data)
+
+        spool = EventSpool(t.path)
+        t.addCleanup(spool.close)
+
+        t.assertEqual(list(spool), _events("b"))
+        t.assertEqual(len(spool), 1)
+
+    def test_append_after_close(t):
+        spool = EventSpool(t.path)
+        spool.close()
+        with t.assertRaises(ValueError):
+            spool.append(_events("a")[0])
+
+    def test_reopen_without_close(t):
+        spool = EventSpool(t.path)
+        events = _events("a", "b")
+        for event in events:
+            spool.append(event)
+        spool.popleft()
+        spool._lockfile.close()
+
+        spool = EventSpool(t.path)
+
+        # Events read since the spool was opened are read again.
+        t.assertEqual(list(spool), events)
+
+    def test_directory_in_use(t):
+        spool = EventSpool(t.path)
+        t.addCleanup(spool.close)
+        with t.assertRaises(IOError):
+            EventSpool(t.path)
+
+    def test_pop_duplicate(t):
+        spool = EventSpool(t.path)
+        a, b = _events("a", "b")
+        a["count"] = 3
+        spool.append(a, "fp-a")
+        spool.append(b, "fp-b")
+
+        ret = spool.pop_duplicate("fp-a")
+
+        t.assertEqual(ret, {"count": 3, "firstTime": 0})
+        t.assertIsNone(spool.pop_duplicate("fp-a"))
+        t.assertEqual(len(spool), 1)
+        spool.close()
+        t.assertEqual(list(EventSpool(t.path)), [b])
+
+    def test_update(t):
+        spool = EventSpool(t.path)
+        (a,) = _events("a")
+        spool.append(a, "fp-a")
+
+        spool.update("fp-a", 2, -1)
+
+        t.assertEqual(spool.get("fp-a"), {"count": 2, "firstTime": -1})
+        spool.close()
+        spool = EventSpool(t.path)
+        event = spool.popleft()
+        t.assertEqual(event["count"], 2)
+        t.assertEqual(event["firstTime"], -1)
+
+    def test_partial_record_is_ignored(t):
+        spool = EventSpool(t.path)
+        spool.append(_events("a")[0])
+        spool._writer.write("\x00\x00\x01")
+        spool.close()
+
+        spool = EventSpool(t.path)
+
+        t.assertEqual(list(spool), _events("a"))
+
+
+class SpoolingEventQueueTest(TestCase):
+    def setUp(t):
+        t.path = tempfile.mkdtemp()
+        t.addCleanup(shutil.rmtree, t.path)
+        t.queue = SpoolingEventQueue(2, DequeEventQueue, t.path, 3)
+
+    def test_spools_events_in_order(t):
+        events = _events("a", "b", "c", "d")
+        for event in events:
+            t.assertIsNone(t.queue.append(event))
+
+        t.assertEqual(len(t.queue), 4)
+        t.assertEqual(list(t.queue), events)
+        t.assertIn(events[3], t.queue)
+        # Events are spooled until the spool is empty.
+        t.assertEqual(t.queue.popleft(), events[0])
+        t.queue.append(_events("e")[0])
+        t.assertEqual(list(t.queue), events[1:] + _events("e"))
+
+    def test_append_discards_oldest_when_full(t):
+        events = _events("a", "b", "c", "d", "e")
+        for event in events:
+            t.queue.append(event)
+
+        ret = t.queue.append(_events("f")[0])
+
+        t.assertEqual(ret, events[0])
+        t.assertEqual(list(t.queue), events[1:] + _events("f"))
+
+    def test_extendleft(t):
+        events = _events("a", "b", "c", "d")
+        for event in events:
+            t.queue.append(event)
+        batch = [t.queue.popleft() for _ in range(3)]
+
+        ret = t.queue.extendleft(batch)
+
+        t.assertEqual(ret, [])
+        t.assertEqual(list(t.queue), events)
+
+    def test_extendleft_returns_extra_events_if_full(t):
+        events = _events("a", "b", "c", "d")
+        for event in events:
+            t.queue.append(event)
+        extra = _events("x", "y")
+
+        ret = t.queue.extendleft(extra)
+
+        t.assertEqual(ret, extra[:1])
+        t.assertEqual(list(t.queue), extra[1:] + events)
+
+    def test_close_spools_events_in_memory(t):
+        events = _events("a", "b", "c")
+        for event in events:
+            t.queue.append(event)
+        t.queue.close()
+
+        queue = SpoolingEventQueue(2, DequeEventQueue, t.path, 3)
+
+        t.assertEqual(len(queue), 3)
+        t.assertEqual([queue.popleft() for _ in range(3)], events)
+
+
+    def test_append_after_close_keeps_events_in_memory(t):
+        t.queue.close()
+        events = _events("a", "b", "c")
+        for event in events:
+            t.queue.append(event)
+
+        t.assertEqual(list(t.queue), events)
+        t.assertEqual(t.queue.popleft(), events[0])
+
+
+class DeDupingSpoolingEventQueueTest(TestCase):
+    def setUp(t):
+        t.path = tempfile.mkdtemp()
+        t.addCleanup(shutil.rmtree, t.path)
+        t.queue = SpoolingEventQueue(2, DeDupingEventQueue, t.path, 3)
+
+    def test_append_deduplicates_spooled_event(t):
+        for event in _events("a", "b", "c", "d"):
+            t.queue.append(event)
+        event = {"name": "c", "rcvtime": 1}
+
+        ret = t.queue.append(event)
+
+        t.assertIsNone(ret)
+        t.assertEqual(len(t.queue), 4)
+        t.assertEqual([e["name"] for e in t.queue], ["a", "b", "d", "c"])
+        t.assertEqual(event["count"], 2)
+        t.assertEqual(event["firstTime"], 0)
+
+    def test_append_moves_duplicate_from_memory_to_spool(t):
+        for event in _events("a", "b", "c"):
+            t.queue.append(event)
+
+        t.queue.append({"name": "a", "rcvtime": 1})
+
+        t.assertEqual([e["name"] for e in t.queue], ["b", "c", "a"])
+
+    def test_extendleft_counts_spooled_duplicate(t):
+        for event in _events("a", "b", "c"):
+            t.queue.append(event)
+
+        ret = t.queue.extendleft(_events("c", "z"))
+
+        t.assertEqual(ret, [])
+        t.assertEqual(
+            [(e["name"], e.get("count", 1)) for e in t.queue],
+            [("z", 1), ("a", 1), ("b", 1), ("c", 2)],
+        )
+
+    def test_counts_survive_restart(t):
+        for event in _events("a", "b", "c", "c"):
+            t.queue.append(event)
+        t.queue.close()
+
+        queue = SpoolingEventQueue(2, DeDupingEventQueue, t.path, 3)
+
+        t.assertEqual(
+            [(e["name"], e.get("count", 1)) for e in queue],
+            [("a", 1), ("b", 1), ("c", 2)],
+        )
+        t.assertIn({"name": "c"}, queue)
@@ -46,6 +46,20 @@ class IDeletionEvent(IInvalidationEvent):
     """
 
 
+class IDeviceChangeSetEvent(IObjectEvent):
+    """
+    A device or its components have been updated.
+
+    Notified once per device for the invalidations processed together,
+    after the IUpdateEvent of each updated object.  Services opt in with
+    the onDeviceChangeSet decorator; the IUpdateEvent of each object is
+    still notified.
+    """
+
+    oids = Attribute("OIDs of the updated device and components")
+    paths = Attribute("Primary paths of the updated components")
+
+
 class IBatchNotifier(Interface):
     """
     Processes subdevices in batches.
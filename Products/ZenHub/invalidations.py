@@ -8,11 +8,16 @@
 ##############################################################################
 
 import logging
+import time
 
+from collections import OrderedDict
+
+from metrology import Metrology
 from twisted.internet import defer
 from zope.component import adapter, getGlobalSiteManager
 from zope.interface import implementer, providedBy
 
+from Products.ZenModel.Device import Device
 from Products.ZenModel.DeviceComponent import DeviceComponent
 from Products.ZenRelations.PrimaryPathObjectManager import (
     PrimaryPathObjectManager,
@@ -20,7 +25,7 @@ from Products.ZenRelations.PrimaryPathObjectManager import (
 from Products.ZenUtils.Utils import giveTimeToReactor
 
 from .interfaces import IInvalidationProcessor, IHubCreatedEvent
-from .zodb import UpdateEvent, DeletionEvent
+from .zodb import DeletionEvent, DeviceChangeSetEvent, UpdateEvent
 
 log = logging.getLogger("zen.zenhub.invalidations")
 INVALIDATIONS_PAUSED = "PAUSED"
@@ -32,6 +37,11 @@ class InvalidationProcessor(object):
     Registered as a global utility. Given a database hook and a list of oids,
     handles pushing updated objects to the appropriate services, which in turn
     cause collectors to be pushed updates.
+
+    Subscribers are notified of each updated or deleted object, then of one
+    DeviceChangeSetEvent per device whose objects were updated.  The
+    per-object events are unchanged; the change set is an additional event
+    for services that would rather handle a device once per batch.
     """
 
     _hub = None
@@ -40,6 +50,9 @@ class InvalidationProcessor(object):
     def __init__(self):
         self._hub_ready = defer.Deferred()
         getGlobalSiteManager().registerHandler(self.onHubCreated)
+        self._processed = Metrology.meter("zenhub.invalidations.processed")
+        self._changesets = Metrology.meter("zenhub.invalidations.changeSets")
+        self._timer = Metrology.timer("zenhub.invalidations.processTime")
 
     @adapter(IHubCreatedEvent)
     def onHubCreated(self, event):
@@ -49,7 +62,9 @@ class InvalidationProcessor(object):
     @defer.inlineCallbacks
     def processQueue(self, oids):
         yield self._hub_ready
+        start = time.time()
         handled, ignored = 0, 0
+        changesets = OrderedDict()
         for oid in oids:
             try:
                 obj = self._hub.dmd._p_jar[oid]
@@ -62,13 +77,49 @@ class InvalidationProcessor(object):
                     handled += 1
                     event = _get_event(self._hub.dmd, obj, oid)
                     yield _notify_event_subscribers(event)
+                    if isinstance(event, UpdateEvent):
+                        _add_to_changeset(changesets, event)
                 else:
                     ignored += 1
             except KeyError:
                 log.warning("object not found  oid=%r", oid)
+        for changeset in changesets.itervalues():
+            yield _notify_event_subscribers(changeset)
+        self._processed.mark(handled + ignored)
+        self._changesets.mark(len(changesets))
+        self._timer.update(int((time.time() - start) * 1000))
+        log.debug(
+            "notified subscribers  objects=%d devices=%d",
+            handled,
+            len(changesets),
+        )
         defer.returnValue((handled, ignored))
 
 
+def _add_to_changeset(changesets, event):
+    """Add the updated object to the change set of its device."""
+    obj = event.object
+    if isinstance(obj, Device):
+        device = obj
+    elif isinstance(obj, DeviceComponent):
+        try:
+            device = obj.device()
+        except Exception:
+            log.debug("no device for component  oid=%r", event.oid)
+            return
+        if device is None:
+            return
+    else:
+        return
+    key = device._p_oid
+    changeset = changesets.get(key)
+    if changeset is None:
+        changeset = changesets[key] = DeviceChangeSetEvent(device)
+    changeset.oids.append(event.oid)
+    if obj is not device:
+        changeset.paths.append(obj.getPrimaryId())
+
+
 def _get_event(dmd, obj, oid):
     try:
         # Try to get the object
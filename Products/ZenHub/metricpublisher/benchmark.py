@@ -0,0 +1,117 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""
+Measure the CPU cost of publishing metrics to redis.
+
+Publishes the datapoints of a synthetic collector through each redis
+publisher, with a redis client that stores nothing, and reports the
+number of datapoints published per second of CPU time, i.e. per
+collector core.
+
+    python -m Products.ZenHub.metricpublisher.benchmark
+"""
+
+import argparse
+import os
+
+from twisted.internet import defer
+
+from .publisher import PipelinedRedisListPublisher, RedisListPublisher
+
+
+class _Connection(object):
+    state = "connected"
+
+    def disconnect(self):
+        pass
+
+
+class _Client(object):
+    """A redis client that stores nothing."""
+
+    def multi(self):
+        return defer.succeed("OK")
+
+    def lpush(self, key, *values):
+        return defer.succeed("QUEUED")
+
+    def ltrim(self, key, start, end):
+        return defer.succeed("QUEUED")
+
+    def execute(self):
+        return defer.succeed([0, "OK"])
+
+    def discard(self):
+        return defer.succeed("OK")
+
+
+def _datapoints(devices, components, points):
+    for device in xrange(devices):
+        for component in xrange(components):
+            uuid = "%032x" % (device * components + component)
+            for point in xrange(points):
+                yield (
+                    "comp_dp%d" % point,
+                    "Devices/device%d/comp%d" % (device, component),
+                    "device%d" % device,
+                    uuid,
+                )
+
+
+def run(factory, datapoints, cycles):
+    """
+    Publish `cycles` times the datapoints and return the number of
+    datapoints published per second of CPU time.
+    """
+    publisher = factory()
+    publisher._connection = _Connection()
+    publisher._redis.client = _Client()
+    start = os.times()
+    count = 0
+    for cycle in xrange(cycles):
+        timestamp = 1500000000.0 + cycle * 300
+        for metric, key, device, uuid in datapoints:
+            # Collectors build the tags of each datapoint.
+            tags = {
+                "key": key,
+                "device": device,
+                "contextUUID": uuid,
+                "monitor": "localhost",
+                "daemon": "zenperfsnmp",
+                "internal": True,
+            }
+            publisher.put(metric, cycle * 1.5, timestamp, tags)
+            count += 1
+        while publisher._mq:
+            publisher._put(False, reschedule=False)
+    end = os.times()
+    if publisher._pubtask is not None and publisher._pubtask.active():
+        publisher._pubtask.cancel()
+    cpu = (end[0] - start[0]) + (end[1] - start[1])
+    return count / cpu if cpu else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--components", type=int, default=20)
+    parser.add_argument("--datapoints", type=int, default=5)
+    parser.add_argument("--cycles", type=int, default=5)
+    args = parser.parse_args()
+    datapoints = list(
+        _datapoints(args.devices, args.components, args.datapoints)
+    )
+    for factory in (RedisListPublisher, PipelinedRedisListPublisher):
+        rate = run(factory, datapoints, args.cycles)
+        print "%-28s %10.0f datapoints/s per core" % (factory.__name__, rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,10 @@
 
 import json as _stdlib_json
 import logging
+import math
 import os
 import sys
+import time
 
 from collections import deque
 from cookielib import CookieJar
@@ -37,6 +39,14 @@ defaultMaxOutstandingMetrics = 864000000
 bufferHighWater = 4096
 HTTP_BATCH = 100
 INITIAL_REDIS_BATCH = 2
+INITIAL_PIPELINED_BATCH = 1024
+MINIMUM_PIPELINED_BATCH = 64
+# Seconds redis may take to store a batch before the batch size shrinks.
+TARGET_BATCH_LATENCY = 0.1
+# Maximum number of metrics in one LPUSH command.
+PUSH_CHUNK = 4096
+# Maximum number of cached metric name and tag encodings.
+ENCODING_CACHE_SIZE = 65536
 
 log = logging.getLogger("zen.publisher")
 
@@ -316,6 +326,218 @@ class RedisListPublisher(BasePublisher):
             disconnect()
 
 
+class AdaptiveBatchSize(object):
+    """
+    Number of metrics sent to redis in one batch, adapted to the time
+    redis takes to store a batch.
+
+    The size doubles after a full batch is stored in less than half the
+    target latency and shrinks in proportion after a batch takes longer
+    than the target.  A failure halves the size.
+    """
+
+    def __init__(
+        self,
+        initial=INITIAL_PIPELINED_BATCH,
+        minimum=MINIMUM_PIPELINED_BATCH,
+        maximum=defaultMetricBufferSize,
+        target=TARGET_BATCH_LATENCY,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target = target
+        self.size = max(minimum, min(initial, maximum))
+
+    def success(self, count, latency):
+        """
+        Adapt the size to a batch of `count` metrics stored in `latency`
+        seconds.
+        """
+        if latency > self.target:
+            self.size = max(
+                self.minimum,
+                min(self.size, int(count * self.target / latency)),
+            )
+        elif count >= self.size and latency < self.target / 2:
+            self.size = min(self.maximum, self.size * 2)
+
+    def failure(self):
+        self.size = max(self.minimum, self.size // 2)
+
+
+_METRIC_FORMAT = '{"metric":%s,"value":%s,"timestamp":%s,"tags":%s}'
+
+
+def _encode_number(value):
+    if value is None:
+        return "null"
+    if type(value) is float:
+        if math.isnan(value) or math.isinf(value):
+            return _stdlib_json.dumps(value)
+        return repr(value)
+    if type(value) in (int, long):
+        return str(value)
+    return _dumps(value)
+
+
+def _dumps(value):
+    try:
+        return json.dumps(value)
+    except (OverflowError, ValueError):
+        # See RedisListPublisher.build_metric.
+        return _stdlib_json.dumps(value)
+
+
+class PipelinedRedisListPublisher(RedisListPublisher):
+    """
+    Publish metrics to redis, encoding whole batches at once.
+
+    The metrics are queued as tuples holding the encoded metric name and
+    tags; the encodings of metric names and tag sets are cached since
+    the same ones are published over and over.  Each batch is encoded in
+    one pass and sent as a MULTI/LPUSH/LTRIM/EXEC transaction written
+    to redis before any reply is read.  The batch size adapts to the
+    time redis takes to store the batches (see AdaptiveBatchSize).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(PipelinedRedisListPublisher, self).__init__(*args, **kwargs)
+        self._batch = AdaptiveBatchSize(maximum=self._buflen)
+        self._metric_encodings = {}
+        self._tag_encodings = {}
+
+    def build_metric(self, metric, value, timestamp, tags):
+        """
+        Return the (metric, value, timestamp, tags) tuple queued for the
+        metric, where metric and tags are JSON strings.
+        """
+        return (
+            self._encode_metric_name(metric),
+            sanitized_float(value),
+            timestamp,
+            self._encode_tags(tags),
+        )
+
+    def _encode_metric_name(self, metric):
+        encoded = self._metric_encodings.get(metric)
+        if encoded is None:
+            if len(self._metric_encodings) >= ENCODING_CACHE_SIZE:
+                self._metric_encodings.clear()
+            encoded = self._metric_encodings[metric] = _dumps(metric)
+        return encoded
+
+    def _encode_tags(self, tags):
+        try:
+            key = tuple(tags.iteritems())
+            encoded = self._tag_encodings.get(key)
+        except TypeError:
+            # unhashable tag values aren't cached
+            key = encoded = None
+        if encoded is None:
+            _tags = tags.copy()
+            for name in self._tagsToFilter:
+                _tags.pop(name, None)
+            encoded = _dumps(_tags)
+            if key is not None:
+                if len(self._tag_encodings) >= ENCODING_CACHE_SIZE:
+                    self._tag_encodings.clear()
+                self._tag_encodings[key] = encoded
+        return encoded
+
+    def encode_batch(self, batch):
+        """Return the JSON strings of a batch of queued metrics."""
+        return [
+            _METRIC_FORMAT
+            % (metric, _encode_number(value), _encode_number(timestamp), tags)
+            for metric, value, timestamp, tags in batch
+        ]
+
+    def _get_batch_size(self):
+        return self._batch.size
+
+    def _metrics_published(self, llen, metricCount, remaining=0):
+        log.debug(
+            "published %d metrics to redis, next batch size %d",
+            metricCount,
+            self._batch.size,
+        )
+        if remaining:
+            reactor.callLater(0, self._putLater, False)
+        return 0
+
+    def _put(self, scheduled, reschedule=True):
+        """
+        Push the buffer of metrics to the specified Redis channel
+        @param scheduled: Whether it was a scheduled invocation
+        """
+        if reschedule:
+            self._reschedule_pubtask(scheduled)
+
+        if len(self._mq) == 0:
+            return defer.succeed(0)
+
+        if self._flushing:
+            log.debug("metric flush to redis in progress, skipping _put")
+            return defer.succeed(len(self._mq))
+
+        if self._connection.state != "connected":
+            return defer.fail()
+
+        count = min(self._get_batch_size(), len(self._mq))
+        batch = [self._mq.popleft() for _ in xrange(count)]
+        return self._flush(batch)
+
+    @defer.inlineCallbacks
+    def _flush(self, batch):
+        try:
+            metrics = self.encode_batch(batch)
+        except Exception:
+            log.exception("unable to encode %d metrics", len(batch))
+            defer.returnValue(len(self._mq))
+        log.debug(
+            "flushing %s metrics, current batch size %s",
+            len(metrics),
+            self._batch.size,
+        )
+        client = self._redis.client
+        self._flushing = True
+        try:
+            started = time.time()
+            # Write the whole transaction before waiting for the replies.
+            replies = [client.multi()]
+            for start in xrange(0, len(metrics), PUSH_CHUNK):
+                replies.append(
+                    client.lpush(
+                        self._channel, *metrics[start : start + PUSH_CHUNK]
+                    )
+                )
+            replies.append(
+                client.ltrim(self._channel, 0, self._maxOutstandingMetrics - 1)
+            )
+            replies.append(client.execute())
+            results = yield defer.gatherResults(replies, consumeErrors=True)
+            latency = time.time() - started
+            llen = results[-1][-2]
+        except Exception as e:
+            if isinstance(e, defer.FirstError):
+                e = e.subFailure.value
+            # since we may be in a mutli redis command state,
+            # attempt to discard it
+            try:
+                yield client.discard()
+            except Exception:
+                pass
+            self._batch.failure()
+            defer.returnValue(self._publish_failed(e, metrics=batch))
+        finally:
+            self._flushing = False
+        self._batch.success(len(batch), latency)
+        yield self._metrics_published(
+            llen, metricCount=len(batch), remaining=len(self._mq)
+        )
+        defer.returnValue(len(self._mq))
+
+
 class HttpPostPublisher(BasePublisher):
     """
     Publish metrics via HTTP POST
@@ -14,6 +14,7 @@ from mock import Mock, MagicMock, create_autospec, patch
 from zope.interface.verify import verifyObject
 
 from Products.ZenHub.metricpublisher.publisher import (
+    AdaptiveBatchSize,
     BasePublisher,
     basic_auth_string_content,
     CookieAgent,
@@ -28,6 +29,7 @@ from Products.ZenHub.metricpublisher.publisher import (
     INITIAL_REDIS_BATCH,
     json,
     os,
+    PipelinedRedisListPublisher,
     RedisClientFactory,
     RedisListPublisher,
     ResponseReceiver,
@@ -276,6 +278,122 @@ class RedisPublisherTest(TestCase):
         self.pub._connection.disconnect.assert_called_once_with()
 
 
+class AdaptiveBatchSizeTest(TestCase):
+    def setUp(self):
+        self.batch = AdaptiveBatchSize(
+            initial=100, minimum=10, maximum=400, target=1.0
+        )
+
+    def test_grows_after_fast_full_batch(self):
+        self.batch.success(100, 0.1)
+        self.assertEqual(self.batch.size, 200)
+        self.batch.success(200, 0.1)
+        self.batch.success(400, 0.1)
+        self.assertEqual(self.batch.size, 400)
+
+    def test_keeps_size_after_partial_batch(self):
+        self.batch.success(50, 0.1)
+        self.assertEqual(self.batch.size, 100)
+
+    def test_keeps_size_near_target(self):
+        self.batch.success(100, 0.8)
+        self.assertEqual(self.batch.size, 100)
+
+    def test_shrinks_after_slow_batch(self):
+        self.batch.success(100, 4.0)
+        self.assertEqual(self.batch.size, 25)
+        self.batch.success(25, 100.0)
+        self.assertEqual(self.batch.size, 10)
+
+    def test_failure_halves_size(self):
+        self.batch.failure()
+        self.assertEqual(self.batch.size, 50)
+        for _ in range(5):
+            self.batch.failure()
+        self.assertEqual(self.batch.size, 10)
+
+
+class PipelinedRedisPublisherTest(TestCase):
+
+    layer = DisableLoggingLayer
+
+    def setUp(self):
+        self.pub = PipelinedRedisListPublisher()
+        self.pub._connection = create_autospec(self.pub._connection)
+        self.pub._connection.state = "connected"
+        self.client = self.pub._redis.client = Mock(
+            name="client",
+            spec_set=["multi", "lpush", "ltrim", "execute", "discard"],
+        )
+        self.client.multi.return_value = defer.succeed("OK")
+        self.client.lpush.return_value = defer.succeed("QUEUED")
+        self.client.ltrim.return_value = defer.succeed("QUEUED")
+        self.client.execute.return_value = defer.succeed([1, "OK"])
+        self.client.discard.return_value = defer.succeed("OK")
+
+    def test_encode_batch(self):
+        self.pub.put("m", "3.3", 1, {"device": "d", "internal": True})
+        self.pub.put("m", None, 1.5, {})
+        metrics = self.pub.encode_batch(self.pub._mq)
+        self.assertEqual(
+            [json.loads(m) for m in metrics],
+            [
+                {
+                    "metric": "m",
+                    "value": 3.3,
+                    "timestamp": 1,
+                    "tags": {"device": "d"},
+                },
+                {"metric": "m", "value": None, "timestamp": 1.5, "tags": {}},
+            ],
+        )
+
+    def test_reuses_tag_encodings(self):
+        self.pub.put("m1", 1, 1, {"device": "d", "key": "k"})
+        self.pub.put("m2", 2, 1, {"device": "d", "key": "k"})
+        self.assertIs(self.pub._mq[0][3], self.pub._mq[1][3])
+
+    def test_tags_changed_after_put(self):
+        tags = {"device": "d"}
+        self.pub.put("m", 1, 1, tags)
+        tags["device"] = "other"
+        self.pub.put("m", 1, 1, tags)
+        self.assertEqual(json.loads(self.pub._mq[0][3]), {"device": "d"})
+        self.assertEqual(json.loads(self.pub._mq[1][3]), {"device": "other"})
+
+    def test__put(self):
+        self.pub._reschedule_pubtask = create_autospec(
+            self.pub._reschedule_pubtask, spec_set=True
+        )
+        self.pub.put("m", "0", 1, {})
+        metrics = self.pub.encode_batch(self.pub._mq)
+        result = self.pub._put(scheduled=SCHEDULED, reschedule=True)
+        self.assertIsInstance(result, defer.Deferred)
+        self.assertEqual(len(self.pub._mq), 0)
+        self.assertFalse(self.pub._flushing)
+        self.client.lpush.assert_called_once_with(
+            self.pub._channel, *metrics
+        )
+        self.client.execute.assert_called_once_with()
+
+    def test__put_fail(self):
+        self.pub._publish_failed = create_autospec(
+            self.pub._publish_failed, spec_set=True
+        )
+        exception_instance = Exception("Boom")
+        self.client.execute.return_value = defer.fail(exception_instance)
+        self.pub.put("m", "0", 1, {})
+        batch = list(self.pub._mq)
+        size = self.pub._get_batch_size()
+        self.pub._put(scheduled=SCHEDULED, reschedule=True)
+        self.assertEqual(self.pub._get_batch_size(), size // 2)
+        self.assertFalse(self.pub._flushing)
+        self.client.discard.assert_called_once_with()
+        self.pub._publish_failed.assert_called_once_with(
+            exception_instance, metrics=batch
+        )
+
+
 class HttpPostPublisherTest(TestCase):
 
     layer = DisableLoggingLayer
@@ -0,0 +1,132 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import
+
+import datetime
+
+from metrology import Metrology
+from twisted.internet import defer
+from twisted.python.failure import Failure
+
+from .utils import getLogger
+
+# Values of the 'idempotent' attribute set by HubService's
+# idempotent decorator.
+PER_MONITOR = "monitor"
+SHARED = "shared"
+
+_scalar_types = (
+    basestring,
+    int,
+    long,
+    float,
+    bool,
+    type(None),
+    datetime.datetime,
+    datetime.date,
+)
+
+
+class ServiceCallCoalescer(object):
+    """Executes identical in-flight service calls only once.
+
+    A service call submitted while an identical call is still executing
+    is not sent to the executor.  Instead, the caller receives the result
+    of the call that is already executing.
+    """
+
+    def __init__(self):
+        # Maps call keys to the deferreds waiting for the call's result.
+        # Dict[Tuple, List[defer.Deferred]]
+        self.__inflight = {}
+        self.__coalesced = Metrology.meter("zenhub.servicecall.coalesced")
+        self.__log = getLogger(self)
+
+    def __len__(self):
+        """Return the number of distinct calls executing."""
+        return len(self.__inflight)
+
+    def submit(self, executor, call, mode=PER_MONITOR):
+        """Submit the call to the executor unless it is already executing.
+
+        Returns a deferred that fires with the result of the call.
+
+        :param executor: Executes the call.
+        :type executor: IServiceExecutor
+        :param call: The service call to execute.
+        :type call: .service.ServiceCall
+        :param mode: PER_MONITOR if the call's result depends on the
+            calling collector, or SHARED if it does not.
+        :rtype: defer.Deferred
+        """
+        key = make_call_key(call, mode)
+        if key is None:
+            return executor.submit(call)
+        d = defer.Deferred()
+        waiting = self.__inflight.get(key)
+        if waiting is not None:
+            waiting.append(d)
+            self.__coalesced.mark()
+            self.__log.debug(
+                "coalesced service call  "
+                "collector=%s service=%s method=%s id=%s waiting=%s",
+                call.monitor,
+                call.service,
+                call.method,
+                call.id.hex,
+                len(waiting),
+            )
+            return d
+        self.__inflight[key] = [d]
+        # A synchronous failure of submit is delivered as a failed
+        # deferred so the call's key is always removed.
+        defer.maybeDeferred(executor.submit, call).addBoth(
+            self.__complete, key
+        )
+        return d
+
+    def __complete(self, result, key):
+        for d in self.__inflight.pop(key, ()):
+            if isinstance(result, Failure):
+                d.errback(result)
+            else:
+                d.callback(result)
+
+
+def make_call_key(call, mode=PER_MONITOR):
+    """Return a hashable key identifying the service call's signature.
+
+    None is returned if the call's arguments cannot be represented
+    in a key.
+
+    :type call: .service.ServiceCall
+    :rtype: Union[Tuple, None]
+    """
+    try:
+        args = _freeze(call.args)
+        kwargs = _freeze(call.kwargs)
+    except TypeError:
+        return None
+    monitor = call.monitor if mode != SHARED else None
+    return (monitor, call.service, call.method, args, kwargs)
+
+
+def _freeze(value):
+    if isinstance(value, _scalar_types):
+        return value
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return ("dict",) + tuple(
+            sorted((_freeze(k), _freeze(v)) for k, v in value.iteritems())
+        )
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(_freeze(v) for v in value))
+    raise TypeError("Unsupported type %s" % (type(value).__name__,))
@@ -58,6 +58,14 @@ class ModuleObjectConfig(object):
     def task_max_retries(self):
         return self.__config.task_max_retries
 
+    @property
+    def task_deadlines(self):
+        return self.__config.task_deadlines
+
+    @property
+    def task_deadline_action(self):
+        return self.__config.task_deadline_action
+
     @property
     def pbport(self):
         return self.__config.pbport
@@ -223,6 +231,17 @@ legacy_metric_priority_map = {
 # returning it as an error.
 task_max_retries = 3
 
+# Maximum number of seconds, by priority, a task may wait in a worklist
+# before its deadline passes.  Priorities not listed have no deadline.
+task_deadlines = {
+    "CONFIG": 300,
+}
+
+# What happens to a task whose deadline has passed:
+#   "promote" -- the task is executed ahead of all other waiting tasks.
+#   "fail"    -- the task is not executed and returns an error.
+task_deadline_action = "promote"
+
 
 class defaults(object):
     """Default values for options."""
@@ -34,6 +34,7 @@ from Products.ZenHub.server.workerpool import WorkerPool
 from Products.ZenHub.server.utils import subTest
 
 from ..workers import (
+    FailExpiredTask,
     RemoteException,
     Scheduler,
     TaskDispatcher,
@@ -97,7 +98,9 @@ class WorkerPoolExecutorTest(TestCase):
             ServiceCallPriority,
             exclude=_mp.return_value,
         )
-        _zhwlist.assert_called_once_with(_ps.return_value)
+        _zhwlist.assert_called_once_with(
+            _ps.return_value, expired=None, recorder=ANY
+        )
         t.assertIsInstance(result, WorkerPoolExecutor)
         t.assertEqual(result.name, t.name)
         t.assertIs(result._worklist, _zhwlist.return_value)
@@ -165,7 +168,25 @@ class WorkerPoolExecutorTest(TestCase):
 
         t.assertFalse(dfr.called)
         t.notify.assert_called_once_with(ANY)
-        t.worklist.push.assert_called_once_with(ANY, ANY)
+        t.worklist.push.assert_called_once_with(ANY, ANY, deadline=None)
+
+    def test_submit_with_deadline(t):
+        t.executor = WorkerPoolExecutor(
+            t.name,
+            t.worklist,
+            t.pool,
+            deadlines={ServiceCallPriority.OTHER: 30.0},
+        )
+        t.executor.start(t.reactor)
+
+        call = MagicMock(spec=ServiceCall)
+        t.executor.submit(call)
+
+        task = t.worklist.push.call_args[0][1]
+        t.assertEqual(task.deadline, task.received_tm + 30.0)
+        t.worklist.push.assert_called_once_with(
+            ServiceCallPriority.OTHER, task, deadline=task.deadline
+        )
 
 
 class SchedulerTest(TestCase):
@@ -272,7 +293,9 @@ class SchedulerTest(TestCase):
 
         t.sched()
 
-        t.worklist.pushfront.assert_called_once_with(task.priority, task)
+        t.worklist.pushfront.assert_called_once_with(
+            task.priority, task, deadline=None
+        )
         t.pool.ready.assert_called_once_with(worker)
 
     def test_worklist_pop_error(t):
@@ -322,10 +345,56 @@ class SchedulerTest(TestCase):
         t.sched()
 
         t.assertFalse(t.deferLater.called)
-        t.worklist.pushfront.assert_called_once_with(task.priority, task)
+        t.worklist.pushfront.assert_called_once_with(
+            task.priority, task, deadline=None
+        )
         t.pool.ready.assert_called_once_with(worker)
 
 
+class FailExpiredTaskTest(TestCase):
+    def setUp(t):
+        t.getLogger_patcher = patch(
+            "{src}.getLogger".format(**PATH),
+            autospec=True,
+        )
+        t.getLogger = t.getLogger_patcher.start()
+        t.addCleanup(t.getLogger_patcher.stop)
+
+        t.notify_patcher = patch(
+            "{src}.notify".format(**PATH),
+            autospec=True,
+        )
+        t.notify = t.notify_patcher.start()
+        t.addCleanup(t.notify_patcher.stop)
+
+        t.expired = FailExpiredTask("default")
+
+    def test_task_fails(t):
+        call = MagicMock(spec=ServiceCall)
+        task = ServiceCallTask(call=call, worklist="default", max_retries=3)
+        task.mark_received()
+
+        t.expired(task.priority, task)
+
+        t.assertEqual(1, task.attempt)
+        t.assertTrue(task.deferred.called)
+        t.assertIsInstance(task.deferred.result.value, pb.Error)
+        t.assertEqual(2, t.notify.call_count)
+
+        # silence 'Unhandled error in Deferred'
+        task.deferred.addErrback(lambda x: None)
+
+    def test_completed_task_is_ignored(t):
+        call = MagicMock(spec=ServiceCall)
+        task = ServiceCallTask(call=call, worklist="default", max_retries=3)
+        task.deferred.callback(None)
+
+        t.expired(task.priority, task)
+
+        t.assertEqual(0, task.attempt)
+        t.assertFalse(t.notify.called)
+
+
 class TaskDispatcherTest(TestCase):
     def setUp(t):
         t.getLogger_patcher = patch(
@@ -28,6 +28,7 @@ from ..events import (
     ServiceCallStarted,
     ServiceCallCompleted,
 )
+from ..metrics import WorklistWaitRecorder
 from ..priority import (
     ModelingPaused,
     PrioritySelection,
@@ -64,21 +65,40 @@ class WorkerPoolExecutor(object):
         selection = PrioritySelection(
             ServiceCallPriority, exclude=modeling_paused
         )
-        worklist = ZenHubWorklist(selection)
-        return cls(name, worklist, pool, max_retries=config.task_max_retries)
+        deadlines = {
+            ServiceCallPriority[priority]: float(seconds)
+            for priority, seconds in config.task_deadlines.items()
+        }
+        expired = None
+        if config.task_deadline_action == "fail":
+            expired = FailExpiredTask(name)
+        worklist = ZenHubWorklist(
+            selection, expired=expired, recorder=WorklistWaitRecorder(name)
+        )
+        return cls(
+            name,
+            worklist,
+            pool,
+            max_retries=config.task_max_retries,
+            deadlines=deadlines,
+        )
 
-    def __init__(self, name, worklist, pool, max_retries=3):
+    def __init__(self, name, worklist, pool, max_retries=3, deadlines=None):
         """
         Initialize a WorkerPoolExecutor instance.
 
         @type name: str
         @type worklist: WorkList
         @type pool: WorkerPool
+        @param deadlines: Seconds a task may wait in the worklist,
+            by priority.
+        @type deadlines: Mapping[ServiceCallPriority, float]
         """
         self._name = name
         self._worklist = worklist
         self._pool = pool
         self._max_retries = max_retries
+        self._deadlines = deadlines if deadlines is not None else {}
         self._log = getLogger(self)
         self._scheduler = None
         self._loop = None
@@ -137,6 +157,9 @@ class WorkerPoolExecutor(object):
             worklist=self._name, call=call, max_retries=self._max_retries
         )
         task.mark_received()
+        timeout = self._deadlines.get(task.priority)
+        if timeout is not None:
+            task.deadline = task.received_tm + timeout
         self._log.info(
             "received task  collector=%s service=%s method=%s id=%s",
             task.call.monitor,
@@ -145,7 +168,7 @@ class WorkerPoolExecutor(object):
             task.call.id.hex,
         )
         notify(EventBuilder.received(task))
-        self._worklist.push(task.priority, task)
+        self._worklist.push(task.priority, task, deadline=task.deadline)
         return task.deferred
 
     def __repr__(self):
@@ -195,13 +218,17 @@ class Scheduler(object):
         except Exception:
             self.log.exception("unexpected failure  worklist=%s", self.name)
             if task and task.retryable:
-                self.worklist.pushfront(task.priority, task)
+                self.worklist.pushfront(
+                    task.priority, task, deadline=task.deadline
+                )
             if worker:
                 self.workers.ready(worker)
 
     def _task_done(self, worker, task, *args):
         if task.retryable:
-            self.worklist.pushfront(task.priority, task)
+            self.worklist.pushfront(
+                task.priority, task, deadline=task.deadline
+            )
             self.log.info(
                 "enqueued task for retry  "
                 "collector=%s service=%s method=%s id=%s",
@@ -213,6 +240,30 @@ class Scheduler(object):
         self.workers.ready(worker)
 
 
+class FailExpiredTask(object):
+    """
+    Fail the tasks whose deadline passed before a worker was available.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.log = getLogger(self)
+
+    def __call__(self, priority, task):
+        if task.deferred.called:
+            return
+        # The started event balances the metrics for the completed event.
+        task.mark_started("")
+        notify(EventBuilder.started(task))
+        error = pb.Error(
+            "Deadline exceeded before a worker was available "
+            "service=%s method=%s" % (task.call.service, task.call.method)
+        )
+        task.mark_failure(error)
+        _log_completed("expired", task, self.log)
+        notify(EventBuilder.completed(task, "error", error))
+
+
 class TaskDispatcher(object):
     """
     Execute (dispatch) a task to worker and handle the result.
@@ -351,6 +402,7 @@ class ServiceCallTask(object):
     started_tm = attr.ib(default=None)
     completed_tm = attr.ib(default=None)
     worker_name = attr.ib(default=None)
+    deadline = attr.ib(default=None)
 
     # These attributes are initialized in __attrs_post_init__.
     desc = attr.ib(init=False)
@@ -37,6 +37,16 @@ class IHubServerConfig(Interface):
         "Limit the number of times a ServiceCall is retried.",
     )
 
+    task_deadlines = Attribute(
+        "Maps priority names to the number of seconds a ServiceCall "
+        "may wait to be executed.",
+    )
+
+    task_deadline_action = Attribute(
+        "Either 'promote' or 'fail'; how a ServiceCall is handled "
+        "once its deadline has passed.",
+    )
+
     pbport = Attribute(
         "The port number the Perspective Broker will listen on.",
     )
@@ -18,6 +18,7 @@ from Products.ZenUtils.PBUtil import setKeepAlive
 from .auth import HubRealm
 from .avatar import HubAvatar
 from .broker import ZenPBServerFactory
+from .coalesce import ServiceCallCoalescer
 from .interface import IHubServerConfig
 from .router import ServiceCallRouter
 from .service import (
@@ -100,7 +101,9 @@ def make_service_manager(pools):
 
     # Build the ZenHub service manager
     loader = ServiceLoader()
-    factory = ServiceReferenceFactory(WorkerInterceptor, routes, executors)
+    factory = ServiceReferenceFactory(
+        WorkerInterceptor, routes, executors, ServiceCallCoalescer()
+    )
     return ServiceManager(registry, loader, factory)
 
 
@@ -80,6 +80,29 @@ def register_legacy_worklist_metrics():
     _legacy_events_meter = Metrology.meter("zenhub.eventsSent")
 
 
+class WorklistWaitRecorder(object):
+    """Records, by priority, how long service calls waited in a worklist.
+
+    The wait times, in milliseconds, are sampled by histograms named
+    zenhub.worklist.<worklist>.<priority>.wait.
+    """
+
+    def __init__(self, worklist):
+        self.__worklist = worklist
+        self.__histograms = {}
+
+    def __call__(self, priority, waited):
+        histogram = self.__histograms.get(priority)
+        if histogram is None:
+            histogram = Metrology.histogram(
+                "zenhub.worklist.{}.{}.wait".format(
+                    self.__worklist, priority.name.lower()
+                )
+            )
+            self.__histograms[priority] = histogram
+        histogram.update(_toMillis(waited))
+
+
 @adapter(ServiceCallReceived)
 def incrementLegacyMetricCounters(event):
     """Update the legacy metric counters."""
@@ -181,7 +181,7 @@ class ServiceCall(object):
 class ServiceReferenceFactory(object):
     """Builds WorkerInterceptor objects."""
 
-    def __init__(self, cls, routes, executors):
+    def __init__(self, cls, routes, executors, coalescer=None):
         """Initialize an instance of ServiceReferenceFactory.
 
         :param cls: The class this factory builds
@@ -189,9 +189,13 @@ class ServiceReferenceFactory(object):
         :type routes: Mapping[ServiceCall, str]
         :param executors: registry of executors
         :type executors: Mapping[str, ServiceExecutor]
+        :param coalescer: Shares results between identical calls.
+        :type coalescer: ServiceCallCoalescer
         """
         self.__cls = cls
         self.__kwargs = {"routes": routes, "executors": executors}
+        if coalescer is not None:
+            self.__kwargs["coalescer"] = coalescer
 
     def __call__(self, service, name, monitor):
         """Build and return a WorkerInterceptor object.
@@ -213,7 +217,9 @@ class ServiceReference(pb.Referenceable):
     service.
     """
 
-    def __init__(self, service, name, monitor, routes, executors):
+    def __init__(
+        self, service, name, monitor, routes, executors, coalescer=None
+    ):
         """Initialize an instance of ServiceReference.
 
         :param service: The service object.
@@ -224,12 +230,16 @@ class ServiceReference(pb.Referenceable):
         :type routes: Mapping[ServiceCall, str]
         :param executors: registry of executors.
         :type executors: Mapping[str, ServiceExecutor]
+        :param coalescer: Shares results between identical calls to
+            methods the service marked as idempotent.
+        :type coalescer: ServiceCallCoalescer
         """
         self.__service = service
         self.__name = name
         self.__monitor = monitor
         self.__executors = executors
         self.__routes = routes
+        self.__coalescer = coalescer
         self.__log = getLogger(self)
 
         # Required to exist by HubService derived classes.
@@ -263,7 +273,13 @@ class ServiceReference(pb.Referenceable):
                 self.__name,
                 self.__monitor,
             )
-            result = yield executor.submit(call)
+            idempotent = self.__get_idempotent(message)
+            if idempotent:
+                result = yield self.__coalescer.submit(
+                    executor, call, mode=idempotent
+                )
+            else:
+                result = yield executor.submit(call)
             response = broker.serialize(result, self.perspective)
             success = True
             defer.returnValue(response)
@@ -311,6 +327,12 @@ class ServiceReference(pb.Referenceable):
             )
         return executor
 
+    def __get_idempotent(self, message):
+        if self.__coalescer is None:
+            return None
+        method = getattr(self.__service, "remote_%s" % (message,), None)
+        return getattr(method, "idempotent", None)
+
     def __getattr__(self, attr):
         """Forward calls to the service object."""
         return getattr(self.__service, attr)
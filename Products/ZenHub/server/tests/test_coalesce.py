@@ -0,0 +1,151 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import
+
+from unittest import TestCase
+
+from mock import Mock, patch
+from twisted.internet import defer
+
+from ..coalesce import (
+    PER_MONITOR,
+    SHARED,
+    ServiceCallCoalescer,
+    make_call_key,
+)
+from ..service import ServiceCall
+
+PATH = {"src": "Products.ZenHub.server.coalesce"}
+
+
+def _call(monitor="localhost", args=("a",), kwargs=None):
+    return ServiceCall(
+        monitor=monitor,
+        service="ConfigCache",
+        method="getOidMap",
+        args=list(args),
+        kwargs=kwargs if kwargs is not None else {},
+    )
+
+
+class MakeCallKeyTest(TestCase):
+    """Test the make_call_key function."""
+
+    def test_identical_calls(self):
+        call1 = _call(kwargs={"b": [1, 2], "a": {"x": None}})
+        call2 = _call(kwargs={"a": {"x": None}, "b": [1, 2]})
+        self.assertEqual(make_call_key(call1), make_call_key(call2))
+
+    def test_different_args(self):
+        self.assertNotEqual(
+            make_call_key(_call(args=("a",))),
+            make_call_key(_call(args=("b",))),
+        )
+
+    def test_list_and_tuple_differ(self):
+        self.assertNotEqual(
+            make_call_key(_call(args=([1],))),
+            make_call_key(_call(args=((1,),))),
+        )
+
+    def test_monitor(self):
+        call1 = _call(monitor="c1")
+        call2 = _call(monitor="c2")
+        self.assertNotEqual(
+            make_call_key(call1, PER_MONITOR),
+            make_call_key(call2, PER_MONITOR),
+        )
+        self.assertEqual(
+            make_call_key(call1, SHARED), make_call_key(call2, SHARED)
+        )
+
+    def test_unsupported_argument(self):
+        self.assertIsNone(make_call_key(_call(args=(object(),))))
+
+
+class ServiceCallCoalescerTest(TestCase):
+    """Test the ServiceCallCoalescer class."""
+
+    def setUp(self):
+        self.metrology_patcher = patch(
+            "{src}.Metrology".format(**PATH),
+            autospec=True,
+        )
+        self.metrology = self.metrology_patcher.start()
+        self.addCleanup(self.metrology_patcher.stop)
+
+        self.executor = Mock(spec=["submit"])
+        self.pending = []
+
+        def submit(call):
+            d = defer.Deferred()
+            self.pending.append(d)
+            return d
+
+        self.executor.submit.side_effect = submit
+        self.coalescer = ServiceCallCoalescer()
+
+    def test_identical_calls_execute_once(self):
+        d1 = self.coalescer.submit(self.executor, _call())
+        d2 = self.coalescer.submit(self.executor, _call())
+        self.assertEqual(1, self.executor.submit.call_count)
+        self.assertEqual(1, len(self.coalescer))
+
+        self.pending[0].callback("result")
+
+        self.assertEqual("result", d1.result)
+        self.assertEqual("result", d2.result)
+        self.assertEqual(0, len(self.coalescer))
+        meter = self.metrology.meter.return_value
+        meter.mark.assert_called_once_with()
+
+    def test_different_calls_execute_separately(self):
+        self.coalescer.submit(self.executor, _call(args=("a",)))
+        self.coalescer.submit(self.executor, _call(args=("b",)))
+        self.assertEqual(2, self.executor.submit.call_count)
+
+    def test_completed_call_is_executed_again(self):
+        self.coalescer.submit(self.executor, _call())
+        self.pending[0].callback("result")
+        self.coalescer.submit(self.executor, _call())
+        self.assertEqual(2, self.executor.submit.call_count)
+
+    def test_failure_is_sent_to_every_caller(self):
+        d1 = self.coalescer.submit(self.executor, _call())
+        d2 = self.coalescer.submit(self.executor, _call())
+        handler1, handler2 = Mock(), Mock()
+        d1.addErrback(handler1)
+        d2.addErrback(handler2)
+
+        self.pending[0].errback(ValueError("boom"))
+
+        self.assertIsInstance(handler1.call_args[0][0].value, ValueError)
+        self.assertIsInstance(handler2.call_args[0][0].value, ValueError)
+        self.assertEqual(0, len(self.coalescer))
+
+    def test_immediate_result(self):
+        self.executor.submit.side_effect = lambda call: defer.succeed("now")
+        d = self.coalescer.submit(self.executor, _call())
+        self.assertEqual("now", d.result)
+        self.assertEqual(0, len(self.coalescer))
+
+    def test_submit_raises(self):
+        self.executor.submit.side_effect = RuntimeError("boom")
+        d = self.coalescer.submit(self.executor, _call())
+        handler = Mock()
+        d.addErrback(handler)
+
+        self.assertIsInstance(handler.call_args[0][0].value, RuntimeError)
+        self.assertEqual(0, len(self.coalescer))
+
+    def test_unkeyable_call_is_submitted(self):
+        call = _call(args=(object(),))
+        d = self.coalescer.submit(self.executor, call)
+        self.assertIs(self.pending[0], d)
@@ -52,6 +52,15 @@ class ModuleObjectConfigTest(TestCase):
             self.config.task_max_retries,
         )
 
+    def test_task_deadlines(self):
+        self.assertIs(self.source.task_deadlines, self.config.task_deadlines)
+
+    def test_task_deadline_action(self):
+        self.assertIs(
+            self.source.task_deadline_action,
+            self.config.task_deadline_action,
+        )
+
     def test_pbport(self):
         self.assertIs(self.source.pbport, self.config.pbport)
 
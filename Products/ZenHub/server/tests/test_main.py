@@ -123,6 +123,7 @@ class MakeServiceManagerTest(TestCase):
     """Test the make_service_manager function."""
 
     @patch("{src}.ServiceManager".format(**PATH), autospec=True)
+    @patch("{src}.ServiceCallCoalescer".format(**PATH), autospec=True)
     @patch("{src}.ServiceReferenceFactory".format(**PATH), autospec=True)
     @patch("{src}.ServiceLoader".format(**PATH), autospec=True)
     @patch("{src}.make_executors".format(**PATH), autospec=True)
@@ -137,6 +138,7 @@ class MakeServiceManagerTest(TestCase):
         _make_executors,
         _ServiceLoader,
         _ServiceReferenceFactory,
+        _ServiceCallCoalescer,
         _ServiceManager,
     ):
         pools = NonCallableMock()
@@ -153,6 +155,7 @@ class MakeServiceManagerTest(TestCase):
             WorkerInterceptor,
             _ServiceCallRouter.from_config.return_value,
             _make_executors.return_value,
+            _ServiceCallCoalescer.return_value,
         )
         _ServiceManager.assert_called_once_with(
             _ServiceRegistry.return_value,
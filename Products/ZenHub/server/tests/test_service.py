@@ -13,7 +13,7 @@ from unittest import TestCase
 
 import attr
 
-from mock import Mock, patch, call, MagicMock, sentinel
+from mock import ANY, Mock, patch, call, MagicMock, sentinel
 from zope.interface.verify import verifyObject
 
 from Products.ZenHub.errors import RemoteException
@@ -350,6 +350,51 @@ class ServiceReferenceTest(TestCase):
         self.assertIs(result, dfr.result)
         self.assertEqual(1, executor.submit.call_count)
 
+    def test_remoteMessageReceived_idempotent(self):
+        coalescer = Mock(spec=["submit"])
+        reference = ServiceReference(
+            self.service,
+            self.name,
+            self.monitor,
+            self.routes,
+            self.executors,
+            coalescer=coalescer,
+        )
+        reference.perspective = sentinel.perspective
+        self.service.remote_method.idempotent = "shared"
+        executor = Mock(spec=["submit"])
+        self.routes.get.return_value = "blah"
+        self.executors.get.return_value = executor
+
+        dfr = reference.remoteMessageReceived(self.broker, "method", [], {})
+
+        self.assertIs(coalescer.submit.return_value, dfr.result)
+        coalescer.submit.assert_called_once_with(
+            executor, ANY, mode="shared"
+        )
+        executor.submit.assert_not_called()
+
+    def test_remoteMessageReceived_not_idempotent(self):
+        coalescer = Mock(spec=["submit"])
+        reference = ServiceReference(
+            self.service,
+            self.name,
+            self.monitor,
+            self.routes,
+            self.executors,
+            coalescer=coalescer,
+        )
+        reference.perspective = sentinel.perspective
+        self.service.remote_method = Mock(spec=[])
+        executor = Mock(spec=["submit"])
+        self.routes.get.return_value = "blah"
+        self.executors.get.return_value = executor
+
+        dfr = reference.remoteMessageReceived(self.broker, "method", [], {})
+
+        self.assertIs(executor.submit.return_value, dfr.result)
+        coalescer.submit.assert_not_called()
+
     def test_remoteMessageReceived_raise_external_error(self):
         args = []
         kwargs = {}
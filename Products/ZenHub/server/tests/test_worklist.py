@@ -12,7 +12,7 @@ from __future__ import absolute_import
 import collections
 
 from itertools import cycle
-from mock import NonCallableMock
+from mock import ANY, Mock, NonCallableMock, patch
 from unittest import TestCase
 
 from ..worklist import ZenHubWorklist
@@ -131,3 +131,105 @@ class ZenHubWorklistTest(TestCase):  # noqa: D101
         # the next returned value is an uncalled deferred, not item1
         ret = self.worklist.pop()
         self.assertFalse(ret.called)
+
+
+class ZenHubWorklistDeadlineTest(TestCase):  # noqa: D101
+    def setUp(self):
+        self.time_patcher = patch("{src}.time".format(**PATH), autospec=True)
+        self.time = self.time_patcher.start()
+        self.addCleanup(self.time_patcher.stop)
+        self.time.time.return_value = 100.0
+
+        self.pvalues = ("a", "b", "c")
+        self.selection = _SimpleSelector(self.pvalues)
+        self.recorder = Mock()
+        self.worklist = ZenHubWorklist(
+            self.selection, recorder=self.recorder
+        )
+
+    def test_counts(self):
+        self.worklist.push("a", NonCallableMock(spec_set=[]))
+        self.worklist.push("b", NonCallableMock(spec_set=[]))
+        self.worklist.pushfront("b", NonCallableMock(spec_set=[]))
+        self.assertEqual(3, len(self.worklist))
+        self.assertEqual(1, self.worklist.count("a"))
+        self.assertEqual(2, self.worklist.count("b"))
+        self.assertEqual(0, self.worklist.count("c"))
+
+    def test_wait_is_recorded(self):
+        item = NonCallableMock(spec_set=[])
+        self.worklist.push("b", item)
+        self.time.time.return_value = 102.5
+        self.assertEqual(item, self.worklist.pop().result)
+        self.recorder.assert_called_once_with("b", 2.5)
+
+    def test_unexpired_deadline_keeps_order(self):
+        item1 = NonCallableMock(spec_set=[])
+        item2 = NonCallableMock(spec_set=[])
+        self.worklist.push("a", item1)
+        self.worklist.push("c", item2, deadline=110.0)
+        self.assertEqual(item1, self.worklist.pop().result)
+        self.assertEqual(item2, self.worklist.pop().result)
+
+    def test_expired_item_is_promoted(self):
+        items = [NonCallableMock(spec_set=[]) for _ in range(3)]
+        self.worklist.push("a", items[0])
+        self.worklist.push("c", items[1], deadline=105.0)
+        self.worklist.push("c", items[2])
+        self.time.time.return_value = 106.0
+
+        self.assertEqual(items[1], self.worklist.pop().result)
+        self.assertEqual(2, len(self.worklist))
+        self.assertEqual(1, self.worklist.count("c"))
+        self.assertEqual(items[0], self.worklist.pop().result)
+        self.assertEqual(items[2], self.worklist.pop().result)
+        self.assertEqual(0, len(self.worklist))
+        self.assertFalse(self.worklist.pop().called)
+
+    def test_earliest_deadline_is_promoted_first(self):
+        item1 = NonCallableMock(spec_set=[])
+        item2 = NonCallableMock(spec_set=[])
+        self.worklist.push("c", item1, deadline=104.0)
+        self.worklist.push("b", item2, deadline=103.0)
+        self.time.time.return_value = 106.0
+        self.assertEqual(item2, self.worklist.pop().result)
+        self.assertEqual(item1, self.worklist.pop().result)
+
+    def test_popped_item_deadline_is_ignored(self):
+        item1 = NonCallableMock(spec_set=[])
+        item2 = NonCallableMock(spec_set=[])
+        self.worklist.push("a", item1, deadline=105.0)
+        self.assertEqual(item1, self.worklist.pop().result)
+        self.worklist.push("a", item2)
+        self.time.time.return_value = 106.0
+        self.assertEqual(item2, self.worklist.pop().result)
+        self.assertEqual(0, len(self.worklist))
+
+    def test_excluded_priority_is_not_promoted(self):
+        self.selection.ignored = "c"
+        self.worklist.push("c", NonCallableMock(spec_set=[]), deadline=101.0)
+        self.time.time.return_value = 106.0
+        self.assertFalse(self.worklist.pop().called)
+        self.assertEqual(1, len(self.worklist))
+
+    def test_expired_callback(self):
+        expired = Mock()
+        worklist = ZenHubWorklist(self.selection, expired=expired)
+        item1 = NonCallableMock(spec_set=[])
+        item2 = NonCallableMock(spec_set=[])
+        worklist.push("c", item1, deadline=101.0)
+        worklist.push("c", item2)
+        self.time.time.return_value = 106.0
+
+        self.assertEqual(item2, worklist.pop().result)
+        expired.assert_called_once_with("c", item1)
+        self.assertEqual(0, len(worklist))
+
+    def test_expired_callback_with_waiting_pop(self):
+        expired = Mock()
+        worklist = ZenHubWorklist(self.selection, expired=expired)
+        ret = worklist.pop()
+        worklist.push("c", NonCallableMock(spec_set=[]), deadline=99.0)
+        expired.assert_called_once_with("c", ANY)
+        self.assertFalse(ret.called)
+        self.assertEqual(0, len(worklist))
@@ -9,10 +9,27 @@
 
 from __future__ import absolute_import
 
+import heapq
+import time
+
 from collections import deque
+from itertools import count
+
 from twisted.internet import defer
 
 
+class _Entry(object):
+    """An item in the worklist and the bookkeeping data for that item."""
+
+    __slots__ = ("item", "enqueued", "deadline", "done")
+
+    def __init__(self, item, enqueued, deadline):
+        self.item = item
+        self.enqueued = enqueued
+        self.deadline = deadline
+        self.done = False
+
+
 class ZenHubWorklist(object):
     """Implements a priority queue with a fair retrieval algorithm.
 
@@ -25,12 +42,23 @@ class ZenHubWorklist(object):
     designed such that higher priorities are selected more frequently than
     lower priorities.  It is never the case that all higher priority items
     are popped before lower priority items are popped.
+
+    An item may be pushed with a deadline.  An item whose deadline has
+    passed is popped ahead of the priority ordering.  If an 'expired'
+    callable is given, expired items are passed to it instead and are
+    not returned by pop.
     """
 
-    def __init__(self, priority_selection):
+    def __init__(self, priority_selection, expired=None, recorder=None):
         """Initialize a ZenHubWorklist object.
 
         :type priority_selection: PrioritySelection
+        :param expired: Called with the priority and item of each
+            item whose deadline has passed.
+        :type expired: Callable[[Sortable[T], Any], None]
+        :param recorder: Called with the priority of each popped item
+            and the number of seconds the item waited in the worklist.
+        :type recorder: Callable[[Sortable[T], float], None]
         """
         # All jobs priority selection
         self.__selection = priority_selection
@@ -40,11 +68,35 @@ class ZenHubWorklist(object):
             priority: deque() for priority in self.__selection.priorities
         }
 
+        # Count of items in the worklist, by priority and in total.
+        # Entries that were removed through their deadline remain in
+        # their queue (marked 'done') until they reach its front.
+        self.__counts = {
+            priority: 0 for priority in self.__selection.priorities
+        }
+        self.__total = 0
+
+        # Heap of (deadline, sequence, entry) tuples for each priority
+        self.__deadlines = {
+            priority: [] for priority in self.__selection.priorities
+        }
+        self.__sequence = count()
+
+        self.__expired = expired
+        self.__recorder = recorder
+
         # Queue of pending requests for data
         self.__waiting = []
 
     def __len__(self):
-        return sum(len(v) for v in self.__queues.itervalues())
+        return self.__total
+
+    def count(self, priority):
+        """Return the number of items having the given priority.
+
+        :rtype: int
+        """
+        return self.__counts[priority]
 
     def __cancel_pop(self, d):
         self.__waiting.remove(d)
@@ -57,11 +109,58 @@ class ZenHubWorklist(object):
         :rtype: Union[Any, None]
         """
         available = self.__selection.available
-        while sum(len(self.__queues[p]) for p in available):
+        now = time.time()
+        while True:
+            priority, entry = self.__pop_expired(available, now)
+            if entry is None:
+                break
+            if self.__expired is None:
+                return self.__take(priority, entry, now)
+            self.__take(priority, entry, now)
+            self.__expired(priority, entry.item)
+        if not any(self.__counts[p] for p in available):
+            return None
+        while True:
             priority = next(self.__selection)
-            queue = self.__queues[priority]
-            if len(queue):
-                return queue.popleft()
+            if self.__counts[priority]:
+                return self.__take(
+                    priority, self.__popleft(priority), now,
+                )
+
+    def __pop_expired(self, available, now):
+        """Remove and return the earliest expired entry.
+
+        Returns (None, None) if no entries have expired.
+        """
+        selected = None
+        for priority in available:
+            heap = self.__deadlines[priority]
+            while heap and heap[0][2].done:
+                heapq.heappop(heap)
+            if not heap or heap[0][0] > now:
+                continue
+            if selected is None or heap[0][:2] < selected[1][:2]:
+                selected = (priority, heap[0])
+        if selected is None:
+            return None, None
+        priority, head = selected
+        heapq.heappop(self.__deadlines[priority])
+        return priority, head[2]
+
+    def __popleft(self, priority):
+        queue = self.__queues[priority]
+        entry = queue.popleft()
+        while entry.done:
+            entry = queue.popleft()
+        return entry
+
+    def __take(self, priority, entry, now):
+        entry.done = True
+        self.__counts[priority] -= 1
+        self.__total -= 1
+        if self.__recorder is not None:
+            self.__recorder(priority, now - entry.enqueued)
+        return entry.item
 
     def pop(self):
         """Return a deferred which fires when an item is available.
@@ -75,17 +174,20 @@ class ZenHubWorklist(object):
         self.__waiting.append(d)
         return d
 
-    def push(self, priority, item):
+    def push(self, priority, item, deadline=None):
         """Add item to the worklist.
 
         :type item: Any
         :param priority: The priority of the item
         :type priority: Sortable[T]
+        :param deadline: When the item expires, in seconds since the epoch
+        :type deadline: Union[float, None]
         """
-        self.__queues[priority].append(item)
+        entry = self.__add(priority, item, deadline)
+        self.__queues[priority].append(entry)
         self.__notify_waiting_request()
 
-    def pushfront(self, priority, item):
+    def pushfront(self, priority, item, deadline=None):
         """Add item to the front of the worklist.
 
         Use this method to return jobs to the worklist.
@@ -93,10 +195,28 @@ class ZenHubWorklist(object):
         :type item: Any
         :param priority: The priority of the item
         :type priority: Sortable[T]
+        :param deadline: When the item expires, in seconds since the epoch
+        :type deadline: Union[float, None]
         """
-        self.__queues[priority].appendleft(item)
+        entry = self.__add(priority, item, deadline)
+        self.__queues[priority].appendleft(entry)
         self.__notify_waiting_request()
 
+    def __add(self, priority, item, deadline):
+        queue = self.__queues[priority]  # raises KeyError on bad priority
+        entry = _Entry(item, time.time(), deadline)
+        if deadline is not None:
+            heapq.heappush(
+                self.__deadlines[priority],
+                (deadline, next(self.__sequence), entry),
+            )
+        # Drop the leading entries that were removed via their deadlines.
+        while queue and queue[0].done:
+            queue.popleft()
+        self.__counts[priority] += 1
+        self.__total += 1
+        return entry
+
     def __notify_waiting_request(self):
         if not self.__waiting:
             return
@@ -9,7 +9,6 @@
 
 from __future__ import print_function
 
-import copy
 import time
 import logging
 
@@ -19,11 +18,16 @@ from Acquisition import aq_base
 from ZODB.transact import transact
 from zope import component
 
+from Products.AdvancedQuery import And, Eq, In
+from Products.DataCollector.ApplyDataMap.fingerprint import (
+    DatamapFingerprints,
+)
 from Products.DataCollector.DeviceProxy import DeviceProxy
 from Products.DataCollector.Plugins import loadPlugins
 from Products.ZenCollector.interfaces import IConfigurationDispatchingFilter
 from Products.ZenEvents import Event
 from Products.ZenHub.errors import translateError
+from Products.Zuul.catalog.interfaces import IModelCatalogTool
 
 from Products.ZenHub.services.PerformanceConfig import PerformanceConfig
 
@@ -81,8 +85,9 @@ class ModelerService(PerformanceConfig):
     @translateError
     def remote_getDeviceConfig(self, names, checkStatus=False):
         result = []
+        devices = self._findDevices(names)
         for name in names:
-            device = self.getPerformanceMonitor().findDeviceByIdExact(name)
+            device = devices.get(name)
             if not device:
                 continue
             device = device.primaryAq()
@@ -120,6 +125,33 @@ class ModelerService(PerformanceConfig):
             result.append(self.createDeviceProxy(device, skipModelMsg))
         return result
 
+    def _findDevices(self, names):
+        """
+        Return the devices whose IDs exactly match the names, indexed by ID.
+
+        All the devices are found using one catalog search.
+        """
+        names = set(names)
+        if len(names) == 1:
+            name = next(iter(names))
+            device = self.getPerformanceMonitor().findDeviceByIdExact(name)
+            return {name: device} if device else {}
+        query = And(
+            Eq("objectImplements", "Products.ZenModel.Device.Device"),
+            In("id", list(names)),
+        )
+        devices = {}
+        results = IModelCatalogTool(self.dmd.Devices).search(query=query)
+        for brain in results.results:
+            try:
+                device = brain.getObject()
+            except Exception:
+                log.warn("unable to load device  uid=%s", brain.getPath())
+                continue
+            if device.id in names:
+                devices[device.id] = device
+        return devices
+
     @translateError
     def remote_getDeviceListByMonitor(self, monitor=None):
         if monitor is None:
@@ -188,13 +220,20 @@ class ModelerService(PerformanceConfig):
         adm.setDeviceClass(device, devclass)
 
         changed = False
+        fingerprints = DatamapFingerprints(device)
+        skipped = 0
         # with pausedAndOptimizedIndexing():
-        for map in maps:
-            # make a copy because ApplyDataMap will modify the data map.
-            datamap = copy.deepcopy(map)
-
+        for datamap in maps:
+            # ApplyDataMap doesn't modify the data map; it works on
+            # shallow copies of the parts it changes.
             preadmdata = self.pre_adm_check(datamap, device)
 
+            ident = fingerprints.identify(datamap)
+            if ident is not None and fingerprints.isCurrent(datamap, ident):
+                skipped += 1
+                self.post_adm_process(datamap, device, preadmdata)
+                continue
+
             start_time = time.time()
             if adm._applyDataMap(device, datamap, commit=False):
                 changed = True
@@ -228,8 +267,18 @@ class ModelerService(PerformanceConfig):
                     changesubject,
                 )
 
+            if ident is not None:
+                fingerprints.update(datamap, ident)
+
             self.post_adm_process(datamap, device, preadmdata)
 
+        if skipped:
+            log.debug(
+                "Skipped unchanged datamaps  device=%s count=%d",
+                device.getId(),
+                skipped,
+            )
+
         if setLastCollection:
             device.setSnmpLastCollection()
 
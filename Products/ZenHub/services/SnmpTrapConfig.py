@@ -22,7 +22,7 @@ from hashlib import md5
 from pynetsnmp import usm
 from twisted.spread import pb
 
-from Products.ZenHub.HubService import HubService
+from Products.ZenHub.HubService import HubService, idempotent
 from Products.Zuul.catalog.interfaces import IModelCatalogTool
 
 log = logging.getLogger("zen.HubService.SnmpTrapConfig")
@@ -87,6 +87,7 @@ class SnmpTrapConfig(HubService):
         log.debug("SnmpTrapConfig.remote_createAllUsers %s users", len(users))
         return list(users)
 
+    @idempotent(shared=True)
     def remote_getTrapFilters(self, remoteCheckSum):
         currentCheckSum = md5(self.zem.trapFilters).hexdigest()  # noqa S324
         return (
@@ -95,6 +96,7 @@ class SnmpTrapConfig(HubService):
             else (currentCheckSum, self.zem.trapFilters)
         )
 
+    @idempotent(shared=True)
     def remote_getOidMap(self, remoteCheckSum):
         oidMap = {b.oid: b.id for b in self.dmd.Mibs.mibSearch() if b.oid}
         currentCheckSum = md5(  # noqa S324
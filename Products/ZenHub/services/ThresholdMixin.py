@@ -10,6 +10,7 @@
 import logging
 
 from Products.ZenHub.errors import translateError
+from Products.ZenHub.HubService import idempotent
 from Products.ZenModel.MinMaxThreshold import MinMaxThreshold
 from Products.ZenModel.ValueChangeThreshold import ValueChangeThreshold
 
@@ -19,6 +20,7 @@ log = logging.getLogger("zen.thresholdmixin")
 class ThresholdMixin(object):
     _cached_thresholdClasses = []
 
+    @idempotent(shared=True)
     @translateError
     def remote_getThresholdClasses(self):
         log.info("retrieving threshold classes")
@@ -37,6 +39,7 @@ class ThresholdMixin(object):
                 self._cached_thresholdClasses,
             )
 
+    @idempotent
     @translateError
     def remote_getCollectorThresholds(self):
         from Products.ZenModel.BuiltInDS import BuiltInDS
@@ -0,0 +1,80 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+import time
+
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from Products.DataCollector.plugins.DataMaps import ObjectMap
+from Products.ZenHub.services.ModelerService import ModelerService
+
+PATH = {"adm": "Products.DataCollector.ApplyDataMap"}
+
+
+class _Device(object):
+    """A device whose commits are done by the test."""
+
+    _p_oid = "device"
+    _p_mtime = None
+    _snmpLastCollection = 0
+
+    def __init__(self):
+        self.id = "device"
+
+    def getId(self):
+        return self.id
+
+    def setSnmpLastCollection(self):
+        self._snmpLastCollection = time.time()
+
+    def commit(self, when=None):
+        self._p_mtime = time.time() if when is None else when
+
+
+class ApplyDataMapsTest(TestCase):
+    """Test the remote_applyDataMaps method of ModelerService."""
+
+    def setUp(t):
+        patcher = patch("{adm}.ApplyDataMap".format(**PATH), autospec=True)
+        t.ApplyDataMap = patcher.start()
+        t.addCleanup(patcher.stop)
+        t.adm = t.ApplyDataMap.return_value
+        t.adm._applyDataMap.return_value = True
+
+        t.device = _Device()
+        t.service = ModelerService.__new__(ModelerService)
+        t.service.getPerformanceMonitor = Mock()
+        monitor = t.service.getPerformanceMonitor.return_value
+        monitor.findDeviceByIdExact.return_value = t.device
+
+    def _apply(t):
+        objmap = ObjectMap(
+            {"snmpContact": "admin"}, plugin_name="zenoss.snmp.NewDeviceMap"
+        )
+        t.service.remote_applyDataMaps(
+            "device", [objmap], setLastCollection=True
+        )
+        t.device.commit()
+
+    def test_unchanged_device_objectmap_is_skipped(t):
+        t._apply()
+        t._apply()
+
+        # Recording the collection time doesn't count as a change.
+        t.assertEqual(t.adm._applyDataMap.call_count, 1)
+
+    def test_device_modified_since_is_applied_again(t):
+        t._apply()
+        # A user modifies the device later on.
+        t.device.commit(time.time() + 120)
+        t._apply()
+
+        t.assertEqual(t.adm._applyDataMap.call_count, 2)
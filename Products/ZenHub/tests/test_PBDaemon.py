@@ -230,6 +230,26 @@ class PBDaemonTest(TestCase):
             maxOutstandingMetrics=t.pbd.options.maxOutstandingMetrics,
         )
 
+    def test_publisher_pipelined(t):
+        host = "localhost"
+        port = 9999
+        t.pbd.options.redisUrl = "http://{}:{}".format(host, port)
+        t.pbd.options.pipelinedMetricPublisher = True
+
+        ret = t.pbd.publisher()
+
+        t.assertEqual(
+            ret, t.publisher.PipelinedRedisListPublisher.return_value
+        )
+        t.publisher.PipelinedRedisListPublisher.assert_called_with(
+            host,
+            port,
+            t.pbd.options.metricBufferSize,
+            channel=t.pbd.options.metricsChannel,
+            maxOutstandingMetrics=t.pbd.options.maxOutstandingMetrics,
+        )
+        t.publisher.RedisListPublisher.assert_not_called()
+
     @patch("{src}.os".format(**PATH), autospec=True)
     def test_internalPublisher(t, _os):
         # All the methods with this pattern need to be converted to properties
@@ -8,6 +8,9 @@ from ..invalidations import (
     _get_event,
     _notify_event_subscribers,
     defer,
+    Device,
+    DeviceChangeSetEvent,
+    DeviceComponent,
     PrimaryPathObjectManager,
     DeletionEvent,
     UpdateEvent,
@@ -188,3 +191,47 @@ class InvalidationProcessorTest(TestCase):
         handled, ignored = d.result
 
         t.assertTupleEqual((handled, ignored), (2, 1))
+
+    @patch("{src}._notify_event_subscribers".format(**PATH), autospec=True)
+    def test_changeset_per_device(t, notify_):
+        device = MagicMock(Device, name="device")
+        device._p_oid = "oid3"
+        device.__of__.return_value.primaryAq.return_value = device
+        components = []
+        for i in range(2):
+            component = MagicMock(DeviceComponent, name="component%d" % i)
+            component.__of__.return_value.primaryAq.return_value = component
+            component.device.return_value = device
+            component.getPrimaryId.return_value = "/device/component%d" % i
+            components.append(component)
+        oids = ["oid1", "oid2", "oid3"]
+        t.ip._hub.dmd._p_jar.update(zip(oids, components + [device]))
+
+        d = t.ip.processQueue(oids)
+
+        t.assertTupleEqual(d.result, (3, 0))
+        events = [args[0] for args, _ in notify_.call_args_list]
+        # Each object is notified, then the change set of the device
+        t.assertEqual(len(events), 4)
+        t.assertEqual(
+            [event.object for event in events[:3]], components + [device]
+        )
+        changeset = events[3]
+        t.assertIsInstance(changeset, DeviceChangeSetEvent)
+        t.assertIs(changeset.object, device)
+        t.assertEqual(changeset.oids, oids)
+        t.assertEqual(
+            changeset.paths, ["/device/component0", "/device/component1"]
+        )
+
+    @patch("{src}._notify_event_subscribers".format(**PATH), autospec=True)
+    def test_no_changeset_for_deleted_objects(t, notify_):
+        component = MagicMock(DeviceComponent, name="component")
+        component.__of__.return_value.primaryAq.side_effect = KeyError()
+        t.ip._hub.dmd._p_jar["oid1"] = component
+
+        d = t.ip.processQueue(["oid1"])
+
+        t.assertTupleEqual(d.result, (1, 0))
+        (event,) = [args[0] for args, _ in notify_.call_args_list]
+        t.assertIsInstance(event, DeletionEvent)
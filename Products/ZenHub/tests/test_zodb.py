@@ -5,11 +5,14 @@ from zope.interface.verify import verifyObject
 
 from Products.ZenHub.zodb import (
     DeletionEvent,
+    DeviceChangeSetEvent,
     IDeletionEvent,
+    IDeviceChangeSetEvent,
     InvalidationEvent,
     IUpdateEvent,
     ObjectEvent,
     onDelete,
+    onDeviceChangeSet,
     onUpdate,
     UpdateEvent,
 )
@@ -62,6 +65,19 @@ class DeletionEventTest(TestCase):
         verifyObject(IDeletionEvent, deletion_event)
 
 
+class DeviceChangeSetEventTest(TestCase):
+    def test___init__(t):
+        device = sentinel.device
+
+        changeset = DeviceChangeSetEvent(device)
+
+        t.assertTrue(IDeviceChangeSetEvent.providedBy(changeset))
+        verifyObject(IDeviceChangeSetEvent, changeset)
+        t.assertIs(changeset.object, device)
+        t.assertEqual(changeset.oids, [])
+        t.assertEqual(changeset.paths, [])
+
+
 class _listener_decorator_factoryTest(TestCase):
 
     """Used to create decorators
@@ -106,3 +122,18 @@ class _listener_decorator_factoryTest(TestCase):
         provideHandler.assert_called_with(
             mc.eventtype_deleted_handler, (eventtype, IDeletionEvent)
         )
+
+    @patch("{src}.provideHandler".format(**PATH), autospec=True)
+    def test_onDeviceChangeSet_decorator(t, provideHandler):
+        eventtype = sentinel.eventtype  # EX: Device
+
+        class MyClass(object):
+            @onDeviceChangeSet(eventtype)
+            def eventtype_changeset_handler(self, device, event):
+                pass
+
+        mc = MyClass()
+
+        provideHandler.assert_called_with(
+            mc.eventtype_changeset_handler, (eventtype, IDeviceChangeSetEvent)
+        )
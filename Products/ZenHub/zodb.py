@@ -14,7 +14,7 @@ from zope.component.interfaces import ObjectEvent
 from zope.interface import implementer
 from zope.interface.advice import addClassAdvisor
 
-from .interfaces import IUpdateEvent, IDeletionEvent
+from .interfaces import IDeletionEvent, IDeviceChangeSetEvent, IUpdateEvent
 
 log = logging.getLogger("zen.ZenHub")
 
@@ -35,6 +35,14 @@ class DeletionEvent(InvalidationEvent):
     pass
 
 
+@implementer(IDeviceChangeSetEvent)
+class DeviceChangeSetEvent(ObjectEvent):
+    def __init__(self, device):
+        super(DeviceChangeSetEvent, self).__init__(device)
+        self.oids = []
+        self.paths = []
+
+
 def _listener_decorator_factory(eventtype):
     """
     Given a particular event interface, returns a decorator factory that may be
@@ -126,6 +134,7 @@ def _listener_decorator_factory(eventtype):
     return factory
 
 
-# Create two decorator factories for the two kinds of events.
+# Create decorator factories for the kinds of events.
 onUpdate = _listener_decorator_factory(IUpdateEvent)
 onDelete = _listener_decorator_factory(IDeletionEvent)
+onDeviceChangeSet = _listener_decorator_factory(IDeviceChangeSetEvent)
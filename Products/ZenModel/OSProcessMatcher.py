@@ -12,7 +12,9 @@ import re
 import os
 import time
 import signal
+import sre_parse
 from contextlib import contextmanager
+from sre_constants import LITERAL, SUBPATTERN
 from sre_parse import parse_template
 from md5 import md5
 
@@ -210,6 +212,158 @@ class OSProcessClassDataMatcher(DataHolder, OSProcessClassMatcher):
 class OSProcessDataMatcher(DataHolder, OSProcessMatcher):
     pass
 
+def _baseMatches(matcher):
+    """
+    Returns True if the matcher uses the matches method of
+    OSProcessClassMatcher or OSProcessMatcher.
+    """
+    func = getattr(type(matcher).matches, 'im_func', None)
+    return func in (OSProcessClassMatcher.matches.im_func,
+                    OSProcessMatcher.matches.im_func)
+
+def _matcherKey(matcher):
+    """
+    Returns the fields that determine the result of OSProcessClassMatcher's
+    matches and generateId methods.
+    """
+    return (getattr(matcher, 'includeRegex', None),
+            getattr(matcher, 'excludeRegex', None),
+            getattr(matcher, 'replaceRegex', None),
+            getattr(matcher, 'replacement', None),
+            matcher.processClassPrimaryUrlPath())
+
+def _requiredLiteral(regex):
+    """
+    Returns the longest string that appears in every string matched by
+    the regex, or None if no such string can be found.
+    """
+    if not regex:
+        return None
+    try:
+        parsed = sre_parse.parse(regex)
+    except Exception:
+        return None
+    if parsed.pattern.flags & sre_parse.SRE_FLAG_IGNORECASE:
+        return None
+    runs = []
+    _collectLiterals(parsed, runs)
+    return max(runs, key=len) if runs else None
+
+def _collectLiterals(items, runs):
+    current = []
+    for op, av in items:
+        # Only ASCII literals, so the literal can be searched for in both
+        # str and unicode command lines.
+        if op == LITERAL and av < 128:
+            current.append(chr(av))
+            continue
+        if current:
+            runs.append(''.join(current))
+            current = []
+        if op == SUBPATTERN:
+            _collectLiterals(av[-1], runs)
+    if current:
+        runs.append(''.join(current))
+
+class _MatcherGroup(object):
+    """
+    Matchers sharing the same regexes and process class; the command line
+    is matched and its ID generated once for all of them.
+    """
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.literal = _requiredLiteral(getattr(matcher, 'includeRegex', None))
+
+class OSProcessMatcherSet(object):
+    """
+    Finds the first matcher, in order, that matches a command line.
+
+    Matchers whose include regex requires a literal string absent from the
+    command line are skipped without running any regex, and matchers that
+    share regexes and a process class are evaluated once per command line.
+    Results are cached per command line so that unchanged processes aren't
+    matched again.
+    """
+    def __init__(self, matchers):
+        self._matchers = list(matchers)
+        self._signature = self._makeSignature(self._matchers)
+        groups = {}
+        # [(literal, group, matcher), ...] in matcher order.  group is None
+        # for matchers with their own matches method.
+        self._entries = []
+        for matcher in self._matchers:
+            if _baseMatches(matcher):
+                key = _matcherKey(matcher)
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = _MatcherGroup(matcher)
+                self._entries.append((group.literal, group, matcher))
+            else:
+                self._entries.append((None, None, matcher))
+        self._results = {}
+
+    @staticmethod
+    def _makeSignature(matchers):
+        return [(id(m), _matcherKey(m), getattr(m, 'generatedId', None))
+                for m in matchers]
+
+    def sameMatchers(self, matchers):
+        """
+        @return: Would a set built from the given matchers behave the same?
+        @rtype: Boolean
+        """
+        return self._makeSignature(matchers) == self._signature
+
+    def match(self, processText):
+        """
+        @return: The first matcher that matches the command line or None
+        """
+        try:
+            return self._results[processText]
+        except KeyError:
+            pass
+        result = self._results[processText] = self._match(processText)
+        return result
+
+    def matchLines(self, lines):
+        """
+        Match many command lines.  Only the results for these command lines
+        are kept in the cache.
+
+        @return: {line => matcher or None, ...}
+        """
+        results = {}
+        for line in lines:
+            if line not in results:
+                results[line] = self.match(line)
+        self._results = results
+        return dict(results)
+
+    def _match(self, processText):
+        if not processText:
+            return None
+        matched = {}
+        ids = {}
+        for literal, group, matcher in self._entries:
+            if literal is not None and literal not in processText:
+                continue
+            if group is None:
+                if matcher.matches(processText):
+                    return matcher
+                continue
+            if group not in matched:
+                matched[group] = OSProcessClassMatcher.matches(
+                    group.matcher, processText)
+            if not matched[group]:
+                continue
+            if not isinstance(matcher, OSProcessMatcher):
+                return matcher
+            if group not in ids:
+                ids[group] = group.matcher.generateId(processText)
+            if ids[group] == getattr(matcher, 'generatedId', False):
+                return matcher
+        return None
+
 def applyOSProcessClassMatchers(matchers, lines):
     """
     @return (matched, unmatched), where...
@@ -218,21 +372,19 @@ def applyOSProcessClassMatchers(matchers, lines):
     """
     matched = {}
     unmatched = []
+    matcherSet = OSProcessMatcherSet(matchers)
     for line in lines:
         log.debug("COMMAND LINE: %s", line)
-        unmatchedLine = True
-        for matcher in matchers:
-            if matcher.matches(line):
-                if matcher not in matched:
-                    matched[matcher] = {}
-                generatedName = matcher.generateName(line)
-                if generatedName not in matched[matcher]:
-                    matched[matcher][generatedName] = []
-                matched[matcher][generatedName].append(line)
-                unmatchedLine = False
-                break
-        if unmatchedLine:
+        matcher = matcherSet.match(line)
+        if matcher is None:
             unmatched.append(line)
+            continue
+        if matcher not in matched:
+            matched[matcher] = {}
+        generatedName = matcher.generateName(line)
+        if generatedName not in matched[matcher]:
+            matched[matcher][generatedName] = []
+        matched[matcher][generatedName].append(line)
     return (matched, unmatched)
 
 def applyOSProcessMatchers(matchers, lines):
@@ -243,18 +395,16 @@ def applyOSProcessMatchers(matchers, lines):
     """
     matched = {}
     unmatched = []
+    matcherSet = OSProcessMatcherSet(matchers)
     for line in lines:
         log.debug("COMMAND LINE: %s", line)
-        unmatchedLine = True
-        for matcher in matchers:
-            if matcher.matches(line):
-                if matcher.generatedName not in matched:
-                    matched[matcher.generatedName] = []
-                matched[matcher.generatedName].append(line)
-                unmatchedLine = False
-                break
-        if unmatchedLine:
+        matcher = matcherSet.match(line)
+        if matcher is None:
             unmatched.append(line)
+            continue
+        if matcher.generatedName not in matched:
+            matched[matcher.generatedName] = []
+        matched[matcher.generatedName].append(line)
     return (matched, unmatched)
 
 def buildObjectMapData(processClassMatchData, lines):
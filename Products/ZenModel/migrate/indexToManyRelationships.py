@@ -0,0 +1,71 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import
+
+import logging
+
+import transaction
+
+from Products.ZenModel.ZMigrateVersion import (
+    SCHEMA_MAJOR,
+    SCHEMA_MINOR,
+    SCHEMA_REVISION,
+)
+
+from . import Migrate
+
+log = logging.getLogger("zen.migrate")
+
+# Number of relationships converted per transaction.
+_BATCH_SIZE = 100
+
+
+class indexToManyRelationships(Migrate.Step):
+    """
+    Store the related objects of the organizer relationships holding many
+    objects in an OrderedObjectSet instead of a list.
+
+    Other relationships are converted when they reach the relationship's
+    orderedSetThreshold.
+    """
+
+    version = Migrate.Version(SCHEMA_MAJOR, SCHEMA_MINOR, SCHEMA_REVISION)
+
+    def cutover(self, dmd):
+        converted = 0
+        for rel in self._relationships(dmd):
+            if len(rel._objects) < rel.orderedSetThreshold:
+                continue
+            try:
+                rel.convertToOrderedObjectSet()
+            except Exception:
+                log.exception(
+                    "Unable to convert relationship %s", rel.getPrimaryId()
+                )
+                continue
+            converted += 1
+            if converted % _BATCH_SIZE == 0:
+                transaction.commit()
+        log.info("Converted %d ToMany relationships", converted)
+
+    def _relationships(self, dmd):
+        for root in (dmd.Groups, dmd.Systems, dmd.Locations):
+            for org in [root] + root.getSubOrganizers():
+                yield org.devices
+        root = dmd.ComponentGroups
+        for org in [root] + root.getSubOrganizers():
+            yield org.components
+        root = dmd.Services
+        for org in [root] + root.getSubOrganizers():
+            for svcclass in org.serviceclasses.objectValuesGen():
+                yield svcclass.instances
+
+
+indexToManyRelationships()
@@ -0,0 +1,138 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+import unittest
+
+from Products.ZenModel.OSProcessMatcher import (
+    OSProcessClassDataMatcher,
+    OSProcessDataMatcher,
+    OSProcessMatcherSet,
+    _requiredLiteral,
+    applyOSProcessClassMatchers,
+)
+
+
+def _classMatcher(include, exclude=None, replace=None, replacement=None,
+                  path="/zport/dmd/Processes/osProcessClasses/test"):
+    return OSProcessClassDataMatcher(
+        includeRegex=include, excludeRegex=exclude, replaceRegex=replace,
+        replacement=replacement, primaryUrlPath=path)
+
+
+def _processMatcher(classMatcher, line):
+    return OSProcessDataMatcher(
+        includeRegex=classMatcher.includeRegex,
+        excludeRegex=classMatcher.excludeRegex,
+        replaceRegex=classMatcher.replaceRegex,
+        replacement=classMatcher.replacement,
+        primaryUrlPath=classMatcher.primaryUrlPath,
+        generatedId=classMatcher.generateId(line))
+
+
+def _firstMatch(matchers, line):
+    for matcher in matchers:
+        if matcher.matches(line):
+            return matcher
+
+
+class TestRequiredLiteral(unittest.TestCase):
+
+    def testLiteral(self):
+        self.assertEqual(_requiredLiteral(r"java.*-jar (zeneventd)"),
+                         "zeneventd")
+        self.assertEqual(_requiredLiteral(r"^/usr/sbin/httpd\b"),
+                         "/usr/sbin/httpd")
+
+    def testNoLiteral(self):
+        self.assertIsNone(_requiredLiteral(r"\w+"))
+        self.assertIsNone(_requiredLiteral(r"foo|bar"))
+        self.assertIsNone(_requiredLiteral(r"(?i)java"))
+        self.assertIsNone(_requiredLiteral(r"bad(regex"))
+        self.assertIsNone(_requiredLiteral(None))
+
+
+class TestOSProcessMatcherSet(unittest.TestCase):
+
+    lines = [
+        "/usr/bin/java -jar zeneventd.jar",
+        "/usr/bin/java -jar zenhub.jar --workers 2",
+        "/usr/sbin/httpd -k start",
+        "/usr/sbin/sshd -D",
+        "  /usr/sbin/sshd -D  ",
+        "python zenping.py",
+        "",
+    ]
+
+    def setUp(self):
+        self.java = _classMatcher(
+            r"java", replace=r".*-jar (\w+).*", replacement=r"\1")
+        self.httpd = _classMatcher(r"httpd", exclude=r"-k stop")
+        self.any = _classMatcher(r".*")
+        self.classMatchers = [self.java, self.httpd, self.any]
+
+    def testClassMatchersAgreeWithMatches(self):
+        matcherSet = OSProcessMatcherSet(self.classMatchers)
+        for line in self.lines:
+            self.assertIs(matcherSet.match(line),
+                          _firstMatch(self.classMatchers, line), line)
+
+    def testProcessMatchersAgreeWithMatches(self):
+        matchers = [_processMatcher(self.java, line)
+                    for line in self.lines[:2]]
+        matchers.append(_processMatcher(self.httpd, self.lines[2]))
+        matcherSet = OSProcessMatcherSet(matchers)
+        for line in self.lines:
+            self.assertIs(matcherSet.match(line),
+                          _firstMatch(matchers, line), line)
+        self.assertIs(matcherSet.match(self.lines[1]), matchers[1])
+
+    def testResultsAreCached(self):
+        matcherSet = OSProcessMatcherSet(self.classMatchers)
+        matcherSet.match(self.lines[0])
+        self.java.includeRegex = r"nomatch"
+        self.assertIs(matcherSet.match(self.lines[0]), self.java)
+
+    def testMatchLinesKeepsOnlyCurrentLines(self):
+        matcherSet = OSProcessMatcherSet(self.classMatchers)
+        matched = matcherSet.matchLines(self.lines[:3])
+        self.assertEqual(
+            matched,
+            {self.lines[0]: self.java,
+             self.lines[1]: self.java,
+             self.lines[2]: self.httpd})
+        matcherSet.matchLines(self.lines[2:3])
+        self.java.includeRegex = r"nomatch"
+        self.assertIs(matcherSet.match(self.lines[0]), self.any)
+
+    def testSameMatchers(self):
+        matcherSet = OSProcessMatcherSet(self.classMatchers)
+        self.assertTrue(matcherSet.sameMatchers(self.classMatchers))
+        self.httpd.excludeRegex = r"-k graceful"
+        self.assertFalse(matcherSet.sameMatchers(self.classMatchers))
+        self.assertFalse(matcherSet.sameMatchers(self.classMatchers[:2]))
+
+    def testApplyOSProcessClassMatchers(self):
+        matched, unmatched = applyOSProcessClassMatchers(
+            [self.java, self.httpd], self.lines)
+        self.assertEqual(matched, {
+            self.java: {
+                "zeneventd": [self.lines[0]],
+                "zenhub": [self.lines[1]],
+            },
+            self.httpd: {"/usr/sbin/httpd -k start": [self.lines[2]]},
+        })
+        self.assertEqual(unmatched, self.lines[3:])
+
+
+def test_suite():
+    from unittest import TestSuite, makeSuite
+    suite = TestSuite()
+    suite.addTest(makeSuite(TestRequiredLiteral))
+    suite.addTest(makeSuite(TestOSProcessMatcherSet))
+    return suite
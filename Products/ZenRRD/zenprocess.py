@@ -46,7 +46,10 @@ from Products.ZenEvents.ZenEventClasses import (
     Status_Perf,
     Status_Snmp,
 )
-from Products.ZenModel.OSProcessMatcher import OSProcessMatcher
+from Products.ZenModel.OSProcessMatcher import (
+    OSProcessMatcher,
+    OSProcessMatcherSet,
+)
 from Products.ZenModel.OSProcessState import determineProcessState
 from Products.ZenUtils.observable import ObservableMixin
 
@@ -161,6 +164,7 @@ class DeviceStats:
         self._processes = {}
         for id, process in deviceProxy.processes.iteritems():
             self._processes[id] = ProcessStats(process)
+        self._matcherSet = None
 
     def update(self, deviceProxy):
         unused = set(self._processes)
@@ -185,6 +189,25 @@ class DeviceStats:
         """
         return self._processes.itervalues()
 
+    @property
+    def matcherSet(self):
+        """
+        returns the OSProcessMatcherSet of the monitored processes.
+
+        The matcher set, and the command line matches it has cached, are
+        kept across collection cycles until the process configs change.
+        """
+        matchers = [
+            pStats
+            for pStats in self._processes.itervalues()
+            if pStats._config.name is not None
+        ]
+        if self._matcherSet is None or not self._matcherSet.sameMatchers(
+            matchers
+        ):
+            self._matcherSet = OSProcessMatcherSet(matchers)
+        return self._matcherSet
+
     @property
     def pids(self):
         """
@@ -701,18 +724,19 @@ class ZenProcessTask(ObservableMixin):
         """
         afterPidToProcessStats = {}
 
+        matched = self._deviceStats.matcherSet.matchLines(
+            name_with_args for _, name_with_args in procs
+        )
         for pid, name_with_args in procs:
             log.debug("pid: %s --- name_with_args: %s", pid, name_with_args)
-            for pStats in self._deviceStats.processStats:
-                if pStats._config.name is not None:
-                    if pStats.matches(name_with_args):
-                        log.debug(
-                            "Found process %s belonging to %s",
-                            name_with_args,
-                            pStats._config,
-                        )
-                        afterPidToProcessStats[pid] = pStats
-                        break
+            pStats = matched.get(name_with_args)
+            if pStats is not None:
+                log.debug(
+                    "Found process %s belonging to %s",
+                    name_with_args,
+                    pStats._config,
+                )
+                afterPidToProcessStats[pid] = pStats
 
         afterByConfig = reverseDict(afterPidToProcessStats)
 
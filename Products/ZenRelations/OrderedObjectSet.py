@@ -0,0 +1,109 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from Acquisition import aq_base
+from BTrees.LLBTree import LLTreeSet
+from BTrees.LOBTree import LOBTree
+from BTrees.OLBTree import OLBTree
+from persistent import Persistent
+
+
+class OrderedObjectSet(Persistent):
+    """
+    The related objects of a ToManyRelationship, in the order they were
+    added.
+
+    Objects are indexed by OID so that membership tests and removals take
+    O(log n) instead of scanning a list.  Objects added before they have
+    an OID are kept apart and scanned; they are indexed by the first change
+    made once they're stored.
+    """
+
+    def __init__(self, objs=()):
+        self._objects = LOBTree()  # position -> object
+        self._positions = OLBTree()  # OID -> position
+        self._unindexed = LLTreeSet()  # positions of objects without OID
+        self._next = 0
+        self._count = 0
+        for obj in objs:
+            if obj not in self:
+                self.append(obj)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter(self._objects.values())
+
+    def __contains__(self, obj):
+        return self._find(obj) is not None
+
+    def get(self, obj):
+        """Return the stored object matching `obj` or None."""
+        position = self._find(obj)
+        if position is None:
+            return None
+        return self._objects[position]
+
+    def append(self, obj):
+        """Add `obj` after the other objects."""
+        obj = aq_base(obj)
+        if self._find(obj) is not None:
+            raise ValueError("object already in set")
+        self._indexUnindexed()
+        position = self._next
+        self._next += 1
+        self._objects[position] = obj
+        oid = self._oid(obj)
+        if oid is None:
+            self._unindexed.insert(position)
+        else:
+            self._positions[oid] = position
+        self._count += 1
+
+    def remove(self, obj):
+        """Remove `obj`; raises ValueError if `obj` isn't in the set."""
+        position = self._find(obj)
+        if position is None:
+            raise ValueError("object not in set")
+        del self._objects[position]
+        if position in self._unindexed:
+            self._unindexed.remove(position)
+        else:
+            del self._positions[aq_base(obj)._p_oid]
+        self._count -= 1
+        self._indexUnindexed()
+
+    def _find(self, obj):
+        obj = aq_base(obj)
+        oid = getattr(obj, "_p_oid", None)
+        if oid is not None:
+            position = self._positions.get(oid)
+            if position is not None:
+                return position
+        for position in self._unindexed:
+            if self._objects[position] is obj:
+                return position
+        return None
+
+    def _oid(self, obj):
+        """Return the OID of `obj` or None if it isn't stored yet."""
+        return getattr(obj, "_p_oid", None)
+
+    def _indexUnindexed(self):
+        if not self._unindexed:
+            return
+        # Objects are stored in about the order they're added, so the
+        # scan stops at the first object that isn't stored yet.
+        for position in list(self._unindexed):
+            oid = self._oid(self._objects[position])
+            if oid is None:
+                break
+            self._unindexed.remove(position)
+            self._positions[oid] = position
@@ -19,6 +19,7 @@ from zExceptions import NotFound
 from Products.ZenUtils.Utils import getObjByPath
 
 from .Exceptions import ObjectNotFound, RelationshipExistsError, zenmarker
+from .OrderedObjectSet import OrderedObjectSet
 from .ToManyRelationshipBase import ToManyRelationshipBase
 
 log = logging.getLogger("zen.Relations")
@@ -46,13 +47,19 @@ class ToManyRelationship(ToManyRelationshipBase):
     containment assumptions.  It provides object*All calles that return
     its object in the same way that ObjectManager does.
 
-    Related references are maintained in a list.
+    Related references are maintained in a list.  A relationship holding
+    orderedSetThreshold objects or more is converted to an OrderedObjectSet,
+    whose membership tests and removals don't scan every related object.
     """
 
     __pychecker__ = "no-override"
 
     meta_type = "ToManyRelationship"
 
+    # The number of related objects from which they're stored in an
+    # OrderedObjectSet instead of a list.
+    orderedSetThreshold = 1000
+
     security = ClassSecurityInfo()
 
     def __init__(self, id):
@@ -66,6 +73,8 @@ class ToManyRelationship(ToManyRelationshipBase):
 
     def hasobject(self, obj):
         "check to see if we have this object"
+        if isinstance(self._objects, OrderedObjectSet):
+            return self._objects.get(obj)
         try:
             idx = self._objects.index(obj)
             return self._objects[idx]
@@ -80,6 +89,8 @@ class ToManyRelationship(ToManyRelationshipBase):
 
     def _add(self, obj):
         """add an object to one side of this toMany relationship"""
+        if len(self._objects) >= self.orderedSetThreshold:
+            self.convertToOrderedObjectSet()
         if obj in self._objects:
             raise RelationshipExistsError
         self._objects.append(aq_base(obj))
@@ -140,13 +151,34 @@ class ToManyRelationship(ToManyRelationshipBase):
         """
         Return object based on its primaryId. plain id will not work!!!
         """
-        objs = filter(lambda x: x.getPrimaryId() == id, self._objects)
+        objs = self._findByPrimaryId(id)
         if len(objs) == 1:
             return objs[0].__of__(self)
         if default != zenmarker:
             return default
         raise AttributeError(id)
 
+    def _findByPrimaryId(self, id):
+        """
+        Return the related objects whose primaryId is `id`.  An absolute
+        `id` is traversed and looked up in the OrderedObjectSet rather than
+        comparing it with the primaryId of every related object.
+        """
+        if (
+            isinstance(self._objects, OrderedObjectSet)
+            and isinstance(id, basestring)
+            and id.startswith("/")
+        ):
+            try:
+                obj = getObjByPath(self, id)
+                found = obj.getPrimaryId() == id
+            except Exception:
+                found = False
+            if found:
+                obj = self._objects.get(obj)
+                return [obj] if obj is not None else []
+        return filter(lambda x: x.getPrimaryId() == id, self._objects)
+
     def objectIdsAll(self):
         """
         Return object ids as their absolute primaryId.
@@ -225,6 +257,11 @@ class ToManyRelationship(ToManyRelationshipBase):
     def convertToPersistentList(self):
         self._objects = PersistentList(self._objects)
 
+    def convertToOrderedObjectSet(self):
+        """Store the related objects in an OrderedObjectSet."""
+        if not isinstance(self._objects, OrderedObjectSet):
+            self._objects = OrderedObjectSet(self._objects)
+
     def checkObjectRelation(self, obj, remoteName, parentObject, repair):
         changed = False
         try:
@@ -273,13 +310,15 @@ class ToManyRelationship(ToManyRelationshipBase):
         # or who should no longer exist in the database
         rname = self.remoteName()
         parobj = self.getPrimaryParent()
-        for obj in self._objects:
+        # Iterate over a copy; a repair removes objects from the container
+        # and an OrderedObjectSet can't change while it's iterated.
+        for obj in list(self._objects):
             if self.checkObjectRelation(obj, rname, parobj, repair):
                 changed = True
 
         # find duplicate objects
         keycount = {}
-        for obj in self._objects:
+        for obj in list(self._objects):
             key = obj.getPrimaryId()
             c = keycount.setdefault(key, 0)
             c += 1
@@ -296,9 +335,9 @@ class ToManyRelationship(ToManyRelationshipBase):
                 )
                 if repair:
                     log.critical("repair key %s", key)
-                    self._objects = PersistentList([
-                        o for o in self._objects if o.getPrimaryId() != key
-                    ])
+                    self._objects = self._objects.__class__(
+                        [o for o in self._objects if o.getPrimaryId() != key]
+                    )
                     changed = True
                     try:
                         obj = self.getObjByPath(key)
@@ -9,6 +9,9 @@
 
 import logging
 import re
+import threading
+
+import transaction
 
 from AccessControl import ClassSecurityInfo
 from AccessControl.class_init import InitializeClass
@@ -35,6 +38,18 @@ iscustprop = re.compile("c[A-Z]").match
 
 log = logging.getLogger("zen.PropertyManager")
 
+_PASSWORD_TYPES = frozenset(
+    ("password", "passwd", "multilinecredentials", "instancecredentials")
+)
+
+# zProperty resolutions cached for the current thread's transaction.
+_resolutions = threading.local()
+
+# Maximum number of cached resolutions; the cache is cleared when full.
+_MAX_RESOLUTIONS = 100000
+
+_MISSING = object()
+
 Z_PROPERTY_META_DATA = {}
 # Z_PROPERTIES is a list of (id, value, type, name, description) tuples that
 # define all the zProperties.  The values are set on dmd.Devices in the
@@ -602,6 +617,7 @@ class PropertyDescriptor(object):
         """
         self._migrate(instance)
         self._set(instance, value)
+        invalidateZPropertyCache()
 
     def __delete__(self, instance):
         """
@@ -609,6 +625,7 @@ class PropertyDescriptor(object):
         """
         self._migrate(instance)
         del instance._propertyValues[self.id]
+        invalidateZPropertyCache()
 
     def _migrate(self, instance):
         """
@@ -655,6 +672,33 @@ class ZenPropertyDoesNotExist(ValueError):
     pass
 
 
+def _getResolutions():
+    """
+    Return the zProperty resolutions cached for the current transaction.
+    """
+    txn = transaction.get()
+    if getattr(_resolutions, "txn", None) is not txn:
+        _resolutions.txn = txn
+        _resolutions.cache = {}
+    return _resolutions.cache
+
+
+def invalidateZPropertyCache():
+    """
+    Discard the zProperty resolutions cached for the current transaction.
+    """
+    _resolutions.txn = None
+    _resolutions.cache = None
+
+
+def _isCacheable(id):
+    """
+    Only properties with a PropertyDescriptor are cached; setting or
+    deleting them goes through the descriptor, which invalidates the cache.
+    """
+    return isinstance(vars(ZenPropertyManager).get(id), PropertyDescriptor)
+
+
 class ZenPropertyManager(object, PropertyManager):
     """
     ZenPropertyManager adds keyedselection type to PropertyManager.
@@ -727,6 +771,7 @@ class ZenPropertyManager(object, PropertyManager):
             setter(value)
         else:
             setattr(self, id, value)
+        invalidateZPropertyCache()
 
     def _setProperty(
         self,
@@ -787,6 +832,10 @@ class ZenPropertyManager(object, PropertyManager):
             setprops(id=id, type=type, visible=visible)
             self._setPropValue(id, value)
 
+    def _delProperty(self, id):
+        super(ZenPropertyManager, self)._delProperty(id)
+        invalidateZPropertyCache()
+
     _onlystars = re.compile(r"^\*+$").search
 
     def _updateProperty(self, id, value):
@@ -891,13 +940,7 @@ class ZenPropertyManager(object, PropertyManager):
 
     def zenPropIsPassword(self, id):
         """Is this field a password field."""
-        passwordTypes = [
-            "password",
-            "passwd",
-            "multilinecredentials",
-            "instancecredentials",
-        ]
-        return self.getPropertyType(id) in passwordTypes
+        return self.getPropertyType(id) in _PASSWORD_TYPES
 
     security.declareProtected(ZEN_ZPROPERTIES_VIEW, "zenPropertyPath")
 
@@ -992,6 +1035,7 @@ class ZenPropertyManager(object, PropertyManager):
                 # and create a new _properties tuple
                 newProps = [x for x in self._properties if x["id"] != propname]
                 self._properties = tuple(newProps)
+                invalidateZPropertyCache()
             except ValueError:
                 raise ZenPropertyDoesNotExist()
         if REQUEST:
@@ -1052,42 +1096,92 @@ class ZenPropertyManager(object, PropertyManager):
             org for org in self.getSubOrganizers() if org.isLocal(propname)
         ]
 
+    def _localPropertyIds(self):
+        """Returns the ids of the properties defined on this object."""
+        props = self._properties
+        cached = getattr(aq_base(self), "_v_localPropertyIds", None)
+        if cached is None or cached[0] is not props:
+            cached = (props, frozenset(p["id"] for p in props))
+            self._v_localPropertyIds = cached
+        return cached[1]
+
+    def _zPropertyChain(self):
+        """Returns (node, key) pairs for the property managers of the
+        acquisition chain.  The key identifies the node by its path.
+        """
+        chain = aq_chain(self)
+        path = tuple(
+            getattr(base, "_p_oid", None) or getattr(base, "id", None)
+            for base in (aq_base(ob) for ob in chain)
+        )
+        return [
+            (ob, path[index:])
+            for index, ob in enumerate(chain)
+            if isinstance(ob, ZenPropertyManager)
+        ]
+
+    def _resolveProperty(self, id, chain=None):
+        """Returns (node, type, value) for the property with the id, where
+        node is self or the first acquisition parent that has the property.
+        Returns None if no parent had the id.
+
+        The resolutions of the acquisition parents are cached until the
+        transaction ends or a property is changed.
+        """
+        if chain is None:
+            chain = self._zPropertyChain()
+        cache = _getResolutions() if _isCacheable(id) else None
+        misses = []
+        resolved = None
+        for index, (ob, key) in enumerate(chain):
+            if index and cache is not None:
+                entry = cache.get((key, id), _MISSING)
+                if entry is not _MISSING:
+                    resolved = entry
+                    break
+                misses.append(key)
+            if id in ob._localPropertyIds():
+                resolved = (
+                    ob,
+                    PropertyManager.getPropertyType(ob, id),
+                    PropertyManager.getProperty(ob, id),
+                )
+                break
+        if misses:
+            if len(cache) + len(misses) > _MAX_RESOLUTIONS:
+                cache.clear()
+            for key in misses:
+                cache[(key, id)] = resolved
+        return resolved
+
     def _findParentWithProperty(self, id):
         """Returns self or the first acquisition parent that has a property
         with the id.  Returns None if no parent had the id.
         """
-        return next(
-            (
-                ob
-                for ob in aq_chain(self)
-                if isinstance(ob, ZenPropertyManager) and ob.hasProperty(id)
-            ),
-            None,
-        )
+        resolved = self._resolveProperty(id)
+        return None if resolved is None else resolved[0]
 
     def hasProperty(self, id, useAcquisition=False):
         """Override method in PropertyManager to support acquisition."""
         if useAcquisition:
-            hasProp = self._findParentWithProperty(id) is not None
-        else:
-            hasProp = PropertyManager.hasProperty(self, id)
-        return hasProp
+            return self._resolveProperty(id) is not None
+        return id in self._localPropertyIds()
 
     def getProperty(self, id, d=None):
         """Get property value and apply transformer.  Overrides method in
         Zope's PropertyManager class.  Acquire values from aquisiton parents
         if needed.
         """
-        ob = self._findParentWithProperty(id)
-        return d if (ob is None) else PropertyManager.getProperty(ob, id, d)
+        resolved = self._resolveProperty(id)
+        return d if (resolved is None) else resolved[2]
 
     security.declareProtected(ZEN_ZPROPERTIES_VIEW, "getPropertyType")
 
     def getPropertyType(self, id):
         """Overrides methods from PropertyManager to support acquisition."""
-        ob = self._findParentWithProperty(id)
-        if ob is not None:
-            return PropertyManager.getPropertyType(ob, id)
+        resolved = self._resolveProperty(id)
+        if resolved is not None:
+            return resolved[1]
 
     security.declareProtected(ZEN_ZPROPERTIES_VIEW, "getZ")
 
@@ -1107,11 +1201,36 @@ class ZenPropertyManager(object, PropertyManager):
         >>> dmd.Devices.getZ('zSnmpAuthPassword')
         >>>
         """
-        if self.hasProperty(
-            id, useAcquisition=True
-        ) and not self.zenPropIsPassword(id):
-            return self.getProperty(id)
-        return default
+        resolved = self._resolveProperty(id)
+        if resolved is None or resolved[1] in _PASSWORD_TYPES:
+            return default
+        return resolved[2]
+
+    security.declareProtected(ZEN_ZPROPERTIES_VIEW, "getZProperties")
+
+    def getZProperties(self, ids=None):
+        """Return the values of zProperties on this object, resolved in one
+        pass over the acquisition path.  Password properties are left out,
+        as getZ does.
+
+        @param ids: ids of the zProperties, all zProperties by default
+        @type ids: collection
+        @return: zProperty values keyed by id
+        @rtype: dict
+        @permission: ZEN_ZPROPERTIES_VIEW
+
+        >>> dmd.Devices.getZProperties(['zSnmpPort', 'zSnmpAuthPassword'])
+        {'zSnmpPort': 161}
+        """
+        if ids is None:
+            ids = self.zenPropertyIds()
+        chain = self._zPropertyChain()
+        values = {}
+        for id in ids:
+            resolved = self._resolveProperty(id, chain)
+            if resolved is not None and resolved[1] not in _PASSWORD_TYPES:
+                values[id] = resolved[2]
+        return values
 
     def exportZProperties(self, exclusionList=()):
         """
@@ -1129,12 +1248,13 @@ class ZenPropertyManager(object, PropertyManager):
         """
         props = []
         root = self.getDmdRoot(self.dmdRootName)
+        values = self.getZProperties()
         for zId in self.zenPropertyIds():
             if zId in exclusionList:
                 continue
             prop = self.exportZProperty(zId, root)
             if not self.zenPropIsPassword(zId):
-                prop["value"] = self.getZ(zId)
+                prop["value"] = values.get(zId)
             else:
                 prop["value"] = self.zenPropertyString(zId)
 
@@ -0,0 +1,109 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from unittest import TestCase
+
+import transaction
+
+from persistent import Persistent
+from ZODB import DB
+from ZODB.MappingStorage import MappingStorage
+
+from Products.ZenRelations.OrderedObjectSet import OrderedObjectSet
+
+
+class Item(Persistent):
+    def __init__(self, name):
+        self.name = name
+
+
+class TestOrderedObjectSet(TestCase):
+    def setUp(self):
+        self.db = DB(MappingStorage())
+        self.conn = self.db.open()
+        self.root = self.conn.root()
+
+    def tearDown(self):
+        transaction.abort()
+        self.conn.close()
+        self.db.close()
+
+    def _names(self, objs):
+        return [obj.name for obj in objs]
+
+    def testOrder(self):
+        items = [Item(str(n)) for n in range(5)]
+        objs = OrderedObjectSet(items)
+        objs.remove(items[2])
+        objs.append(items[2])
+        self.assertEqual(self._names(objs), ["0", "1", "3", "4", "2"])
+        self.assertEqual(len(objs), 5)
+
+    def testMembership(self):
+        a, b = Item("a"), Item("b")
+        objs = OrderedObjectSet([a])
+        self.assertTrue(a in objs)
+        self.assertFalse(b in objs)
+        self.assertIs(objs.get(a), a)
+        self.assertIsNone(objs.get(b))
+
+    def testDuplicates(self):
+        a = Item("a")
+        objs = OrderedObjectSet([a, a])
+        self.assertEqual(len(objs), 1)
+        self.assertRaises(ValueError, objs.append, a)
+
+    def testRemoveMissing(self):
+        objs = OrderedObjectSet([Item("a")])
+        self.assertRaises(ValueError, objs.remove, Item("a"))
+
+    def testDoesNotAssignOids(self):
+        objs = self.root["objs"] = OrderedObjectSet()
+        transaction.commit()
+        a = Item("a")
+        objs.append(a)
+        self.assertIsNone(a._p_oid)
+        self.assertIsNone(a._p_jar)
+        self.assertEqual(len(objs._unindexed), 1)
+        self.assertIs(objs.get(a), a)
+
+    def testIndexesAfterCommit(self):
+        a, b = Item("a"), Item("b")
+        objs = self.root["objs"] = OrderedObjectSet([a])
+        self.assertEqual(len(objs._unindexed), 1)
+        transaction.commit()
+        self.assertTrue(a in objs)
+        objs.append(b)
+        self.assertFalse(objs._unindexed)
+        self.assertTrue(a in objs)
+        self.assertTrue(b in objs)
+        self.assertEqual(self._names(objs), ["a", "b"])
+
+    def testReload(self):
+        self.root["objs"] = OrderedObjectSet([Item("a"), Item("b")])
+        transaction.commit()
+        conn = self.db.open()
+        try:
+            objs = conn.root()["objs"]
+            self.assertEqual(self._names(objs), ["a", "b"])
+            a = list(objs)[0]
+            self.assertIs(objs.get(a), a)
+            objs.remove(a)
+            self.assertEqual(self._names(objs), ["b"])
+        finally:
+            transaction.abort()
+            conn.close()
+
+
+def test_suite():
+    from unittest import TestSuite, makeSuite
+
+    suite = TestSuite()
+    suite.addTest(makeSuite(TestOrderedObjectSet))
+    return suite
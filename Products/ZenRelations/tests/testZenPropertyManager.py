@@ -287,6 +287,43 @@ class GetZTest(BaseTestCase):
         self.assertEqual(None, manager.getZ("something_new"))
 
 
+class ZPropertyCacheTest(BaseTestCase):
+    def afterSetUp(self):
+        super(ZPropertyCacheTest, self).afterSetUp()
+        self.server = self.dmd.Devices.createOrganizer("/Server")
+        self.linux = self.dmd.Devices.createOrganizer("/Server/Linux")
+        self.dev = self.linux.createInstance("dev")
+
+    def testParentChange(self):
+        self.assertEqual(161, self.dev.getZ("zSnmpPort"))
+        self.server.setZenProperty("zSnmpPort", 1161)
+        self.assertEqual(1161, self.dev.getZ("zSnmpPort"))
+        self.assertEqual("/Server", self.dev.zenPropertyPath("zSnmpPort"))
+        self.server.deleteZenProperty("zSnmpPort")
+        self.assertEqual(161, self.dev.getZ("zSnmpPort"))
+        self.assertEqual("/", self.linux.zenPropertyPath("zSnmpPort"))
+
+    def testLocalChange(self):
+        self.assertEqual(161, self.dev.getProperty("zSnmpPort"))
+        self.dev.setZenProperty("zSnmpPort", 2161)
+        self.assertEqual(2161, self.dev.getProperty("zSnmpPort"))
+        self.assertEqual(161, self.linux.getProperty("zSnmpPort"))
+
+    def testGetZProperties(self):
+        self.assertEqual(
+            {"zSnmpPort": 161},
+            self.dev.getZProperties(
+                ["zSnmpPort", "zSnmpAuthPassword", "zNoSuchProperty"]
+            ),
+        )
+        values = self.dev.getZProperties()
+        for zId in self.dev.zenPropertyIds():
+            if self.dev.zenPropIsPassword(zId):
+                self.assertNotIn(zId, values)
+            else:
+                self.assertEqual(self.dev.getZ(zId), values[zId])
+
+
 class OldStyleClass:
     """
     Test that MyPropertyManager can inherit from an old-style class that does
@@ -334,6 +371,7 @@ def test_suite():
     suite.addTest(makeSuite(AcquisitionTest))
     suite.addTest(makeSuite(TalesTest))
     suite.addTest(makeSuite(GetZTest))
+    suite.addTest(makeSuite(ZPropertyCacheTest))
     suite.addTest(makeSuite(PropertyDescriptorTest))
     return suite
 
@@ -12,6 +12,8 @@ import sys
 
 import six
 
+from persistent.list import PersistentList
+
 
 def _compile_file(filename):
     with open(filename) as f:
@@ -27,6 +29,7 @@ from Products.ZenRelations.Exceptions import (  # noqa E402
     ZenRelationsError,
     ZenSchemaError,
 )
+from Products.ZenRelations.OrderedObjectSet import OrderedObjectSet  # noqa E402
 from Products.ZenRelations.ToOneRelationship import manage_addToOneRelationship  # noqa E402
 
 from Products.ZenRelations.tests.TestSchema import (  # noqa E402
@@ -609,6 +612,68 @@ class ToManyRelationshipTest(ZenRelationsBaseTest):
         self.failUnless((dev2id, dev2) in loc.devices.objectItemsAll())
         self.failUnless(len(loc.devices.objectItems()) == 0)
 
+    def testToManyOrder(self):
+        """Test that a ToMany keeps the order objects are added in"""
+        loc = self.create(self.app, Location, "loc")
+        devs = [self.create(self.app, Device, "dev%d" % n) for n in range(4)]
+        for dev in devs:
+            loc.addRelation("devices", dev)
+        loc.devices.removeRelation(devs[1])
+        loc.devices.addRelation(devs[1])
+        self.assertEqual(
+            loc.devices.objectIdsAll(), ["dev0", "dev2", "dev3", "dev1"]
+        )
+
+    def testGetObByPrimaryId(self):
+        """Test _getOb on a ToMany with an absolute primaryId"""
+        loc = self.create(self.dmd, Location, "loc")
+        dev = self.create(self.dmd, Device, "dev")
+        dev2 = self.create(self.dmd, Device, "dev2")
+        loc.addRelation("devices", dev)
+        self.failUnless(loc.devices._getOb(dev.getPrimaryId()) == dev)
+        self.failUnless(loc.devices._getOb(dev2.getPrimaryId(), None) is None)
+        self.assertRaises(
+            AttributeError, loc.devices._getOb, dev2.getPrimaryId()
+        )
+
+    def testSmallToManyKeepsList(self):
+        """Test that a ToMany below the threshold is stored in a list"""
+        loc = self.create(self.app, Location, "loc")
+        dev = self.create(self.app, Device, "dev")
+        loc.addRelation("devices", dev)
+        loc.removeRelation("devices", dev)
+        self.assertIsInstance(loc.devices._objects, PersistentList)
+
+    def testConvertListToOrderedObjectSet(self):
+        """Test that a ToMany reaching the threshold is converted"""
+        loc = self.create(self.app, Location, "loc")
+        loc.devices.orderedSetThreshold = 2
+        devs = [self.create(self.app, Device, "dev%d" % n) for n in range(3)]
+        loc.addRelation("devices", devs[0])
+        loc.addRelation("devices", devs[1])
+        self.assertIsInstance(loc.devices._objects, PersistentList)
+        self.failUnless(loc.devices.hasobject(devs[0]) is not None)
+        loc.addRelation("devices", devs[2])
+        self.assertIsInstance(loc.devices._objects, OrderedObjectSet)
+        self.assertEqual(
+            loc.devices.objectIdsAll(), ["dev0", "dev1", "dev2"]
+        )
+
+    def testRepairOrderedObjectSet(self):
+        """Test repairing a ToMany stored in an OrderedObjectSet"""
+        loc = self.create(self.app, Location, "loc")
+        loc.devices.orderedSetThreshold = 2
+        for n in range(4):
+            loc.addRelation(
+                "devices", self.create(self.app, Device, "dev%d" % n)
+            )
+        self.assertIsInstance(loc.devices._objects, OrderedObjectSet)
+        # Delete devices from their primary path only.
+        self.app._delOb("dev1")
+        self.app._delOb("dev2")
+        self.failUnless(loc.devices.checkRelation(repair=True))
+        self.assertEqual(loc.devices.objectIdsAll(), ["dev0", "dev3"])
+
     def testaddRelationManyToMany(self):
         """Test froming a many to many relationship"""
         dev = self.create(self.app, Device, "dev")
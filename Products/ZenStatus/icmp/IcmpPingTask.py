@@ -0,0 +1,195 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""IcmpPingTask
+
+Pings all IPv4 and IPv6 devices in the current device list from within
+zenping using the IcmpEngine.
+"""
+
+import logging
+import math
+import time
+
+from collections import defaultdict
+
+from twisted.internet import defer, reactor, task as twistedTask
+from zope import component
+
+from Products.ZenCollector import interfaces
+from Products.ZenStatus import PingTask
+from Products.ZenStatus.nmap.NmapPingTask import (
+    MAX_NMAP_OVERHEAD,
+    MIN_PING_TIMEOUT,
+    NmapPingCollectionPreferences,
+    NmapPingTask,
+    NPingTaskFactory,
+    _NEVER_INTERVAL,
+    _SENDEVENT_YIELD_INTERVAL,
+)
+
+from . import IcmpEngineError
+from .engine import DEFAULT_RATE, IcmpEngine
+from .PingResult import PingResult
+
+log = logging.getLogger("zen.IcmpPingTask")
+
+
+class IcmpPingCollectionPreferences(NmapPingCollectionPreferences):
+    def _makeTask(self, daemon):
+        return IcmpPingTask(
+            "IcmpPingTask", "IcmpPingTask", taskConfig=daemon._prefs
+        )
+
+    def buildOptions(self, parser):
+        super(IcmpPingCollectionPreferences, self).buildOptions(parser)
+        parser.add_option(
+            "--icmp-rate",
+            dest="icmpRate",
+            default=DEFAULT_RATE,
+            type="int",
+            help="Minimum number of echo requests sent per second "
+            "(default %default)",
+        )
+
+    def runPostConfigTasks(self):
+        daemon = component.getUtility(interfaces.ICollector)
+        daemon._scheduler.resetStats("IcmpPingTask")
+
+
+class IcmpPingTaskFactory(NPingTaskFactory):
+    """
+    A Factory to create PingTasks that do not run. This allows IcmpPingTask
+    to use the created PingTasks, both IPv4 and IPv6, as placeholders for
+    configuration.
+    """
+
+    def build(self):
+        log.debug(
+            "Creating an IPv%s task: %s",
+            self.config.monitoredIps[0].ipVersion,
+            self.config.monitoredIps[0].ip,
+        )
+        task = PingTask(
+            self.name,
+            self.configId,
+            self.interval,
+            self.config,
+        )
+        # don't run the tasks, they are used for storing config
+        task.pauseOnScheduled = True
+        task.interval = _NEVER_INTERVAL
+        return task
+
+
+class IcmpPingTask(NmapPingTask):
+    """
+    IcmpPingTask pings all PingTasks using the IcmpEngine.
+
+    Result handling, events and correlation are those of NmapPingTask;
+    traceroute is not supported, so correlation relies on the traces
+    already in the trace cache.
+    """
+
+    _ipVersions = (4, 6)
+    _executionName = "icmp"
+    _executionErrors = (IcmpEngineError,)
+
+    def __init__(
+        self, taskName, configId, scheduleIntervalSeconds=60, taskConfig=None
+    ):
+        super(IcmpPingTask, self).__init__(
+            taskName,
+            configId,
+            scheduleIntervalSeconds,
+            taskConfig=taskConfig,
+        )
+        self._engine = IcmpEngine(rate=self._daemon.options.icmpRate)
+
+    @defer.inlineCallbacks
+    def _pingIpTasks(self, ipTasks):
+        """
+        Ping the IPs and log the results to their PingTasks.
+        """
+        options = self._daemon.options
+        pingTries = self._daemon._prefs.pingTries
+        cycleInterval = self._daemon._prefs.pingCycleInterval
+
+        # Make sure all the tries fit within one cycle.
+        timeout = min(
+            self._preferences.pingTimeOut,
+            (cycleInterval - MAX_NMAP_OVERHEAD) / max(pingTries, 1),
+        )
+        timeout = max(timeout, MIN_PING_TIMEOUT)
+
+        i = 0
+        pingTasks = ipTasks
+        for attempt in range(0, pingTries):
+            if attempt > 0 and options.retryUnanswered:
+                pingTasks = {
+                    taskName: ipTask
+                    for taskName, ipTask in pingTasks.iteritems()
+                    if not ipTask.isUp
+                }
+                if not pingTasks:
+                    log.debug("All IPs answered by attempt %d", attempt)
+                    break
+                log.debug(
+                    "Retrying %d unanswered IPs (attempt %d)",
+                    len(pingTasks),
+                    attempt + 1,
+                )
+
+            tasksByIp = defaultdict(list)
+            for ipTask in pingTasks.itervalues():
+                tasksByIp[ipTask.config.ip].append(ipTask)
+
+            # Go fast enough to finish all the tries within one cycle.
+            minRate = len(tasksByIp) * pingTries / float(cycleInterval)
+            rate = max(options.icmpRate, int(math.ceil(minRate)))
+
+            start = time.time()
+            results = yield self._engine.ping(
+                tasksByIp.keys(),
+                timeout=timeout,
+                dataLength=options.dataLength,
+                rate=rate,
+            )
+            log.debug(
+                "Pinged %d IPs in %f seconds",
+                len(tasksByIp),
+                time.time() - start,
+            )
+
+            for ip, tasks in tasksByIp.iteritems():
+                result = results.get(ip) or PingResult(ip)
+                for ipTask in tasks:
+                    i += 1
+                    ipTask.logPingResult(result)
+                    # give time to reactor to send events if necessary
+                    if i % _SENDEVENT_YIELD_INTERVAL == 0:
+                        yield twistedTask.deferLater(
+                            reactor, 0, lambda: None
+                        )
+
+    def displayStatistics(self):
+        """
+        Called by the collector framework scheduler, and allows us to
+        see how each task is doing.
+        """
+        engine = self._engine
+        return "sent=%d received=%d expired=%d errors=%d" % (
+            engine.sent,
+            engine.received,
+            engine.expired,
+            engine.errors,
+        )
+
+    def cleanup(self):
+        self._engine.close()
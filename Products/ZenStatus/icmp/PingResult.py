@@ -0,0 +1,82 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""PingResult
+
+Represents the result of an ICMP echo request sent by the IcmpEngine.
+"""
+
+import math
+
+from zope import interface
+
+from Products.ZenStatus import interfaces
+
+_STATE_TO_STRING_MAP = {True: "up", False: "down"}
+_NAN = float("nan")
+_NO_TRACE = tuple()
+
+
+@interface.implementer(interfaces.IPingResult)
+class PingResult(object):
+    """
+    Model of an ICMP echo request's result.
+    """
+
+    def __init__(self, address, timestamp=None, rtt=_NAN):
+        """
+        @param address: The IP address that was pinged.
+        @param timestamp: When the echo request was sent.
+        @param rtt: Round trip time in milliseconds; nan if no reply.
+        """
+        self._address = address
+        self._timestamp = timestamp
+        self._rtt = rtt
+
+    @property
+    def timestamp(self):
+        """Timestamp of when ping was sent (seconds since epoch)."""
+        return self._timestamp
+
+    @property
+    def address(self):
+        """Address of the host"""
+        return self._address
+
+    @property
+    def trace(self):
+        """traceroute of the host; not supported"""
+        return _NO_TRACE
+
+    def getStatusString(self):
+        """status string: up or down"""
+        return _STATE_TO_STRING_MAP[self.isUp]
+
+    def __repr__(self):
+        return "PingResult [%s, %s]" % (self._address, self.getStatusString())
+
+    @property
+    def isUp(self):
+        """true if host is up, false if host is down"""
+        return not math.isnan(self._rtt)
+
+    @property
+    def rtt(self):
+        """round trip time aka ping time aka rtt; nan if host was down"""
+        return self._rtt
+
+    @property
+    def variance(self):
+        """variance of the rtt; nan if host was down"""
+        return 0.0 if self.isUp else _NAN
+
+    @property
+    def stdDeviation(self):
+        """standard deviation of the rtt; nan if host was down"""
+        return 0.0 if self.isUp else _NAN
@@ -0,0 +1,14 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+
+class IcmpEngineError(Exception):
+    """
+    IcmpEngineError is raised when ICMP echo requests can't be sent.
+    """
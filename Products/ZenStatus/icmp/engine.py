@@ -0,0 +1,439 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""IcmpEngine
+
+Sends ICMP and ICMPv6 echo requests and matches their echo replies from
+within the Twisted reactor, without running any subprocesses.
+"""
+
+import errno
+import logging
+import math
+import os
+import socket
+import struct
+import time
+
+from collections import OrderedDict
+
+from twisted.internet import defer, reactor as _reactor, task
+from twisted.internet.interfaces import IReadDescriptor
+from zope import interface
+
+from . import IcmpEngineError
+from .PingResult import PingResult
+
+log = logging.getLogger("zen.zenping.icmp")
+
+# Echo requests sent per second
+DEFAULT_RATE = 1000
+
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+_ICMP6_ECHO_REQUEST = 128
+_ICMP6_ECHO_REPLY = 129
+
+_IPPROTO_ICMPV6 = getattr(socket, "IPPROTO_ICMPV6", 58)
+
+_FAMILY = {4: socket.AF_INET, 6: socket.AF_INET6}
+_PROTOCOL = {4: socket.IPPROTO_ICMP, 6: _IPPROTO_ICMPV6}
+_REQUEST_TYPE = {4: _ICMP_ECHO_REQUEST, 6: _ICMP6_ECHO_REQUEST}
+_REPLY_TYPE = {4: _ICMP_ECHO_REPLY, 6: _ICMP6_ECHO_REPLY}
+
+# type, code, checksum, identifier, sequence number
+_HEADER = struct.Struct("!BBHHH")
+
+# The payload starts with the time the request was sent.
+_TIMESTAMP = struct.Struct("!d")
+
+# Seconds between sending each group of echo requests.
+_SEND_INTERVAL = 0.01
+
+# Seconds between checks for echo requests that timed out.
+_EXPIRE_INTERVAL = 0.05
+
+# Largest number of packets read at once before yielding to the reactor.
+_MAX_READS = 1000
+
+
+def checksum(data):
+    """
+    Return the Internet checksum (RFC 1071) of `data`.
+    """
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack("!%dH" % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def buildEchoRequest(version, ident, sequence, dataLength=0, now=None):
+    """
+    Return an echo request packet whose payload starts with the current
+    time and is padded to at least `dataLength` bytes.
+    """
+    if now is None:
+        now = time.time()
+    payload = _TIMESTAMP.pack(now)
+    if dataLength > len(payload):
+        payload += b"\0" * (dataLength - len(payload))
+    header = _HEADER.pack(_REQUEST_TYPE[version], 0, 0, ident, sequence)
+    # The kernel computes the checksum of ICMPv6 packets.
+    if version == 4:
+        header = _HEADER.pack(
+            _REQUEST_TYPE[version],
+            0,
+            checksum(header + payload),
+            ident,
+            sequence,
+        )
+    return header + payload
+
+
+def parseEchoReply(version, packet, hasIpHeader=False):
+    """
+    Return the (identifier, sequence) of an echo reply or None if
+    `packet` isn't an echo reply.
+
+    @param hasIpHeader: True if the packet begins with an IPv4 header,
+        i.e. it was read from a raw IPv4 socket.
+    """
+    if hasIpHeader:
+        if not packet:
+            return None
+        packet = packet[(ord(packet[0]) & 0x0F) * 4 :]
+    if len(packet) < _HEADER.size:
+        return None
+    icmpType, code, _, ident, sequence = _HEADER.unpack_from(packet)
+    if icmpType != _REPLY_TYPE[version] or code != 0:
+        return None
+    return ident, sequence
+
+
+def _packAddress(version, ip):
+    # Normalizes the address so replies can be matched to requests
+    # regardless of how the address was written.
+    return socket.inet_pton(_FAMILY[version], ip.split("%", 1)[0])
+
+
+def _ipVersion(ip):
+    return 6 if ":" in ip else 4
+
+
+@interface.implementer(IReadDescriptor)
+class _IcmpSocket(object):
+    """
+    A non-blocking ICMP or ICMPv6 socket watched by the reactor.
+
+    A datagram ('ping') socket is used if the system allows it, otherwise
+    a raw socket is used, which requires the CAP_NET_RAW capability.
+    """
+
+    def __init__(self, version, onReply):
+        self.version = version
+        self._onReply = onReply
+        family, proto = _FAMILY[version], _PROTOCOL[version]
+        try:
+            self._socket = socket.socket(family, socket.SOCK_DGRAM, proto)
+            self.raw = False
+        except socket.error:
+            try:
+                self._socket = socket.socket(family, socket.SOCK_RAW, proto)
+            except socket.error as ex:
+                raise IcmpEngineError(
+                    "unable to open an ICMPv%d socket: %s" % (version, ex)
+                )
+            self.raw = True
+        self._socket.setblocking(False)
+        self._closed = False
+
+    def fileno(self):
+        return self._socket.fileno()
+
+    def logPrefix(self):
+        return "ICMPv%d" % self.version
+
+    def connectionLost(self, reason):
+        self._closed = True
+        self._socket.close()
+
+    def send(self, packet, ip):
+        """
+        Send the packet to `ip`.  Returns None if successful, otherwise
+        the socket error.
+        """
+        try:
+            self._socket.sendto(packet, (ip, 0))
+        except socket.error as ex:
+            return ex
+
+    def doRead(self):
+        for _ in xrange(_MAX_READS):
+            if self._closed:
+                return
+            try:
+                packet, address = self._socket.recvfrom(65535)
+            except socket.error as ex:
+                if ex.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return
+                if ex.args[0] == errno.EINTR:
+                    continue
+                log.debug("ICMPv%d receive error: %s", self.version, ex)
+                return
+            received = time.time()
+            reply = parseEchoReply(
+                self.version, packet, self.raw and self.version == 4
+            )
+            if reply is not None:
+                self._onReply(address[0], reply[0], reply[1], received)
+
+
+class _Probe(object):
+    __slots__ = ("ip", "sent", "deadline", "batch")
+
+    def __init__(self, ip, sent, deadline, batch):
+        self.ip = ip
+        self.sent = sent
+        self.deadline = deadline
+        self.batch = batch
+
+
+class _Batch(object):
+    """
+    The IPs given to one call of IcmpEngine.ping.
+    """
+
+    def __init__(self, ips, timeout, dataLength, rate):
+        self.ips = iter(ips)
+        self.timeout = timeout
+        self.dataLength = dataLength
+        self.rate = rate
+        self.results = {}
+        self.outstanding = 0
+        self.sending = True
+        # IP versions whose socket couldn't be opened.
+        self.unavailable = set()
+        self.deferred = defer.Deferred()
+
+    def addResult(self, result):
+        self.results[result.address] = result
+
+    def checkDone(self):
+        if not self.sending and self.outstanding == 0:
+            if not self.deferred.called:
+                self.deferred.callback(self.results)
+
+
+class IcmpEngine(object):
+    """
+    Pings many IPs at a controlled rate using one ICMP socket and one
+    ICMPv6 socket.
+
+    Each echo request is identified by the engine's identifier and a
+    sequence number; replies are matched to requests using the reply's
+    source address and sequence number.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, reactor=None):
+        """
+        @param rate: The number of echo requests sent per second.
+        """
+        self.rate = rate
+        self._reactor = reactor if reactor is not None else _reactor
+        self._ident = os.getpid() & 0xFFFF
+        self._sequence = 0
+        self._sockets = {}
+        # (version, packed address, sequence) -> _Probe, in send order.
+        self._pending = OrderedDict()
+        self._batches = []
+        self._sender = None
+        self._expirer = None
+        self.sent = 0
+        self.received = 0
+        self.expired = 0
+        self.errors = 0
+
+    def ping(self, ips, timeout=1.5, dataLength=0, rate=None):
+        """
+        Send one echo request to each IP.
+
+        Returns a deferred that fires with a dict of PingResults indexed
+        by IP once a reply has been received from, or `timeout` seconds
+        have passed for, every IP.
+
+        @param timeout: Seconds to wait for each echo reply.
+        @param dataLength: Minimum size of each echo request's payload.
+        @param rate: Overrides the engine's rate for these IPs.
+        """
+        ips = list(ips)
+        batch = _Batch(ips, timeout, dataLength, rate or self.rate)
+        if not ips:
+            batch.sending = False
+            batch.checkDone()
+            return batch.deferred
+        self._batches.append(batch)
+        if self._sender is None:
+            self._sender = task.LoopingCall(self._send)
+            self._sender.clock = self._reactor
+            self._sender.start(_SEND_INTERVAL)
+        return batch.deferred
+
+    def close(self):
+        """
+        Close the sockets.  IPs that haven't been pinged or haven't
+        replied yet are reported as down.
+        """
+        self._stopSending()
+        self._stopExpiring()
+        batches = set(self._batches)
+        for batch in self._batches:
+            for ip in batch.ips:
+                batch.addResult(PingResult(ip))
+            batch.sending = False
+        self._batches = []
+        for probe in self._pending.itervalues():
+            probe.batch.addResult(PingResult(probe.ip, probe.sent))
+            probe.batch.outstanding -= 1
+            batches.add(probe.batch)
+        self._pending.clear()
+        for batch in batches:
+            batch.checkDone()
+        for sock in self._sockets.values():
+            self._reactor.removeReader(sock)
+            sock.connectionLost(None)
+        self._sockets.clear()
+
+    def _getSocket(self, version):
+        sock = self._sockets.get(version)
+        if sock is None:
+            sock = self._sockets[version] = _IcmpSocket(
+                version, self._received
+            )
+            self._reactor.addReader(sock)
+            log.info(
+                "opened %s ICMPv%d socket",
+                "raw" if sock.raw else "datagram",
+                version,
+            )
+        return sock
+
+    def _nextSequence(self):
+        self._sequence = (self._sequence + 1) & 0xFFFF
+        return self._sequence
+
+    def _send(self):
+        batch = self._batches[0]
+        count = max(1, int(math.ceil(batch.rate * _SEND_INTERVAL)))
+        for ip in batch.ips:
+            self._sendRequest(batch, ip)
+            count -= 1
+            if count == 0:
+                break
+        else:
+            batch.sending = False
+            self._batches.pop(0)
+            batch.checkDone()
+            if not self._batches:
+                self._stopSending()
+
+    def _stopSending(self):
+        if self._sender is not None and self._sender.running:
+            self._sender.stop()
+        self._sender = None
+
+    def _sendRequest(self, batch, ip):
+        version = _ipVersion(ip)
+        try:
+            address = _packAddress(version, ip)
+        except (socket.error, ValueError):
+            log.debug("invalid IP address %r", ip)
+            batch.addResult(PingResult(ip))
+            return
+        sock = self._openSocket(batch, version)
+        if sock is None:
+            self.errors += 1
+            batch.addResult(PingResult(ip))
+            return
+        sequence = self._nextSequence()
+        now = time.time()
+        packet = buildEchoRequest(
+            version, self._ident, sequence, batch.dataLength, now
+        )
+        error = sock.send(packet, ip)
+        if error is not None:
+            self.errors += 1
+            log.debug("failed to send echo request to %s: %s", ip, error)
+            batch.addResult(PingResult(ip, timestamp=now))
+            return
+        self.sent += 1
+        key = (version, address, sequence)
+        self._pending[key] = _Probe(ip, now, now + batch.timeout, batch)
+        batch.outstanding += 1
+        if self._expirer is None:
+            self._expirer = task.LoopingCall(self._expire)
+            self._expirer.clock = self._reactor
+            self._expirer.start(_EXPIRE_INTERVAL, now=False)
+
+    def _openSocket(self, batch, version):
+        # A socket that can't be opened only fails the IPs of its own
+        # version; each batch tries to open it once.
+        if version in batch.unavailable:
+            return None
+        try:
+            return self._getSocket(version)
+        except IcmpEngineError as ex:
+            batch.unavailable.add(version)
+            log.error("%s; reporting ICMPv%d addresses as down", ex, version)
+            return None
+
+    def _received(self, source, ident, sequence, received):
+        sock = self._sockets.get(_ipVersion(source))
+        # The kernel sets the identifier of echo requests sent using
+        # datagram sockets, and only delivers the replies to them.
+        if sock is not None and sock.raw and ident != self._ident:
+            return
+        version = _ipVersion(source)
+        try:
+            key = (version, _packAddress(version, source), sequence)
+        except (socket.error, ValueError):
+            return
+        probe = self._pending.pop(key, None)
+        if probe is None:
+            return
+        self.received += 1
+        rtt = (received - probe.sent) * 1000.0
+        self._finish(probe, PingResult(probe.ip, probe.sent, rtt))
+
+    def _expire(self):
+        now = time.time()
+        # Probes are in send order, so the probes that timed out are at
+        # the front; a probe of a later call to ping having a shorter
+        # timeout expires when the probes in front of it do.
+        while self._pending:
+            key, probe = next(self._pending.iteritems())
+            if probe.deadline > now:
+                break
+            del self._pending[key]
+            self.expired += 1
+            self._finish(probe, PingResult(probe.ip, probe.sent))
+        if not self._pending:
+            self._stopExpiring()
+
+    def _stopExpiring(self):
+        if self._expirer is not None and self._expirer.running:
+            self._expirer.stop()
+        self._expirer = None
+
+    def _finish(self, probe, result):
+        batch = probe.batch
+        batch.addResult(result)
+        batch.outstanding -= 1
+        batch.checkDone()
@@ -63,9 +63,7 @@ class NmapPingCollectionPreferences(PingCollectionPreferences):
         Hook in to application startup and start background NmapPingTask.
         """
         daemon = component.getUtility(interfaces.ICollector)
-        task = NmapPingTask(
-            "NmapPingTask", "NmapPingTask", taskConfig=daemon._prefs
-        )
+        task = self._makeTask(daemon)
         # introduce a small delay to can have a chance to load some config
         task.startDelay = 5
         daemon._scheduler.addTask(task)
@@ -76,6 +74,11 @@ class NmapPingCollectionPreferences(PingCollectionPreferences):
             )
         task.disable_correlator = daemon.options.disableCorrelator
 
+    def _makeTask(self, daemon):
+        return NmapPingTask(
+            "NmapPingTask", "NmapPingTask", taskConfig=daemon._prefs
+        )
+
     def buildOptions(self, parser):
         super(NmapPingCollectionPreferences, self).buildOptions(parser)
         parser.add_option(
@@ -86,6 +89,14 @@ class NmapPingCollectionPreferences(PingCollectionPreferences):
             help="Suppress ping downs using interfaces on a device whose "
             "IPs may not be monitored",
         )
+        parser.add_option(
+            "--retry-unanswered",
+            dest="retryUnanswered",
+            default=False,
+            action="store_true",
+            help="After the first ping attempt of a cycle, ping only the "
+            "IPs that haven't answered yet",
+        )
 
     def runPostConfigTasks(self):
         daemon = component.getUtility(interfaces.ICollector)
@@ -139,12 +150,32 @@ class NPingTaskFactory(object):
         self.config = None
 
 
+def _writeIps(tfile, ipTasks):
+    """
+    Replace the contents of the nmap input file with the IPs of the tasks.
+    """
+    tfile.seek(0)
+    tfile.truncate()
+    for ip in sorted({ipTask.config.ip for ipTask in ipTasks.itervalues()}):
+        tfile.write("%s\n" % ip)
+    tfile.flush()
+
+
 class NmapPingTask(BaseTask):
     interface.implements(ZenCollector.interfaces.IScheduledTask)
     """
     NmapPingTask pings all PingTasks using using nmap.
     """
 
+    # The IP versions of the PingTasks pinged by this task.
+    _ipVersions = (4,)
+
+    # Identifies the ping method in the execution events.
+    _executionName = "nmap"
+
+    # Errors that indicate the ping method failed.
+    _executionErrors = (nmap.NmapExecutionError,)
+
     def __init__(
         self, taskName, configId, scheduleIntervalSeconds=60, taskConfig=None
     ):
@@ -253,16 +284,19 @@ class NmapPingTask(BaseTask):
         Send/Clear event to show that nmap is executed properly.
         """
         if ex is None:
-            msg = "nmap executed correctly"
+            msg = "%s executed correctly" % self._executionName
             severity = _CLEAR
         else:
-            msg = "nmap did not execute correctly: %s" % ex
+            msg = "%s did not execute correctly: %s" % (
+                self._executionName,
+                ex,
+            )
             severity = _CRITICAL
         evt = dict(
             device=self.collectorName,
             eventClass=ZenEventClasses.Status_Ping,
             eventGroup="Ping",
-            eventKey="nmap_execution",
+            eventKey="%s_execution" % self._executionName,
             severity=severity,
             summary=msg,
         )
@@ -288,18 +322,19 @@ class NmapPingTask(BaseTask):
 
         except nmap.ShortCycleIntervalError:
             self._sendShortCycleInterval(self.interval)
-        except nmap.NmapExecutionError as ex:
+        except self._executionErrors as ex:
             self._nmapExecution(ex)
 
     def _getPingTasks(self):
         """
-        Iterate the daemons task list and find PingTask tasks that are IPV4.
+        Iterate the daemons task list and find PingTask tasks having one of
+        the IP versions pinged by this task.
         """
         tasks = self._daemon._scheduler._tasks
         pingTasks = {}
         for configName, task in tasks.iteritems():
             if isinstance(task.task, PingTask):
-                if task.task.config.ipVersion == 4:
+                if task.task.config.ipVersion in self._ipVersions:
                     pingTasks[configName] = task.task
         return pingTasks
 
@@ -319,15 +354,21 @@ class NmapPingTask(BaseTask):
 
         # only increment if we have tasks to ping
         self._pings += 1
+        for taskName, ipTask in ipTasks.iteritems():
+            ipTask.resetPingResult()  # clear out previous run's results
+
+        yield self._pingIpTasks(ipTasks)
+        yield self._processResults(ipTasks)
+
+        self._nmapExecution()
+
+    @defer.inlineCallbacks
+    def _pingIpTasks(self, ipTasks):
+        """
+        Ping/traceroute the IPs and log the results to their PingTasks.
+        """
         with tempfile.NamedTemporaryFile(prefix="zenping_nmap_") as tfile:
-            ips = []
-            for taskName, ipTask in ipTasks.iteritems():
-                ips.append(ipTask.config.ip)
-                ipTask.resetPingResult()  # clear out previous run's results
-            ips.sort()
-            for ip in ips:
-                tfile.write("%s\n" % ip)
-            tfile.flush()
+            _writeIps(tfile, ipTasks)
 
             # ping up to self._preferences.pingTries
             tracerouteInterval = self._daemon.options.tracerouteInterval
@@ -338,20 +379,48 @@ class NmapPingTask(BaseTask):
                 if self._pings == 0 or (self._pings % tracerouteInterval) == 0:
                     doTraceroute = True  # try to traceroute on next ping
 
+            retryUnanswered = self._daemon.options.retryUnanswered
+
             import time
 
             i = 0
+            pingTasks = ipTasks
             for attempt in range(0, self._daemon._prefs.pingTries):
+                if attempt > 0 and retryUnanswered:
+                    pingTasks = {
+                        taskName: ipTask
+                        for taskName, ipTask in pingTasks.iteritems()
+                        if not ipTask.isUp
+                    }
+                    if not pingTasks:
+                        log.debug("All IPs answered by attempt %d", attempt)
+                        break
+                    log.debug(
+                        "Retrying %d unanswered IPs (attempt %d)",
+                        len(pingTasks),
+                        attempt + 1,
+                    )
+                    _writeIps(tfile, pingTasks)
+
+                tasksByIp = defaultdict(list)
+                for ipTask in pingTasks.itervalues():
+                    tasksByIp[ipTask.config.ip].append(ipTask)
+
+                def logResult(result, tasksByIp=tasksByIp):
+                    # record the results as nmap reports them
+                    for ipTask in tasksByIp.pop(result.address, ()):
+                        ipTask.logPingResult(result)
 
                 start = time.time()
-                results = yield executeNmapCmd(
+                yield executeNmapCmd(
                     tfile.name,
                     traceroute=doTraceroute,
-                    num_devices=len(ipTasks),
+                    num_devices=len(pingTasks),
                     dataLength=self._daemon.options.dataLength,
                     pingTries=self._daemon._prefs.pingTries,
                     pingTimeOut=self._preferences.pingTimeOut,
                     pingCycleInterval=self._daemon._prefs.pingCycleInterval,
+                    resultHandler=logResult,
                 )
                 elapsed = time.time() - start
                 log.debug("Nmap execution took %f seconds", elapsed)
@@ -359,82 +428,83 @@ class NmapPingTask(BaseTask):
                 # only do traceroute on the first ping attempt, if at all
                 doTraceroute = False
 
-                # record the results!
-                for taskName, ipTask in ipTasks.iteritems():
-                    i += 1
-                    ip = ipTask.config.ip
-                    if ip in results:
-                        result = results[ip]
-                        ipTask.logPingResult(result)
-                    else:
-                        # received no result, log as down
+                # received no result, log as down
+                for ip, unanswered in tasksByIp.iteritems():
+                    for ipTask in unanswered:
+                        i += 1
                         ipTask.logPingResult(PingResult(ip, isUp=False))
-                    # give time to reactor to send events if necessary
-                    if i % _SENDEVENT_YIELD_INTERVAL:
-                        yield twistedTask.deferLater(reactor, 0, lambda: None)
-
-            self._cleanupDownCounts()
-            dcs = self._down_counts
-            delayCount = self._daemon.options.delayCount
-            pingTimeOut = self._preferences.pingTimeOut
-            for taskName, ipTask in ipTasks.iteritems():
-                i += 1
-                if ipTask.isUp:
-                    if taskName in dcs:
-                        del dcs[taskName]
-                    log.debug("%s is up!", ipTask.config.ip)
-                    ipTask.delayedIsUp = True
-                    ipTask.sendPingUp()
-                    averageRtt = ipTask.averageRtt()
-                    if averageRtt is not None:
-                        if (
-                            averageRtt / 1000.0 > pingTimeOut
-                        ):  # millisecs to secs
-                            ipTask.sendPingDegraded(rtt=averageRtt)
-                        else:
-                            ipTask.clearPingDegraded(rtt=averageRtt)
-                else:
-                    dcs[taskName] = (dcs[taskName][0] + 1, datetime.now())
-                    if dcs[taskName][0] > delayCount:
-                        log.debug(
-                            "%s is down, %r", ipTask.config.ip, ipTask.trace
-                        )
-                        ipTask.delayedIsUp = False
+                        # give time to reactor to send events if necessary
+                        if i % _SENDEVENT_YIELD_INTERVAL:
+                            yield twistedTask.deferLater(
+                                reactor, 0, lambda: None
+                            )
+
+    @defer.inlineCallbacks
+    def _processResults(self, ipTasks):
+        """
+        Update the down counts, correlate, and send events.
+        """
+        i = 0
+        self._cleanupDownCounts()
+        dcs = self._down_counts
+        delayCount = self._daemon.options.delayCount
+        pingTimeOut = self._preferences.pingTimeOut
+        for taskName, ipTask in ipTasks.iteritems():
+            i += 1
+            if ipTask.isUp:
+                if taskName in dcs:
+                    del dcs[taskName]
+                log.debug("%s is up!", ipTask.config.ip)
+                ipTask.delayedIsUp = True
+                ipTask.sendPingUp()
+                averageRtt = ipTask.averageRtt()
+                if averageRtt is not None:
+                    if (
+                        averageRtt / 1000.0 > pingTimeOut
+                    ):  # millisecs to secs
+                        ipTask.sendPingDegraded(rtt=averageRtt)
                     else:
-                        log.debug(
-                            "%s is down. %s ping downs received. "
-                            "Delaying events until more than %s ping "
-                            "downs are received.",
-                            ipTask.config.ip,
-                            dcs[taskName][0],
-                            delayCount,
-                        )
-
-                ipTask.storeResults()
-                # give time to reactor to send events if necessary
-                if i % _SENDEVENT_YIELD_INTERVAL:
-                    yield twistedTask.deferLater(reactor, 0, lambda: None)
-
-            if not self.disable_correlator:
-                try:
-                    yield defer.maybeDeferred(self._correlate, ipTasks)
-                except Exception as ex:
-                    self._correlationExecution(ex)
-                    log.critical(
-                        "There was a problem performing correlation: %s", ex
+                        ipTask.clearPingDegraded(rtt=averageRtt)
+            else:
+                dcs[taskName] = (dcs[taskName][0] + 1, datetime.now())
+                if dcs[taskName][0] > delayCount:
+                    log.debug(
+                        "%s is down, %r", ipTask.config.ip, ipTask.trace
                     )
+                    ipTask.delayedIsUp = False
                 else:
-                    self._correlationExecution()  # send clear
-            else:
-                downTasks = (
-                    ipTask
-                    for ipTask in ipTasks.values()
-                    if not (ipTask.isUp or ipTask.delayedIsUp)
-                )
-                for ipTask in downTasks:
-                    ipTask.sendPingDown()
+                    log.debug(
+                        "%s is down. %s ping downs received. "
+                        "Delaying events until more than %s ping "
+                        "downs are received.",
+                        ipTask.config.ip,
+                        dcs[taskName][0],
+                        delayCount,
+                    )
 
-            self._nmapExecution()
+            ipTask.storeResults()
+            # give time to reactor to send events if necessary
+            if i % _SENDEVENT_YIELD_INTERVAL:
+                yield twistedTask.deferLater(reactor, 0, lambda: None)
+
+        if not self.disable_correlator:
+            try:
+                yield defer.maybeDeferred(self._correlate, ipTasks)
+            except Exception as ex:
+                self._correlationExecution(ex)
+                log.critical(
+                    "There was a problem performing correlation: %s", ex
+                )
+            else:
+                self._correlationExecution()  # send clear
+        else:
+            downTasks = (
+                ipTask
+                for ipTask in ipTasks.values()
+                if not (ipTask.isUp or ipTask.delayedIsUp)
+            )
+            for ipTask in downTasks:
+                ipTask.sendPingDown()
 
     def _cleanupDownCounts(self):
         """Clear out old down counts so process memory utilization doesn't
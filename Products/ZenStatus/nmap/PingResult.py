@@ -36,12 +36,18 @@ def parseNmapXml(input):
     """
     Parse the XML output of nmap and return a list PingResults.
     """
-    results = []
-    parseTree = etree.parse(input)
-    for hostTree in parseTree.xpath("/nmaprun/host"):
-        result = PingResult.createNmapResult(hostTree)
-        results.append(result)
-    return results
+    return list(iterNmapXml(input))
+
+
+def iterNmapXml(input):
+    """
+    Parse the XML output of nmap incrementally, producing a PingResult
+    for each host as soon as its host element has been read.
+    """
+    for _, hostTree in etree.iterparse(input, events=("end",), tag="host"):
+        if _isHostTree(hostTree):
+            yield PingResult.createNmapResult(hostTree)
+            _release(hostTree)
 
 
 def parseNmapXmlToDict(input):
@@ -50,11 +56,66 @@ def parseNmapXmlToDict(input):
     by IP.
     """
     rdict = {}
-    for result in parseNmapXml(input):
+    for result in iterNmapXml(input):
         rdict[result.address] = result
     return rdict
 
 
+class NmapXmlParser(object):
+    """
+    Parses the XML output of nmap as it is received.
+
+    The data is given to the feed method in chunks of any size; feed
+    returns the PingResults of the hosts whose host elements were
+    completed by the chunk.
+    """
+
+    def __init__(self):
+        self._parser = etree.XMLPullParser(events=("end",), tag="host")
+
+    def feed(self, data):
+        """
+        Parse a chunk of nmap's output and return a list of PingResults.
+        """
+        self._parser.feed(data)
+        return self._read()
+
+    def close(self):
+        """
+        Finish parsing and return a list of any remaining PingResults.
+
+        An exception is raised if the output isn't well formed XML.
+        """
+        self._parser.close()
+        return self._read()
+
+    def _read(self):
+        results = []
+        for _, hostTree in self._parser.read_events():
+            if _isHostTree(hostTree):
+                results.append(PingResult.createNmapResult(hostTree))
+                _release(hostTree)
+        return results
+
+
+def _isHostTree(element):
+    parent = element.getparent()
+    return (
+        parent is not None
+        and parent.tag == "nmaprun"
+        and parent.getparent() is None
+    )
+
+
+def _release(hostTree):
+    # Free the parsed host element and the already parsed elements
+    # preceding it so memory use doesn't grow with the number of hosts.
+    hostTree.clear()
+    parent = hostTree.getparent()
+    while hostTree.getprevious() is not None:
+        del parent[0]
+
+
 class PingResult(object):
     """
     Model of an nmap ping/traceroute result.
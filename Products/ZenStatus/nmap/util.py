@@ -11,10 +11,9 @@ import logging
 import math
 import tempfile
 
-from cStringIO import StringIO
-from twisted.internet import utils, defer
+from twisted.internet import defer, protocol, reactor
 
-from Products.ZenStatus.nmap.PingResult import parseNmapXmlToDict
+from Products.ZenStatus.nmap.PingResult import NmapXmlParser
 from Products.ZenStatus import nmap
 
 log = logging.getLogger("zen.nmap")
@@ -67,9 +66,16 @@ def executeNmapCmd(
     pingTries=2,
     pingTimeOut=1.5,
     pingCycleInterval=60,
+    resultHandler=None,
 ):
     """
     Execute nmap and return its output.
+
+    The output is parsed while nmap is running.  If `resultHandler` is
+    given, it is called with each host's PingResult as soon as the
+    result has been parsed.
+
+    @return: A dict of PingResults indexed by IP.
     """
     args = ["-iL", inputFileFilename]  # input file
 
@@ -136,9 +142,14 @@ def executeNmapCmd(
         log.debug("executing nmap %s", " ".join(args))
     args = ["-n", _NMAP_BINARY] + args
     log.debug("Executing /bin/sudo %s", " ".join(args))
-    out, err, exitCode = yield utils.getProcessOutputAndValue(
-        "/bin/sudo", args
+    nmapProtocol = _NmapProcessProtocol(resultHandler)
+    reactor.spawnProcess(
+        nmapProtocol, "/bin/sudo", ["/bin/sudo"] + args, env={}
     )
+    yield nmapProtocol.finished
+    out = nmapProtocol.stdout
+    err = nmapProtocol.stderr
+    exitCode = nmapProtocol.exitCode
 
     if exitCode != 0:
         input = open(inputFileFilename).read()
@@ -149,16 +160,68 @@ def executeNmapCmd(
             exitCode=exitCode, stdout=out, stderr=err, args=args
         )
 
-    try:
-        nmapResults = parseNmapXmlToDict(StringIO(out))
-        log.debug("nmapResults -> %s", nmapResults)
-        defer.returnValue(nmapResults)
-    except Exception as e:
+    if nmapProtocol.parseError is not None:
         input = open(inputFileFilename).read()
         log.debug("input file: %s", input)
         log.debug("stdout: %s", out)
         log.debug("stderr: %s", err)
-        log.exception(e)
+        log.error(nmapProtocol.parseError)
         raise nmap.NmapExecutionError(
             exitCode=exitCode, stdout=out, stderr=err, args=args
         )
+
+    log.debug("nmapResults -> %s", nmapProtocol.results)
+    defer.returnValue(nmapProtocol.results)
+
+
+class _NmapProcessProtocol(protocol.ProcessProtocol):
+    """
+    Collects nmap's output, parsing its XML output as it's received.
+    """
+
+    def __init__(self, resultHandler=None):
+        self.finished = defer.Deferred()
+        self.results = {}
+        self.exitCode = None
+        self.parseError = None
+        self._handler = resultHandler
+        self._parser = NmapXmlParser()
+        self._out = []
+        self._err = []
+
+    @property
+    def stdout(self):
+        return "".join(self._out)
+
+    @property
+    def stderr(self):
+        return "".join(self._err)
+
+    def outReceived(self, data):
+        self._out.append(data)
+        if self.parseError is None:
+            self._parse(self._parser.feed, data)
+
+    def errReceived(self, data):
+        self._err.append(data)
+
+    def processEnded(self, reason):
+        self.exitCode = reason.value.exitCode
+        if self.parseError is None:
+            self._parse(self._parser.close)
+        self.finished.callback(None)
+
+    def _parse(self, parse, *args):
+        try:
+            results = parse(*args)
+        except Exception as ex:
+            self.parseError = ex
+            return
+        for result in results:
+            self.results[result.address] = result
+            if self._handler is None:
+                continue
+            try:
+                self._handler(result)
+            except Exception:
+                log.exception("failed to handle nmap result %s", result)
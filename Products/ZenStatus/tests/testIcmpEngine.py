@@ -0,0 +1,163 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+import math
+import struct
+
+from twisted.internet.task import Clock
+
+from Products.ZenStatus.icmp import IcmpEngineError, engine
+from Products.ZenStatus.icmp.PingResult import PingResult
+from Products.ZenTestCase.BaseTestCase import BaseTestCase
+
+
+class FakeSocket(object):
+    raw = False
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, packet, ip):
+        self.sent.append((ip, packet))
+
+
+class TestPackets(BaseTestCase):
+    def testChecksum(self):
+        packet = engine.buildEchoRequest(4, 0x1234, 7, dataLength=32)
+        self.assertEqual(engine.checksum(packet), 0)
+        self.assertEqual(len(packet), 8 + 32)
+
+    def testParseReply(self):
+        request = engine.buildEchoRequest(4, 0x1234, 7)
+        reply = struct.pack("!B", engine._ICMP_ECHO_REPLY) + request[1:]
+        self.assertEqual(engine.parseEchoReply(4, reply), (0x1234, 7))
+        self.assertIsNone(engine.parseEchoReply(4, request))
+        self.assertIsNone(engine.parseEchoReply(4, reply[:4]))
+
+    def testParseReplyWithIpHeader(self):
+        request = engine.buildEchoRequest(4, 0x1234, 7)
+        reply = struct.pack("!B", engine._ICMP_ECHO_REPLY) + request[1:]
+        header = struct.pack("!B", 0x45) + "\0" * 19
+        self.assertEqual(
+            engine.parseEchoReply(4, header + reply, hasIpHeader=True),
+            (0x1234, 7),
+        )
+
+    def testParseIcmp6Reply(self):
+        request = engine.buildEchoRequest(6, 0x1234, 7)
+        reply = struct.pack("!B", engine._ICMP6_ECHO_REPLY) + request[1:]
+        self.assertEqual(engine.parseEchoReply(6, reply), (0x1234, 7))
+        self.assertIsNone(engine.parseEchoReply(4, reply))
+
+
+class TestIcmpEngine(BaseTestCase):
+    def afterSetUp(self):
+        super(TestIcmpEngine, self).afterSetUp()
+        self.clock = Clock()
+        self.engine = engine.IcmpEngine(rate=1000, reactor=self.clock)
+        self.sockets = {4: FakeSocket(), 6: FakeSocket()}
+        self.engine._sockets.update(self.sockets)
+
+    def _ping(self, ips, **kw):
+        results = []
+        self.engine.ping(ips, **kw).addCallback(results.append)
+        return results
+
+    def _reply(self, ip, packet):
+        _, _, _, ident, sequence = engine._HEADER.unpack_from(packet)
+        self.engine._received(ip, ident, sequence, 0)
+
+    def testReplies(self):
+        results = self._ping(["127.0.0.1", "::1"], timeout=60)
+        self.assertEqual(self.engine.sent, 2)
+        self.assertEqual(results, [])
+        for version, sock in self.sockets.iteritems():
+            for ip, packet in sock.sent:
+                self._reply(ip, packet)
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0]["127.0.0.1"].isUp)
+        self.assertTrue(results[0]["::1"].isUp)
+        self.assertEqual(self.engine.received, 2)
+
+    def testUnknownReplyIgnored(self):
+        results = self._ping(["127.0.0.1"], timeout=60)
+        ip, packet = self.sockets[4].sent[0]
+        self._reply("127.0.0.2", packet)
+        self.assertEqual(results, [])
+        self.assertEqual(self.engine.received, 0)
+
+    def testTimeout(self):
+        results = self._ping(["127.0.0.1"], timeout=0)
+        self.clock.advance(engine._EXPIRE_INTERVAL)
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0]["127.0.0.1"].isUp)
+        self.assertEqual(self.engine.expired, 1)
+
+    def testRate(self):
+        ips = ["10.0.0.%d" % n for n in range(1, 51)]
+        results = self._ping(ips, timeout=60, rate=1000)
+        self.assertEqual(len(self.sockets[4].sent), 10)
+        self.clock.pump([engine._SEND_INTERVAL] * 4)
+        self.assertEqual(len(self.sockets[4].sent), 50)
+        self.assertEqual(results, [])
+
+    def testInvalidAddress(self):
+        results = self._ping(["not.an.ip"], timeout=60)
+        self.clock.advance(engine._SEND_INTERVAL)
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0]["not.an.ip"].isUp)
+
+    def testUnavailableVersionReportedAsDown(self):
+        def failingSocket(version, onReply):
+            raise IcmpEngineError("unable to open an ICMPv%d socket" % version)
+
+        self.engine._sockets.pop(6)
+        original = engine._IcmpSocket
+        engine._IcmpSocket = failingSocket
+        self.addCleanup(setattr, engine, "_IcmpSocket", original)
+        results = self._ping(["127.0.0.1", "::1", "::2"], timeout=60)
+        self.assertEqual(self.engine.sent, 1)
+        self.assertEqual(self.engine.errors, 2)
+        ip, packet = self.sockets[4].sent[0]
+        self._reply(ip, packet)
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0]["127.0.0.1"].isUp)
+        self.assertFalse(results[0]["::1"].isUp)
+        self.assertFalse(results[0]["::2"].isUp)
+
+    def testCloseReportsPendingAsDown(self):
+        results = self._ping(["127.0.0.1"], timeout=60)
+        self.engine._sockets.clear()
+        self.engine.close()
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0]["127.0.0.1"].isUp)
+
+
+class TestPingResult(BaseTestCase):
+    def testUp(self):
+        result = PingResult("127.0.0.1", 1.0, 0.5)
+        self.assertTrue(result.isUp)
+        self.assertEqual(result.rtt, 0.5)
+        self.assertEqual(result.variance, 0.0)
+
+    def testDown(self):
+        result = PingResult("127.0.0.1")
+        self.assertFalse(result.isUp)
+        self.assertTrue(math.isnan(result.rtt))
+        self.assertEqual(result.trace, tuple())
+
+
+def test_suite():
+    from unittest import TestSuite, makeSuite
+
+    suite = TestSuite()
+    suite.addTest(makeSuite(TestPackets))
+    suite.addTest(makeSuite(TestIcmpEngine))
+    suite.addTest(makeSuite(TestPingResult))
+    return suite
@@ -160,9 +160,45 @@ class TestPingResult(BaseTestCase):
                 self.assertEqual(hop.rtt, o["trace"][i][1], msg)
 
 
+class TestNmapXmlParser(BaseTestCase):
+    def setUp(self):
+        nmap_testfile = os.path.sep.join(
+            [os.path.dirname(os.path.realpath(__file__)), "nmap_ping.xml"]
+        )
+        with open(nmap_testfile) as f:
+            self._data = f.read()
+
+    def testChunkedInput(self):
+        parser = PingResult.NmapXmlParser()
+        results = []
+        counts = []
+        for i in range(0, len(self._data), 100):
+            chunk = parser.feed(self._data[i : i + 100])
+            counts.append(len(chunk))
+            results.extend(chunk)
+        results.extend(parser.close())
+        # Results are produced before all the output has been read.
+        self.assertGreater(sum(counts[:-1]), 0)
+        self.assertEqual(
+            sorted(r.address for r in results),
+            sorted(o["ip"] for o in testObjs),
+        )
+        byIp = {r.address: r for r in results}
+        for o in testObjs:
+            self.assertEqual(byIp[o["ip"]].isUp, o["isUp"])
+            self.assertEqual(len(byIp[o["ip"]].trace), len(o["trace"]))
+
+    def testMalformedInput(self):
+        parser = PingResult.NmapXmlParser()
+        parser.feed(self._data[: len(self._data) // 2])
+        with self.assertRaises(Exception):
+            parser.close()
+
+
 def test_suite():
     from unittest import TestSuite, makeSuite
 
     suite = TestSuite()
     suite.addTest(makeSuite(TestPingResult))
+    suite.addTest(makeSuite(TestNmapXmlParser))
     return suite
@@ -23,6 +23,7 @@ Patched methods in PackUndo:
 
 from relstorage.adapters.connections import LoadConnection, PrePackConnection
 from Products.ZenUtils.Utils import monkeypatch
+from Products.ZenUtils.zodbpackgraph import GraphTooLarge, ReachabilityGraph
 from collections import defaultdict, deque
 from itertools import groupby
 from operator import itemgetter
@@ -53,6 +54,7 @@ def set_external_option(option, value=True):
         "BUILD_TABLES_ONLY"
         "N_WORKERS"
         "MINIMIZE_MEMORY_USAGE"
+        "IN_MEMORY_GRAPH": maximum number of bytes used by the graph
     """
     GLOBAL_OPTIONS[option] = value
 
@@ -647,6 +649,7 @@ try:
 
     REPORT_PERIOD = 60
     OIDS_PER_TASK = 1000
+    GRAPH_ROWS_PER_QUERY = 10000
 
     class RefTableWorker(multiprocessing.Process):
         def __init__(self, tasks_queue, results_queue, load_connection,
@@ -961,9 +964,104 @@ try:
             upload_batch()
 
 
+    @monkeypatch('relstorage.adapters.packundo.PackUndo')
+    def _select_in_batches(self, cursor, stmt, key_columns):
+        """Yield the rows selected by stmt, GRAPH_ROWS_PER_QUERY at a time.
+
+        The rows are paged by their first columns, named by key_columns:
+        stmt is formatted with those names mapped to the values of the last
+        row fetched, and 'limit' mapped to the number of rows to fetch.
+        Only one page of rows is held by the client at a time.
+        """
+        last = dict.fromkeys(key_columns, -1)
+        last['limit'] = GRAPH_ROWS_PER_QUERY
+        while True:
+            self.runner.run_script_stmt(cursor, stmt % last)
+            rows = cursor.fetchall()
+            for row in rows:
+                yield row
+            if len(rows) < GRAPH_ROWS_PER_QUERY:
+                return
+            last.update(zip(key_columns, rows[-1]))
+
+
+    @monkeypatch('relstorage.adapters.packundo.PackUndo')
+    def _in_memory_traverse_graph(self, load_connection, store_connection):
+        """Visit the entire object graph to find out what should be kept.
+
+        The graph is loaded in a compact ReachabilityGraph, then the keep
+        flags are set with one condition per range of reachable objects.
+        Raises GraphTooLarge if the graph needs more memory than allowed.
+        """
+        graph = ReachabilityGraph(GLOBAL_OPTIONS["IN_MEMORY_GRAPH"])
+
+        # The rows are fetched in pages ordered by primary key, because
+        # the MySQL driver buffers every row of a query in the client.
+        log.info("pre_pack: loading pack_object in memory.")
+        stmt = """
+        SELECT zoid, keep
+        FROM pack_object
+        WHERE zoid > %(zoid)d
+        ORDER BY zoid
+        LIMIT %(limit)d
+        """
+        graph.add_objects(self._select_in_batches(
+            load_connection.cursor, stmt, ('zoid',)))
+
+        # The page condition is spelled out, rather than compared as a row,
+        # so that the databases scan a range of the primary key of
+        # object_ref instead of the whole table for each page.
+        log.info("pre_pack: loading object_ref in memory.")
+        stmt = """
+        SELECT object_ref.zoid, object_ref.to_zoid
+        FROM object_ref
+            JOIN pack_object ON (object_ref.zoid = pack_object.zoid)
+        WHERE object_ref.tid >= pack_object.keep_tid
+            AND (object_ref.zoid > %(zoid)d
+                OR (object_ref.zoid = %(zoid)d
+                    AND object_ref.to_zoid > %(to_zoid)d))
+        ORDER BY object_ref.zoid, object_ref.to_zoid
+        LIMIT %(limit)d
+        """
+        graph.add_references(self._select_in_batches(
+            load_connection.cursor, stmt, ('zoid', 'to_zoid')))
+
+        log.info("pre_pack: traversing the object graph "
+            "to find reachable objects.")
+        reachable = graph.traverse()
+
+        log.info("pre_pack: marking objects reachable: %d", reachable)
+        batch = []
+
+        def upload_batch():
+            condition = ' OR '.join(
+                'zoid BETWEEN %d AND %d' % oids for oids in batch)
+            del batch[:]
+            stmt = """
+            UPDATE pack_object SET keep = %%(TRUE)s, visited = %%(TRUE)s
+            WHERE %s
+            """ % condition
+            self.runner.run_script_stmt(store_connection.cursor, stmt)
+
+        for oids in graph.reachable_ranges():
+            batch.append(oids)
+            if len(batch) >= 1000:
+                upload_batch()
+        if batch:
+            upload_batch()
+
+
     @monkeypatch('relstorage.adapters.packundo.PackUndo')
     def _traverse_graph(self, load_connection, store_connection):
-        if "MINIMIZE_MEMORY_USAGE" in GLOBAL_OPTIONS:
+        if "IN_MEMORY_GRAPH" in GLOBAL_OPTIONS:
+            try:
+                self._in_memory_traverse_graph(load_connection, store_connection)
+                return
+            except GraphTooLarge as e:
+                log.warning("pre_pack: %s, traversing the graph in the "
+                    "database instead.", e)
+            self._patched_traverse_graph(load_connection, store_connection)
+        elif "MINIMIZE_MEMORY_USAGE" in GLOBAL_OPTIONS:
             self._patched_traverse_graph(load_connection, store_connection)
         else:
             original(self, load_connection, store_connection)
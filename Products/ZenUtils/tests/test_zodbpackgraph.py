@@ -0,0 +1,81 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from unittest import TestCase
+
+from Products.ZenUtils.zodbpackgraph import (
+    GraphTooLarge,
+    ReachabilityGraph,
+    synthetic_graph,
+)
+
+
+def _reachable(objects, references):
+    """Reference implementation of the traversal."""
+    children = {}
+    for zoid, to_zoid in references:
+        children.setdefault(zoid, set()).add(to_zoid)
+    known = set(zoid for zoid, _ in objects)
+    keep = set(zoid for zoid, root in objects if root)
+    parents = set(keep)
+    while parents:
+        found = set()
+        for zoid in parents:
+            found.update(children.get(zoid, ()))
+        parents = (found & known) - keep
+        keep.update(parents)
+    return sorted(keep)
+
+
+class ReachabilityGraphTest(TestCase):
+    def test_traverse(t):
+        graph = ReachabilityGraph()
+        graph.add_objects(
+            [(0, True), (3, False), (5, False), (7, False), (9, True)]
+        )
+        graph.add_references([(0, 3), (3, 0), (3, 5), (7, 9), (9, 42)])
+
+        t.assertEqual(graph.traverse(), 4)
+        t.assertEqual(list(graph.reachable()), [0, 3, 5, 9])
+        t.assertEqual(list(graph.reachable_ranges()), [(0, 5), (9, 9)])
+
+    def test_matches_reference_implementation(t):
+        objects, references = synthetic_graph(2000, 2, roots=3)
+        # Drop some references so that some objects are unreachable.
+        references = references[::2]
+        graph = ReachabilityGraph()
+        graph.add_objects(objects)
+        graph.add_references(references)
+
+        expected = _reachable(objects, references)
+
+        t.assertEqual(graph.traverse(), len(expected))
+        t.assertEqual(list(graph.reachable()), expected)
+        ranges = list(graph.reachable_ranges())
+        t.assertEqual(
+            [
+                zoid
+                for first, last in ranges
+                for zoid in range(first, last + 1)
+            ],
+            expected,
+        )
+
+    def test_references_must_be_sorted(t):
+        graph = ReachabilityGraph()
+        graph.add_objects([(1, True), (2, False)])
+        with t.assertRaises(ValueError):
+            graph.add_references([(2, 1), (1, 2)])
+
+    def test_memory_limit(t):
+        objects, references = synthetic_graph(1000, 4)
+        graph = ReachabilityGraph(max_bytes=1000 * 16)
+        graph.add_objects(objects)
+        with t.assertRaises(GraphTooLarge):
+            graph.add_references(references)
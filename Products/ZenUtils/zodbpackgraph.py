@@ -0,0 +1,329 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+"""
+Compact in-memory object graph used by zenossdbpack to find the objects
+reachable from the objects that must be kept.
+
+The objects are stored in a sorted array of OIDs; an object is identified
+by its position in that array.  The references are stored in compressed
+sparse row form: the references of the object at position k are the
+positions targets[offsets[k]:offsets[k + 1]].  Visited objects are marked
+in a bitmap, so the whole graph takes about 16 bytes per object (an 8 byte
+OID and an 8 byte offset) plus 4 bytes per reference.
+"""
+
+import logging
+import time
+
+from array import array
+from bisect import bisect_left
+
+log = logging.getLogger("zenoss.zodbpack.graph")
+
+# OIDs and offsets are 8 byte integers ('l' is 64 bits wide on the
+# platforms Zenoss runs on); positions fit in 4 bytes.
+_OID_TYPE = "l"
+_POSITION_TYPE = "i"
+
+# Number of rows or objects processed between memory and progress checks.
+_CHECK_INTERVAL = 1 << 16
+
+REPORT_PERIOD = 60
+
+
+class GraphTooLarge(Exception):
+    """The graph doesn't fit in the memory allowed for it."""
+
+
+class ReachabilityGraph(object):
+    """
+    Object graph loaded from the pack_object and object_ref tables.
+
+    Load the objects with add_objects, then the references with
+    add_references, then call traverse to mark the reachable objects.
+    """
+
+    def __init__(self, max_bytes=None, report_period=REPORT_PERIOD):
+        """
+        @param max_bytes: GraphTooLarge is raised when the graph needs more
+            memory than this; None means no limit.
+        @param report_period: Seconds between progress reports.
+        """
+        self.max_bytes = max_bytes
+        self.report_period = report_period
+        self._oids = array(_OID_TYPE)
+        self._roots = array(_POSITION_TYPE)
+        self._offsets = array(_OID_TYPE)
+        self._targets = array(_POSITION_TYPE)
+        self._visited = bytearray()
+        self._frontier_bytes = 0
+
+    def __len__(self):
+        return len(self._oids)
+
+    @property
+    def references(self):
+        """The number of references between the objects of the graph."""
+        return len(self._targets)
+
+    @property
+    def memory(self):
+        """The number of bytes used by the graph."""
+        return (
+            sum(
+                len(a) * a.itemsize
+                for a in (
+                    self._oids,
+                    self._roots,
+                    self._offsets,
+                    self._targets,
+                )
+            )
+            + len(self._visited)
+            + self._frontier_bytes
+        )
+
+    def add_objects(self, rows):
+        """
+        Add the objects of the graph.
+
+        @param rows: (zoid, keep) pairs sorted by zoid; the objects to keep
+            are the roots of the traversal.
+        """
+        if self._oids:
+            raise ValueError("objects already added")
+        oids = self._oids
+        last = None
+        for zoid, keep in rows:
+            if last is not None and zoid <= last:
+                raise ValueError("objects not sorted by zoid")
+            last = zoid
+            if keep:
+                self._roots.append(len(oids))
+            oids.append(zoid)
+            if len(oids) % _CHECK_INTERVAL == 0:
+                self._check_memory()
+        self._check_memory()
+        log.info("Loaded objects  objects=%d roots=%d memory=%d",
+                 len(oids), len(self._roots), self.memory)
+
+    def add_references(self, rows):
+        """
+        Add the references between the objects of the graph.
+
+        References from or to unknown objects are ignored.
+
+        @param rows: (zoid, to_zoid) pairs sorted by zoid.
+        """
+        if self._offsets:
+            raise ValueError("references already added")
+        oids = self._oids
+        offsets = self._offsets
+        targets = self._targets
+        last = None
+        source = None
+        count = 0
+        started = last_report = time.time()
+        for zoid, to_zoid in rows:
+            count += 1
+            if count % _CHECK_INTERVAL == 0:
+                self._check_memory()
+                now = time.time()
+                if now > last_report + self.report_period:
+                    last_report = now
+                    log.info("Loading references  rows=%d references=%d "
+                             "memory=%d", count, len(targets), self.memory)
+            if zoid != last:
+                if last is not None and zoid < last:
+                    raise ValueError("references not sorted by zoid")
+                last = zoid
+                source = self._position(zoid)
+                if source is not None:
+                    while len(offsets) <= source:
+                        offsets.append(len(targets))
+            if source is None:
+                continue
+            target = self._position(to_zoid)
+            if target is not None:
+                targets.append(target)
+        while len(offsets) <= len(oids):
+            offsets.append(len(targets))
+        self._check_memory()
+        log.info("Loaded references  rows=%d references=%d memory=%d "
+                 "elapsed=%.1fs", count, len(targets), self.memory,
+                 time.time() - started)
+
+    def traverse(self):
+        """
+        Mark the objects reachable from the roots.
+
+        Returns the number of reachable objects.
+        """
+        if not self._offsets:
+            self.add_references(())
+        self._visited = visited = bytearray((len(self._oids) + 7) >> 3)
+        offsets = self._offsets
+        targets = self._targets
+        frontier = array(_POSITION_TYPE)
+        for position in self._roots:
+            if not visited[position >> 3] & (1 << (position & 7)):
+                visited[position >> 3] |= 1 << (position & 7)
+                frontier.append(position)
+        reached = len(frontier)
+        level = 0
+        processed = 0
+        started = last_report = time.time()
+        while frontier:
+            level += 1
+            children = array(_POSITION_TYPE)
+            for position in frontier:
+                processed += 1
+                if processed % _CHECK_INTERVAL == 0:
+                    self._frontier_bytes = (
+                        len(frontier) + len(children)
+                    ) * frontier.itemsize
+                    self._check_memory()
+                    now = time.time()
+                    if now > last_report + self.report_period:
+                        last_report = now
+                        self._log_progress(level, reached, len(children))
+                for target in targets[
+                    offsets[position]:offsets[position + 1]
+                ]:
+                    byte, bit = target >> 3, 1 << (target & 7)
+                    if not visited[byte] & bit:
+                        visited[byte] |= bit
+                        children.append(target)
+            reached += len(children)
+            frontier = children
+        self._frontier_bytes = 0
+        log.info("Traversed graph  reachable=%d objects=%d levels=%d "
+                 "elapsed=%.1fs", reached, len(self._oids), level,
+                 time.time() - started)
+        return reached
+
+    def reachable(self):
+        """Return an iterator over the OIDs of the reachable objects."""
+        oids = self._oids
+        for byte, value in enumerate(self._visited):
+            if not value:
+                continue
+            base = byte << 3
+            for bit in xrange(8):
+                if value & (1 << bit):
+                    yield oids[base + bit]
+
+    def reachable_ranges(self):
+        """
+        Return an iterator over (first, last) OID pairs.  The objects
+        whose OIDs are within those ranges are the reachable objects.
+
+        Neighbouring objects of the graph are reported as one range, so
+        the keep flags can be updated with a few range conditions.
+        """
+        oids = self._oids
+        visited = self._visited
+        start = None
+        for byte, value in enumerate(visited):
+            if value == 0xFF and start is not None:
+                continue
+            if value == 0 and start is None:
+                continue
+            base = byte << 3
+            for bit in xrange(8):
+                position = base + bit
+                if value & (1 << bit):
+                    if start is None:
+                        start = position
+                elif start is not None:
+                    yield oids[start], oids[position - 1]
+                    start = None
+        if start is not None:
+            yield oids[start], oids[len(oids) - 1]
+
+    def _position(self, zoid):
+        oids = self._oids
+        position = bisect_left(oids, zoid)
+        if position < len(oids) and oids[position] == zoid:
+            return position
+        return None
+
+    def _check_memory(self):
+        if self.max_bytes is not None and self.memory > self.max_bytes:
+            raise GraphTooLarge(
+                "graph needs more than %d bytes" % self.max_bytes
+            )
+
+    def _log_progress(self, level, reached, found):
+        total = len(self._oids)
+        log.info("Traversing graph  level=%d reachable=%d (%.2f%%) "
+                 "found=%d memory=%d", level, reached,
+                 reached * 100.0 / total if total else 100.0,
+                 found, self.memory)
+
+
+def synthetic_graph(objects, degree, roots=1, seed=0):
+    """
+    Return the (zoid, keep) and (zoid, to_zoid) rows of a random graph
+    shaped like a ZODB: every object is referenced by an object with a
+    lower OID and references `degree` objects on average.
+    """
+    import random
+    rng = random.Random(seed)
+    objects_rows = [(zoid, zoid < roots) for zoid in xrange(objects)]
+    references = []
+    for zoid in xrange(1, objects):
+        references.append((rng.randrange(zoid), zoid))
+    for _ in xrange(max(objects * (degree - 1), 0)):
+        references.append((rng.randrange(objects), rng.randrange(objects)))
+    references.sort()
+    return objects_rows, references
+
+
+def benchmark(objects, degree, max_bytes=None):
+    """Time the traversal of a synthetic graph."""
+    objects_rows, references = synthetic_graph(objects, degree)
+    graph = ReachabilityGraph(max_bytes)
+    started = time.time()
+    graph.add_objects(objects_rows)
+    graph.add_references(references)
+    loaded = time.time()
+    reachable = graph.traverse()
+    traversed = time.time()
+    ranges = sum(1 for _ in graph.reachable_ranges())
+    finished = time.time()
+    return {
+        "objects": len(graph),
+        "references": graph.references,
+        "reachable": reachable,
+        "ranges": ranges,
+        "memory": graph.memory,
+        "load": loaded - started,
+        "traverse": traversed - loaded,
+        "ranges_time": finished - traversed,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the traversal of a synthetic object graph."
+    )
+    parser.add_argument("--objects", type=int, default=1000000)
+    parser.add_argument("--degree", type=int, default=4)
+    args = parser.parse_args()
+    print (
+        "objects=%(objects)d references=%(references)d "
+        "reachable=%(reachable)d ranges=%(ranges)d memory=%(memory)d "
+        "load=%(load).2fs traverse=%(traverse).2fs "
+        "ranges_time=%(ranges_time).2fs"
+        % benchmark(args.objects, args.degree)
+    )
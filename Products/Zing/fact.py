@@ -426,11 +426,18 @@ def _serialize(fact):
         return None, False
 
 
-def serialize_facts(facts):
-    serialized_facts = []
+def iter_serialized_facts(facts):
+    """Serialize each fact, skipping the facts that can't be serialized."""
     for fact in facts:
         data, successful = _serialize(fact)
         if successful:
-            serialized_facts.append(data)
-    if serialize_facts:
-        return '{{"models": [{}]}}'.format(", ".join(serialized_facts))
+            yield data
+
+
+def join_serialized_facts(serialized_facts):
+    """Return the zing-connector request body for the serialized facts."""
+    return '{{"models": [{}]}}'.format(", ".join(serialized_facts))
+
+
+def serialize_facts(facts):
+    return join_serialized_facts(iter_serialized_facts(facts))
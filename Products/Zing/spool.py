@@ -0,0 +1,303 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+import errno
+import fcntl
+import itertools
+import logging
+import os
+import threading
+import time
+
+from collections import deque
+
+log = logging.getLogger("zen.zing.spool")
+
+_SUFFIX = ".facts"
+_TMP_SUFFIX = ".tmp"
+_LOCK_NAME = "lock"
+
+
+class SpooledBatch(object):
+    """A batch of serialized facts stored in the spool."""
+
+    __slots__ = ("name", "size", "count", "enqueued")
+
+    def __init__(self, name, size, count, enqueued):
+        self.name = name
+        self.size = size
+        self.count = count
+        self.enqueued = enqueued
+
+    @classmethod
+    def from_name(cls, name, size):
+        millis, _, count = name[: -len(_SUFFIX)].split("-")
+        return cls(name, size, int(count), int(millis) / 1000.0)
+
+    @staticmethod
+    def make_name(enqueued, sequence, count):
+        return "%016d-%08d-%d%s" % (
+            int(enqueued * 1000),
+            sequence % 100000000,
+            count,
+            _SUFFIX,
+        )
+
+
+class FactSpool(object):
+    """
+    Bounded, durable FIFO of batches of serialized facts.
+
+    Each batch is a file of serialized facts, one per line.  The spool
+    claims a directory under `root` by locking it, so the batches of a
+    process that stopped before publishing them are published by the
+    next process claiming the directory.
+    """
+
+    def __init__(self, root, max_bytes, fsync=True):
+        self._max_bytes = max_bytes
+        self._fsync = fsync
+        self.path, self._lockfile = _claim(root)
+        self._cond = threading.Condition()
+        self._batches = deque()
+        self._bytes = 0
+        self._facts = 0
+        self._sequence = itertools.count()
+        self.dropped = 0
+        for name in sorted(os.listdir(self.path)):
+            filename = os.path.join(self.path, name)
+            if name.endswith(_TMP_SUFFIX):
+                os.unlink(filename)
+            elif name.endswith(_SUFFIX):
+                self._append(
+                    SpooledBatch.from_name(name, os.path.getsize(filename))
+                )
+        if self._batches:
+            log.info(
+                "Found spooled facts  path=%s batches=%d facts=%d",
+                self.path,
+                len(self._batches),
+                self._facts,
+            )
+
+    def __len__(self):
+        return len(self._batches)
+
+    @property
+    def facts(self):
+        """The number of spooled facts."""
+        return self._facts
+
+    @property
+    def size(self):
+        """The number of bytes used by the spooled facts."""
+        return self._bytes
+
+    def put(self, serialized):
+        """
+        Add a batch of serialized facts to the spool.
+
+        Returns False if the facts were dropped because the spool is full.
+        """
+        serialized = list(serialized)
+        if not serialized:
+            return True
+        data = "\n".join(serialized) + "\n"
+        with self._cond:
+            if self._bytes + len(data) > self._max_bytes:
+                self.dropped += len(serialized)
+                return False
+            now = time.time()
+            name = SpooledBatch.make_name(
+                now, next(self._sequence), len(serialized)
+            )
+            self._write(name, data)
+            self._append(SpooledBatch(name, len(data), len(serialized), now))
+            self._cond.notify()
+        return True
+
+    def peek(self, timeout=None):
+        """
+        Return the oldest batch and its serialized facts without removing
+        it from the spool, or None if the spool stays empty for `timeout`
+        seconds.
+        """
+        with self._cond:
+            if not self._batches:
+                self._cond.wait(timeout)
+            if not self._batches:
+                return None
+            batch = self._batches[0]
+        with open(os.path.join(self.path, batch.name)) as f:
+            return batch, f.read().splitlines()
+
+    def remove(self, batch):
+        """Remove the oldest batch, returned by peek, from the spool."""
+        with self._cond:
+            if not self._batches or self._batches[0] is not batch:
+                return
+            self._batches.popleft()
+            self._bytes -= batch.size
+            self._facts -= batch.count
+        try:
+            os.unlink(os.path.join(self.path, batch.name))
+        except OSError as ex:
+            if ex.errno != errno.ENOENT:
+                raise
+
+    def wakeup(self):
+        """Wake up the threads waiting for a batch."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def close(self):
+        """Release the spool's directory."""
+        self._lockfile.close()
+
+    def _append(self, batch):
+        self._batches.append(batch)
+        self._bytes += batch.size
+        self._facts += batch.count
+
+    def _write(self, name, data):
+        tmpname = os.path.join(self.path, name + _TMP_SUFFIX)
+        with open(tmpname, "wb") as f:
+            f.write(data)
+            if self._fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.rename(tmpname, os.path.join(self.path, name))
+
+
+def _claim(root):
+    """Return the path and lock file of the first unused directory."""
+    for index in itertools.count():
+        path = os.path.join(root, str(index))
+        try:
+            os.makedirs(path)
+        except OSError as ex:
+            if ex.errno != errno.EEXIST:
+                raise
+        lockfile = open(os.path.join(path, _LOCK_NAME), "a")
+        try:
+            fcntl.flock(lockfile, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except IOError as ex:
+            lockfile.close()
+            if ex.errno in (errno.EAGAIN, errno.EACCES):
+                continue
+            raise
+        return path, lockfile
+
+
+class FactPublisher(object):
+    """
+    Publishes the spooled facts to zing-connector from a background thread.
+
+    The batches are published in order.  A batch is retried until
+    zing-connector can be reached; facts that zing-connector fails to
+    process are logged and discarded by the client.
+    """
+
+    def __init__(
+        self, spool, client, retry_interval=5.0, stats_interval=300.0
+    ):
+        """
+        @param spool: The FactSpool to publish.
+        @param client: The client sending the facts; its publish method
+            returns the number of facts that weren't accepted, or None
+            if zing-connector couldn't be reached.
+        """
+        self.spool = spool
+        self._client = client
+        self._retry_interval = retry_interval
+        self._stats_interval = stats_interval
+        self._stopping = threading.Event()
+        self._thread = None
+        self._last_stats = time.time()
+        self.sent = 0
+        self.rejected = 0
+        self.retries = 0
+        # Seconds between spooling and publishing the last batch.
+        self.latency = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="zing-fact-publisher"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop publishing once the spool is empty or `timeout` seconds have
+        passed.
+        """
+        if timeout:
+            deadline = time.time() + timeout
+            while len(self.spool) and time.time() < deadline:
+                time.sleep(0.1)
+        self._stopping.set()
+        self.spool.wakeup()
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    def stats(self):
+        return {
+            "batches": len(self.spool),
+            "facts": self.spool.facts,
+            "bytes": self.spool.size,
+            "sent": self.sent,
+            "rejected": self.rejected,
+            "dropped": self.spool.dropped,
+            "retries": self.retries,
+            "latency": self.latency,
+        }
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.publish_next(timeout=1.0)
+            except Exception:
+                log.exception("Unable to publish spooled facts")
+                self._stopping.wait(self._retry_interval)
+            if time.time() - self._last_stats >= self._stats_interval:
+                self._log_stats()
+
+    def publish_next(self, timeout=None):
+        """
+        Publish the oldest batch.  Returns True if a batch was published.
+        """
+        item = self.spool.peek(timeout)
+        if item is None:
+            return False
+        batch, serialized = item
+        failed = self._client.publish(serialized)
+        if failed is None:
+            self.retries += 1
+            log.debug(
+                "zing-connector unavailable, retrying in %s seconds",
+                self._retry_interval,
+            )
+            self._stopping.wait(self._retry_interval)
+            return False
+        self.spool.remove(batch)
+        self.sent += batch.count - failed
+        self.rejected += failed
+        self.latency = time.time() - batch.enqueued
+        return True
+
+    def _log_stats(self):
+        self._last_stats = time.time()
+        stats = self.stats()
+        log.info(
+            "Zing fact spool  batches=%(batches)d facts=%(facts)d "
+            "bytes=%(bytes)d sent=%(sent)d rejected=%(rejected)d "
+            "dropped=%(dropped)d retries=%(retries)d latency=%(latency)s",
+            stats,
+        )
@@ -0,0 +1,132 @@
+##############################################################################
+#
+# Copyright (C) Zenoss, Inc. 2026, all rights reserved.
+#
+# This content is made available according to terms specified in
+# License.zenoss under the directory where your Zenoss product is installed.
+#
+##############################################################################
+
+from __future__ import absolute_import
+
+import shutil
+import tempfile
+
+from unittest import TestCase
+from mock import Mock
+
+from ..spool import FactPublisher, FactSpool
+
+
+class SpoolTestCase(TestCase):
+    def setUp(t):
+        t.root = tempfile.mkdtemp()
+        t.addCleanup(shutil.rmtree, t.root)
+
+    def _spool(t, max_bytes=1024):
+        spool = FactSpool(t.root, max_bytes, fsync=False)
+        t.addCleanup(spool.close)
+        return spool
+
+
+class TestFactSpool(SpoolTestCase):
+    def test_fifo(t):
+        spool = t._spool()
+        t.assertTrue(spool.put(['{"a": 1}', '{"b": 2}']))
+        t.assertTrue(spool.put(['{"c": 3}']))
+        t.assertEqual(len(spool), 2)
+        t.assertEqual(spool.facts, 3)
+
+        batch, serialized = spool.peek(0)
+        t.assertEqual(serialized, ['{"a": 1}', '{"b": 2}'])
+        t.assertEqual(batch.count, 2)
+        spool.remove(batch)
+
+        batch, serialized = spool.peek(0)
+        t.assertEqual(serialized, ['{"c": 3}'])
+        spool.remove(batch)
+
+        t.assertIsNone(spool.peek(0))
+        t.assertEqual(spool.size, 0)
+
+    def test_empty_batch(t):
+        spool = t._spool()
+        t.assertTrue(spool.put([]))
+        t.assertEqual(len(spool), 0)
+
+    def test_full(t):
+        spool = t._spool(max_bytes=10)
+        t.assertTrue(spool.put(['{"a": 1}']))
+        t.assertFalse(spool.put(['{"b": 2}', '{"c": 3}']))
+        t.assertEqual(spool.dropped, 2)
+        t.assertEqual(spool.facts, 1)
+
+    def test_reload(t):
+        spool = t._spool()
+        spool.put(['{"a": 1}'])
+        spool.put(['{"b": 2}'])
+        spool.close()
+
+        spool = t._spool()
+        t.assertEqual(len(spool), 2)
+        t.assertEqual(spool.facts, 2)
+        t.assertEqual(spool.peek(0)[1], ['{"a": 1}'])
+
+    def test_directory_is_claimed(t):
+        first = t._spool()
+        second = t._spool()
+        t.assertNotEqual(first.path, second.path)
+        first.put(['{"a": 1}'])
+        t.assertEqual(len(second), 0)
+
+
+class TestFactPublisher(SpoolTestCase):
+    def setUp(t):
+        super(TestFactPublisher, t).setUp()
+        t.spool = t._spool()
+        t.client = Mock(name="client")
+        t.publisher = FactPublisher(t.spool, t.client, retry_interval=0)
+
+    def test_publish(t):
+        t.spool.put(['{"a": 1}', '{"b": 2}'])
+        t.client.publish.return_value = 0
+
+        t.assertTrue(t.publisher.publish_next(0))
+
+        t.client.publish.assert_called_once_with(['{"a": 1}', '{"b": 2}'])
+        t.assertEqual(len(t.spool), 0)
+        t.assertEqual(t.publisher.sent, 2)
+        t.assertIsNotNone(t.publisher.latency)
+
+    def test_unreachable_is_retried(t):
+        t.spool.put(['{"a": 1}'])
+        t.client.publish.side_effect = [None, 0]
+
+        t.assertFalse(t.publisher.publish_next(0))
+        t.assertEqual(len(t.spool), 1)
+        t.assertEqual(t.publisher.retries, 1)
+
+        t.assertTrue(t.publisher.publish_next(0))
+        t.assertEqual(len(t.spool), 0)
+        t.assertEqual(t.publisher.sent, 1)
+
+    def test_rejected(t):
+        t.spool.put(['{"a": 1}', '{"b": 2}', '{"c": 3}'])
+        t.client.publish.return_value = 1
+
+        t.assertTrue(t.publisher.publish_next(0))
+
+        t.assertEqual(len(t.spool), 0)
+        t.assertEqual(t.publisher.sent, 2)
+        t.assertEqual(t.publisher.rejected, 1)
+
+    def test_empty(t):
+        t.assertFalse(t.publisher.publish_next(0))
+        t.client.publish.assert_not_called()
+
+    def test_stop_drains(t):
+        t.spool.put(['{"a": 1}'])
+        t.client.publish.return_value = 0
+        t.publisher.start()
+        t.publisher.stop(timeout=5)
+        t.assertEqual(len(t.spool), 0)
@@ -7,6 +7,7 @@
 #
 ##############################################################################
 
+import atexit
 import logging
 import httplib
 import requests
@@ -20,9 +21,15 @@ from zope.component.factory import Factory
 from zope.interface import implementer
 
 from Products.ZenUtils.GlobalConfig import getGlobalConfiguration
+from Products.ZenUtils.Utils import zenPath
 
-from .fact import serialize_facts
+from .fact import (
+    iter_serialized_facts,
+    join_serialized_facts,
+    serialize_facts,
+)
 from .interfaces import IZingConnectorClient, IZingConnectorProxy
+from .spool import FactPublisher, FactSpool
 
 log = logging.getLogger("zen.zing.zing-connector")
 
@@ -33,12 +40,18 @@ GLOBAL_ZING_CLIENT_NAME = "zing-connector-client"
 GLOBAL_ZING_CONNECTOR_URL = "zing-connector-url"
 GLOBAL_ZING_CONNECTOR_ENDPOINT = "zing-connector-endpoint"
 GLOBAL_ZING_CONNECTOR_TIMEOUT = "zing-connector-timeout"
+GLOBAL_ZING_CONNECTOR_SPOOL_DIR = "zing-connector-spool-dir"
+GLOBAL_ZING_CONNECTOR_SPOOL_SIZE = "zing-connector-spool-size"
 
-DEFAULT_CLIENT = "ZingConnectorClient"
+DEFAULT_CLIENT = "ZingSpoolingClient"
 DEFAULT_HOST = "http://localhost:9237"
 DEFAULT_ENDPOINT = "/api/model/ingest"
 DEFAULT_TIMEOUT = 5
 DEFAULT_BATCH_SIZE = 1000
+DEFAULT_SPOOL_SIZE = 512  # in MB
+
+# Seconds to keep publishing spooled facts when the process exits.
+_EXIT_FLUSH_TIMEOUT = 10
 
 
 class ZingConnectorConfig(object):
@@ -72,6 +85,21 @@ class ZingConnectorConfig(object):
         # admin port exists no longer
         self.ping_url = self.facts_url
 
+        self.spool_dir = getGlobalConfiguration().get(
+            GLOBAL_ZING_CONNECTOR_SPOOL_DIR
+        ) or zenPath("var", "zing-spool")
+
+        spool_size = (
+            getGlobalConfiguration().get(GLOBAL_ZING_CONNECTOR_SPOOL_SIZE)
+            or DEFAULT_SPOOL_SIZE
+        )
+        try:
+            spool_size = int(spool_size)
+        except Exception:
+            log.error("could not coerce spool size to int: %s", spool_size)
+            spool_size = DEFAULT_SPOOL_SIZE
+        self.spool_size = spool_size * 1024 * 1024
+
 
 def _getZingConnectorClient():
     client_name = (
@@ -173,16 +201,61 @@ class ZingConnectorClient(object):
             )
         return resp_code
 
-    def _send_one_by_one(self, facts):
-        failed = 0
-        for fact in facts:
-            serialized = serialize_facts([fact])
-            resp_code = self._send_facts(serialized, already_serialized=True)
-            if resp_code != httplib.OK:
-                failed += 1
-                log.warn("Error sending fact: %s", serialized)
-        log.warn("%s out of %s facts were not processed.", failed, len(facts))
-        return failed == 0
+    def _send_serialized(self, serialized):
+        """
+        Send the serialized facts, bisecting the batches that
+        zing-connector fails to process.
+
+        Returns the number of facts that were not processed.
+        """
+        resp_code = self._send_facts(
+            join_serialized_facts(serialized), already_serialized=True
+        )
+        if resp_code == httplib.OK:
+            return 0
+        if resp_code == httplib.INTERNAL_SERVER_ERROR:
+            return self._bisect(serialized)
+        return len(serialized)
+
+    def _bisect(self, serialized):
+        if len(serialized) == 1:
+            log.warn("Error sending fact: %s", serialized[0])
+            return 1
+        middle = len(serialized) // 2
+        return self._send_serialized(
+            serialized[:middle]
+        ) + self._send_serialized(serialized[middle:])
+
+    def publish(self, serialized):
+        """
+        Send the serialized facts; used by the FactPublisher.
+
+        Returns the number of facts that were not processed, or None if
+        zing-connector couldn't be reached and the facts should be sent
+        again later.
+        """
+        resp_code = self._send_facts(
+            join_serialized_facts(serialized), already_serialized=True
+        )
+        if resp_code == httplib.OK:
+            return 0
+        if resp_code == httplib.INTERNAL_SERVER_ERROR:
+            failed = self._bisect(serialized)
+            if failed:
+                log.warn(
+                    "%s out of %s facts were not processed.",
+                    failed,
+                    len(serialized),
+                )
+            return failed
+        if httplib.BAD_REQUEST <= resp_code < httplib.INTERNAL_SERVER_ERROR:
+            log.error(
+                "zing-connector rejected %s facts (%s)",
+                len(serialized),
+                resp_code,
+            )
+            return len(serialized)
+        return None
 
     def log_zing_connector_not_reachable(self, custom_msg=""):
         msg = "zing-connector is not available"
@@ -207,8 +280,15 @@ class ZingConnectorClient(object):
                 "unexpected response code (%s)", resp_code,
             )
             if resp_code == httplib.INTERNAL_SERVER_ERROR:
-                log.info("Sending facts one by one to minimize data loss")
-                return self._send_one_by_one(facts)
+                log.info("Bisecting facts to minimize data loss")
+                serialized = list(iter_serialized_facts(facts))
+                failed = self._bisect(serialized) if serialized else 0
+                log.warn(
+                    "%s out of %s facts were not processed.",
+                    failed,
+                    len(serialized),
+                )
+                return failed == 0
         return resp_code == httplib.OK
 
     def send_facts_in_batches(self, facts, batch_size=DEFAULT_BATCH_SIZE):
@@ -223,9 +303,8 @@ class ZingConnectorClient(object):
         if not self.ping():
             self.log_zing_connector_not_reachable()
             return False
-        while facts:
-            batch = facts[:batch_size]
-            del facts[:batch_size]
+        for start in xrange(0, len(facts), batch_size):
+            batch = facts[start:start + batch_size]
             success = success and self.send_facts(batch, ping=False)
         return bool(success)
 
@@ -277,6 +356,73 @@ class ZingConnectorClient(object):
         return resp_code == httplib.NOT_IMPLEMENTED
 
 
+# The process' FactPublisher
+_publisher = None
+_publisher_lock = threading.Lock()
+
+
+def _get_publisher(config):
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            spool = FactSpool(config.spool_dir, config.spool_size)
+            publisher = FactPublisher(spool, ZingConnectorClient(config))
+            publisher.start()
+            atexit.register(publisher.stop, _EXIT_FLUSH_TIMEOUT)
+            _publisher = publisher
+            log.info("Spooling facts for zing-connector  path=%s", spool.path)
+    return _publisher
+
+
+@implementer(IZingConnectorClient)
+class ZingSpoolingClient(ZingConnectorClient):
+    """Spools the facts on disk; a background thread sends them to
+    zing-connector, so callers don't wait for zing-connector.
+
+    Sending facts returns False only if facts were dropped because the
+    spool is full.
+    """
+
+    def __init__(self, config=None):
+        super(ZingSpoolingClient, self).__init__(config)
+        self.publisher = _get_publisher(self.config)
+
+    def _spool(self, serialized):
+        if self.publisher.spool.put(serialized):
+            return True
+        log.error(
+            "Dropped facts, the zing-connector spool is full  "
+            "path=%s dropped=%s",
+            self.publisher.spool.path,
+            self.publisher.spool.dropped,
+        )
+        return False
+
+    def send_facts(self, facts, ping=True):
+        return self._spool(iter_serialized_facts(facts))
+
+    def send_facts_in_batches(self, facts, batch_size=DEFAULT_BATCH_SIZE):
+        return self.send_fact_generator_in_batches(facts, batch_size)
+
+    def send_fact_generator_in_batches(
+        self, fact_gen, batch_size=DEFAULT_BATCH_SIZE, external_log=None
+    ):
+        success = True
+        batch = []
+        for data in iter_serialized_facts(fact_gen):
+            batch.append(data)
+            if len(batch) == batch_size:
+                success = self._spool(batch) and success
+                batch = []
+        if batch:
+            success = self._spool(batch) and success
+        return success
+
+    def ping(self):
+        # The spool accepts facts whether or not zing-connector is up.
+        return True
+
+
 @implementer(IZingConnectorProxy)
 class ZingConnectorProxy(object):
     """This class provides a ZingConnectorClient per zope thread.
@@ -316,4 +462,5 @@ class ZingConnectorProxy(object):
 
 
 CLIENT_FACTORY = Factory(ZingConnectorClient)
+SPOOLING_CLIENT_FACTORY = Factory(ZingSpoolingClient)
 NULL_CLIENT_FACTORY = Factory(NullZingClient)
@@ -41,6 +41,12 @@ class ComponentWrapper(object):
             sort = True
             attr = attr[:-6]
         val = getattr(self._info, attr)
+        if isinstance(val, list):
+            val = val[0] if val else None
+        if callable(val):
+            val = val()
+        if IInfo.providedBy(val):
+            val = val.name
         if isinstance(val, dict):
             return val.get('name')
         return pad_numeric_values_for_indexing(val) if sort else str(val)
@@ -72,19 +78,34 @@ class ComponentFieldSpec(object):
         for component in obj.device().componentSearch(meta_type=meta_type):
             catalog.catalog_object(ComponentWrapper(component.getObject()), component.getPath())
 
-    def get_catalog(self, obj, meta_type):
+    def get_sort_index(self, catalog, field):
+        """
+        @return: The name of the index of catalog sorting on field, or None
+                 if field isn't indexed.
+        """
+        for index in (field + '__sort', field):
+            if index in catalog._catalog.indexes:
+                return index
+        return None
+
+    def get_catalog(self, obj, meta_type, create=True):
         """
         @param obj:       A device component for which a type-specific catalog should get got
         @type obj:        DeviceComponent
         @param meta_type: The meta_type the catalog is being created for
         @type meta_type:  str
-        @return:          The component type catalog
+        @param create:    Whether to create the catalog if it doesn't exist
+        @type create:     bool
+        @return:          The component type catalog, or None if it doesn't
+                          exist and create is False
         @rtype:           ZCatalog
         """
         device = obj.device()
         try:
             catalog = device._getOb(self.catalog_name)
         except AttributeError:
+            if not create:
+                return None
             catalog = self.create_catalog(device)
             self.index_all_of_type(obj, meta_type)
         if 'path' not in catalog._catalog.indexes:
@@ -101,7 +122,12 @@ def onComponentIndexingEvent(ob, event):
     spec = get_component_field_spec(ob.meta_type)
     if spec is None:
         return
-    catalog = spec.get_catalog(ob, ob.meta_type)
+    # The catalog is created, and all the components of its type are
+    # indexed, when a grid first asks for it; don't create it while the
+    # device is being modelled.
+    catalog = spec.get_catalog(ob, ob.meta_type, create=False)
+    if catalog is None:
+        return
     catalog.catalog_object(ComponentWrapper(ob), '/'.join(ob.getPhysicalPath()))
 
 
@@ -110,7 +136,9 @@ def onComponentRemoved(ob, event):
         spec = get_component_field_spec(ob.meta_type)
         if spec is None:
             return
-        catalog = spec.get_catalog(ob, ob.meta_type)
+        catalog = spec.get_catalog(ob, ob.meta_type, create=False)
+        if catalog is None:
+            return
         uid = '/'.join(ob.getPrimaryPath())
         if catalog.getrid(uid) is None:
             # Avoid "tried to uncatalog nonexistent object" warnings
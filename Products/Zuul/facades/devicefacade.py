@@ -77,6 +77,9 @@ from Products.Zuul.utils import (
 iszprop = re.compile("z[A-Z]").match
 log = logging.getLogger("zen.DeviceFacade")
 
+# Component grid columns that the grid filter doesn't search.
+_UNSEARCHABLE_KEYS = ("uid", "uuid", "events", "status", "severity")
+
 
 class DeviceCollectorChangeEvent(object):
     implements(IDeviceCollectorChangeEvent)
@@ -177,8 +180,7 @@ class DeviceFacade(TreeFacade):
         for comp in comps:
             keep = False
             for key in keys:
-                # non searchable fields
-                if key in ("uid", "uuid", "events", "status", "severity"):
+                if key in _UNSEARCHABLE_KEYS:
                     continue
                 val = getattr(comp, key, None)
                 if not val:
@@ -210,13 +212,21 @@ class DeviceFacade(TreeFacade):
         spec = get_component_field_spec(meta_type)
         if spec is None:
             return None, 0
+        if name and any(
+            key not in spec.fields and key not in _UNSEARCHABLE_KEYS
+            for key in keys
+        ):
+            # The filter must match columns the catalog doesn't index;
+            # fall back to slow queries and filtering
+            return None, 0
         typecat = spec.get_catalog(obj, meta_type)
         sortspec = ()
         if sort:
-            if sort not in typecat._catalog.indexes:
+            index = spec.get_sort_index(typecat, sort)
+            if index is None:
                 # Fall back to slow queries and sorting
                 return None, 0
-            sortspec = ((sort, dir),)
+            sortspec = ((index, "desc" if dir == "DESC" else "asc"),)
         querySet = [Generic("path", uid)]
         if name:
             querySet.append(
@@ -230,9 +240,8 @@ class DeviceFacade(TreeFacade):
             brains = brains[start : start + limit]
         return brains, total
 
-    def _typecatComponentPostProcess(
-        self, brains, total, sort="name", reverse=False
-    ):
+    def _typecatComponentPostProcess(self, brains, total):
+        # The brains are the requested page, already sorted by the catalog.
         hash_ = str(total)
         comps = map(IInfo, map(unbrain, brains))
         # fetch any rrd data necessary
@@ -249,10 +258,7 @@ class DeviceFacade(TreeFacade):
             severities = zep.getWorstSeverity(uuids)
             for r in comps:
                 r.setWorstEventSeverity(severities[r.uuid])
-        sortedComps = sorted(
-            comps, key=lambda x: getattr(x, sort), reverse=reverse
-        )
-        return SearchResults(iter(sortedComps), total, hash_, False)
+        return SearchResults(iter(comps), total, hash_, False)
 
     # Get components from model catalog. Not used for now
     def _get_component_brains_from_model_catalog(self, uid, meta_type=()):
@@ -290,9 +296,7 @@ class DeviceFacade(TreeFacade):
                 uid, types, meta_type, start, limit, sort, dir, name, keys
             )
             if brains is not None:
-                return self._typecatComponentPostProcess(
-                    brains, total, sort, reverse
-                )
+                return self._typecatComponentPostProcess(brains, total)
         if isinstance(meta_type, six.string_types):
             meta_type = (meta_type,)
         if isinstance(types, six.string_types):
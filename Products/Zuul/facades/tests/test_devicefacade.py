@@ -223,6 +223,45 @@ class DeviceFacadeTest(ZuulFacadeTestCase):
         self.assertEquals(device.getProductionState(), 1000)
         self.assertEquals(device.getPerformanceServer().id, 'localhost')
 
+    def test_getComponentsSortsAndPagesInCatalog(self):
+        from Products.ZenModel.IpInterface import manage_addIpInterface
+        dev = self.dmd.Devices.createInstance('dev')
+        for name in ('eth10', 'eth2', 'eth1', 'eth3'):
+            manage_addIpInterface(dev.os.interfaces, name, True)
+            notify(IndexingEvent(dev.os.interfaces._getOb(name)))
+        # Indexing doesn't create the catalog; the first grid request does.
+        catalog = 'IpInterface_componentCatalog'
+        self.assertIsNone(dev._getOb(catalog, None))
+        uid = dev.getPrimaryId()
+
+        results = self.facade.getComponents(
+            uid=uid, meta_type='IpInterface', start=1, limit=2,
+            sort='name', dir='ASC')
+        self.assertEquals(4, results.total)
+        self.assertEquals(['eth2', 'eth3'], [c.name for c in results])
+        self.assertIsNotNone(dev._getOb(catalog, None))
+
+        results = self.facade.getComponents(
+            uid=uid, meta_type='IpInterface', start=0, limit=1,
+            sort='name', dir='DESC')
+        self.assertEquals(4, results.total)
+        self.assertEquals(['eth10'], [c.name for c in results])
+
+    def test_getComponentsFiltersUnindexedColumns(self):
+        from Products.ZenModel.IpInterface import manage_addIpInterface
+        dev = self.dmd.Devices.createInstance('dev')
+        for name in ('eth0', 'eth1'):
+            manage_addIpInterface(dev.os.interfaces, name, True)
+        dev.os.interfaces.eth1.addIpAddress('10.1.2.3', 24)
+        uid = dev.getPrimaryId()
+
+        # ipAddress isn't indexed by the IpInterface catalog.
+        results = self.facade.getComponents(
+            uid=uid, meta_type='IpInterface', sort='name', dir='ASC',
+            name='10.1.2', keys=['name', 'ipAddress'])
+        self.assertEquals(1, results.total)
+        self.assertEquals(['eth1'], [c.name for c in results])
+
     def test_setProductionState(self):
         dev = self.dmd.Devices.createInstance('dev')
         dev2 = self.dmd.Devices.createInstance('dev2')